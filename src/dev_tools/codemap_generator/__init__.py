@@ -10,23 +10,58 @@ Public API:
     ImportInfo        — Dataclass for import statements
     EntryPoint        — Dataclass for entry points
     CallInfo          — Dataclass for call relationships
+    CallGraph         — Resolved call graph with reachability/path/ranking queries
+    DependencyGraph   — Module import graph with cycles and transitive closures
+    FileAnalysis      — Per-file extraction result (picklable)
+    extract_file      — Extract one file into a FileAnalysis
+    ExtractionCache   — Persistent per-file extraction cache
+    ResourceLimits    — Per-file size/time limits for extraction
+    RevisionSource    — A package's files at a git revision (read without checkout)
+    GitError          — Raised when a git revision cannot be read
+    SymbolStore       — SQLite-backed symbol database and query API
+    CodeMapExport     — Memory-mapped, per-module loader of a binary export
+    Monorepo          — Every package under several source roots, in one pass
+    CodeMapWatcher    — Keeps an analysis current by re-parsing only changed files
     main              — CLI entry point
 """
 
+from dev_tools.codemap_generator.cache import ExtractionCache
+from dev_tools.codemap_generator.callgraph import CallGraph
+from dev_tools.codemap_generator.cli import main
+from dev_tools.codemap_generator.depgraph import DependencyGraph
+from dev_tools.codemap_generator.export import CodeMapExport
+from dev_tools.codemap_generator.extractor import extract_file
 from dev_tools.codemap_generator.generator import (
     CallInfo,
     CodeMapGenerator,
     EntryPoint,
+    FileAnalysis,
     ImportInfo,
     SymbolInfo,
-    main,
 )
+from dev_tools.codemap_generator.gitrev import GitError, RevisionSource
+from dev_tools.codemap_generator.guards import ResourceLimits
+from dev_tools.codemap_generator.monorepo import Monorepo
+from dev_tools.codemap_generator.store import SymbolStore
+from dev_tools.codemap_generator.watch import CodeMapWatcher
 
 __all__ = [
+    "CallGraph",
     "CallInfo",
+    "CodeMapExport",
     "CodeMapGenerator",
+    "CodeMapWatcher",
+    "DependencyGraph",
     "EntryPoint",
+    "ExtractionCache",
+    "FileAnalysis",
+    "GitError",
     "ImportInfo",
+    "Monorepo",
+    "ResourceLimits",
+    "RevisionSource",
     "SymbolInfo",
+    "SymbolStore",
+    "extract_file",
     "main",
 ]
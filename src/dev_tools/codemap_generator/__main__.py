@@ -1,6 +1,8 @@
 """Allow running the codemap generator as ``python -m dev_tools.codemap_generator``."""
 
-from dev_tools.codemap_generator.generator import main
+import sys
+
+from dev_tools.codemap_generator.cli import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+Blocking-call-in-coroutine detection for the code map generator.
+
+One blocking call — ``time.sleep``, ``open(...).read()``,
+``requests.get``, ``subprocess.run`` — inside an ``async def`` stalls the
+whole event loop.  :func:`find_blocking_calls` walks the resolved
+:class:`~dev_tools.codemap_generator.callgraph.CallGraph` to report them:
+
+* **direct** — a coroutine calls a blocking API itself;
+* **transitive** — a coroutine calls a plain (sync) package function
+  that, through any chain of further sync calls, reaches one.
+
+Calls into other coroutines are not followed: they are reported where
+the blocking call happens.  Functions handed to ``asyncio.to_thread`` or
+``run_in_executor`` are passed, not called, so they do not count.
+
+Blocking APIs are matched by fully qualified name (after import
+resolution) against ``fnmatch`` patterns such as ``requests.*``; bare
+builtins (``open``, ``input``) are matched when the module does not
+define its own.  The defaults are :data:`DEFAULT_BLOCKING_APIS`.
+
+Usage::
+
+    gen.find_blocking_calls()
+    gen.find_blocking_calls(blocking_apis=[*DEFAULT_BLOCKING_APIS, "mylib.sync_*"])
+"""
+
+import fnmatch
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Optional
+
+from dev_tools.codemap_generator.callgraph import CallGraph
+from dev_tools.codemap_generator.extractor import module_name_for
+from dev_tools.codemap_generator.models import CallInfo, SymbolInfo
+
+#: Output file name of the blocking-call report.
+ASYNC_BLOCKING_FILE_NAME = "async-blocking.md"
+
+#: Known blocking APIs (``fnmatch`` patterns over qualified names).
+DEFAULT_BLOCKING_APIS: tuple[str, ...] = (
+    "time.sleep",
+    "open",
+    "input",
+    "subprocess.run",
+    "subprocess.call",
+    "subprocess.check_call",
+    "subprocess.check_output",
+    "subprocess.getoutput",
+    "subprocess.getstatusoutput",
+    "os.system",
+    "os.popen",
+    "os.wait",
+    "os.waitpid",
+    "requests.*",
+    "httpx.get",
+    "httpx.post",
+    "httpx.put",
+    "httpx.patch",
+    "httpx.delete",
+    "httpx.head",
+    "httpx.request",
+    "urllib.request.urlopen",
+    "socket.create_connection",
+    "socket.getaddrinfo",
+    "socket.gethostbyname",
+    "shutil.copy*",
+    "shutil.move",
+    "shutil.rmtree",
+    "sqlite3.connect",
+)
+
+_SYNC_TYPES = ("function", "method")
+_ASYNC_TYPES = ("async_function", "async_method")
+
+
+@dataclass
+class BlockingCall:
+    """A coroutine that (transitively) makes a blocking call."""
+
+    coroutine: str  # qualified name of the ``async def``
+    api: str  # the blocking API reached
+    file_path: str
+    line_number: int  # of the coroutine's first call on the path
+    path: list[str]  # coroutine, sync package functions..., api
+
+    @property
+    def direct(self) -> bool:
+        """``True`` if the coroutine calls the API itself."""
+        return len(self.path) == 2
+
+
+def compile_patterns(patterns: Iterable[str]) -> re.Pattern[str]:
+    """Merge ``fnmatch`` patterns into one regex (matches nothing when empty)."""
+    alternatives = [fnmatch.translate(p) for p in patterns]
+    return re.compile("|".join(alternatives) if alternatives else r"(?!)")
+
+
+class _Analysis:  # pylint: disable=too-few-public-methods
+    """State shared by the passes of :func:`find_blocking_calls`."""
+
+    def __init__(
+        self,
+        graph: CallGraph,
+        symbols: list[SymbolInfo],
+        calls: list[CallInfo],
+        src_dir: str,
+        blocking: re.Pattern[str],
+    ) -> None:
+        self.graph = graph
+        self.blocking = blocking
+        self.location: dict[str, tuple[str, int]] = {}
+        for sym in symbols:
+            module = module_name_for(sym.file_path, src_dir)
+            owner = f"{module}.{sym.parent_class}" if sym.parent_class else module
+            self.location[f"{owner}.{sym.name}"] = (sym.file_path, sym.line_number)
+
+        # Direct blocking APIs per package function, from the resolved graph ...
+        self.direct: dict[str, set[str]] = {}
+        for name in graph.names:
+            if not blocking.fullmatch(name):
+                continue
+            for caller in graph.callers(name):
+                self.direct.setdefault(caller, set()).add(name)
+        # ... plus bare builtins, which the graph cannot resolve, and call lines.
+        self.lines: dict[tuple[str, str], int] = {}
+        for call in calls:
+            module = module_name_for(call.file_path, src_dir)
+            caller = f"{module}.{call.caller}"
+            key = (caller, call.callee)
+            if key not in self.lines or call.line_number < self.lines[key]:
+                self.lines[key] = call.line_number
+            target = call.target or call.callee
+            if (
+                "." not in target
+                and blocking.fullmatch(target)
+                and not graph.is_internal(f"{module}.{target}")
+            ):
+                self.direct.setdefault(caller, set()).add(target)
+
+    def line_of(self, caller: str, callee: str) -> int:
+        """Line of the first call from *caller* to *callee* (by bare name)."""
+        line = self.lines.get((caller, callee.rpartition(".")[2]))
+        if line is None:
+            return self.location.get(caller, ("", 0))[1]
+        return line
+
+    def next_hops(self) -> dict[str, str]:
+        """Sync package function → next sync callee (or API) on a shortest blocking path.
+
+        A multi-source BFS backwards from every function with a direct
+        blocking call, through sync callers only.
+        """
+        hop: dict[str, str] = {}
+        queue: deque[str] = deque()
+        for name in sorted(self.direct):
+            if self.graph.symbol_type(name) in _SYNC_TYPES:
+                hop[name] = min(self.direct[name])
+                queue.append(name)
+        while queue:
+            name = queue.popleft()
+            for caller in self.graph.callers(name):
+                if caller not in hop and self.graph.symbol_type(caller) in _SYNC_TYPES:
+                    hop[caller] = name
+                    queue.append(caller)
+        return hop
+
+
+def find_blocking_calls(
+    graph: CallGraph,
+    symbols: list[SymbolInfo],
+    calls: list[CallInfo],
+    src_dir: str = "",
+    blocking_apis: Iterable[str] = DEFAULT_BLOCKING_APIS,
+) -> list[BlockingCall]:
+    """Report blocking calls made directly or transitively from coroutines.
+
+    Args:
+        graph: The resolved call graph.
+        symbols: All collected symbols (for locations and async scopes).
+        calls: All collected in-function calls (for call lines and builtins).
+        src_dir: Name of the src directory that prefixes recorded paths.
+        blocking_apis: ``fnmatch`` patterns of blocking qualified names.
+
+    Returns:
+        Findings sorted by file and line; direct calls are listed per API,
+        transitive ones once per first sync callee (with the shortest path).
+    """
+    analysis = _Analysis(graph, symbols, calls, src_dir, compile_patterns(blocking_apis))
+    hops = analysis.next_hops()
+    found: list[BlockingCall] = []
+    for coroutine, (file_path, _line) in analysis.location.items():
+        if graph.symbol_type(coroutine) not in _ASYNC_TYPES:
+            continue
+        for api in sorted(analysis.direct.get(coroutine, ())):
+            found.append(BlockingCall(
+                coroutine, api, file_path, analysis.line_of(coroutine, api), [coroutine, api]
+            ))
+        if coroutine not in graph:
+            continue
+        for callee in graph.callees(coroutine):
+            if callee not in hops or callee in analysis.direct.get(coroutine, ()):
+                continue  # not blocking, or a blocking API reported as direct above
+            path = [coroutine, callee]
+            # A blocking pattern may match package functions that call each
+            # other: stop at the first matched API or at a repeated name.
+            while path[-1] in hops and not analysis.blocking.fullmatch(path[-1]):
+                step = hops[path[-1]]
+                if step in path:
+                    break
+                path.append(step)
+            found.append(BlockingCall(
+                coroutine, path[-1], file_path, analysis.line_of(coroutine, callee), path
+            ))
+    found.sort(key=lambda f: (f.file_path, f.line_number, f.coroutine, f.api))
+    return found
+
+
+def iter_report(
+    findings: list[BlockingCall], patterns: Optional[Iterable[str]] = None
+) -> Iterator[str]:
+    """Yield the markdown body of the blocking-call report (without a header)."""
+    if patterns is not None:
+        yield f"Blocking APIs: {', '.join(f'`{p}`' for p in patterns)}"
+        yield ""
+    if not findings:
+        yield "_No blocking calls reachable from coroutines._"
+        return
+    coroutines = {f.coroutine for f in findings}
+    direct = sum(1 for f in findings if f.direct)
+    yield (
+        f"{len(findings)} blocking calls in {len(coroutines)} coroutines"
+        f" ({direct} direct, {len(findings) - direct} through sync helpers)."
+    )
+    yield from [
+        "",
+        "| Coroutine | Location | Blocking Call | Via |",
+        "|-----------|----------|---------------|-----|",
+    ]
+    for finding in findings:
+        location = f"{finding.file_path}:{finding.line_number}"
+        via = " → ".join(f"`{name}`" for name in finding.path[1:-1]) or "direct"
+        yield (
+            f"| `{finding.coroutine}` | [{location}]({finding.file_path}#L{finding.line_number})"
+            f" | `{finding.api}` | {via} |"
+        )
+    yield ""
+    yield (
+        "Move blocking work off the event loop (`await asyncio.to_thread(...)`,"
+        " `loop.run_in_executor`) or use an async client."
+    )
@@ -0,0 +1,27 @@
+"""
+Permissions for files written atomically (temporary file + ``os.replace``).
+
+``tempfile.mkstemp`` creates its file with mode ``0600`` and ``os.replace``
+keeps the temporary file's mode, so without :func:`set_replacement_mode`
+every replaced report, export or cache entry would become private to the
+user who wrote it.
+"""
+
+import os
+import stat
+from pathlib import Path
+
+
+def set_replacement_mode(tmp_name: str, path: Path) -> None:
+    """Give *tmp_name* the mode *path* should have once it is replaced.
+
+    That is *path*'s current mode, or for a new file ``0o666`` minus the
+    umask, as :func:`open` would create it.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(tmp_name, mode)
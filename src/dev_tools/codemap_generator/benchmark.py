@@ -0,0 +1,448 @@
+"""
+Benchmark for the code map generator on a synthetic package.
+
+Generates a package with a configurable number of modules, each containing
+classes, methods, functions, imports and calls, then times every phase of
+a run separately: :meth:`CodeMapGenerator.analyze`, each ``generate_*``
+report and :meth:`CodeMapGenerator.write_outputs`.  One further, untimed
+run is traced with :mod:`tracemalloc` to record each phase's peak memory
+(tracing slows Python down too much to time the same run).
+
+Results can be written as JSON and compared with an earlier result, so a
+regression in the AST or report paths shows up as a failing exit code.
+
+``--record-memory`` also loads the package's records, as the extraction
+cache does, once as plain dataclasses with list fields (the layout before
+slotted records) and once as the current slotted, interned records, each
+in a fresh interpreter, and reports the resident set size they take.
+
+Usage:
+    python -m dev_tools.codemap_generator.benchmark [--modules 500] [--repeat 3]
+    python -m dev_tools.codemap_generator.benchmark --json after.json --baseline before.json
+    python -m dev_tools.codemap_generator.benchmark --record-memory --repeat 1
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import MISSING, field, fields, make_dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from dev_tools.codemap_generator.generator import CodeMapGenerator, discover_files
+from dev_tools.codemap_generator.models import (
+    CallInfo,
+    EntryPoint,
+    FileAnalysis,
+    ImportInfo,
+    SymbolInfo,
+)
+from dev_tools.codemap_generator.timing import peak_rss
+
+#: Bump when the synthetic package or the result layout changes; results
+#: of different versions are not compared.
+BENCHMARK_VERSION = 2
+
+#: Default allowed slowdown per phase before ``--baseline`` fails (25%).
+DEFAULT_TOLERANCE = 0.25
+
+#: Phases shorter than this (seconds) in the baseline are never reported
+#: as regressions; their timings are mostly noise.
+_MIN_COMPARED = 0.005
+
+#: Record layouts compared by :func:`measure_record_memory`.
+RECORD_LAYOUTS = ("dataclass", "slotted")
+
+#: Record lists of a :class:`FileAnalysis` loaded in both layouts.
+_RECORD_LISTS = ("symbols", "imports", "calls", "entry_points", "module_calls")
+
+
+def generate_synthetic_package(  # pylint: disable=too-many-arguments,too-many-locals
+    src_root: Path,
+    package_name: str = "synthetic_pkg",
+    *,
+    modules: int = 200,
+    classes: int = 4,
+    methods: int = 6,
+    functions: int = 8,
+    calls: int = 3,
+    imports: int = 1,
+) -> Path:
+    """Write a synthetic package under *src_root* and return its directory.
+
+    Modules are spread over ten subpackages.  Each module imports
+    ``func_0`` from its *imports* predecessors (called from its own
+    ``func_0``), defines *classes* classes with *methods* methods and
+    *functions* top-level functions, and every function or method makes
+    *calls* calls.
+    """
+    package_root = src_root / package_name
+    package_root.mkdir(parents=True, exist_ok=True)
+    (package_root / "__init__.py").write_text('"""Synthetic package."""\n', encoding="utf-8")
+
+    for index in range(modules):
+        sub = package_root / f"sub_{index % 10}"
+        if not sub.exists():
+            sub.mkdir()
+            (sub / "__init__.py").write_text("", encoding="utf-8")
+
+        lines = [f'"""Synthetic module {index}."""', "import os", "import json"]
+        imported = []
+        for prev in range(index - 1, max(index - imports, 0) - 1, -1):
+            imported.append(f"mod_{prev}_func_0")
+            lines.append(
+                f"from {package_name}.sub_{prev % 10}.mod_{prev} import func_0 as {imported[-1]}"
+            )
+        lines.append("")
+
+        body_calls = [f"    helper_{c}(value)" for c in range(calls)]
+        for cls in range(classes):
+            lines.extend([f"class Class{cls}:", f'    """Class {cls}."""', ""])
+            for method in range(methods):
+                lines.extend([
+                    f"    def method_{method}(self, value, other=None):",
+                    f'        """Method {method}."""',
+                    *(f"        self.method_{(method + c + 1) % methods}(value)"
+                      for c in range(calls)),
+                    "        return value",
+                    "",
+                ])
+        for func in range(functions):
+            lines.extend([
+                f"def func_{func}(value, *args, **kwargs):",
+                f'    """Function {func}."""',
+                *body_calls,
+                *(f"    {name}(value)" for name in (imported if func == 0 else ())),
+                "    return os.path.join(str(value), json.dumps(args))",
+                "",
+            ])
+        for c in range(calls):
+            lines.extend([f"def helper_{c}(value):", "    return value", ""])
+        lines.extend(['if __name__ == "__main__":', "    func_0(1)", ""])
+        (sub / f"mod_{index}.py").write_text("\n".join(lines), encoding="utf-8")
+
+    return package_root
+
+
+def time_analyze(src_root: Path, package_name: str, repeat: int = 3, workers: int = 1) -> float:
+    """Return the best wall time (seconds) of *repeat* ``analyze()`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        generator = CodeMapGenerator(src_root, package_name, workers=workers)
+        start = time.perf_counter()
+        generator.analyze()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _phases(
+    generator: CodeMapGenerator, output_dir: Path
+) -> list[tuple[str, Callable[[], object]]]:
+    """The phases of one run, in order.
+
+    The dependency and call graphs are built by the first report that
+    needs them, so ``write_outputs`` measures rendering and I/O only.
+    """
+    phases: list[tuple[str, Callable[[], object]]] = [("analyze", generator.analyze)]
+    phases.extend(
+        (f"generate_{name}", getattr(generator, f"generate_{name}"))
+        for _, name in CodeMapGenerator.OUTPUTS
+    )
+    phases.append(("write_outputs", lambda: generator.write_outputs(output_dir)))
+    return phases
+
+
+def _quietly(func: Callable[[], object]) -> None:
+    """Call *func* with stdout discarded (``write_outputs`` prints each file)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+
+
+def run_benchmark(
+    src_root: Path,
+    package_name: str,
+    *,
+    repeat: int = 3,
+    workers: int = 1,
+    memory: bool = True,
+) -> dict[str, Any]:
+    """Time each phase of *repeat* runs and trace one for peak memory.
+
+    Returns:
+        ``timings`` (best seconds per phase), ``peak_memory`` (bytes
+        allocated at the peak of each phase, empty without *memory*),
+        ``files`` analyzed and ``symbols`` found.
+    """
+    timings: dict[str, float] = {}
+    generator = CodeMapGenerator(src_root, package_name)
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(max(repeat, 1)):
+            generator = CodeMapGenerator(src_root, package_name, workers=workers)
+            for phase, func in _phases(generator, Path(tmp) / f"run_{run}"):
+                start = time.perf_counter()
+                _quietly(func)
+                elapsed = time.perf_counter() - start
+                timings[phase] = min(timings.get(phase, elapsed), elapsed)
+
+        peak_memory: dict[str, int] = {}
+        if memory:
+            traced = CodeMapGenerator(src_root, package_name)  # in-process: traceable
+            tracemalloc.start()
+            try:
+                for phase, func in _phases(traced, Path(tmp) / "traced"):
+                    tracemalloc.reset_peak()
+                    _quietly(func)
+                    peak_memory[phase] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    return {
+        "files": len(generator.source_hashes),
+        "symbols": len(generator.symbols),
+        "timings": timings,
+        "peak_memory": peak_memory,
+    }
+
+
+def _unslotted(cls: type) -> type:
+    """*cls* as a plain dataclass with ``list`` sequences, as records used to be."""
+    return make_dataclass(cls.__name__, [
+        (spec.name, list, field(default_factory=list)) if spec.default == ()
+        else (spec.name, spec.type) if spec.default is MISSING
+        else (spec.name, spec.type, field(default=spec.default))
+        for spec in fields(cls)
+    ])
+
+
+#: Record list → its record type in the ``"dataclass"`` layout.
+_UNSLOTTED: dict[str, type] = dict(zip(
+    _RECORD_LISTS, map(_unslotted, (SymbolInfo, ImportInfo, CallInfo, EntryPoint, CallInfo))
+))
+
+
+def _load_records(data: dict[str, Any], layout: str) -> object:
+    """Build one file's records from its cached form in *layout*."""
+    if layout == "slotted":
+        analysis = FileAnalysis.from_dict(data)
+        analysis.intern_strings()
+        return analysis
+    return {name: [_UNSLOTTED[name](**record) for record in data[name]] for name in _RECORD_LISTS}
+
+
+def _current_rss() -> Optional[int]:
+    """Current resident set size in bytes (the peak, where ``/proc`` is missing)."""
+    try:
+        resident = Path("/proc/self/statm").read_text(encoding="ascii").split()[1]
+    except OSError:
+        return peak_rss()
+    return int(resident) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _record_memory_child(conn: Any, dump_path: str, layout: str) -> None:
+    """Load every file of *dump_path* (JSON lines) and send the RSS growth."""
+    gc.collect()
+    before = _current_rss()
+    with Path(dump_path).open(encoding="utf-8") as lines:
+        kept = [_load_records(json.loads(line), layout) for line in lines]
+    after = _current_rss()
+    conn.send(None if before is None or after is None else after - before)
+    conn.close()
+    del kept
+
+
+def _dump_records(src_root: Path, package_name: str, dump: Path) -> int:
+    """Extract the package into *dump* (one JSON file result per line); count records."""
+    generator = CodeMapGenerator(src_root, package_name)
+    records = 0
+    with dump.open("w", encoding="utf-8") as out:
+        for analysis in generator.extract_files(discover_files(src_root / package_name)):
+            data = analysis.to_dict()
+            records += sum(len(data[name]) for name in _RECORD_LISTS)
+            out.write(json.dumps(
+                {key: data[key] for key in ("file_path", "module_name", *_RECORD_LISTS)}
+            ) + "\n")
+    return records
+
+
+def measure_record_memory(src_root: Path, package_name: str) -> dict[str, Any]:
+    """Resident memory taken by the package's records in each layout.
+
+    The records are extracted once and dumped as the extraction cache
+    stores them; each layout then loads the dump, one file at a time, in
+    a fresh interpreter, whose peak RSS growth is what the records take.
+
+    Returns:
+        ``records`` loaded and, per :data:`RECORD_LAYOUTS` entry, the
+        RSS growth in bytes (``None`` where the platform reports no RSS).
+    """
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        dump = Path(tmp) / "records.jsonl"
+        result: dict[str, Any] = {"records": _dump_records(src_root, package_name, dump)}
+        for layout in RECORD_LAYOUTS:
+            receiver, sender = context.Pipe(duplex=False)
+            child = context.Process(
+                target=_record_memory_child, args=(sender, str(dump), layout)
+            )
+            child.start()
+            sender.close()
+            result[layout] = receiver.recv()
+            child.join()
+    return result
+
+
+def compare(
+    result: dict[str, Any], baseline: dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> list[str]:
+    """Phases that got more than *tolerance* slower than in *baseline*.
+
+    Raises:
+        ValueError: If the two results are not comparable (different
+            benchmark version or synthetic package parameters).
+    """
+    for key in ("version", "parameters"):
+        if result.get(key) != baseline.get(key):
+            raise ValueError(
+                f"Baseline is not comparable: {key} {baseline.get(key)!r} != {result.get(key)!r}"
+            )
+    before = baseline["timings"]
+    return [
+        phase for phase, seconds in result["timings"].items()
+        if before.get(phase, 0.0) >= _MIN_COMPARED and seconds > before[phase] * (1 + tolerance)
+    ]
+
+
+def _print_result(result: dict[str, Any], baseline: Optional[dict[str, Any]]) -> None:
+    """Print the per-phase table (with the baseline ratio when given)."""
+    params = result["parameters"]
+    print(
+        f"{params['modules']} modules, {result['files']} files, {result['symbols']} symbols"
+        f" (best of {params['repeat']}, {params['jobs']} job(s))"
+    )
+    for phase, seconds in result["timings"].items():
+        line = f"  {phase:<36} {seconds * 1000:9.1f} ms"
+        peak = result["peak_memory"].get(phase)
+        if peak is not None:
+            line += f" {peak / 2**20:9.1f} MiB peak"
+        if baseline is not None and baseline["timings"].get(phase):
+            line += f"  x{seconds / baseline['timings'][phase]:.2f}"
+        print(line)
+    analyze = result["timings"]["analyze"]
+    print(f"analyze(): {params['modules']} modules in {analyze:.3f}s "
+          f"({params['modules'] / analyze:.0f} modules/s)")
+    if result["max_rss"] is not None:
+        print(f"max RSS: {result['max_rss'] / 2**20:.1f} MiB")
+    record_memory = result.get("record_memory")
+    if record_memory is not None and None not in record_memory.values():
+        old, new = record_memory["dataclass"], record_memory["slotted"]
+        print(
+            f"records: {record_memory['records']:,} take {new / 2**20:.1f} MiB RSS slotted"
+            f" and interned, {old / 2**20:.1f} MiB as plain dataclasses"
+            + (f" ({1 - new / old:.0%} less)" if old > 0 else "")
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the benchmark's argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark CodeMapGenerator phase by phase on a synthetic package"
+    )
+    parser.add_argument("--modules", type=int, default=500, help="Number of modules (default: 500)")
+    parser.add_argument("--classes", type=int, default=4, help="Classes per module (default: 4)")
+    parser.add_argument("--methods", type=int, default=6, help="Methods per class (default: 6)")
+    parser.add_argument(
+        "--functions", type=int, default=8, help="Functions per module (default: 8)"
+    )
+    parser.add_argument(
+        "--imports", type=int, default=1, help="Internal imports per module (default: 1)"
+    )
+    parser.add_argument(
+        "--calls", type=int, default=3, help="Calls per function or method (default: 3)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs; best is reported")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the traced peak-memory run"
+    )
+    parser.add_argument(
+        "--record-memory",
+        action="store_true",
+        help="Also compare the RSS of the records as plain dataclasses and slotted",
+    )
+    parser.add_argument("--json", type=Path, metavar="FILE", help="Also write the result as JSON")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        metavar="FILE",
+        help="Compare with an earlier --json result; exit 1 on a regression",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Allowed slowdown per phase for --baseline (default: {DEFAULT_TOLERANCE:g})",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and print the timings."""
+    args = build_parser().parse_args(argv)
+    parameters = {
+        "modules": args.modules, "classes": args.classes, "methods": args.methods,
+        "functions": args.functions, "imports": args.imports, "calls": args.calls,
+        "repeat": args.repeat, "jobs": args.jobs,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src_root = Path(tmp) / "src"
+        generate_synthetic_package(
+            src_root,
+            **{key: parameters[key] for key in
+               ("modules", "classes", "methods", "functions", "calls", "imports")},
+        )
+        measured = run_benchmark(
+            src_root, "synthetic_pkg",
+            repeat=args.repeat, workers=args.jobs, memory=not args.no_memory,
+        )
+        if args.record_memory:
+            measured["record_memory"] = measure_record_memory(src_root, "synthetic_pkg")
+
+    result = {
+        "version": BENCHMARK_VERSION,
+        "python": platform.python_version(),
+        "parameters": parameters,
+        **measured,
+        "max_rss": peak_rss(),
+    }
+    baseline = (
+        json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    )
+    _print_result(result, baseline)
+    if args.json is not None:
+        args.json.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+
+    if baseline is not None:
+        try:
+            slower = compare(result, baseline, args.tolerance)
+        except ValueError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 2
+        if slower:
+            print(f"Regression (> {args.tolerance:.0%} slower): {', '.join(slower)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,152 @@
+"""
+Persistent per-file extraction cache for the code map generator.
+
+Each analyzed file's :class:`~dev_tools.codemap_generator.models.FileAnalysis`
+is stored as a small JSON document keyed by a hash of the file's path, its
+content, the extractor version and the running Python version.  A later run
+only re-parses files whose key is not already cached, and drops the entries
+of files it no longer saw.
+
+Files read from a git revision are keyed by their blob id instead of their
+content, so a hit needs no blob read at all.  They live in a namespace of
+their own: a blob's extraction never goes stale, so one revision's run must
+not prune the entries of another revision (or of the working tree), and
+only the entries of other extractor or Python versions are removed.
+
+Layout::
+
+    <cache_dir>/<package_name>/<key[:2]>/<key>.json
+    <cache_dir>/<package_name>/blobs/<version>/<key[:2]>/<key>.json
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from dev_tools.codemap_generator.atomic import set_replacement_mode
+from dev_tools.codemap_generator.extractor import EXTRACTOR_VERSION
+from dev_tools.codemap_generator.guards import ResourceLimits, extract_guarded, skipped_analysis
+from dev_tools.codemap_generator.models import FileAnalysis
+
+
+class ExtractionCache:
+    """On-disk cache of :class:`FileAnalysis` results for one package.
+
+    Instances are small and picklable, so they can be handed to worker
+    processes which then read and write entries directly.
+
+    Args:
+        cache_dir: Root cache directory (shared between packages).
+        package_name: Namespace for this package's entries.
+        blobs: Use the namespace of blob-keyed entries (:meth:`key_for_blob`)
+            instead of the working-tree one.
+    """
+
+    def __init__(self, cache_dir: Path, package_name: str, *, blobs: bool = False) -> None:
+        version = f"v{EXTRACTOR_VERSION}-py{sys.version_info.major}.{sys.version_info.minor}"
+        self.directory = cache_dir / package_name
+        if blobs:
+            self.directory = self.directory / "blobs" / version
+        self._salt = f"codemap:{version}:".encode()
+
+    def key_for(self, rel_path: str, data: bytes) -> str:
+        """Return the cache key for a file's relative path and raw content."""
+        digest = hashlib.sha256(self._salt)
+        digest.update(rel_path.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def key_for_blob(self, rel_path: str, blob_id: str) -> str:
+        """Return the cache key for a file's relative path and git blob id."""
+        digest = hashlib.sha256(self._salt)
+        digest.update(f"blob:{rel_path}\0{blob_id}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[FileAnalysis]:
+        """Return the cached analysis for *key*, or ``None`` on a miss."""
+        try:
+            text = self._entry_path(key).read_text(encoding="utf-8")
+            return FileAnalysis.from_dict(json.loads(text))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, analysis: FileAnalysis) -> None:
+        """Store *analysis* under *key* (atomic; errors are ignored)."""
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(analysis.to_dict(), handle, separators=(",", ":"))
+            set_replacement_mode(tmp_name, path)  # shareable, not mkstemp's 0600
+            os.replace(tmp_name, path)
+        except OSError:
+            pass
+
+    def prune(self, keep: set[str]) -> int:
+        """Delete entries whose key is not in *keep*; return how many were removed.
+
+        Only this namespace's entries are considered (the blob namespace sits
+        one level deeper and is never touched by a working-tree prune).
+        """
+        removed = 0
+        if not self.directory.is_dir():
+            return removed
+        for entry in self.directory.glob("*/*.json"):
+            if entry.stem not in keep:
+                try:
+                    entry.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def prune_versions(self) -> int:
+        """Delete blob namespaces of other extractor or Python versions; return how many."""
+        removed = 0
+        if not self.directory.parent.is_dir():
+            return removed
+        for entry in self.directory.parent.iterdir():
+            if entry != self.directory and entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+def extract_file_cached(
+    file_path: Path,
+    base_dir: Path,
+    cache: ExtractionCache,
+    limits: ResourceLimits = ResourceLimits(),
+) -> tuple[FileAnalysis, str, bool]:
+    """Extract *file_path* within *limits*, consulting and filling *cache*.
+
+    Files skipped by a resource limit are neither read nor cached, so
+    raising a limit takes effect on the next run.
+
+    Returns:
+        ``(analysis, key, hit)`` — *hit* is ``True`` when the result came
+        from the cache; *key* is ``""`` for skipped files.
+    """
+    reason = limits.size_reason(file_path.stat().st_size)
+    if reason is not None:
+        return skipped_analysis(file_path, base_dir, reason), "", False
+    data = file_path.read_bytes()
+    rel_str = str(file_path.relative_to(base_dir)).replace("\\", "/")
+    key = cache.key_for(rel_str, data)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, key, True
+    analysis = extract_guarded(file_path, base_dir, data, limits)
+    if analysis.skipped is None:
+        cache.put(key, analysis)
+    return analysis, key, False
@@ -0,0 +1,384 @@
+"""
+Resolved, queryable call graph for the code map generator.
+
+:class:`CallGraph` turns the raw :class:`CallInfo` records (bare callee
+names plus the dotted call expression) into edges between fully qualified
+symbols, resolving each call through the calling file's own definitions
+and import table:
+
+* ``helper()`` → ``pkg.mod.helper`` (defined in the same module)
+* ``self.save()`` → ``pkg.mod.Model.save`` (method of the enclosing class)
+* ``models.Model()`` → ``pkg.models.Model.__init__`` (via ``from pkg import models``)
+* ``Model().save()`` → ``pkg.models.Model.save``
+* ``os.path.join()`` → ``os.path.join`` (external, via ``import os``)
+
+Imports re-exported by a package ``__init__`` are followed to the module
+that defines the symbol.  Calls through local variables, attributes of
+instances other than ``self`` and builtins cannot be resolved statically
+and are counted in :attr:`CallGraph.unresolved`.
+
+Adjacency is stored as compressed sparse rows of node ids (``array('I')``,
+see :mod:`~dev_tools.codemap_generator.graph_utils`) in both directions, so
+traversals are plain integer BFS.
+
+Usage::
+
+    gen = CodeMapGenerator(Path("src"), "my_package")
+    gen.analyze()
+    graph = gen.call_graph
+    graph.callers("my_package.models.Model.save")
+    graph.shortest_path("my_package.cli.main", "my_package.db.connect")
+    graph.fan_in(top=10)
+"""
+
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from typing import Optional
+
+from dev_tools.codemap_generator.extractor import (
+    MAIN_CALLER,
+    absolute_import,
+    module_name_for,
+)
+from dev_tools.codemap_generator.graph_utils import pack_csr, pack_edge
+from dev_tools.codemap_generator.index import CLASS_TYPES, FUNCTION_TYPES, METHOD_TYPES
+from dev_tools.codemap_generator.models import CallInfo, EntryPoint, ImportInfo, SymbolInfo
+
+#: How many re-export hops are followed before giving up.
+_MAX_ALIAS_DEPTH = 8
+
+
+class _Resolver:
+    """Maps ``(file, dotted call expression)`` to a qualified name."""
+
+    def __init__(
+        self, symbols: list[SymbolInfo], imports: list[ImportInfo], src_dir: str
+    ) -> None:
+        self.src_dir = src_dir
+        self.module_of: dict[str, str] = {}
+        self.packages: set[str] = set()
+        self.defined: dict[str, str] = {}  # qualified name → symbol type
+        self.bindings: dict[str, dict[str, str]] = {}  # module → local name → dotted target
+        self._memo: dict[tuple[str, str, str], Optional[str]] = {}
+
+        for sym in symbols:
+            module = self.module(sym.file_path)
+            owner = f"{module}.{sym.parent_class}" if sym.parent_class else module
+            self.defined[f"{owner}.{sym.name}"] = sym.symbol_type
+
+        for imp in imports:
+            module = self.module(imp.file_path)
+            table = self.bindings.setdefault(module, {})
+            if imp.is_from_import:
+                source = absolute_import(module, module in self.packages, imp.module, imp.level)
+                for name, local in zip(imp.names, imp.aliases or imp.names):
+                    if name != "*":
+                        table[local] = f"{source}.{name}" if source else name
+            elif imp.names:
+                local = imp.aliases[0] if imp.aliases else imp.names[0]
+                asname = imp.names[0] != imp.module
+                table[local] = imp.module if asname else imp.module.partition(".")[0]
+
+    def module(self, file_path: str) -> str:
+        """Return (and remember) the dotted module name of *file_path*."""
+        module = self.module_of.get(file_path)
+        if module is None:
+            module = self.module_of[file_path] = module_name_for(file_path, self.src_dir)
+            if file_path.endswith("/__init__.py"):
+                self.packages.add(module)
+        return module
+
+    def canonical(self, dotted: str) -> str:
+        """Follow re-exports (``pkg.Name`` imported into ``pkg/__init__``) to a definition."""
+        for _ in range(_MAX_ALIAS_DEPTH):
+            if dotted in self.defined:
+                break
+            parts = dotted.split(".")
+            for i in range(len(parts) - 1, 0, -1):
+                module = ".".join(parts[:i])
+                if module in self.bindings:
+                    target = self.bindings[module].get(parts[i])
+                    if target is None:
+                        return dotted
+                    dotted = ".".join([target, *parts[i + 1:]])
+                    break
+            else:
+                break
+        return dotted
+
+    def resolve(self, call: CallInfo) -> Optional[str]:
+        """Return the qualified name *call* refers to, or ``None``."""
+        target = call.target or call.callee
+        head, _, rest = target.partition(".")
+        # Only ``self.x``/``cls.x`` depend on the caller (its enclosing classes).
+        is_self = head in ("self", "cls") and bool(rest) and "." not in rest
+        key = (call.file_path, call.caller.rpartition(".")[0] if is_self else "", target)
+        if key in self._memo:
+            return self._memo[key]
+
+        module = self.module(call.file_path)
+        if is_self:
+            resolved = self._resolve_self(module, key[1], rest)
+        elif "()." in target:
+            resolved = self._resolve_instance(module, target)
+        else:
+            resolved = self._resolve_name(module, target, head, rest)
+        self._memo[key] = resolved
+        return resolved
+
+    def _resolve_instance(self, module: str, target: str) -> Optional[str]:
+        """Resolve ``Class().method`` to the method of the constructed class."""
+        factory, _, attr = target.rpartition("().")
+        if "." in attr or "()" in factory:
+            return None
+        head, _, rest = factory.partition(".")
+        cls = self._resolve_name(module, factory, head, rest)
+        if cls is not None:
+            cls = cls.removesuffix(".__init__")
+        if self.defined.get(cls or "") not in CLASS_TYPES:
+            return None
+        method = f"{cls}.{attr}"
+        return method if method in self.defined else None
+
+    def _resolve_self(self, module: str, enclosing: str, attr: str) -> Optional[str]:
+        scope = enclosing.split(".")
+        for end in range(len(scope), 0, -1):
+            owner = f"{module}.{'.'.join(scope[:end])}"
+            if self.defined.get(owner) in CLASS_TYPES:
+                method = f"{owner}.{attr}"
+                return method if method in self.defined else None
+        return None
+
+    def _resolve_name(self, module: str, target: str, head: str, rest: str) -> Optional[str]:
+        if f"{module}.{head}" in self.defined:
+            dotted = f"{module}.{target}"
+        elif head in self.bindings.get(module, {}):
+            bound = self.bindings[module][head]
+            dotted = f"{bound}.{rest}" if rest else bound
+        else:
+            return None
+
+        dotted = self.canonical(dotted)
+        if self.defined.get(dotted) in CLASS_TYPES and f"{dotted}.__init__" in self.defined:
+            return f"{dotted}.__init__"
+        return dotted
+
+
+class CallGraph:  # pylint: disable=too-many-instance-attributes
+    """Call graph over fully qualified names with integer-indexed adjacency.
+
+    Nodes are every defined function, method and class, every module-level
+    pseudo-caller (``pkg.mod.<module>``, ``pkg.mod.__main__``) and every
+    external name a call resolved to (``os.path.join``).  Edges are
+    deduplicated caller → callee pairs.
+
+    Args:
+        symbols: All collected symbols.
+        imports: All collected imports (the per-file import tables).
+        calls: All collected calls, including module-level ones.
+        entry_points: Detected entry points; ``main_block`` and
+            ``console_script`` entries become traversal roots.
+        src_dir: Name of the src directory that prefixes recorded paths.
+
+    Attributes:
+        names: Node names, indexed by node id.
+        unresolved: Number of call sites that could not be resolved.
+        roots: Node names of the detected entry points.
+    """
+
+    def __init__(
+        self,
+        symbols: list[SymbolInfo],
+        imports: list[ImportInfo],
+        calls: list[CallInfo],
+        entry_points: Iterable[EntryPoint] = (),
+        src_dir: str = "",
+    ) -> None:
+        resolver = _Resolver(symbols, imports, src_dir)
+        self._defined = resolver.defined
+        self.names: list[str] = list(resolver.defined)
+        self._ids: dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.unresolved = 0
+
+        edges: set[int] = set()
+        caller_ids: dict[tuple[str, str], int] = {}
+        for call in calls:
+            callee = resolver.resolve(call)
+            if callee is None:
+                self.unresolved += 1
+                continue
+            caller_key = (call.file_path, call.caller)
+            caller = caller_ids.get(caller_key)
+            if caller is None:
+                module = resolver.module(call.file_path)
+                caller = caller_ids[caller_key] = self._intern(f"{module}.{call.caller}")
+            edges.add(pack_edge(caller, self._intern(callee)))
+
+        self._out_offsets, self._out_targets = pack_csr(edges, len(self.names))
+        self._in_offsets, self._in_targets = pack_csr(edges, len(self.names), reverse=True)
+
+        self.roots = self._find_roots(resolver, entry_points)
+
+    def _find_roots(self, resolver: _Resolver, entry_points: Iterable[EntryPoint]) -> list[str]:
+        """Map ``main_block`` and ``console_script`` entry points to node names."""
+        roots: list[str] = []
+        for ep in entry_points:
+            if ep.entry_type == "main_block":
+                root = f"{resolver.module(ep.file_path)}.{MAIN_CALLER}"
+            elif ep.entry_type == "console_script" and ep.description:
+                target = ep.description.partition("->")[2].strip()
+                root = resolver.canonical(target.replace(":", "."))
+            else:
+                continue
+            if root in self._ids and root not in roots:
+                roots.append(root)
+        return roots
+
+    def _intern(self, name: str) -> int:
+        node = self._ids.get(name)
+        if node is None:
+            node = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return node
+
+    # -- basic lookups -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    @property
+    def edge_count(self) -> int:
+        """Number of distinct caller → callee edges."""
+        return len(self._out_targets)
+
+    def is_internal(self, name: str) -> bool:
+        """``True`` if *name* is a symbol defined in the analyzed package."""
+        return name in self._defined
+
+    def symbol_type(self, name: str) -> Optional[str]:
+        """The :class:`SymbolInfo` type of an internal *name* (``None`` if external)."""
+        return self._defined.get(name)
+
+    def find(self, name: str) -> list[str]:
+        """Return node names equal to *name* or ending in ``.name``."""
+        if name in self._ids:
+            return [name]
+        suffix = f".{name}"
+        return sorted(n for n in self.names if n.endswith(suffix))
+
+    def _id(self, name: str) -> int:
+        node = self._ids.get(name)
+        if node is None:
+            raise KeyError(f"Unknown call graph node: {name}")
+        return node
+
+    def _successors(self, node: int) -> array:
+        return self._out_targets[self._out_offsets[node]:self._out_offsets[node + 1]]
+
+    def _predecessors(self, node: int) -> array:
+        return self._in_targets[self._in_offsets[node]:self._in_offsets[node + 1]]
+
+    def edges(self, internal: bool = False) -> list[tuple[str, str]]:
+        """Every ``(caller, callee)`` pair, sorted.
+
+        With *internal*, only calls to functions defined in the package.
+        """
+        pairs = (
+            (self.names[src], self.names[dst])
+            for src in range(len(self.names))
+            for dst in self._successors(src)
+        )
+        return sorted(
+            (caller, callee) for caller, callee in pairs
+            if not internal or callee in self._defined
+        )
+
+    def callees(self, name: str) -> list[str]:
+        """Qualified names *name* calls directly."""
+        return sorted(self.names[n] for n in self._successors(self._id(name)))
+
+    def callers(self, name: str) -> list[str]:
+        """Qualified names that call *name* directly."""
+        return sorted(self.names[n] for n in self._predecessors(self._id(name)))
+
+    # -- traversals ----------------------------------------------------------
+
+    def reachable(self, roots: Optional[Iterable[str]] = None) -> set[str]:
+        """Everything transitively called from *roots* (default: :attr:`roots`).
+
+        The roots themselves are included.
+        """
+        start = [self._id(r) for r in (self.roots if roots is None else roots)]
+        seen = bytearray(len(self.names))
+        stack = list(start)
+        for node in start:
+            seen[node] = 1
+        while stack:
+            for succ in self._successors(stack.pop()):
+                if not seen[succ]:
+                    seen[succ] = 1
+                    stack.append(succ)
+        return {self.names[n] for n in range(len(self.names)) if seen[n]}
+
+    def unreachable(self, roots: Optional[Iterable[str]] = None) -> list[str]:
+        """Package functions and methods not reachable from *roots*.
+
+        Candidates for dead code; dynamic dispatch and external callers
+        are invisible to static analysis, so treat these as hints.
+        """
+        reached = self.reachable(roots)
+        callable_types = FUNCTION_TYPES + METHOD_TYPES
+        return sorted(
+            name for name, kind in self._defined.items()
+            if kind in callable_types and name not in reached
+        )
+
+    def shortest_path(self, source: str, target: str) -> Optional[list[str]]:
+        """Shortest call chain from *source* to *target*, or ``None``."""
+        start, goal = self._id(source), self._id(target)
+        parent = {start: start}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == goal:
+                path = [node]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                return [self.names[n] for n in reversed(path)]
+            for succ in self._successors(node):
+                if succ not in parent:
+                    parent[succ] = node
+                    queue.append(succ)
+        return None
+
+    # -- rankings ------------------------------------------------------------
+
+    def _ranking(
+        self, offsets: array, top: Optional[int], internal_only: bool
+    ) -> list[tuple[str, int]]:
+        ranked = sorted(
+            (
+                (self.names[n], offsets[n + 1] - offsets[n])
+                for n in range(len(self.names))
+                if offsets[n + 1] > offsets[n]
+                and (not internal_only or self.names[n] in self._defined)
+            ),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return ranked if top is None else ranked[:top]
+
+    def fan_in(
+        self, top: Optional[int] = None, internal_only: bool = True
+    ) -> list[tuple[str, int]]:
+        """``(name, distinct callers)`` pairs, most-called first."""
+        return self._ranking(self._in_offsets, top, internal_only)
+
+    def fan_out(
+        self, top: Optional[int] = None, internal_only: bool = True
+    ) -> list[tuple[str, int]]:
+        """``(name, distinct callees)`` pairs, busiest callers first."""
+        return self._ranking(self._out_offsets, top, internal_only)
@@ -0,0 +1,710 @@
+"""Command-line interface for the code map generator.
+
+Two modes share the ``codemap-generator`` console script:
+
+* ``codemap-generator --package PKG [...]`` analyzes a package and writes
+  the markdown reports (and optionally a SQLite symbol database).
+* ``codemap-generator query --db PATH KIND [NAME]`` answers lookups from a
+  previously written database without re-parsing anything.
+
+All analysis logic lives in :mod:`dev_tools.codemap_generator.generator`.
+"""
+
+import argparse
+import json
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from dev_tools.codemap_generator.asyncblock import DEFAULT_BLOCKING_APIS
+from dev_tools.codemap_generator.condense import DEFAULT_NODE_BUDGET
+from dev_tools.codemap_generator.export import EXPORT_FILE_NAME
+from dev_tools.codemap_generator.generator import CodeMapGenerator
+from dev_tools.codemap_generator.gitrev import GitError
+from dev_tools.codemap_generator.guards import (
+    DEFAULT_ISOLATE_SIZE,
+    DEFAULT_MAX_FILE_SIZE,
+    DEFAULT_TIME_BUDGET,
+    ResourceLimits,
+)
+from dev_tools.codemap_generator.monorepo import Monorepo
+from dev_tools.codemap_generator.store import SymbolStore
+from dev_tools.codemap_generator.timing import DEFAULT_TOP_FILES, PROFILE_FILE_NAME, PhaseTimer
+from dev_tools.codemap_generator.watch import (
+    DEFAULT_POLL_INTERVAL,
+    CodeMapWatcher,
+    WatchUpdate,
+)
+
+#: Default file name for the SQLite symbol database.
+DEFAULT_DB_NAME = "codemap.sqlite"
+
+#: Default output directory for generated files.
+DEFAULT_OUTPUT_DIR = Path("docs/ai-context/generated")
+
+
+# ---------------------------------------------------------------------------
+# Generate mode
+# ---------------------------------------------------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for generate mode."""
+    parser = argparse.ArgumentParser(
+        prog="codemap-generator",
+        description="Generate code map documentation for a Python package",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""\
+Examples:
+    codemap-generator --package my_package
+    codemap-generator --package my_package --output-dir docs/generated
+    codemap-generator --package my_package --jobs 0
+    codemap-generator --package my_package --cache-dir .codemap-cache
+    codemap-generator --package my_package --db
+    codemap-generator --package my_package --deterministic
+    codemap-generator --package my_package --sharded --jobs 0
+    codemap-generator --package my_package --import-time
+    codemap-generator --package my_package --perf-lint
+    codemap-generator --package my_package --async-lint --blocking-api 'mylib.sync_*'
+    codemap-generator --package my_package --import-weight
+    codemap-generator --package my_package --revision v2.0 --api-diff v1.0
+    codemap-generator --package my_package --pstats run.pstats
+    codemap-generator --monorepo libs/core/src libs/api/src services/src --jobs 0
+    codemap-generator --package my_package --export
+    codemap-generator --package my_package --watch
+    codemap-generator --package my_package --profile
+    codemap-generator query callers process
+    python -m dev_tools.codemap_generator --package my_package
+
+Output files:
+    code-map.md         Combined overview
+    symbol-index.md     All classes and functions
+    dependency-graph.md Import relationships
+    entry-points.md     CLI scripts and main blocks
+    module-summaries.md Per-module descriptions
+    call-graph.md       Approximate call relationships
+    codemap.sqlite      Queryable symbol database (with --db)
+    codemap.cmx         Compact, memory-mappable record export (with --export)
+    import-cost.md      Measured import-time costs (with --import-time)
+    perf-findings.md    Ranked performance anti-patterns (with --perf-lint)
+    async-blocking.md   Blocking calls reachable from coroutines (with --async-lint)
+    import-weight.md    Module-level side effects per module (with --import-weight)
+    api-diff.md         Public symbols added, removed or changed (with --api-diff)
+
+With --monorepo, every package found under the given source roots is
+analyzed in one pass; each gets the files above in <output-dir>/<package>/
+and <output-dir>/cross-package.md shows the dependencies between them.
+The optional reports, --pstats, --db and --export apply to every package;
+--revision and --profile are not available.
+
+With --sharded, the combined files are replaced by:
+    index.md            Package overview linking every shard
+    shards/<pkg>.md     One untruncated document per (sub)package
+
+Run 'codemap-generator query --help' for database lookups.
+""",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Output directory for generated files (default: docs/ai-context/generated)",
+    )
+    parser.add_argument(
+        "--src-root",
+        type=Path,
+        default=Path("src"),
+        help="Source root directory (default: src)",
+    )
+    parser.add_argument(
+        "--package",
+        type=str,
+        default=None,
+        help="Package name to analyze (e.g. my_package); required unless --monorepo is given",
+    )
+    parser.add_argument(
+        "--monorepo",
+        type=Path,
+        nargs="+",
+        default=None,
+        metavar="ROOT",
+        help=(
+            "Analyze every package under these source roots in one parallel pass,"
+            " writing per-package maps and cross-package.md"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Parse files in N worker processes (0 = one per CPU; default: 1)",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=DEFAULT_MAX_FILE_SIZE,
+        metavar="BYTES",
+        help=(
+            "Skip (and report) files larger than BYTES instead of parsing them"
+            f" (0 = no limit; default: {DEFAULT_MAX_FILE_SIZE})"
+        ),
+    )
+    parser.add_argument(
+        "--isolate-size",
+        type=int,
+        default=DEFAULT_ISOLATE_SIZE,
+        metavar="BYTES",
+        help=(
+            "Parse files larger than BYTES in a separate process, subject to"
+            f" --time-budget (0 = never; default: {DEFAULT_ISOLATE_SIZE})"
+        ),
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=DEFAULT_TIME_BUDGET,
+        metavar="SECONDS",
+        help=(
+            "Give up on an isolated file after SECONDS and report it as skipped"
+            f" (0 = no limit; default: {DEFAULT_TIME_BUDGET:g})"
+        ),
+    )
+    parser.add_argument(
+        "--graph-nodes",
+        type=int,
+        default=DEFAULT_NODE_BUDGET,
+        metavar="N",
+        help=(
+            "Condense dependency and call diagrams with more than N nodes by"
+            " collapsing packages and merging cycles"
+            f" (0 = never condense; default: {DEFAULT_NODE_BUDGET})"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Persist per-file extraction results in DIR and only re-parse changed files",
+    )
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help=(
+            "Stamp outputs with a hash of the sources instead of the current time,"
+            " so unchanged sources leave the output files untouched"
+        ),
+    )
+    parser.add_argument(
+        "--sharded",
+        action="store_true",
+        help=(
+            "Write one document per (sub)package plus an index instead of the"
+            " combined files; only shards with changed sources are regenerated"
+        ),
+    )
+    parser.add_argument(
+        "--revision",
+        default=None,
+        metavar="REV",
+        help=(
+            "Analyze the package as of a git revision (tag, branch, commit) instead of"
+            " the working tree; files are read from git, no checkout needed"
+        ),
+    )
+    parser.add_argument(
+        "--api-diff",
+        default=None,
+        metavar="BASE",
+        help=(
+            "Write api-diff.md: public symbols added, removed or changed since git"
+            " revision BASE (compared with --revision, or the working tree)"
+        ),
+    )
+    parser.add_argument(
+        "--import-time",
+        action="store_true",
+        help=(
+            "Import the package under 'python -X importtime' and write import-cost.md"
+            " (dominant import chains and lazy-import candidates)"
+        ),
+    )
+    parser.add_argument(
+        "--perf-lint",
+        action="store_true",
+        help=(
+            "Write perf-findings.md: likely hot-loop problems (list membership,"
+            " string +=, regex literals, getenv in loops, len(list(...))) ranked by severity"
+        ),
+    )
+    parser.add_argument(
+        "--async-lint",
+        action="store_true",
+        help=(
+            "Write async-blocking.md: blocking calls (time.sleep, open, requests, subprocess,"
+            " ...) made directly or through sync helpers from async functions"
+        ),
+    )
+    parser.add_argument(
+        "--import-weight",
+        action="store_true",
+        help=(
+            "Write import-weight.md: module-level I/O, calls, loops, eager third-party"
+            " imports and large literals, scored per module (static, nothing is imported)"
+        ),
+    )
+    parser.add_argument(
+        "--blocking-api",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help=(
+            "Extra blocking API for --async-lint, as an fnmatch pattern over qualified"
+            " names (e.g. 'mylib.sync_*'); repeatable"
+        ),
+    )
+    parser.add_argument(
+        "--pstats",
+        type=Path,
+        nargs="+",
+        default=None,
+        metavar="FILE",
+        help=(
+            "Annotate the symbol index and call graph with call counts and times"
+            " from cProfile/pstats dumps, and add a hot paths section"
+        ),
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Also write an indexed SQLite symbol database "
+            f"(default path: <output-dir>/{DEFAULT_DB_NAME})"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Print per-phase wall times, the slowest files to parse, throughput and"
+            " peak RSS, and write them as JSON"
+            f" (default path: <output-dir>/{PROFILE_FILE_NAME})"
+        ),
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_TOP_FILES,
+        metavar="N",
+        help=f"Number of slowest files listed by --profile (default: {DEFAULT_TOP_FILES})",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        nargs="?",
+        const=DEFAULT_POLL_INTERVAL,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "After writing, keep polling the package every SECONDS"
+            f" (default: {DEFAULT_POLL_INTERVAL:g}); re-parse only changed files and"
+            " rewrite only the affected documents until interrupted with Ctrl+C"
+        ),
+    )
+    parser.add_argument(
+        "--export",
+        type=Path,
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Also write a compact binary export of symbols, imports, calls and"
+            " entry points, loadable per module with CodeMapExport"
+            f" (default path: <output-dir>/{EXPORT_FILE_NAME})"
+        ),
+    )
+    return parser
+
+
+def _write_optional_reports(
+    generator: CodeMapGenerator, args: argparse.Namespace
+) -> list[Path]:
+    """Write the reports requested by the optional flags; return their paths."""
+    files = []
+    if args.perf_lint:
+        files.append(generator.write_report(args.output_dir, "perf_findings"))
+    if args.async_lint:
+        files.append(generator.write_report(
+            args.output_dir,
+            "async_blocking",
+            blocking_apis=[*DEFAULT_BLOCKING_APIS, *args.blocking_api],
+        ))
+    if args.api_diff:
+        files.append(generator.write_report(args.output_dir, "api_diff", base=args.api_diff))
+    if args.import_weight:
+        files.append(generator.write_report(args.output_dir, "import_weight"))
+    if args.import_time:
+        try:
+            files.append(generator.write_report(args.output_dir, "import_cost"))
+        except (RuntimeError, OSError, subprocess.TimeoutExpired) as exc:
+            print(f"Warning: import-time measurement skipped: {exc}", file=sys.stderr)
+    return files
+
+
+def _write_record_files(
+    generator: CodeMapGenerator, args: argparse.Namespace
+) -> list[Path]:
+    """Write the ``--db`` database and the ``--export`` file; return their paths."""
+    files = []
+    if args.db is not None:
+        db_path = args.output_dir / DEFAULT_DB_NAME if args.db is True else args.db
+        files.append(generator.write_database(db_path))
+        print(f"  Generated {db_path}")
+    if args.export is not None:
+        export_path = args.output_dir / EXPORT_FILE_NAME if args.export is True else args.export
+        files.append(generator.write_export(export_path))
+        print(f"  Generated {export_path}")
+    return files
+
+
+def _write_documents(
+    generator: CodeMapGenerator, args: argparse.Namespace, only: list[str] | None = None
+) -> list[Path]:
+    """Write the reports, the optional reports and the record files.
+
+    *only* restricts the main reports to those names (see
+    :meth:`CodeMapGenerator.write_outputs`); shards are incremental anyway.
+    """
+    if args.sharded:
+        files = generator.write_shards(args.output_dir)
+    else:
+        files = generator.write_outputs(args.output_dir, only=only)
+    files.extend(_write_optional_reports(generator, args))
+    files.extend(_write_record_files(generator, args))
+    return files
+
+
+def _print_update(update: WatchUpdate) -> None:
+    """Print one line describing a watch update."""
+    parts = [f"{len(update.changed)} changed"]
+    if update.removed:
+        parts.append(f"{len(update.removed)} removed")
+    affected = ", ".join(update.outputs) if update.facets else "nothing to regenerate"
+    print(
+        f"[{time.strftime('%H:%M:%S')}] {', '.join(parts)} file(s)"
+        f" in {update.seconds * 1000:.0f} ms: {affected}"
+    )
+
+
+def _watch(watcher: CodeMapWatcher, args: argparse.Namespace) -> int:
+    """Rewrite the documents each change affects until interrupted."""
+    generator = watcher.generator
+    print(f"Watching {watcher.package_root} for changes (Ctrl+C to stop)...")
+    try:
+        for update in watcher.updates(args.watch):
+            _print_update(update)
+            if not update.facets:
+                continue
+            try:
+                if args.pstats and "symbols" in update.facets:
+                    generator.load_profiles(args.pstats)
+                _write_documents(generator, args, only=update.outputs)
+            except (GitError, FileNotFoundError, OSError, ValueError) as exc:
+                print(f"Error: {exc}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print()
+        print("Stopped watching.")
+    return 0
+
+
+def _write_profile(timer: PhaseTimer, args: argparse.Namespace) -> Path:
+    """Print the ``--profile`` report and write its JSON sidecar."""
+    path = args.output_dir / PROFILE_FILE_NAME if args.profile is True else args.profile
+    for line in timer.iter_report(args.profile_top):
+        print(line)
+    timer.write_json(path, args.profile_top)
+    print(f"  Generated {path}")
+    return path
+
+
+def _limits(args: argparse.Namespace) -> ResourceLimits:
+    """The per-file resource limits selected on the command line (``0`` = off)."""
+    return ResourceLimits(
+        max_file_size=args.max_file_size or None,
+        isolate_size=args.isolate_size or None,
+        time_budget=args.time_budget or None,
+    )
+
+
+def _print_found(generator: CodeMapGenerator, args: argparse.Namespace) -> None:
+    """Print the record counts of an analyzed package."""
+    print(f"   Found {len(generator.symbols)} symbols")
+    print(f"   Found {len(generator.imports)} imports")
+    print(f"   Found {len(generator.entry_points)} entry points")
+    print(f"   Found {len(generator.calls)} call relationships")
+    if generator.skipped_files:
+        print(f"   Skipped {len(generator.skipped_files)} files over resource limits")
+    if args.cache_dir is not None:
+        print(
+            f"   Cache: {generator.cache_hits} reused,"
+            f" {generator.cache_misses} re-parsed"
+        )
+
+
+def _generate_monorepo(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    """Run generate mode over every package under ``--monorepo`` roots."""
+    if args.revision or args.profile is not None:
+        parser.error("--revision and --profile cannot be combined with --monorepo")
+    if isinstance(args.db, Path) or isinstance(args.export, Path):
+        parser.error(
+            "--db and --export take no PATH with --monorepo"
+            " (each package writes its own under <output-dir>/<package>/)"
+        )
+    print("Code Map Generator (monorepo)")
+    print(f"   Roots:  {', '.join(str(root) for root in args.monorepo)}")
+    print(f"   Output: {args.output_dir}")
+    print()
+
+    try:
+        repo = Monorepo(
+            args.monorepo,
+            workers=args.jobs,
+            cache_dir=args.cache_dir,
+            deterministic=args.deterministic,
+            limits=_limits(args),
+            node_budget=args.graph_nodes or None,
+        )
+    except FileNotFoundError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    if not repo.packages:
+        print("Error: no packages found", file=sys.stderr)
+        return 2
+
+    print(f"Analyzing {len(repo.packages)} packages...")
+    repo.analyze()
+    for name, gen in repo.generators.items():
+        print(f"   {name}: {len(gen.symbols)} symbols, {len(gen.imports)} imports")
+    edges = repo.package_edges()
+    print(f"   {len(edges)} cross-package dependencies")
+    if args.pstats:
+        try:
+            profiles = [gen.load_profiles(args.pstats) for gen in repo.generators.values()]
+        except (OSError, TypeError, ValueError) as exc:
+            print(f"Error: cannot load profile data: {exc}", file=sys.stderr)
+            return 2
+        print(f"   Profile: {sum(map(len, profiles))} symbols matched")
+    print()
+
+    print("Generating documentation...")
+    files = repo.write_outputs(args.output_dir, sharded=args.sharded)
+    try:
+        for name, gen in repo.generators.items():
+            package_dir = args.output_dir / name
+            package_args = argparse.Namespace(**{**vars(args), "output_dir": package_dir})
+            files.extend(_write_optional_reports(gen, package_args))
+            files.extend(_write_record_files(gen, package_args))
+    except (GitError, FileNotFoundError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    print()
+    print(f"Done! Wrote {len(files)} files in {args.output_dir}")
+    return 0
+
+
+def _generate(argv: list[str]) -> int:
+    """Run generate mode."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.watch is not None and (args.monorepo is not None or args.revision):
+        parser.error("--watch cannot be combined with --monorepo or --revision")
+    if args.monorepo is not None:
+        return _generate_monorepo(parser, args)
+    if args.package is None:
+        parser.error("the following arguments are required: --package (or --monorepo)")
+
+    print("Code Map Generator")
+    revision = f" @ {args.revision}" if args.revision else ""
+    print(f"   Source: {args.src_root}/{args.package}{revision}")
+    print(f"   Output: {args.output_dir}")
+    print()
+
+    generator = CodeMapGenerator(
+        args.src_root,
+        args.package,
+        workers=args.jobs,
+        cache_dir=args.cache_dir,
+        deterministic=args.deterministic,
+        revision=args.revision,
+        limits=_limits(args),
+        node_budget=args.graph_nodes or None,
+        timer=PhaseTimer() if args.profile is not None else None,
+    )
+
+    watcher = CodeMapWatcher(generator) if args.watch is not None else None
+    print("Analyzing codebase...")
+    try:
+        if watcher is not None:
+            watcher.load()
+        else:
+            generator.analyze()
+    except (GitError, FileNotFoundError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+
+    _print_found(generator, args)
+    if args.pstats:
+        try:
+            profile = generator.load_profiles(args.pstats)
+        except (OSError, TypeError, ValueError) as exc:
+            print(f"Error: cannot load profile data: {exc}", file=sys.stderr)
+            return 2
+        print(
+            f"   Profile: {len(profile)} symbols matched,"
+            f" {len(profile.edges)} measured call edges"
+        )
+    print()
+
+    print("Generating documentation...")
+    try:
+        files = _write_documents(generator, args)
+    except (GitError, FileNotFoundError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    print()
+
+    if generator.timer is not None:
+        files.append(_write_profile(generator.timer, args))
+        print()
+
+    print(f"Done! Generated {len(files)} files in {args.output_dir}")
+    if generator.files_unchanged:
+        print(f"   ({len(generator.files_unchanged)} already up to date)")
+    print()
+    if watcher is not None:
+        return _watch(watcher, args)
+    print("Next steps:")
+    print("  1. Review generated files for accuracy")
+    print("  2. Add human context where marked with placeholders")
+    print("  3. Commit the generated documentation")
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Query mode
+# ---------------------------------------------------------------------------
+
+#: Query kind → (SymbolStore method, whether a NAME argument is required).
+_QUERY_KINDS: dict[str, tuple[str, bool]] = {
+    "where": ("definitions", True),
+    "callers": ("callers_of", True),
+    "callees": ("callees_of", True),
+    "imports": ("imports_of", True),
+    "importers": ("importers_of", True),
+    "entry-points": ("entry_points", False),
+}
+
+
+def build_query_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for ``codemap-generator query``."""
+    parser = argparse.ArgumentParser(
+        prog="codemap-generator query",
+        description="Look up symbols, calls and imports in a code map database",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""\
+Query kinds:
+    where NAME        Where is NAME (or Class.method) defined?
+    callers NAME      Who calls NAME?
+    callees NAME      What does NAME (func, method or Class.method) call?
+    imports MODULE    What does MODULE (e.g. pkg.sub.mod) import?
+    importers MODULE  Which modules import MODULE or its submodules?
+    entry-points      All detected entry points
+
+Exit code: 0 if results were found, 1 if none, 2 on error.
+""",
+    )
+    parser.add_argument("kind", choices=sorted(_QUERY_KINDS), help="What to look up")
+    parser.add_argument("name", nargs="?", help="Symbol or module name")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR / DEFAULT_DB_NAME,
+        help=f"Database path (default: {DEFAULT_OUTPUT_DIR / DEFAULT_DB_NAME})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="output_json",
+        help="Output results as JSON",
+    )
+    return parser
+
+
+def _format_row(kind: str, row: sqlite3.Row) -> str:
+    """Render one result row as a ``file:line  detail`` line."""
+    if kind == "entry-points":
+        return f"{row['file_path']}  {row['entry_type']}  {row['description'] or '-'}"
+    location = f"{row['file_path']}:{row['line_number']}"
+    if kind == "where":
+        return f"{location}  {row['symbol_type']} {row['qualified_name']}"
+    if kind in ("callers", "callees"):
+        return f"{location}  {row['caller']} -> {row['callee']}"
+    names = ", ".join(json.loads(row["names"]))
+    return f"{location}  {row['module']} ({names})"
+
+
+def _query(argv: list[str]) -> int:
+    """Run query mode."""
+    parser = build_query_parser()
+    args = parser.parse_args(argv)
+    method_name, needs_name = _QUERY_KINDS[args.kind]
+    if needs_name and not args.name:
+        parser.error(f"'{args.kind}' requires a NAME argument")
+
+    if not args.db.is_file():
+        print(f"Error: database not found: {args.db}", file=sys.stderr)
+        print("Create it with: codemap-generator --package <pkg> --db", file=sys.stderr)
+        return 2
+
+    with SymbolStore(args.db) as store:
+        method = getattr(store, method_name)
+        rows = method(args.name) if needs_name else method()
+
+    if args.output_json:
+        print(json.dumps([dict(row) for row in rows], indent=2, ensure_ascii=False))
+    else:
+        for row in rows:
+            print(_format_row(args.kind, row))
+    return 0 if rows else 1
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point for the codemap generator CLI.
+
+    Args:
+        argv: Command-line arguments.  ``None`` uses ``sys.argv[1:]``.
+
+    Returns:
+        Exit code.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["query"]:
+        return _query(argv[1:])
+    return _generate(argv)
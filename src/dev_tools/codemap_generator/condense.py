@@ -0,0 +1,213 @@
+"""
+Graph condensation for the rendered dependency and call diagrams.
+
+A mermaid diagram stops being readable (or renderable) past a few hundred
+nodes, so :func:`condense` shrinks a graph to a node budget before it is
+drawn, trying the least lossy step first:
+
+1. collapse dotted names to the deepest package level that fits
+   (``pkg.sub.mod`` → ``pkg.sub``), summing parallel edges into weights,
+   but never down to a single node;
+2. merge each strongly connected component of the hard edges (import
+   cycle, mutual recursion) into one node;
+3. keep only the best-connected nodes (by weighted degree).
+
+Finally only the *edge_budget* heaviest edges are kept.  Graphs that are
+already within budget come back unchanged, one node per name and every
+edge of weight 1.
+
+Usage::
+
+    condensed = condense(graph.modules, graph.edges(), node_budget=60, edge_budget=150)
+    lines = list(iter_mermaid(condensed))
+"""
+
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from dev_tools.codemap_generator.graph_utils import (
+    pack_csr,
+    pack_edge,
+    strongly_connected_components,
+)
+
+#: Default node budget of a rendered diagram.
+DEFAULT_NODE_BUDGET = 60
+
+
+@dataclass
+class WeightedEdge:
+    """An edge between condensed nodes."""
+
+    source: str
+    target: str
+    weight: int  # number of original edges merged into it
+    soft: bool = False  # every merged edge was soft (e.g. a deferred import)
+
+
+@dataclass
+class CondensedGraph:
+    """Result of :func:`condense`.
+
+    Attributes:
+        nodes: Node label → the original names it stands for, sorted by label.
+        edges: Kept edges, sorted by source and target.
+        steps: Human-readable description of each condensation step applied.
+        edge_total: Number of condensed edges before the edge budget.
+        omitted: Original names dropped by the last-resort node cut.
+    """
+
+    nodes: dict[str, list[str]]
+    edges: list[WeightedEdge]
+    steps: list[str] = field(default_factory=list)
+    edge_total: int = 0
+    omitted: int = 0
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the edge budget dropped edges."""
+        return self.edge_total > len(self.edges)
+
+
+def _prefix(name: str, depth: int) -> str:
+    return ".".join(name.split(".")[:depth])
+
+
+def _weigh(
+    group: dict[str, str], edges: list[tuple[str, str]], soft: set[tuple[str, str]]
+) -> tuple[Counter[tuple[str, str]], set[tuple[str, str]]]:
+    """Condensed edge weights, and the condensed edges with a hard original edge."""
+    weights: Counter[tuple[str, str]] = Counter()
+    hard: set[tuple[str, str]] = set()
+    for src, dst in edges:
+        key = (group[src], group[dst])
+        if key[0] == key[1]:
+            continue
+        weights[key] += 1
+        if (src, dst) not in soft:
+            hard.add(key)
+    return weights, hard
+
+
+def _merge_cycles(group: dict[str, str], edges: set[tuple[str, str]]) -> int:
+    """Relabel every multi-node strongly connected component; return how many."""
+    labels = sorted(set(group.values()))
+    ids = {label: i for i, label in enumerate(labels)}
+    offsets, targets = pack_csr(
+        {pack_edge(ids[src], ids[dst]) for src, dst in edges}, len(labels)
+    )
+    renamed: dict[str, str] = {}
+    merged = 0
+    for component in strongly_connected_components(offsets, targets):
+        if len(component) > 1:
+            members = sorted(labels[n] for n in component)
+            merged += 1
+            for member in members:
+                renamed[member] = f"cycle: {members[0]} +{len(members) - 1}"
+    for name, label in group.items():
+        group[name] = renamed.get(label, label)
+    return merged
+
+
+def condense(  # pylint: disable=too-many-locals
+    nodes: Iterable[str],
+    edges: Iterable[tuple[str, str]],
+    soft_edges: Iterable[tuple[str, str]] = (),
+    *,
+    node_budget: int | None = DEFAULT_NODE_BUDGET,
+    edge_budget: int | None = None,
+) -> CondensedGraph:
+    """Shrink a graph over dotted names to at most *node_budget* nodes.
+
+    Args:
+        nodes: All node names (isolated nodes included).
+        edges: Directed ``(source, target)`` edges.
+        soft_edges: Further edges drawn differently (deferred imports); a
+            condensed edge is soft only if all its original edges are.
+        node_budget: Maximum node count (``None``: never condense nodes).
+        edge_budget: Maximum edge count, heaviest kept (``None``: all).
+    """
+    soft = set(soft_edges)
+    all_edges = [*edges, *soft]
+    names = sorted({*nodes, *(n for edge in all_edges for n in edge)})
+    group = {name: name for name in names}
+    steps: list[str] = []
+
+    def node_count() -> int:
+        return len(set(group.values()))
+
+    if node_budget is not None and node_count() > node_budget:
+        # Never collapse so far that one node is left (a single package root).
+        depth = max(name.count(".") + 1 for name in names)
+        while node_count() > node_budget and depth > 1:
+            collapsed = {name: _prefix(name, depth - 1) for name in names}
+            if len(set(collapsed.values())) < 2:
+                break
+            depth -= 1
+            group = collapsed
+            steps[:] = [f"names collapsed to their first {depth} dotted part{'s' * (depth > 1)}"]
+
+    weights, hard = _weigh(group, all_edges, soft)
+    if node_budget is not None and node_count() > node_budget:
+        merged = _merge_cycles(group, hard)
+        if merged:
+            steps.append(f"{merged} cycles merged")
+            weights, hard = _weigh(group, all_edges, soft)
+
+    omitted = 0
+    if node_budget is not None and node_count() > node_budget:
+        degree: Counter[str] = Counter({label: 0 for label in group.values()})
+        for (src, dst), weight in weights.items():
+            degree[src] += weight
+            degree[dst] += weight
+        ranked_nodes = sorted(degree.items(), key=lambda item: (-item[1], item[0]))
+        kept = {label for label, _ in ranked_nodes[:node_budget]}
+        omitted = sum(1 for label in group.values() if label not in kept)
+        group = {name: label for name, label in group.items() if label in kept}
+        weights = Counter({key: w for key, w in weights.items() if set(key) <= kept})
+        steps.append(f"{omitted} least connected names omitted")
+
+    members: dict[str, list[str]] = {}
+    for name, label in group.items():
+        members.setdefault(label, []).append(name)
+    ranked = sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+    kept_edges = ranked if edge_budget is None else ranked[:edge_budget]
+    return CondensedGraph(
+        nodes=dict(sorted(members.items())),
+        edges=[
+            WeightedEdge(src, dst, weight, (src, dst) not in hard)
+            for (src, dst), weight in sorted(kept_edges)
+        ],
+        steps=steps,
+        edge_total=len(weights),
+        omitted=omitted,
+    )
+
+
+def _mermaid_text(text: str) -> str:
+    return text.replace('"', "#quot;").replace("<", "#lt;").replace(">", "#gt;")
+
+
+def iter_mermaid(
+    graph: CondensedGraph, direction: str = "TD", id_prefix: str = "n"
+) -> Iterator[str]:
+    """Yield a fenced mermaid diagram of *graph*'s edges.
+
+    Node ids are positional (``n0``, ``n1``, ... in label order) so labels
+    never collide; merged nodes show their member count, merged edges
+    their weight, and soft edges are dotted.
+    """
+    ids = {label: f"{id_prefix}{i}" for i, label in enumerate(graph.nodes)}
+    yield "```mermaid"
+    yield f"graph {direction}"
+    for label in sorted({n for edge in graph.edges for n in (edge.source, edge.target)}):
+        members = graph.nodes[label]
+        text = label if members == [label] else f"{label} ({len(members)})"
+        yield f'    {ids[label]}["{_mermaid_text(text)}"]'
+    for edge in graph.edges:
+        arrow = "-.->" if edge.soft else "-->"
+        if edge.weight > 1:
+            arrow += f"|{edge.weight}|"
+        yield f"    {ids[edge.source]} {arrow} {ids[edge.target]}"
+    yield "```"
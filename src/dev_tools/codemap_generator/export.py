@@ -0,0 +1,373 @@
+"""
+Compact binary export of the code map, with a memory-mapped lazy loader.
+
+The markdown reports are for people; tools and agents that want the raw
+symbols, imports, calls and entry points should not have to re-parse
+tables or re-run the generator.  :func:`write_export` writes them into a
+single file that :class:`CodeMapExport` memory-maps and decodes one source
+file at a time, so looking up a module touches only that module's record,
+the index and the strings it uses.
+
+Layout (all integers little-endian ``u32`` words unless noted)::
+
+    header    magic ``CODEMAPX``, format version, extractor version,
+              package string id, string count, file count,
+              string table offset (u64), index offset (u64)
+    records   one variable-length record per source file (see below)
+    strings   string count + 1 byte offsets, then the UTF-8 data
+              (padded to a word boundary) — every string is stored once
+    index     per file: path id, module id, docstring id,
+              record offset and length (in words, relative to the records)
+
+A record is four length-prefixed groups — symbols, imports, calls and
+entry points — each a flat run of words: string ids (``0xFFFFFFFF`` for
+``None``), line numbers, flags, and count-prefixed string id lists.  The
+file path of every record in a group is implied by the file it belongs to.
+
+Usage::
+
+    gen.write_export(Path("codemap.cmx"))
+
+    with CodeMapExport(Path("codemap.cmx")) as export:
+        analysis = export.load("my_package.core.models")
+        for sym in analysis.symbols:
+            print(sym.name, sym.line_number)
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Callable, Optional
+
+from dev_tools.codemap_generator.atomic import set_replacement_mode
+from dev_tools.codemap_generator.extractor import EXTRACTOR_VERSION, module_name_for
+from dev_tools.codemap_generator.models import (
+    CallInfo,
+    EntryPoint,
+    FileAnalysis,
+    ImportInfo,
+    SymbolInfo,
+)
+
+if TYPE_CHECKING:
+    from dev_tools.codemap_generator.generator import CodeMapGenerator
+
+#: Default file name of the export.
+EXPORT_FILE_NAME = "codemap.cmx"
+
+#: Bump when the layout changes; older files are then rejected on open.
+EXPORT_FORMAT_VERSION = 2
+
+_MAGIC = b"CODEMAPX"
+_HEADER = struct.Struct("<8sIIIIIQQ")
+_NONE = 0xFFFFFFFF
+_INDEX_WIDTH = 5
+_WORD = 4
+
+assert array("I").itemsize == _WORD and _HEADER.size % _WORD == 0
+
+
+class _Interner:
+    """Assigns each distinct string a dense id, in first-seen order."""
+
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+
+    def __call__(self, text: Optional[str]) -> int:
+        if text is None:
+            return _NONE
+        found = self.ids.get(text)
+        if found is None:
+            found = self.ids[text] = len(self.ids)
+        return found
+
+    def many(self, words: array, texts: list[str]) -> None:
+        """Append a count-prefixed list of string ids to *words*."""
+        words.append(len(texts))
+        words.extend(self(text) for text in texts)
+
+
+_Records = tuple[list[SymbolInfo], list[ImportInfo], list[CallInfo], list[EntryPoint]]
+
+
+def _encode_record(words: array, intern: _Interner, records: _Records) -> None:
+    symbols, imports, calls, entry_points = records
+    words.append(len(symbols))
+    for sym in symbols:
+        words.extend((
+            intern(sym.name), intern(sym.symbol_type), sym.line_number,
+            intern(sym.docstring), intern(sym.parent_class), int(sym.is_public),
+            intern(sym.signature),
+        ))
+        intern.many(words, sym.decorators)
+        intern.many(words, sym.parameters)
+    words.append(len(imports))
+    for imp in imports:
+        words.extend((
+            intern(imp.module), int(imp.is_from_import), imp.line_number,
+            imp.level, int(imp.deferred),
+        ))
+        intern.many(words, imp.names)
+        intern.many(words, imp.aliases)
+    words.append(len(calls))
+    for call in calls:
+        words.extend((
+            intern(call.caller), intern(call.callee), call.line_number, intern(call.target),
+        ))
+    words.append(len(entry_points))
+    for entry in entry_points:
+        words.extend((intern(entry.entry_type), intern(entry.description)))
+
+
+def _little_endian(words: array) -> bytes:
+    if sys.byteorder == "big":
+        words = array("I", words)
+        words.byteswap()
+    return words.tobytes()
+
+
+def write_export(  # pylint: disable=too-many-locals
+    generator: "CodeMapGenerator", path: Path
+) -> Path:
+    """Write *generator*'s analysis results to *path* (see the module docs).
+
+    The file is written next to *path* and renamed into place, so readers
+    that have the previous export mapped keep a consistent view.
+    """
+    src_dir = generator.src_root.name
+    grouped: dict[str, _Records] = {
+        file_path: ([], [], [], []) for file_path in generator.source_hashes
+    }
+    for slot, records in enumerate((
+        generator.symbols, generator.imports, generator.calls, generator.entry_points
+    )):
+        for record in records:
+            grouped.setdefault(record.file_path, ([], [], [], []))[slot].append(record)
+
+    intern = _Interner()
+    package_id = intern(generator.package_name)
+    body = array("I")
+    index = array("I")
+    for file_path in sorted(grouped):
+        is_module = file_path.endswith(".py")
+        docstring = generator.module_docstrings.get(
+            file_path.removesuffix(".py").replace("/", ".")
+        )
+        offset = len(body)
+        _encode_record(body, intern, grouped[file_path])
+        index.extend((
+            intern(file_path),
+            intern(module_name_for(file_path, src_dir) if is_module else None),
+            intern(docstring if is_module else None),
+            offset,
+            len(body) - offset,
+        ))
+
+    encoded = [text.encode("utf-8", "surrogatepass") for text in intern.ids]
+    string_offsets = array("I", [0])
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+    string_data = b"".join(encoded)
+    string_data += b"\0" * (-len(string_data) % _WORD)
+
+    strings_at = _HEADER.size + len(body) * _WORD
+    index_at = strings_at + len(string_offsets) * _WORD + len(string_data)
+    header = _HEADER.pack(
+        _MAGIC, EXPORT_FORMAT_VERSION, EXTRACTOR_VERSION, package_id,
+        len(encoded), len(grouped), strings_at, index_at,
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            for chunk in (
+                header, _little_endian(body), _little_endian(string_offsets),
+                string_data, _little_endian(index),
+            ):
+                handle.write(chunk)
+        set_replacement_mode(tmp_name, path)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+
+class CodeMapExport:  # pylint: disable=too-many-instance-attributes
+    """Read-only, memory-mapped view of a file written by :func:`write_export`.
+
+    Nothing is decoded up front: strings are decoded (and memoized) when a
+    record refers to them, and each source file's record when it is
+    :meth:`load`\\ ed.
+
+    Args:
+        path: Export file.
+
+    Attributes:
+        package: Package the export was written for.
+        extractor_version: Extractor version of the exported analysis.
+
+    Raises:
+        ValueError: If *path* is not an export, or of another format version.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"Not a code map export: {path}")
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.extractor_version, package_id, self._string_count, \
+            self._file_count, strings_at, index_at = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a code map export: {path}")
+        if version != EXPORT_FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(
+                f"Unsupported export format version {version} in {path}"
+                f" (expected {EXPORT_FORMAT_VERSION})"
+            )
+        self._view = memoryview(self._mmap)
+        if sys.byteorder == "little":
+            self._words: memoryview | array = self._view.cast("I")
+        else:
+            self._words = array("I", self._view.tobytes())
+            self._words.byteswap()
+        self._body = _HEADER.size // _WORD
+        self._strings_at = strings_at // _WORD
+        self._string_data = strings_at + (self._string_count + 1) * _WORD
+        self._index = index_at // _WORD
+        self._decoded: dict[int, str] = {}
+        self._rows: Optional[dict[str, int]] = None
+        self.package = self.string(package_id)
+
+    # -- lifetime ------------------------------------------------------------
+
+    def close(self) -> None:
+        """Unmap the file."""
+        if isinstance(self._words, memoryview):
+            self._words.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "CodeMapExport":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    # -- lookups -------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._file_count
+
+    def string(self, string_id: int) -> str:
+        """The interned string with id *string_id*."""
+        text = self._decoded.get(string_id)
+        if text is None:
+            start = self._words[self._strings_at + string_id]
+            end = self._words[self._strings_at + string_id + 1]
+            text = self._decoded[string_id] = str(
+                self._mmap[self._string_data + start:self._string_data + end],
+                "utf-8",
+                "surrogatepass",
+            )
+        return text
+
+    def _optional(self, string_id: int) -> Optional[str]:
+        return None if string_id == _NONE else self.string(string_id)
+
+    def _row(self, row: int) -> tuple[int, ...]:
+        start = self._index + row * _INDEX_WIDTH
+        return tuple(self._words[start:start + _INDEX_WIDTH])
+
+    def files(self) -> list[str]:
+        """Recorded path of every exported file, sorted."""
+        return [self.string(self._row(row)[0]) for row in range(self._file_count)]
+
+    def modules(self) -> list[str]:
+        """Dotted name of every exported module, in file order."""
+        ids = (self._row(row)[1] for row in range(self._file_count))
+        return [self.string(module_id) for module_id in ids if module_id != _NONE]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._lookup()
+
+    def _lookup(self) -> dict[str, int]:
+        """Module name and file path → index row (built on first use)."""
+        if self._rows is None:
+            self._rows = {}
+            for row in range(self._file_count):
+                path_id, module_id = self._row(row)[:2]
+                self._rows[self.string(path_id)] = row
+                if module_id != _NONE:
+                    self._rows.setdefault(self.string(module_id), row)
+        return self._rows
+
+    def load(self, name: str) -> FileAnalysis:
+        """Decode the records of one module (dotted name) or file (recorded path).
+
+        The result's ``module_name`` is the dotted name (``""`` for
+        non-module files such as ``pyproject.toml``); only symbols,
+        imports, calls and entry points are exported.
+
+        Raises:
+            KeyError: If no exported file has that module name or path.
+        """
+        return self._decode(self._lookup()[name])
+
+    def __iter__(self) -> Iterator[FileAnalysis]:
+        for row in range(self._file_count):
+            yield self._decode(row)
+
+    def _decode(self, row: int) -> FileAnalysis:  # pylint: disable=too-many-locals
+        path_id, module_id, doc_id, offset, length = self._row(row)
+        start = self._body + offset
+        words = iter(self._words[start:start + length])
+        take: Callable[[], int] = words.__next__
+        string, optional = self.string, self._optional
+        file_path = string(path_id)
+
+        def strings() -> tuple[str, ...]:
+            return tuple(string(take()) for _ in range(take()))
+
+        analysis = FileAnalysis(
+            file_path, self._optional(module_id) or "", self._optional(doc_id)
+        )
+        for _ in range(take()):
+            name, kind, line, doc, parent, public, signature = (take() for _ in range(7))
+            analysis.symbols.append(SymbolInfo(
+                string(name), string(kind), file_path, line, optional(doc),
+                optional(parent), bool(public), strings(), strings(), string(signature),
+            ))
+        for _ in range(take()):
+            module, is_from, line, level, deferred = (take() for _ in range(5))
+            names = strings()
+            analysis.imports.append(ImportInfo(
+                string(module), names, bool(is_from), file_path, line, level,
+                strings(), bool(deferred),
+            ))
+        for _ in range(take()):
+            caller, callee, line, target = (take() for _ in range(4))
+            analysis.calls.append(
+                CallInfo(string(caller), string(callee), file_path, line, optional(target))
+            )
+        for _ in range(take()):
+            kind, description = take(), take()
+            analysis.entry_points.append(
+                EntryPoint(file_path, string(kind), optional(description))
+            )
+        return analysis
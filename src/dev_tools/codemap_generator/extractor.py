@@ -0,0 +1,673 @@
+"""
+Per-file AST extraction for the code map generator.
+
+:func:`extract_file` parses one Python file and returns a
+:class:`~dev_tools.codemap_generator.models.FileAnalysis`.  It is a plain
+module-level function with picklable inputs and outputs, so
+:class:`~dev_tools.codemap_generator.generator.CodeMapGenerator` can run it
+in a process pool.
+"""
+
+import ast
+import hashlib
+import time
+from pathlib import Path
+from typing import Optional
+
+from dev_tools.codemap_generator import perflint, sideeffects
+from dev_tools.codemap_generator.models import (
+    CallInfo,
+    EntryPoint,
+    FileAnalysis,
+    ImportInfo,
+    ParseTiming,
+    PerfFinding,
+    SymbolInfo,
+)
+
+#: Bump whenever the records produced for a given source change, so
+#: persisted extraction caches are invalidated.
+EXTRACTOR_VERSION = 8
+
+
+def path_to_module(file_path: Path, base_dir: Path) -> str:
+    """Convert a file path to a dotted module name relative to *base_dir*."""
+    relative = file_path.relative_to(base_dir)
+    parts = relative.with_suffix("").parts
+    return ".".join(parts)
+
+
+def absolute_import(module: str, is_package: bool, target: str, level: int) -> str:
+    """Resolve a ``from`` import's module name as seen from *module*.
+
+    Args:
+        module: Dotted name of the importing module.
+        is_package: Whether *module* is a package (``__init__``).
+        target: The ``from`` part without leading dots (may be empty).
+        level: Number of leading dots (``0`` for an absolute import).
+    """
+    if not level:
+        return target
+    package = module if is_package else module.rpartition(".")[0]
+    for _ in range(level - 1):
+        package = package.rpartition(".")[0]
+    if target and package:
+        return f"{package}.{target}"
+    return target or package
+
+
+def module_name_for(rel_path: str, src_dir: str = "") -> str:
+    """Return the importable dotted module name for a recorded file path.
+
+    Recorded paths include the src directory (``src/pkg/sub/__init__.py``);
+    *src_dir* is stripped from the front and ``__init__`` collapses to its
+    package (``pkg.sub``).
+    """
+    parts = rel_path.removesuffix(".py").split("/")
+    if src_dir and parts and parts[0] == src_dir:
+        parts = parts[1:]
+    if len(parts) > 1 and parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def extract_file(
+    file_path: Path, base_dir: Path, data: Optional[bytes] = None
+) -> FileAnalysis:
+    """Parse *file_path* and extract its symbols, imports, calls and entry points.
+
+    Args:
+        file_path: The Python file to analyze.
+        base_dir: Directory that recorded file paths are relative to
+            (the parent of the src root).
+        data: The file's raw bytes, if the caller has already read them.
+
+    Returns:
+        The extraction result.  When the file cannot be read or parsed,
+        ``error`` is set and all record lists are empty.
+    """
+    rel_str = str(file_path.relative_to(base_dir)).replace("\\", "/")
+    analysis = FileAnalysis(
+        file_path=rel_str,
+        module_name=path_to_module(file_path, base_dir),
+    )
+    started = time.perf_counter()
+    try:
+        if data is None:
+            data = file_path.read_bytes()
+        read = time.perf_counter()
+        analysis.content_hash = hashlib.sha256(data).hexdigest()
+        source = data.decode("utf-8")
+        tree = ast.parse(source, filename=str(file_path))
+    except (SyntaxError, UnicodeDecodeError) as e:
+        analysis.error = str(e)
+        return analysis
+
+    parsed = time.perf_counter()
+    _FileExtractor(analysis).run(tree)
+    analysis.timing = ParseTiming(
+        len(data), read - started, parsed - read, time.perf_counter() - parsed
+    )
+    return analysis
+
+
+#: Call targets that are too common to be worth recording (prefix match).
+_IGNORED_CALL_PREFIXES = ("print", "len", "str", "int", "list", "dict", "set", "tuple")
+
+#: Dunder methods that are listed as public API.
+_PUBLIC_DUNDERS = frozenset({"__init__", "__call__", "__enter__", "__exit__"})
+
+#: Node types without interesting children (expression contexts, operators).
+_LEAF_NODES = (ast.expr_context, ast.operator, ast.unaryop, ast.boolop, ast.cmpop)
+
+#: Caller names for calls made outside any class or function.
+MODULE_CALLER = "<module>"
+MAIN_CALLER = "__main__"
+
+#: CLI indicators in priority order (first one found is reported).
+_CLI_INDICATORS = ("argparse", "argumentparser", "click.command", "typer", "@app.command")
+
+
+def _get_full_attr(node: ast.Attribute) -> str:
+    """Get full attribute path like 'module.attr'."""
+    parts = []
+    current: ast.expr = node
+    while isinstance(current, ast.Attribute):
+        parts.append(current.attr)
+        current = current.value
+    if isinstance(current, ast.Name):
+        parts.append(current.id)
+    return ".".join(reversed(parts))
+
+
+def _call_target(node: ast.expr) -> Optional[str]:
+    """Return the dotted name a call goes through, if it is one.
+
+    ``a.b.c`` for plain names and attributes; a call in the chain is kept
+    as ``()`` so ``Service().handle`` stays resolvable.
+    """
+    parts = []
+    current = node
+    while isinstance(current, ast.Attribute):
+        parts.append(current.attr)
+        current = current.value
+    if isinstance(current, ast.Name):
+        parts.append(current.id)
+    elif isinstance(current, ast.Call):
+        inner = _call_target(current.func)
+        if inner is None:
+            return None
+        parts.append(f"{inner}()")
+    else:
+        return None
+    return ".".join(reversed(parts))
+
+
+def _get_decorator_name(decorator: ast.expr) -> str:
+    """Get the name of a decorator."""
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    if isinstance(decorator, ast.Name):
+        return decorator.id
+    if isinstance(decorator, ast.Attribute):
+        return _get_full_attr(decorator)
+    return "unknown"
+
+
+def _extract_parameters(node: ast.FunctionDef | ast.AsyncFunctionDef) -> tuple[str, ...]:
+    """Extract parameter names from a function."""
+    return tuple(arg.arg for arg in node.args.args if arg.arg not in ("self", "cls"))
+
+
+def _render_signature(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+    """Render the full parameter list, e.g. ``'a, /, b=..., *args, c, **kw'``.
+
+    Every parameter kind is kept in order, with ``=...`` marking the ones
+    that have a default; a leading ``self``/``cls`` is left out.
+    """
+    args = node.args
+    positional = [*args.posonlyargs, *args.args]
+    first_default = len(positional) - len(args.defaults)
+    parts: list[str] = []
+    for i, arg in enumerate(positional):
+        if not (i == 0 and arg.arg in ("self", "cls")):
+            parts.append(f"{arg.arg}=..." if i >= first_default else arg.arg)
+        if i == len(args.posonlyargs) - 1 and parts:
+            parts.append("/")
+    if args.vararg is not None:
+        parts.append(f"*{args.vararg.arg}")
+    elif args.kwonlyargs:
+        parts.append("*")
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+        parts.append(arg.arg if default is None else f"{arg.arg}=...")
+    if args.kwarg is not None:
+        parts.append(f"**{args.kwarg.arg}")
+    return ", ".join(parts)
+
+
+def _is_main_check(test: ast.expr) -> bool:
+    """Check if an expression is __name__ == '__main__'."""
+    return (
+        isinstance(test, ast.Compare)
+        and len(test.ops) == 1
+        and isinstance(test.ops[0], ast.Eq)
+        and isinstance(test.left, ast.Name)
+        and test.left.id == "__name__"
+        and bool(test.comparators)
+        and isinstance(test.comparators[0], ast.Constant)
+        and test.comparators[0].value == "__main__"
+    )
+
+
+def _is_type_checking(test: ast.expr) -> bool:
+    """Check if an expression is ``TYPE_CHECKING`` or ``typing.TYPE_CHECKING``."""
+    if isinstance(test, ast.Name):
+        return test.id == "TYPE_CHECKING"
+    return isinstance(test, ast.Attribute) and test.attr == "TYPE_CHECKING"
+
+
+def _runs_later(test: ast.expr) -> bool:
+    """Whether an ``if`` body guarded by *test* does not run on import."""
+    return _is_type_checking(test) or _is_main_check(test)
+
+
+class _FileExtractor(ast.NodeVisitor):  # pylint: disable=too-many-instance-attributes
+    """Single-pass visitor that fills a :class:`FileAnalysis`.
+
+    One traversal collects symbols, imports, calls, ``__main__`` blocks,
+    CLI indicators and :mod:`~dev_tools.codemap_generator.perflint`
+    findings.  A scope stack of enclosing class/function names gives
+    call-site attribution, and the ids of the module's top-level statements
+    give an O(1) top-level check.  For the lint rules, each scope also
+    tracks its loop nesting and which local names are bound to lists or
+    strings.
+    """
+
+    #: Per-node-type visit method cache, shared by all instances.
+    _dispatch: dict[type, str] = {}
+
+    def __init__(self, analysis: FileAnalysis) -> None:
+        self.analysis = analysis
+        self._scope: list[str] = []
+        self._top_level: set[int] = set()
+        self._main_blocks: list[EntryPoint] = []
+        self._cli_found: set[str] = set()
+        self._in_main = False
+        self._deferred = 0  # depth of function bodies / TYPE_CHECKING blocks
+        self._in_function = False
+        self._loop_depth = 0  # loops/comprehensions enclosing the node, in this scope
+        self._kinds: list[dict[str, str]] = [{}]  # per scope: local name → "list"/"str"
+        self._origins: dict[str, str] = {}  # imported local name → dotted origin
+
+    def run(self, tree: ast.Module) -> None:
+        """Extract everything from *tree*."""
+        self.analysis.docstring = ast.get_docstring(tree) or None
+        self._top_level = {id(stmt) for stmt in tree.body}
+        self.visit(tree)
+        self.analysis.side_effects = sideeffects.classify_module(
+            tree, self.analysis.file_path, _runs_later
+        )
+
+        self.analysis.entry_points.extend(self._main_blocks)
+        for indicator in _CLI_INDICATORS:
+            if indicator in self._cli_found:
+                self.analysis.entry_points.append(
+                    EntryPoint(
+                        file_path=self.analysis.file_path,
+                        entry_type="cli_script",
+                        description=f"CLI script (detected: {indicator})",
+                    )
+                )
+                break
+
+    # -- traversal ---------------------------------------------------------
+
+    def visit(self, node: ast.AST) -> None:
+        """Dispatch to ``visit_<NodeType>`` via a per-type cache."""
+        node_type = type(node)
+        method = self._dispatch.get(node_type)
+        if method is None:
+            method = f"visit_{node_type.__name__}"
+            if not hasattr(self, method):
+                method = "generic_visit"
+            self._dispatch[node_type] = method
+        getattr(self, method)(node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        """Visit child nodes, skipping leaf contexts and operators."""
+        for field_name in node._fields:
+            value = getattr(node, field_name, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        self.visit(item)
+            elif isinstance(value, ast.AST) and not isinstance(value, _LEAF_NODES):
+                self.visit(value)
+
+    # -- definitions -------------------------------------------------------
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:  # pylint: disable=invalid-name
+        """Record a class (at any depth) and its direct methods."""
+        file_path = self.analysis.file_path
+        self.analysis.symbols.append(
+            SymbolInfo(
+                name=node.name,
+                symbol_type="class",
+                file_path=file_path,
+                line_number=node.lineno,
+                docstring=ast.get_docstring(node),
+                is_public=not node.name.startswith("_"),
+                decorators=self._decorators(node),
+            )
+        )
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.analysis.symbols.append(
+                    SymbolInfo(
+                        name=item.name,
+                        symbol_type="async_method"
+                        if isinstance(item, ast.AsyncFunctionDef)
+                        else "method",
+                        file_path=file_path,
+                        line_number=item.lineno,
+                        docstring=ast.get_docstring(item),
+                        parent_class=node.name,
+                        is_public=not item.name.startswith("_")
+                        or item.name in _PUBLIC_DUNDERS,
+                        decorators=self._decorators(item),
+                        parameters=_extract_parameters(item),
+                        signature=_render_signature(item),
+                    )
+                )
+        self._visit_scope(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:  # pylint: disable=invalid-name
+        """Record a top-level function and visit its body."""
+        self._visit_function(node)
+
+    def visit_AsyncFunctionDef(  # pylint: disable=invalid-name
+        self, node: ast.AsyncFunctionDef
+    ) -> None:
+        """Record a top-level async function and visit its body."""
+        self._visit_function(node)
+
+    def _visit_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        if id(node) in self._top_level:
+            self.analysis.symbols.append(
+                SymbolInfo(
+                    name=node.name,
+                    symbol_type="async_function"
+                    if isinstance(node, ast.AsyncFunctionDef)
+                    else "function",
+                    file_path=self.analysis.file_path,
+                    line_number=node.lineno,
+                    docstring=ast.get_docstring(node),
+                    is_public=not node.name.startswith("_"),
+                    decorators=self._decorators(node),
+                    parameters=_extract_parameters(node),
+                    signature=_render_signature(node),
+                )
+            )
+        self._visit_scope(node)
+
+    def _visit_scope(self, node: ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        is_function = not isinstance(node, ast.ClassDef)
+        kinds: dict[str, str] = {}
+        if is_function:
+            for arg in (*node.args.posonlyargs, *node.args.args, *node.args.kwonlyargs):
+                kind = perflint.annotation_kind(arg.annotation)
+                if kind:
+                    kinds[arg.arg] = kind
+        saved = (self._in_function, self._loop_depth)
+        self._in_function = self._in_function or is_function
+        self._loop_depth = 0
+        self._kinds.append(kinds)
+        self._scope.append(node.name)
+        self._deferred += is_function
+        self.generic_visit(node)
+        self._deferred -= is_function
+        self._scope.pop()
+        self._kinds.pop()
+        self._in_function, self._loop_depth = saved
+
+    def _decorators(
+        self, node: ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef
+    ) -> tuple[str, ...]:
+        names = tuple(_get_decorator_name(d) for d in node.decorator_list)
+        if "click.command" in names:
+            self._cli_found.add("click.command")
+        if "app.command" in names:
+            self._cli_found.add("@app.command")
+        return names
+
+    # -- imports -----------------------------------------------------------
+
+    def visit_Import(self, node: ast.Import) -> None:  # pylint: disable=invalid-name
+        """Record a plain import."""
+        for alias in node.names:
+            self._note_cli_module(alias.name)
+            if alias.asname:
+                self._origins[alias.asname] = alias.name
+            else:
+                top = alias.name.partition(".")[0]
+                self._origins[top] = top
+            self.analysis.imports.append(
+                ImportInfo(
+                    module=alias.name,
+                    names=(alias.asname or alias.name,),
+                    is_from_import=False,
+                    file_path=self.analysis.file_path,
+                    line_number=node.lineno,
+                    aliases=(alias.asname or alias.name.partition(".")[0],),
+                    deferred=self._deferred > 0,
+                )
+            )
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:  # pylint: disable=invalid-name
+        """Record a ``from ... import ...`` statement."""
+        module = node.module or ""
+        self._note_cli_module(module)
+        if module and not node.level:
+            for alias in node.names:
+                self._origins[alias.asname or alias.name] = f"{module}.{alias.name}"
+        names = tuple(alias.name for alias in node.names)
+        for name in names:
+            self._note_cli_name(name)
+        self.analysis.imports.append(
+            ImportInfo(
+                module=module,
+                names=names,
+                is_from_import=True,
+                file_path=self.analysis.file_path,
+                line_number=node.lineno,
+                level=node.level or 0,
+                aliases=tuple(alias.asname or alias.name for alias in node.names),
+                deferred=self._deferred > 0,
+            )
+        )
+
+    # -- entry points ------------------------------------------------------
+
+    def visit_If(self, node: ast.If) -> None:  # pylint: disable=invalid-name
+        """Detect ``if __name__ == "__main__":`` and ``if TYPE_CHECKING:`` blocks."""
+        if _is_type_checking(node.test):
+            self._deferred += 1
+            for stmt in node.body:
+                self.visit(stmt)
+            self._deferred -= 1
+            for stmt in node.orelse:
+                self.visit(stmt)
+            return
+        if _is_main_check(node.test):
+            self._main_blocks.append(
+                EntryPoint(
+                    file_path=self.analysis.file_path,
+                    entry_type="main_block",
+                    description=f"Main block at line {node.lineno}",
+                )
+            )
+            if not self._scope:
+                self._in_main = True
+                self.generic_visit(node)
+                self._in_main = False
+                return
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:  # pylint: disable=invalid-name
+        """Note names that indicate a CLI framework."""
+        self._note_cli_name(node.id)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:  # pylint: disable=invalid-name
+        """Note attributes that indicate a CLI framework."""
+        self._note_cli_name(node.attr)
+        self.generic_visit(node)
+
+    def _note_cli_module(self, module: str) -> None:
+        top = module.partition(".")[0].lower()
+        if top in ("argparse", "typer"):
+            self._cli_found.add(top)
+
+    def _note_cli_name(self, name: str) -> None:
+        lowered = name.lower()
+        if lowered in ("argparse", "typer", "argumentparser"):
+            self._cli_found.add(lowered)
+
+    # -- calls -------------------------------------------------------------
+
+    def visit_Call(self, node: ast.Call) -> None:  # pylint: disable=invalid-name
+        """Record a call, attributed to its enclosing class/function scope.
+
+        Calls outside any definition go to ``module_calls`` with the caller
+        :data:`MODULE_CALLER` (or :data:`MAIN_CALLER` inside a
+        ``__main__`` block).
+        """
+        func = node.func
+        callee: Optional[str] = None
+        if isinstance(func, ast.Name):
+            callee = func.id
+        elif isinstance(func, ast.Attribute):
+            callee = func.attr
+        if callee and not callee.startswith(_IGNORED_CALL_PREFIXES):
+            if self._scope:
+                records, caller = self.analysis.calls, ".".join(self._scope)
+            else:
+                records = self.analysis.module_calls
+                caller = MAIN_CALLER if self._in_main else MODULE_CALLER
+            records.append(
+                CallInfo(
+                    caller=caller,
+                    callee=callee,
+                    file_path=self.analysis.file_path,
+                    line_number=node.lineno,
+                    target=_call_target(func),
+                )
+            )
+        if callee in perflint.CALL_NAMES:
+            self._check_call(node, callee)
+        self.generic_visit(node)
+
+    # -- performance lint --------------------------------------------------
+
+    def _finding(self, rule: str, node: ast.AST, message: str) -> None:
+        self.analysis.findings.append(
+            PerfFinding(
+                rule=rule,
+                file_path=self.analysis.file_path,
+                line_number=getattr(node, "lineno", 0),
+                scope=".".join(self._scope) or MODULE_CALLER,
+                message=message,
+                loop_depth=self._loop_depth,
+            )
+        )
+
+    def _kind_of(self, name: str) -> Optional[str]:
+        """What *name* is bound to in the current scope, else at module level."""
+        kind = self._kinds[-1].get(name)
+        return kind if kind is not None else self._kinds[0].get(name)
+
+    def _bind(self, target: ast.expr, kind: Optional[str]) -> None:
+        if isinstance(target, ast.Name):
+            if kind is None:
+                self._kinds[-1].pop(target.id, None)
+            else:
+                self._kinds[-1][target.id] = kind
+
+    def _origin(self, func: ast.expr) -> Optional[str]:
+        """The call target with its first name replaced by the import it came from."""
+        target = _call_target(func)
+        if target is None:
+            return None
+        head, dot, rest = target.partition(".")
+        return f"{self._origins.get(head, head)}{dot}{rest}"
+
+    def _check_call(self, node: ast.Call, callee: str) -> None:
+        if callee == "len":
+            if perflint.is_len_of_list(node):
+                self._finding(
+                    "len-of-list", node, f"`{perflint.snippet(node)}` builds a list to count it"
+                )
+            return
+        if not (self._in_function or self._loop_depth):
+            return
+        origin = self._origin(node.func)
+        if origin is None:
+            return
+        if self._loop_depth and origin in perflint.GETENV_TARGETS:
+            self._finding("getenv-loop", node, f"`{origin}()` is called on every iteration")
+        module, _, name = origin.rpartition(".")
+        if (
+            self._in_function
+            and module == "re"
+            and name in perflint.REGEX_FUNCTIONS
+            and perflint.has_literal_pattern(node)
+        ):
+            self._finding(
+                "regex-literal", node, f"`re.{name}()` with a literal pattern on every call"
+            )
+
+    def visit_Assign(self, node: ast.Assign) -> None:  # pylint: disable=invalid-name
+        """Track names bound to lists/strings."""
+        kind = perflint.binding_kind(node.value)
+        for target in node.targets:
+            self._bind(target, kind)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:  # pylint: disable=invalid-name
+        """Track annotated names bound to lists/strings."""
+        self._bind(
+            node.target,
+            perflint.annotation_kind(node.annotation) or perflint.binding_kind(node.value),
+        )
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:  # pylint: disable=invalid-name
+        """Flag ``s += ...`` string accumulation inside loops."""
+        if (
+            self._loop_depth
+            and isinstance(node.op, ast.Add)
+            and isinstance(node.target, ast.Name)
+            and "str" in (self._kind_of(node.target.id), perflint.binding_kind(node.value))
+        ):
+            self._finding(
+                "str-concat-loop", node, f"`{node.target.id} += ...` copies the string each time"
+            )
+        self.generic_visit(node)
+
+    def visit_Compare(self, node: ast.Compare) -> None:  # pylint: disable=invalid-name
+        """Flag ``x in <list>`` membership tests inside loops."""
+        if self._loop_depth:
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)) and perflint.is_list_expr(
+                    comparator, self._kind_of
+                ):
+                    self._finding(
+                        "list-membership",
+                        node,
+                        f"`{perflint.snippet(node)}` scans a list on every iteration",
+                    )
+                    break
+        self.generic_visit(node)
+
+    def visit_For(self, node: ast.For | ast.AsyncFor) -> None:  # pylint: disable=invalid-name
+        """Visit a ``for`` loop; its iterable is evaluated once, outside the loop."""
+        self.visit(node.iter)
+        self._loop_depth += 1
+        self.visit(node.target)
+        for stmt in node.body:
+            self.visit(stmt)
+        self._loop_depth -= 1
+        for stmt in node.orelse:
+            self.visit(stmt)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node: ast.While) -> None:  # pylint: disable=invalid-name
+        """Visit a ``while`` loop; its condition runs on every iteration."""
+        self._loop_depth += 1
+        self.visit(node.test)
+        for stmt in node.body:
+            self.visit(stmt)
+        self._loop_depth -= 1
+        for stmt in node.orelse:
+            self.visit(stmt)
+
+    def visit_ListComp(  # pylint: disable=invalid-name
+        self, node: ast.ListComp | ast.SetComp | ast.DictComp | ast.GeneratorExp
+    ) -> None:
+        """Visit a comprehension; only its first iterable is outside the loop."""
+        first, *rest = node.generators
+        self.visit(first.iter)
+        self._loop_depth += 1
+        self.visit(first.target)
+        for cond in first.ifs:
+            self.visit(cond)
+        for generator in rest:
+            self.visit(generator)
+        if isinstance(node, ast.DictComp):
+            self.visit(node.key)
+            self.visit(node.value)
+        else:
+            self.visit(node.elt)
+        self._loop_depth -= 1
+
+    visit_SetComp = visit_DictComp = visit_GeneratorExp = visit_ListComp
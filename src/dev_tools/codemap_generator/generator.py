@@ -23,64 +23,155 @@ Run this script:
     - When onboarding new developers/agents
     - As part of release documentation
 """
+# pylint: disable=too-many-lines
 
-import ast
-import argparse
+import contextlib
+import filecmp
+import hashlib
+import os
 import re
+import tempfile
 import sys
 from collections import defaultdict
-from dataclasses import dataclass, field
+from collections.abc import Callable, Container, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
-from typing import Optional
-
-
-@dataclass
-class SymbolInfo:  # pylint: disable=too-many-instance-attributes
-    """Information about a code symbol (class, function, method)."""
-
-    name: str
-    symbol_type: str  # 'class', 'function', 'method', 'async_function'
-    file_path: str
-    line_number: int
-    docstring: Optional[str] = None
-    parent_class: Optional[str] = None
-    is_public: bool = True
-    decorators: list[str] = field(default_factory=list)
-    parameters: list[str] = field(default_factory=list)
-
+from typing import Any, TypeVar
+
+from dev_tools.codemap_generator import perflint
+from dev_tools.codemap_generator import asyncblock
+from dev_tools.codemap_generator import gitrev
+from dev_tools.codemap_generator import sideeffects
+from dev_tools.codemap_generator import export
+from dev_tools.codemap_generator.atomic import set_replacement_mode
+from dev_tools.codemap_generator.cache import ExtractionCache, extract_file_cached
+from dev_tools.codemap_generator.callgraph import CallGraph
+from dev_tools.codemap_generator.condense import (
+    DEFAULT_NODE_BUDGET,
+    CondensedGraph,
+    condense,
+    iter_mermaid,
+)
+from dev_tools.codemap_generator.depgraph import DependencyGraph
+from dev_tools.codemap_generator.extractor import module_name_for
+from dev_tools.codemap_generator.guards import ResourceLimits, extract_guarded
+from dev_tools.codemap_generator.importtime import (
+    IMPORT_COST_FILE_NAME,
+    ImportCostAnalysis,
+    ImportTiming,
+    measure_import_time,
+)
+from dev_tools.codemap_generator.index import (
+    CLASS_TYPES,
+    FUNCTION_TYPES,
+    METHOD_TYPES,
+    CodeIndex,
+)
+from dev_tools.codemap_generator.models import (
+    CallInfo,
+    EntryPoint,
+    FileAnalysis,
+    ImportInfo,
+    PerfFinding,
+    SideEffect,
+    SymbolInfo,
+)
+from dev_tools.codemap_generator.profiles import ProfileData, load_stats
+from dev_tools.codemap_generator.shards import (
+    INDEX_FILE_NAME,
+    SHARD_DIR_NAME,
+    build_shards,
+    load_manifest,
+    render_index,
+    render_shard,
+    save_manifest,
+)
+from dev_tools.codemap_generator.store import SymbolStore
+from dev_tools.codemap_generator.timing import EXTRACT_PHASE, PhaseTimer
+
+_T = TypeVar("_T")
+
+#: Edge cap for the dependency and call diagrams: the heaviest edges are
+#: kept (the tables are not capped).
+MAX_DIAGRAM_EDGES = 150
+
+#: Row cap for the cycle and heaviest-import tables.
+MAX_REPORT_ROWS = 20
+
+
+def _resolve_workers(workers: int | None) -> int:
+    """Normalise a worker count: ``None``/``<= 0`` means one per CPU."""
+    if workers is None or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def discover_files(package_root: Path) -> list[Path]:
+    """Return a package's Python files in a stable, sorted order."""
+    return sorted(
+        py_file for py_file in package_root.rglob("*.py")
+        if "__pycache__" not in str(py_file)
+    )
 
-@dataclass
-class ImportInfo:
-    """Information about an import statement."""
 
-    module: str
-    names: list[str]  # Specific names imported, or ['*'] for star import
-    is_from_import: bool
-    file_path: str
-    line_number: int
+def parallel_map(
+    workers: int | None, func: Callable[..., _T], items: Sequence[Any], *args: Iterable[Any]
+) -> list[_T]:
+    """Apply *func* to every item, serially or across a process pool.
 
+    *workers* is normalised as for :class:`CodeMapGenerator`.  Results are
+    returned in *items* order either way, which keeps merges deterministic.
+    """
+    workers = min(_resolve_workers(workers), len(items))
+    if workers <= 1:
+        return list(map(func, items, *args))
 
-@dataclass
-class EntryPoint:
-    """Information about an entry point."""
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items, *args, chunksize=chunksize))
 
-    file_path: str
-    entry_type: str  # 'main_block', 'cli_script', 'console_script'
-    description: Optional[str] = None
 
+def read_pyproject(src_root: Path) -> str | None:
+    """Return the ``pyproject.toml`` next to *src_root*, if there is one."""
+    try:
+        return (src_root.parent / "pyproject.toml").read_text(encoding="utf-8")
+    except OSError:
+        return None
 
-@dataclass
-class CallInfo:
-    """Information about a function/method call."""
 
-    caller: str  # function/method making the call
-    callee: str  # function/method being called
-    file_path: str
-    line_number: int
+def write_if_changed(path: Path, lines: Iterable[str]) -> bool:
+    """Stream *lines* (joined with newlines) to *path* unless it already matches.
 
+    The content is written to a temporary file in the same directory and
+    compared byte-for-byte with *path*; it replaces *path* atomically only
+    when they differ, keeping *path*'s permissions.
 
-class CodeMapGenerator:
+    Returns:
+        ``True`` if *path* was created or replaced.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            separator = ""
+            for line in lines:
+                handle.write(separator)
+                handle.write(line)
+                separator = "\n"
+        if path.is_file() and filecmp.cmp(tmp_name, path, shallow=False):
+            os.unlink(tmp_name)
+            return False
+        set_replacement_mode(tmp_name, path)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return True
+
+
+class CodeMapGenerator:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """
     Generates code map documentation from Python source files.
 
@@ -89,260 +180,330 @@ class CodeMapGenerator:
     - Import relationships
     - Entry points
     - Call graph (approximate)
+
+    Args:
+        src_root: Source root directory containing the package.
+        package_name: Name of the package directory under *src_root*.
+        workers: Number of worker processes for :meth:`analyze`.  ``1``
+            (the default) parses serially in-process; ``0`` or ``None``
+            uses one worker per CPU.  Output is identical either way.
+        cache_dir: Directory for the persistent per-file extraction cache.
+            When set, unchanged files are loaded from the cache instead of
+            being re-parsed.  ``None`` (the default) disables caching.
+        deterministic: Stamp reports with a digest of the analyzed sources
+            instead of the current time, so identical inputs produce
+            byte-identical outputs.
+        revision: Analyze the package as of this git revision (tag, branch,
+            commit) instead of the working tree; files are read from the
+            object database, so no checkout is needed.  See
+            :mod:`~dev_tools.codemap_generator.gitrev`.
+        limits: Per-file size and time limits; files over them are listed
+            in :attr:`skipped_files` instead of parsed.  See
+            :class:`~dev_tools.codemap_generator.guards.ResourceLimits`.
+        node_budget: Maximum nodes per rendered diagram; larger graphs are
+            condensed (package collapse, cycle merge) to fit.  ``None``
+            never condenses.  See :mod:`~dev_tools.codemap_generator.condense`.
+        timer: Records phase wall times and per-file parse times of this
+            run.  See :class:`~dev_tools.codemap_generator.timing.PhaseTimer`.
     """
 
-    def __init__(self, src_root: Path, package_name: str) -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        src_root: Path,
+        package_name: str,
+        workers: int | None = 1,
+        cache_dir: Path | None = None,
+        deterministic: bool = False,
+        *,
+        revision: str | None = None,
+        limits: ResourceLimits | None = None,
+        node_budget: int | None = DEFAULT_NODE_BUDGET,
+        timer: PhaseTimer | None = None,
+    ) -> None:
         self.src_root = src_root
         self.package_name = package_name
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.deterministic = deterministic
+        self.revision = revision
+        self.limits = limits if limits is not None else ResourceLimits()
+        self.node_budget = node_budget
+        self.timer = timer
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.symbols: list[SymbolInfo] = []
         self.imports: list[ImportInfo] = []
         self.entry_points: list[EntryPoint] = []
         self.calls: list[CallInfo] = []
+        self.module_calls: list[CallInfo] = []
+        self.perf_findings: list[PerfFinding] = []
+        self.side_effects: list[SideEffect] = []
         self.module_docstrings: dict[str, str] = {}
+        self.source_hashes: dict[str, str] = {}
+        self.skipped_files: dict[str, str] = {}  # recorded path → reason
+        self.files_changed: list[Path] = []
+        self.files_unchanged: list[Path] = []
+        self.shards_rendered = 0
+        self.profile: ProfileData | None = None
+        self._index: CodeIndex | None = None
+        self._call_graph: CallGraph | None = None
+        self._call_graph_key: tuple[int, ...] = ()
+        self._dependency_graph: DependencyGraph | None = None
+        self._dependency_graph_key: tuple[int, ...] = ()
+        # cache key of a (path, blob id) → extraction, shared by api_diff()
+        self._blob_analyses: dict[str, FileAnalysis] = {}
+
+    @property
+    def index(self) -> CodeIndex:
+        """Secondary indexes over ``symbols`` and ``calls``.
+
+        Built once after :meth:`analyze` and rebuilt automatically if the
+        record lists are replaced or grow.
+        """
+        if self._index is None or not self._index.is_current(self.symbols, self.calls):
+            self._index = CodeIndex(self.symbols, self.calls)
+        return self._index
+
+    @property
+    def call_graph(self) -> CallGraph:
+        """Call graph with callees resolved to qualified names.
+
+        Built on first access after :meth:`analyze` and rebuilt if the
+        record lists change.  See :class:`~dev_tools.codemap_generator.callgraph.CallGraph`.
+        """
+        key = tuple(
+            len(records) for records in
+            (self.symbols, self.imports, self.calls, self.module_calls, self.entry_points)
+        )
+        if self._call_graph is None or key != self._call_graph_key:
+            self._call_graph = CallGraph(
+                self.symbols,
+                self.imports,
+                self.calls + self.module_calls,
+                self.entry_points,
+                src_dir=self.src_root.name,
+            )
+            self._call_graph_key = key
+        return self._call_graph
+
+    @property
+    def dependency_graph(self) -> DependencyGraph:
+        """Module dependency graph with full module names and cycle detection.
+
+        Built on first access after :meth:`analyze` and rebuilt if the
+        imports change.  See :class:`~dev_tools.codemap_generator.depgraph.DependencyGraph`.
+        """
+        key = (len(self.imports), len(self.source_hashes))
+        if self._dependency_graph is None or key != self._dependency_graph_key:
+            self._dependency_graph = DependencyGraph(
+                [path for path in self.source_hashes if path.endswith(".py")],
+                self.imports,
+                src_dir=self.src_root.name,
+            )
+            self._dependency_graph_key = key
+        return self._dependency_graph
+
+    def load_profiles(self, paths: Iterable[Path]) -> ProfileData:
+        """Match ``cProfile``/``pstats`` dumps to the analyzed symbols.
+
+        Call after :meth:`analyze`.  Once loaded, the symbol index gains a
+        "Profiled Symbols" table and the call graph "Hot Paths" and
+        "Hottest Calls" sections.  See
+        :class:`~dev_tools.codemap_generator.profiles.ProfileData`.
+        """
+        self.profile = ProfileData(
+            load_stats(paths),
+            self.symbols,
+            src_dir=self.src_root.name,
+            file_paths=[path for path in self.source_hashes if path.endswith(".py")],
+        )
+        return self.profile
 
     def analyze(self) -> None:
-        """Analyze all Python files in the source root."""
-        package_root = self.src_root / self.package_name
-        if not package_root.exists():
-            raise FileNotFoundError(f"Package not found: {package_root}")
-
-        for py_file in package_root.rglob("*.py"):
-            if "__pycache__" in str(py_file):
-                continue
-            self._analyze_file(py_file)
-
-        # Also check for pyproject.toml console_scripts
-        self._detect_console_scripts()
-
-    def _analyze_file(self, file_path: Path) -> None:
-        """Analyze a single Python file."""
-        try:
-            source = file_path.read_text(encoding="utf-8")
-            tree = ast.parse(source, filename=str(file_path))
-        except (SyntaxError, UnicodeDecodeError) as e:
-            print(f"Warning: Could not parse {file_path}: {e}", file=sys.stderr)
-            return
+        """Analyze all Python files in the source root (or at :attr:`revision`).
+
+        Raises:
+            FileNotFoundError: If the package does not exist.
+            gitrev.GitError: If a revision is set and cannot be read.
+        """
+        if self.revision is None:
+            package_root = self.src_root / self.package_name
+            if not package_root.exists():
+                raise FileNotFoundError(f"Package not found: {package_root}")
+            with self._phase("discover files"):
+                files = discover_files(package_root)
+                pyproject = read_pyproject(self.src_root)
+            with self._phase(EXTRACT_PHASE):
+                analyses = self.extract_files(files)
+        else:
+            with self._phase(EXTRACT_PHASE):
+                analyses, pyproject = self._extract_revision(self.revision)
+        if self.timer is not None:
+            self.timer.record(analyses)
+        self.load_analyses(analyses, pyproject)
+
+    def _phase(self, name: str) -> contextlib.AbstractContextManager[None]:
+        """Time a phase into :attr:`timer`, if there is one."""
+        return self.timer.phase(name) if self.timer is not None else contextlib.nullcontext()
+
+    def load_analyses(self, analyses: Iterable[FileAnalysis], pyproject: str | None = None) -> None:
+        """Merge extraction results made elsewhere and finish the analysis.
+
+        :meth:`analyze` ends here; :class:`~dev_tools.codemap_generator.monorepo.Monorepo`
+        extracts many packages in one pass and hands each generator its share.
+
+        Args:
+            analyses: The package's per-file results, in file order.
+            pyproject: Content of the ``pyproject.toml`` next to the src
+                root, for console-script detection.
+        """
+        with self._phase("merge results"):
+            for analysis in analyses:
+                self._merge(analysis)
+
+            # Also check for pyproject.toml console_scripts
+            self._detect_console_scripts(pyproject)
+            self._index = CodeIndex(self.symbols, self.calls)
+
+    def extract_files(self, files: list[Path]) -> list[FileAnalysis]:
+        """Extract every file, in *files* order, consulting the cache if enabled.
+
+        Cache entries of files not in *files* are pruned, so pass the whole
+        package.  Nothing is merged; see :meth:`load_analyses`.
+        """
+        base_dir = self.src_root.parent
+        if self.cache_dir is None:
+            return self._map(
+                extract_guarded, files, repeat(base_dir), repeat(None), repeat(self.limits)
+            )
 
-        relative_path = file_path.relative_to(self.src_root.parent)
-        rel_str = str(relative_path).replace("\\", "/")
-
-        # Extract module docstring
-        if ast.get_docstring(tree):
-            module_name = self._path_to_module(file_path)
-            self.module_docstrings[module_name] = ast.get_docstring(tree) or ""
-
-        # Walk the AST
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                self._extract_class(node, rel_str)
-            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                # Only top-level functions (not methods)
-                if self._is_top_level(tree, node):
-                    self._extract_function(node, rel_str)
-            elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                self._extract_import(node, rel_str)
-
-        # Check for entry points
-        self._detect_main_block(tree, rel_str)
-        self._detect_cli_patterns(tree, rel_str)
-
-        # Extract calls (approximate)
-        self._extract_calls(tree, rel_str)
-
-    def _is_top_level(self, tree: ast.Module, node: ast.AST) -> bool:
-        """Check if a node is at the top level of the module."""
-        return node in tree.body
-
-    def _extract_class(self, node: ast.ClassDef, file_path: str) -> None:
-        """Extract class and its methods."""
-        is_public = not node.name.startswith("_")
-        decorators = [self._get_decorator_name(d) for d in node.decorator_list]
-
-        class_info = SymbolInfo(
-            name=node.name,
-            symbol_type="class",
-            file_path=file_path,
-            line_number=node.lineno,
-            docstring=ast.get_docstring(node),
-            is_public=is_public,
-            decorators=decorators,
+        cache = ExtractionCache(self.cache_dir, self.package_name)
+        results = self._map(
+            extract_file_cached, files, repeat(base_dir), repeat(cache), repeat(self.limits)
         )
-        self.symbols.append(class_info)
-
-        # Extract methods
-        for item in node.body:
-            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                method_is_public = not item.name.startswith("_") or item.name in (
-                    "__init__",
-                    "__call__",
-                    "__enter__",
-                    "__exit__",
-                )
-                method_decorators = [
-                    self._get_decorator_name(d) for d in item.decorator_list
-                ]
-                params = self._extract_parameters(item)
-
-                method_info = SymbolInfo(
-                    name=item.name,
-                    symbol_type="async_method"
-                    if isinstance(item, ast.AsyncFunctionDef)
-                    else "method",
-                    file_path=file_path,
-                    line_number=item.lineno,
-                    docstring=ast.get_docstring(item),
-                    parent_class=node.name,
-                    is_public=method_is_public,
-                    decorators=method_decorators,
-                    parameters=params,
-                )
-                self.symbols.append(method_info)
-
-    def _extract_function(
-        self, node: ast.FunctionDef | ast.AsyncFunctionDef, file_path: str
-    ) -> None:
-        """Extract a top-level function."""
-        is_public = not node.name.startswith("_")
-        decorators = [self._get_decorator_name(d) for d in node.decorator_list]
-        params = self._extract_parameters(node)
-
-        func_info = SymbolInfo(
-            name=node.name,
-            symbol_type="async_function"
-            if isinstance(node, ast.AsyncFunctionDef)
-            else "function",
-            file_path=file_path,
-            line_number=node.lineno,
-            docstring=ast.get_docstring(node),
-            is_public=is_public,
-            decorators=decorators,
-            parameters=params,
+        self.cache_hits = sum(1 for _, _, hit in results if hit)
+        self.cache_misses = len(results) - self.cache_hits
+        cache.prune({key for _, key, _ in results})
+        return [analysis for analysis, _, _ in results]
+
+    def reset(self) -> None:
+        """Forget every merged result, as before :meth:`analyze`.
+
+        Loaded profile data is kept; call :meth:`load_profiles` again once
+        the symbols have been reloaded.
+        """
+        self.symbols = []
+        self.imports = []
+        self.entry_points = []
+        self.calls = []
+        self.module_calls = []
+        self.perf_findings = []
+        self.side_effects = []
+        self.module_docstrings = {}
+        self.source_hashes = {}
+        self.skipped_files = {}
+        self._index = None
+        self._call_graph = None
+        self._dependency_graph = None
+
+    def _extract_revision(  # pylint: disable=too-many-locals
+        self, revision: str
+    ) -> tuple[list[FileAnalysis], str | None]:
+        """Extract the package's files at *revision*; also return its ``pyproject.toml``.
+
+        Extractions are reused by ``(path, blob id)`` from memory and the
+        cache; the remaining blobs (and ``pyproject.toml``) are read through
+        one ``git cat-file --batch`` process and parsed across the workers.
+        """
+        source = gitrev.RevisionSource(self.src_root, self.package_name, revision)
+        blobs = source.blobs()
+        if not blobs:
+            raise FileNotFoundError(
+                f"Package not found: {self.src_root / self.package_name} at {revision}"
+            )
+        cache = (
+            ExtractionCache(self.cache_dir, self.package_name, blobs=True)
+            if self.cache_dir is not None else None
         )
-        self.symbols.append(func_info)
-
-    def _extract_parameters(
-        self, node: ast.FunctionDef | ast.AsyncFunctionDef
-    ) -> list[str]:
-        """Extract parameter names from a function."""
-        params = []
-        for arg in node.args.args:
-            if arg.arg not in ("self", "cls"):
-                params.append(arg.arg)
-        return params
-
-    def _get_decorator_name(self, decorator: ast.expr) -> str:
-        """Get the name of a decorator."""
-        if isinstance(decorator, ast.Name):
-            return decorator.id
-        if isinstance(decorator, ast.Attribute):
-            return self._get_full_attr(decorator)
-        if isinstance(decorator, ast.Call):
-            if isinstance(decorator.func, ast.Name):
-                return decorator.func.id
-            if isinstance(decorator.func, ast.Attribute):
-                return self._get_full_attr(decorator.func)
-        return "unknown"
-
-    def _get_full_attr(self, node: ast.Attribute) -> str:
-        """Get full attribute path like 'module.attr'."""
-        parts = []
-        current = node
-        while isinstance(current, ast.Attribute):
-            parts.append(current.attr)
-            current = current.value
-        if isinstance(current, ast.Name):
-            parts.append(current.id)
-        return ".".join(reversed(parts))
-
-    def _extract_import(
-        self, node: ast.Import | ast.ImportFrom, file_path: str
-    ) -> None:
-        """Extract import information."""
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                self.imports.append(
-                    ImportInfo(
-                        module=alias.name,
-                        names=[alias.asname or alias.name],
-                        is_from_import=False,
-                        file_path=file_path,
-                        line_number=node.lineno,
-                    )
-                )
-        elif isinstance(node, ast.ImportFrom):
-            module = node.module or ""
-            names = [alias.name for alias in node.names]
-            self.imports.append(
-                ImportInfo(
-                    module=module,
-                    names=names,
-                    is_from_import=True,
-                    file_path=file_path,
-                    line_number=node.lineno,
-                )
+        keyer = cache if cache is not None else ExtractionCache(
+            Path(), self.package_name, blobs=True
+        )
+        keys = [keyer.key_for_blob(path, blob_id) for path, blob_id in blobs]
+        found: dict[str, FileAnalysis] = {}
+        for key in keys:
+            hit = self._blob_analyses.get(key) or (cache.get(key) if cache else None)
+            if hit is not None:
+                found[key] = hit
+        missing = [i for i, key in enumerate(keys) if key not in found]
+
+        with source.reader() as reader:
+            names = [blobs[i][1] for i in missing] + [source.file_name("pyproject.toml")]
+            contents = list(reader.read_many(names))
+        pyproject_data = contents.pop()
+        base_dir = self.src_root.parent
+        parsed = self._map(
+            extract_guarded,
+            [base_dir / blobs[i][0] for i in missing],
+            repeat(base_dir),
+            contents,
+            repeat(self.limits),
+        )
+        for i, analysis in zip(missing, parsed):
+            found[keys[i]] = analysis
+            if cache is not None and analysis.skipped is None:
+                cache.put(keys[i], analysis)
+        self._blob_analyses.update(found)
+        self.cache_hits = len(blobs) - len(missing)
+        self.cache_misses = len(missing)
+        if cache is not None:
+            # Blob entries stay valid for every revision: never prune by this one.
+            cache.prune_versions()
+        pyproject = pyproject_data.decode("utf-8", "replace") if pyproject_data else None
+        return [found[key] for key in keys], pyproject
+
+    def _map(
+        self, func: Callable[..., _T], items: Sequence[Any], *args: Iterable[Any]
+    ) -> list[_T]:
+        """Apply *func* to every item across this generator's workers (see :func:`parallel_map`)."""
+        return parallel_map(self.workers, func, items, *args)
+
+    def _merge(self, analysis: FileAnalysis) -> None:
+        """Fold one file's extraction result into the aggregate lists."""
+        if analysis.skipped is not None:
+            self.skipped_files[analysis.file_path] = analysis.skipped
+            print(f"Warning: Skipped {analysis.file_path}: {analysis.skipped}", file=sys.stderr)
+            return
+        analysis.intern_strings()  # share names with the files merged before
+        if analysis.content_hash is not None:
+            self.source_hashes[analysis.file_path] = analysis.content_hash
+        if analysis.error is not None:
+            print(
+                f"Warning: Could not parse {self.src_root.parent / analysis.file_path}:"
+                f" {analysis.error}",
+                file=sys.stderr,
             )
-
-    def _detect_main_block(self, tree: ast.Module, file_path: str) -> None:
-        """Detect if __name__ == '__main__' blocks."""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.If):
-                # Check for: if __name__ == "__main__"
-                if self._is_main_check(node.test):
-                    self.entry_points.append(
-                        EntryPoint(
-                            file_path=file_path,
-                            entry_type="main_block",
-                            description=f"Main block at line {node.lineno}",
-                        )
-                    )
-
-    def _is_main_check(self, test: ast.expr) -> bool:
-        """Check if an expression is __name__ == '__main__'."""
-        if isinstance(test, ast.Compare):
-            if len(test.ops) == 1 and isinstance(test.ops[0], ast.Eq):
-                left = test.left
-                right = test.comparators[0] if test.comparators else None
-                if isinstance(left, ast.Name) and left.id == "__name__":
-                    if isinstance(right, ast.Constant) and right.value == "__main__":
-                        return True
-        return False
-
-    def _detect_cli_patterns(self, _tree: ast.Module, file_path: str) -> None:
-        """Detect CLI patterns like argparse, click, typer."""
-        source_lower = ""
-        try:
-            full_path = Path(self.src_root.parent / file_path)
-            source_lower = full_path.read_text(
-                encoding="utf-8"
-            ).lower()
-        except (FileNotFoundError, UnicodeDecodeError):
             return
+        if analysis.docstring:
+            self.module_docstrings[analysis.module_name] = analysis.docstring
+        self.symbols.extend(analysis.symbols)
+        self.imports.extend(analysis.imports)
+        self.entry_points.extend(analysis.entry_points)
+        self.calls.extend(analysis.calls)
+        self.module_calls.extend(analysis.module_calls)
+        self.perf_findings.extend(analysis.findings)
+        self.side_effects.extend(analysis.side_effects)
 
-        cli_indicators = [
-            "argparse",
-            "argumentparser",
-            "click.command",
-            "typer",
-            "@app.command",
-        ]
-        for indicator in cli_indicators:
-            if indicator in source_lower:
-                self.entry_points.append(
-                    EntryPoint(
-                        file_path=file_path,
-                        entry_type="cli_script",
-                        description=f"CLI script (detected: {indicator})",
-                    )
-                )
-                break
+    def _analyze_file(self, file_path: Path) -> None:
+        """Analyze a single Python file."""
+        self._merge(extract_guarded(file_path, self.src_root.parent, limits=self.limits))
 
-    def _detect_console_scripts(self) -> None:
+    def _detect_console_scripts(self, content: str | None) -> None:
         """Detect console_scripts from pyproject.toml (best-effort regex parse)."""
-        pyproject_path = self.src_root.parent / "pyproject.toml"
-        try:
-            content = pyproject_path.read_text(encoding="utf-8")
-        except OSError:
+        if content is None:
             return
+        self.source_hashes["pyproject.toml"] = hashlib.sha256(
+            content.encode("utf-8")
+        ).hexdigest()
 
         try:
             # Find [project.scripts] section
@@ -372,96 +533,204 @@ class CodeMapGenerator:
         except Exception:  # pylint: disable=broad-exception-caught  # noqa: BLE001
             pass
 
-    def _extract_calls(self, tree: ast.Module, file_path: str) -> None:
-        """Extract function/method calls (approximate call graph)."""
-        calls_list = self.calls
-
-        class CallVisitor(ast.NodeVisitor):
-            """AST visitor that tracks call relationships between functions."""
-
-            def __init__(self) -> None:
-                self.current_scope: list[str] = []
-
-            def visit_FunctionDef(  # pylint: disable=invalid-name
-                self, node: ast.FunctionDef
-            ) -> None:
-                """Visit a function definition node."""
-                self.current_scope.append(node.name)
-                self.generic_visit(node)
-                self.current_scope.pop()
-
-            def visit_AsyncFunctionDef(  # pylint: disable=invalid-name
-                self, node: ast.AsyncFunctionDef
-            ) -> None:
-                """Visit an async function definition node."""
-                self.current_scope.append(node.name)
-                self.generic_visit(node)
-                self.current_scope.pop()
-
-            def visit_ClassDef(self, node: ast.ClassDef) -> None:  # pylint: disable=invalid-name
-                """Visit a class definition node."""
-                self.current_scope.append(node.name)
-                self.generic_visit(node)
-                self.current_scope.pop()
-
-            def visit_Call(self, node: ast.Call) -> None:  # pylint: disable=invalid-name
-                """Visit a call expression node."""
-                if self.current_scope:
-                    caller = ".".join(self.current_scope)
-                    callee = self._get_callee_name(node)
-                    if callee and not callee.startswith(
-                        (
-                            "print",
-                            "len",
-                            "str",
-                            "int",
-                            "list",
-                            "dict",
-                            "set",
-                            "tuple",
-                        )
-                    ):
-                        calls_list.append(
-                            CallInfo(
-                                caller=caller,
-                                callee=callee,
-                                file_path=file_path,
-                                line_number=node.lineno,
-                            )
-                        )
-                self.generic_visit(node)
-
-            def _get_callee_name(
-                self, node: ast.Call
-            ) -> Optional[str]:
-                """Get the name of the function being called."""
-                if isinstance(node.func, ast.Name):
-                    return node.func.id
-                if isinstance(node.func, ast.Attribute):
-                    return node.func.attr
-                return None
-
-        visitor = CallVisitor()
-        visitor.visit(tree)
-
-    def _path_to_module(self, file_path: Path) -> str:
-        """Convert file path to module name."""
-        relative = file_path.relative_to(self.src_root.parent)
-        parts = relative.with_suffix("").parts
-        return ".".join(parts)
-
     # =========================================================================
     # Output Generation
     # =========================================================================
 
-    def generate_symbol_index(self) -> str:
-        """Generate the symbol index markdown."""
-        lines = [
-            "# Symbol Index",
+    #: Output file name → report name, in write order.  ``generate_<name>``
+    #: returns the document as a string; ``_iter_<name>`` yields its lines.
+    OUTPUTS: tuple[tuple[str, str], ...] = (
+        ("code-map.md", "combined_code_map"),
+        ("symbol-index.md", "symbol_index"),
+        ("dependency-graph.md", "dependency_graph"),
+        ("entry-points.md", "entry_points"),
+        ("module-summaries.md", "module_summaries"),
+        ("call-graph.md", "call_graph"),
+    )
+
+    #: Report name → the kinds of per-file results it is rendered from
+    #: (see :data:`~dev_tools.codemap_generator.watch.FACETS`); used to
+    #: re-render only the reports an edit affects.
+    OUTPUT_SOURCES: dict[str, frozenset[str]] = {
+        "combined_code_map": frozenset({"symbols", "entry_points", "docstring", "files"}),
+        "symbol_index": frozenset({"symbols"}),
+        "dependency_graph": frozenset({"imports", "files"}),
+        "entry_points": frozenset({"entry_points"}),
+        "module_summaries": frozenset({"symbols", "docstring"}),
+        "call_graph": frozenset({"symbols", "imports", "calls", "entry_points"}),
+    }
+
+    def source_digest(self) -> str:
+        """Return a hash of every analyzed source file and ``pyproject.toml``.
+
+        Identical inputs give an identical digest regardless of when or
+        where the analysis ran.
+        """
+        digest = hashlib.sha256()
+        for file_path, content_hash in sorted(self.source_hashes.items()):
+            digest.update(f"{file_path}\0{content_hash}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def stamp(self) -> str:
+        """Return the provenance part of the report header.
+
+        ``on <date time>`` normally, ``from sources `<digest>``` in
+        deterministic mode, prefixed with ``at revision `<rev>``` when
+        analyzing a git revision.
+        """
+        at = f"at revision `{self.revision}` " if self.revision is not None else ""
+        if self.deterministic:
+            return f"{at}from sources `{self.source_digest()[:12]}`"
+        return f"{at}on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+    def _header(self, title: str) -> Iterator[str]:
+        """Yield the title and provenance lines shared by every report."""
+        yield from [
+            title,
             "",
-            (f"> Auto-generated by `codemap_generator`"
-             f" on {datetime.now().strftime('%Y-%m-%d %H:%M')}"),
+            f"> Auto-generated by `codemap_generator` {self.stamp()}",
             "> **Do not edit manually** — regenerate with `codemap-generator`",
+        ]
+
+    def generate_symbol_index(self) -> str:
+        """Generate the symbol index markdown."""
+        return "\n".join(self._iter_symbol_index())
+
+    def generate_dependency_graph(self) -> str:
+        """Generate the dependency graph markdown."""
+        return "\n".join(self._iter_dependency_graph())
+
+    def generate_entry_points(self) -> str:
+        """Generate the entry points markdown."""
+        return "\n".join(self._iter_entry_points())
+
+    def generate_module_summaries(self) -> str:
+        """Generate module summaries from docstrings."""
+        return "\n".join(self._iter_module_summaries())
+
+    def generate_call_graph(self) -> str:
+        """Generate approximate call graph."""
+        return "\n".join(self._iter_call_graph())
+
+    def generate_combined_code_map(self) -> str:
+        """Generate the combined code map with all sections."""
+        return "\n".join(self._iter_combined_code_map())
+
+    def generate_import_cost(self, timings: list[ImportTiming] | None = None) -> str:
+        """Generate the import-time cost report.
+
+        Args:
+            timings: Parsed ``-X importtime`` output; measured with
+                :func:`~dev_tools.codemap_generator.importtime.measure_import_time`
+                (which imports the package in a subprocess) when omitted.
+        """
+        return "\n".join(self._iter_import_cost(timings))
+
+    def generate_perf_findings(self) -> str:
+        """Generate the ranked performance anti-pattern report."""
+        return "\n".join(self._iter_perf_findings())
+
+    def _iter_perf_findings(self) -> Iterator[str]:
+        yield from self._header(f"# Performance Findings — {self.package_name}")
+        yield ""
+        yield from perflint.iter_report(self.perf_findings)
+        yield ""
+
+    def import_weights(self) -> list[sideeffects.ModuleWeight]:
+        """Static import-time weight of every module with side effects, heaviest first.
+
+        See :mod:`~dev_tools.codemap_generator.sideeffects`.
+        """
+        modules = {
+            path: module_name_for(path, self.src_root.name)
+            for path in self.source_hashes
+            if path.endswith(".py")
+        }
+        return sideeffects.module_weights(self.side_effects, modules, self.dependency_graph)
+
+    def generate_import_weight(self) -> str:
+        """Generate the module-level side-effect / import-time weight report."""
+        return "\n".join(self._iter_import_weight())
+
+    def _iter_import_weight(self) -> Iterator[str]:
+        yield from self._header(f"# Import-Time Weight — {self.package_name}")
+        yield ""
+        yield from sideeffects.iter_report(self.import_weights())
+        yield ""
+
+    def api_diff(self, base: str, head: str | None = None) -> list[gitrev.ApiChange]:
+        """Public symbols added, removed or changed from revision *base* to *head*.
+
+        *head* defaults to this generator's own analysis (the working tree,
+        or :attr:`revision`), so call :meth:`analyze` first.  Both
+        revisions are read with this generator's settings; files whose
+        blob is unchanged are extracted once and shared between them.
+        """
+        old = self._at_revision(base)
+        new = self if head is None else self._at_revision(head)
+        return gitrev.api_diff(old.symbols, new.symbols, self.src_root.name)
+
+    def _at_revision(self, revision: str) -> "CodeMapGenerator":
+        other = CodeMapGenerator(
+            self.src_root, self.package_name, self.workers, self.cache_dir, revision=revision
+        )
+        other._blob_analyses = self._blob_analyses  # pylint: disable=protected-access
+        other.analyze()
+        return other
+
+    def generate_api_diff(self, base: str, head: str | None = None) -> str:
+        """Generate the API diff report (see :meth:`api_diff`)."""
+        return "\n".join(self._iter_api_diff(base, head))
+
+    def _iter_api_diff(self, base: str, head: str | None = None) -> Iterator[str]:
+        changes = self.api_diff(base, head)
+        yield from self._header(f"# API Diff — {self.package_name}")
+        yield ""
+        yield from gitrev.iter_report(changes, base, head or self.revision or "working tree")
+        yield ""
+
+    def find_blocking_calls(
+        self, blocking_apis: Iterable[str] = asyncblock.DEFAULT_BLOCKING_APIS
+    ) -> list[asyncblock.BlockingCall]:
+        """Blocking calls made directly or transitively from ``async def`` code.
+
+        *blocking_apis* are ``fnmatch`` patterns over qualified names; see
+        :mod:`~dev_tools.codemap_generator.asyncblock`.
+        """
+        return asyncblock.find_blocking_calls(
+            self.call_graph, self.symbols, self.calls, self.src_root.name, blocking_apis
+        )
+
+    def generate_async_blocking(
+        self, blocking_apis: Iterable[str] = asyncblock.DEFAULT_BLOCKING_APIS
+    ) -> str:
+        """Generate the blocking-calls-in-coroutines report."""
+        return "\n".join(self._iter_async_blocking(blocking_apis))
+
+    def _iter_async_blocking(
+        self, blocking_apis: Iterable[str] = asyncblock.DEFAULT_BLOCKING_APIS
+    ) -> Iterator[str]:
+        patterns = list(blocking_apis)
+        yield from self._header(f"# Blocking Calls in Coroutines — {self.package_name}")
+        yield ""
+        yield from asyncblock.iter_report(self.find_blocking_calls(patterns), patterns)
+        yield ""
+
+    def _iter_import_cost(self, timings: list[ImportTiming] | None = None) -> Iterator[str]:
+        if timings is None:
+            timings = measure_import_time(self.package_name, src_root=self.src_root)
+        analysis = ImportCostAnalysis(
+            timings, self.package_name, self.dependency_graph, self.call_graph
+        )
+        yield from self._header(f"# Import Cost — {self.package_name}")
+        yield ""
+        yield from analysis.iter_report()
+        yield ""
+
+    def _iter_symbol_index(self) -> Iterator[str]:
+        """Yield the lines of the symbol index."""
+        yield from self._header("# Symbol Index")
+        yield from [
             "",
             "## Classes",
             "",
@@ -469,59 +738,48 @@ class CodeMapGenerator:
             "|-------|------|------|-------------|",
         ]
 
-        classes = [s for s in self.symbols if s.symbol_type == "class" and s.is_public]
+        index = self.index
+        classes = [s for s in index.of_types(CLASS_TYPES) if s.is_public]
         classes.sort(key=lambda x: (x.file_path, x.name))
 
         for cls in classes:
             doc = (cls.docstring or "").split("\n")[0][:60] if cls.docstring else "-"
-            lines.append(
+            yield (
                 f"| `{cls.name}` | [{cls.file_path}]({cls.file_path}#L{cls.line_number})"
                 f" | {cls.line_number} | {doc} |"
             )
 
-        lines.extend(
-            [
-                "",
-                "## Functions",
-                "",
-                "| Function | File | Line | Description |",
-                "|----------|------|------|-------------|",
-            ]
-        )
-
-        functions = [
-            s
-            for s in self.symbols
-            if s.symbol_type in ("function", "async_function") and s.is_public
+        yield from [
+            "",
+            "## Functions",
+            "",
+            "| Function | File | Line | Description |",
+            "|----------|------|------|-------------|",
         ]
+
+        functions = [s for s in index.of_types(FUNCTION_TYPES) if s.is_public]
         functions.sort(key=lambda x: (x.file_path, x.name))
 
         for func in functions:
             doc = (func.docstring or "").split("\n")[0][:60] if func.docstring else "-"
             func_type = "async " if "async" in func.symbol_type else ""
-            lines.append(
+            yield (
                 f"| `{func_type}{func.name}` "
                 f"| [{func.file_path}]({func.file_path}"
                 f"#L{func.line_number})"
                 f" | {func.line_number} | {doc} |"
             )
 
-        lines.extend(
-            [
-                "",
-                "## Key Methods (Public)",
-                "",
-                "| Class.Method | File | Line | Description |",
-                "|--------------|------|------|-------------|",
-            ]
-        )
+        yield from [
+            "",
+            "## Key Methods (Public)",
+            "",
+            "| Class.Method | File | Line | Description |",
+            "|--------------|------|------|-------------|",
+        ]
 
         methods = [
-            s
-            for s in self.symbols
-            if s.symbol_type in ("method", "async_method")
-            and s.is_public
-            and s.parent_class
+            s for s in index.of_types(METHOD_TYPES) if s.is_public and s.parent_class
         ]
         methods.sort(key=lambda x: (x.file_path, x.parent_class or "", x.name))
 
@@ -531,27 +789,24 @@ class CodeMapGenerator:
                 if method.docstring
                 else "-"
             )
-            lines.append(
+            yield (
                 f"| `{method.parent_class}.{method.name}` "
                 f"| [{method.file_path}]({method.file_path}#L{method.line_number})"
                 f" | {method.line_number} | {doc} |"
             )
 
         if len(methods) > 100:
-            lines.append(
+            yield (
                 f"| ... | ... | ... | _{len(methods) - 100} more methods not shown_ |"
             )
 
-        return "\n".join(lines)
+        if self.profile is not None:
+            yield from self.profile.iter_symbol_section()
 
-    def generate_dependency_graph(self) -> str:  # pylint: disable=too-many-locals
-        """Generate the dependency graph markdown."""
-        lines = [
-            "# Dependency Graph",
-            "",
-            (f"> Auto-generated by `codemap_generator`"
-             f" on {datetime.now().strftime('%Y-%m-%d %H:%M')}"),
-            "> **Do not edit manually** — regenerate with `codemap-generator`",
+    def _iter_dependency_graph(self) -> Iterator[str]:  # pylint: disable=too-many-locals
+        """Yield the lines of the dependency graph."""
+        yield from self._header("# Dependency Graph")
+        yield from [
             "",
             "## Internal Dependencies",
             "",
@@ -559,44 +814,17 @@ class CodeMapGenerator:
             "",
         ]
 
-        # Group imports by source file
-        internal_deps: dict[str, set[str]] = defaultdict(set)
-        for imp in self.imports:
-            if self.package_name in imp.module:
-                source_module = (
-                    imp.file_path.replace("/", ".")
-                    .replace("\\", ".")
-                    .replace(".py", "")
-                )
-                internal_deps[source_module].add(imp.module)
-
-        if internal_deps:
-            lines.append("```mermaid")
-            lines.append("graph TD")
-            seen_edges: set[str] = set()
-            for source, targets in sorted(internal_deps.items()):
-                source_short = source.split(".")[-1] if "." in source else source
-                for target in sorted(targets):
-                    target_short = target.split(".")[-1] if "." in target else target
-                    edge = f"{source_short}-->{target_short}"
-                    if edge not in seen_edges and source_short != target_short:
-                        lines.append(f"    {source_short} --> {target_short}")
-                        seen_edges.add(edge)
-            lines.append("```")
-        else:
-            lines.append("_No internal dependencies detected._")
+        yield from self._iter_internal_dependencies()
 
-        lines.extend(
-            [
-                "",
-                "## External Dependencies",
-                "",
-                "Third-party packages used:",
-                "",
-                "| Package | Used In | Import Type |",
-                "|---------|---------|-------------|",
-            ]
-        )
+        yield from [
+            "",
+            "## External Dependencies",
+            "",
+            "Third-party packages used:",
+            "",
+            "| Package | Used In | Import Type |",
+            "|---------|---------|-------------|",
+        ]
 
         # Use sys.stdlib_module_names (Python 3.10+) for robust stdlib detection
         stdlib_modules = getattr(sys, "stdlib_module_names", set())
@@ -604,7 +832,8 @@ class CodeMapGenerator:
         external_deps: dict[str, list[str]] = defaultdict(list)
         for imp in self.imports:
             if (
-                not imp.module.startswith(self.package_name)
+                not imp.level
+                and not imp.module.startswith(self.package_name)
                 and imp.module
                 and not imp.module.startswith((".", "__"))
             ):
@@ -617,18 +846,62 @@ class CodeMapGenerator:
             files_str = ", ".join(unique_files)
             if len(set(files)) > 3:
                 files_str += f" (+{len(set(files)) - 3} more)"
-            lines.append(f"| `{pkg}` | {files_str} | from import |")
+            yield f"| `{pkg}` | {files_str} | from import |"
 
-        return "\n".join(lines)
+    def _iter_internal_dependencies(self) -> Iterator[str]:  # pylint: disable=too-many-locals
+        """Yield the internal import diagram plus cycle and weight tables."""
+        graph = self.dependency_graph
+        if not graph.edge_count and not graph.deferred_edges:
+            yield "_No internal dependencies detected._"
+            return
 
-    def generate_entry_points(self) -> str:
-        """Generate the entry points markdown."""
-        lines = [
-            "# Entry Points",
-            "",
-            (f"> Auto-generated by `codemap_generator`"
-             f" on {datetime.now().strftime('%Y-%m-%d %H:%M')}"),
-            "> **Do not edit manually** — regenerate with `codemap-generator`",
+        condensed = condense(
+            graph.modules,
+            graph.edges(),
+            graph.deferred_edges,
+            node_budget=self.node_budget,
+            edge_budget=MAX_DIAGRAM_EDGES,
+        )
+        yield from iter_mermaid(condensed, id_prefix="m")
+        if any(edge.soft for edge in condensed.edges):
+            yield ""
+            yield "Dotted arrows are deferred imports (inside functions or `TYPE_CHECKING`)."
+        yield from self._iter_condensed_note(condensed, len(graph), "modules")
+
+        yield from ["", "## Import Cycles", ""]
+        cycles = graph.cycles()
+        if cycles:
+            yield from ["| Modules | Example Cycle |", "|---------|---------------|"]
+            for members in cycles[:MAX_REPORT_ROWS]:
+                path = graph.cycle_path(members[0]) or members
+                yield f"| {len(members)} | {' → '.join(f'`{m}`' for m in path)} |"
+        else:
+            yield "_No import cycles detected._"
+
+        heaviest = graph.heaviest(top=MAX_REPORT_ROWS)
+        if heaviest:
+            yield from [
+                "",
+                "## Heaviest Imports",
+                "",
+                "Modules that pull in the most internal modules at import time:",
+                "",
+                "| Module | Modules Pulled In | Direct Imports |",
+                "|--------|-------------------|----------------|",
+            ]
+            for module, size in heaviest:
+                yield f"| `{module}` | {size} | {len(graph.imports_of(module))} |"
+
+        chains = graph.longest_chains(top=5)
+        if chains:
+            yield from ["", "## Longest Import Chains", ""]
+            for chain in chains:
+                yield f"- {' → '.join(f'`{m}`' for m in chain)} ({len(chain)} modules)"
+
+    def _iter_entry_points(self) -> Iterator[str]:
+        """Yield the lines of the entry points document."""
+        yield from self._header("# Entry Points")
+        yield from [
             "",
             "## CLI Scripts",
             "",
@@ -639,49 +912,42 @@ class CodeMapGenerator:
         ]
 
         for ep in self.entry_points:
-            lines.append(
+            yield (
                 f"| [{ep.file_path}]({ep.file_path}) | {ep.entry_type}"
                 f" | {ep.description or '-'} |"
             )
 
-        lines.extend(
-            [
-                "",
-                "## Main Blocks",
-                "",
-                "Files with `if __name__ == '__main__':` blocks:",
-                "",
-            ]
-        )
+        yield from [
+            "",
+            "## Main Blocks",
+            "",
+            "Files with `if __name__ == '__main__':` blocks:",
+            "",
+        ]
 
         main_blocks = [ep for ep in self.entry_points if ep.entry_type == "main_block"]
         for ep in main_blocks:
-            lines.append(f"- [{ep.file_path}]({ep.file_path})")
+            yield f"- [{ep.file_path}]({ep.file_path})"
 
-        return "\n".join(lines)
-
-    def generate_module_summaries(self) -> str:  # pylint: disable=too-many-locals
-        """Generate module summaries from docstrings."""
-        lines = [
-            "# Module Summaries",
-            "",
-            (f"> Auto-generated by `codemap_generator`"
-             f" on {datetime.now().strftime('%Y-%m-%d %H:%M')}"),
-            "> **Do not edit manually** — regenerate with `codemap-generator`",
+    def _iter_module_summaries(self) -> Iterator[str]:  # pylint: disable=too-many-locals
+        """Yield the lines of the module summaries."""
+        yield from self._header("# Module Summaries")
+        yield from [
             "",
             "## Package Structure",
             "",
         ]
 
         # Group files by directory
-        files_by_dir: dict[str, list[tuple[str, str]]] = defaultdict(list)
-        for sym in self.symbols:
-            if sym.symbol_type == "class" or (
-                sym.symbol_type == "function" and sym.is_public
+        index = self.index
+        files_by_dir: dict[str, set[tuple[str, str]]] = defaultdict(set)
+        for file_path, file_symbols in index.by_file.items():
+            if any(
+                s.symbol_type == "class" or (s.symbol_type == "function" and s.is_public)
+                for s in file_symbols
             ):
-                dir_path = "/".join(sym.file_path.split("/")[:-1])
-                file_name = sym.file_path.split("/")[-1]
-                files_by_dir[dir_path].append((file_name, sym.file_path))
+                dir_path, _, file_name = file_path.rpartition("/")
+                files_by_dir[dir_path].add((file_name, file_path))
 
         # Also include modules with docstrings
         for module, docstring in self.module_docstrings.items():
@@ -690,18 +956,17 @@ class CodeMapGenerator:
                 dir_path = "/".join(parts[:-1])
                 file_name = parts[-1] + ".py"
                 full_path = module.replace(".", "/") + ".py"
-                if (file_name, full_path) not in files_by_dir[dir_path]:
-                    files_by_dir[dir_path].append((file_name, full_path))
+                files_by_dir[dir_path].add((file_name, full_path))
 
         for dir_path in sorted(files_by_dir.keys()):
             if not dir_path:
                 continue
-            lines.append(f"### `{dir_path}/`")
-            lines.append("")
+            yield f"### `{dir_path}/`"
+            yield ""
 
             # Get unique files
             seen_files: set[str] = set()
-            for file_name, full_path in sorted(set(files_by_dir[dir_path])):
+            for file_name, full_path in sorted(files_by_dir[dir_path]):
                 if file_name in seen_files:
                     continue
                 seen_files.add(file_name)
@@ -712,21 +977,8 @@ class CodeMapGenerator:
                 summary = docstring.split("\n")[0][:80] if docstring else ""
 
                 # Count symbols in this file
-                class_count = len(
-                    [
-                        s
-                        for s in self.symbols
-                        if s.file_path == full_path and s.symbol_type == "class"
-                    ]
-                )
-                func_count = len(
-                    [
-                        s
-                        for s in self.symbols
-                        if s.file_path == full_path
-                        and s.symbol_type in ("function", "async_function")
-                    ]
-                )
+                class_count = index.count(full_path, CLASS_TYPES)
+                func_count = index.count(full_path, FUNCTION_TYPES)
 
                 symbol_info = []
                 if class_count:
@@ -740,22 +992,16 @@ class CodeMapGenerator:
 
                 symbol_str = f" ({', '.join(symbol_info)})" if symbol_info else ""
 
-                lines.append(f"- **[{file_name}]({full_path})**{symbol_str}")
+                yield f"- **[{file_name}]({full_path})**{symbol_str}"
                 if summary:
-                    lines.append(f"  - {summary}")
+                    yield f"  - {summary}"
 
-            lines.append("")
+            yield ""
 
-        return "\n".join(lines)
-
-    def generate_call_graph(self) -> str:
-        """Generate approximate call graph."""
-        lines = [
-            "# Call Graph (Approximate)",
-            "",
-            (f"> Auto-generated by `codemap_generator`"
-             f" on {datetime.now().strftime('%Y-%m-%d %H:%M')}"),
-            "> **Do not edit manually** — regenerate with `codemap-generator`",
+    def _iter_call_graph(self) -> Iterator[str]:
+        """Yield the lines of the approximate call graph."""
+        yield from self._header("# Call Graph (Approximate)")
+        yield from [
             "",
             "Warning: This is a static analysis approximation."
             " Dynamic calls and indirect references are not captured.",
@@ -764,53 +1010,47 @@ class CodeMapGenerator:
             "",
         ]
 
-        # Group calls by caller
-        calls_by_caller: dict[str, set[str]] = defaultdict(set)
-        for call in self.calls:
-            calls_by_caller[call.caller].add(call.callee)
-
-        # Filter to interesting calls (class methods calling other methods)
-        interesting_callers = [c for c in calls_by_caller if "." in c]
-
-        if interesting_callers:
-            lines.append("```mermaid")
-            lines.append("graph LR")
-
-            seen_edges: set[str] = set()
-            edge_count = 0
-            for caller in sorted(interesting_callers):
-                if edge_count > 50:  # Limit graph size
-                    break
-                callees = calls_by_caller[caller]
-                caller_short = caller.split(".")[-1] if "." in caller else caller
-                for callee in sorted(callees):
-                    edge = f"{caller_short}-->{callee}"
-                    if edge not in seen_edges and caller_short != callee:
-                        lines.append(f"    {caller_short} --> {callee}")
-                        seen_edges.add(edge)
-                        edge_count += 1
-
-            lines.append("```")
-
-            if edge_count >= 50:
-                lines.append("")
-                lines.append(
-                    f"_Graph truncated at 50 edges."
-                    f" Total edges: {sum(len(v) for v in calls_by_caller.values())}_"
-                )
+        # Resolved calls between functions and methods defined in the package
+        calls = self.call_graph.edges(internal=True)
+        if calls:
+            callers = {caller for caller, _ in calls}
+            condensed = condense(
+                callers,
+                calls,
+                node_budget=self.node_budget,
+                edge_budget=MAX_DIAGRAM_EDGES,
+            )
+            yield from iter_mermaid(condensed, direction="LR", id_prefix="c")
+            yield from self._iter_condensed_note(
+                condensed, len(callers | {callee for _, callee in calls}), "functions"
+            )
         else:
-            lines.append("_No significant call relationships detected._")
-
-        return "\n".join(lines)
+            yield "_No significant call relationships detected._"
+
+        if self.profile is not None:
+            yield from self.profile.iter_call_graph_section(self.call_graph)
+
+    @staticmethod
+    def _iter_condensed_note(condensed: CondensedGraph, total: int, noun: str) -> Iterator[str]:
+        """Explain how a diagram was condensed or truncated, if it was."""
+        if condensed.steps:
+            yield ""
+            yield (
+                f"_Condensed from {total} {noun} to {len(condensed.nodes)} nodes"
+                f" ({'; '.join(condensed.steps)}). Counts in node labels are merged"
+                " names; edge labels count the merged edges._"
+            )
+        if condensed.truncated:
+            yield ""
+            yield (
+                f"_Diagram shows the {len(condensed.edges)} heaviest"
+                f" of {condensed.edge_total} edges._"
+            )
 
-    def generate_combined_code_map(self) -> str:
-        """Generate the combined code map with all sections."""
-        lines = [
-            f"# Code Map — {self.package_name}",
-            "",
-            (f"> Auto-generated by `codemap_generator`"
-             f" on {datetime.now().strftime('%Y-%m-%d %H:%M')}"),
-            "> **Do not edit manually** — regenerate with `codemap-generator`",
+    def _iter_combined_code_map(self) -> Iterator[str]:
+        """Yield the lines of the combined code map."""
+        yield from self._header(f"# Code Map — {self.package_name}")
+        yield from [
             "",
             "This document provides a machine-generated overview of the codebase structure.",
             "",
@@ -819,169 +1059,227 @@ class CodeMapGenerator:
         ]
 
         # Statistics
-        class_count = len([s for s in self.symbols if s.symbol_type == "class"])
-        func_count = len(
-            [
-                s
-                for s in self.symbols
-                if s.symbol_type in ("function", "async_function")
-            ]
-        )
-        method_count = len(
-            [s for s in self.symbols if s.symbol_type in ("method", "async_method")]
-        )
-        file_count = len(set(s.file_path for s in self.symbols))
-
-        lines.extend(
-            [
-                "## Quick Stats",
-                "",
-                f"- **Files analyzed**: {file_count}",
-                f"- **Classes**: {class_count}",
-                f"- **Functions**: {func_count}",
-                f"- **Methods**: {method_count}",
-                f"- **Entry points**: {len(self.entry_points)}",
-                "",
-                "---",
-                "",
-            ]
-        )
+        index = self.index
+        class_count = index.count_all(CLASS_TYPES)
+        func_count = index.count_all(FUNCTION_TYPES)
+        method_count = index.count_all(METHOD_TYPES)
+        file_count = len(index.by_file)
+
+        yield from [
+            "## Quick Stats",
+            "",
+            f"- **Files analyzed**: {file_count}",
+            f"- **Classes**: {class_count}",
+            f"- **Functions**: {func_count}",
+            f"- **Methods**: {method_count}",
+            f"- **Entry points**: {len(self.entry_points)}",
+        ]
+        if self.skipped_files:
+            yield f"- **Files skipped**: {len(self.skipped_files)} (resource limits)"
+            yield from ["", "### Skipped Files", "", "| File | Reason |", "|------|--------|"]
+            for path, reason in sorted(self.skipped_files.items()):
+                yield f"| `{path}` | {reason} |"
+        yield from ["", "---", ""]
 
         # Entry points (most important for agents)
-        lines.append(self.generate_entry_points())
-        lines.extend(["", "---", ""])
+        yield from self._iter_entry_points()
+        yield from ["", "---", ""]
 
         # Module summaries
-        lines.append(self.generate_module_summaries())
-        lines.extend(["", "---", ""])
+        yield from self._iter_module_summaries()
+        yield from ["", "---", ""]
 
         # Symbol index (abbreviated for combined view)
-        lines.extend(
-            [
-                "## Symbol Index (Key Classes)",
-                "",
-                "| Class | File | Description |",
-                "|-------|------|-------------|",
-            ]
-        )
+        yield from [
+            "## Symbol Index (Key Classes)",
+            "",
+            "| Class | File | Description |",
+            "|-------|------|-------------|",
+        ]
 
-        classes = [s for s in self.symbols if s.symbol_type == "class" and s.is_public]
+        classes = [s for s in index.of_types(CLASS_TYPES) if s.is_public]
         classes.sort(key=lambda x: x.name)
 
         for cls in classes[:30]:
             doc = (cls.docstring or "").split("\n")[0][:50] if cls.docstring else "-"
-            lines.append(
+            yield (
                 f"| `{cls.name}` | [{cls.file_path}]({cls.file_path}#L{cls.line_number}) | {doc} |"
             )
 
         if len(classes) > 30:
-            lines.append(
+            yield (
                 f"| ... | ... | _{len(classes) - 30} more classes"
                 f" in [symbol-index.md](symbol-index.md)_ |"
             )
 
-        lines.extend(["", "---", ""])
+        yield from ["", "---", ""]
 
         # Dependency graph (abbreviated)
-        lines.extend(
-            [
-                "## Internal Dependencies",
-                "",
-                "See [dependency-graph.md](dependency-graph.md) for full dependency analysis.",
-                "",
-            ]
-        )
-
-        return "\n".join(lines)
+        yield from [
+            "## Internal Dependencies",
+            "",
+            "See [dependency-graph.md](dependency-graph.md) for full dependency analysis.",
+            "",
+        ]
 
-    def write_outputs(self, output_dir: Path) -> list[Path]:
-        """Write all generated files to the output directory."""
+    def write_outputs(
+        self, output_dir: Path, only: Container[str] | None = None
+    ) -> list[Path]:
+        """Write all generated files to the output directory.
+
+        Each document is streamed line by line into a temporary file next to
+        its destination and only moved into place when its content differs
+        from the existing file, so unchanged outputs keep their mtime and do
+        not trigger downstream rebuilds.
+
+        Args:
+            output_dir: Directory to write to.
+            only: Report names (see :attr:`OUTPUTS`) to render; the other
+                files are left as they are and count as unchanged.
+
+        Returns:
+            All output paths, written or unchanged.  The split is recorded
+            in :attr:`files_changed` and :attr:`files_unchanged`.
+        """
         output_dir.mkdir(parents=True, exist_ok=True)
 
         files_written: list[Path] = []
-
-        outputs = [
-            ("code-map.md", self.generate_combined_code_map()),
-            ("symbol-index.md", self.generate_symbol_index()),
-            ("dependency-graph.md", self.generate_dependency_graph()),
-            ("entry-points.md", self.generate_entry_points()),
-            ("module-summaries.md", self.generate_module_summaries()),
-            ("call-graph.md", self.generate_call_graph()),
-        ]
-
-        for filename, content in outputs:
+        self.files_changed = []
+        self.files_unchanged = []
+        if self.timer is not None:
+            # Built lazily by the first report that needs them otherwise.
+            with self._phase("build call graph"):
+                _ = self.call_graph
+            with self._phase("build dependency graph"):
+                _ = self.dependency_graph
+
+        for filename, method_name in self.OUTPUTS:
             file_path = output_dir / filename
-            file_path.write_text(content, encoding="utf-8")
+            if only is not None and method_name not in only and file_path.is_file():
+                self.files_unchanged.append(file_path)
+                files_written.append(file_path)
+                continue
+            lines: Iterable[str] = getattr(self, f"_iter_{method_name}")()
+            if self.timer is not None:  # render up front to time it apart from writing
+                with self._phase(f"render {filename}"):
+                    lines = list(lines)
+            with self._phase("write files"):
+                written = write_if_changed(file_path, lines)
+            if written:
+                self.files_changed.append(file_path)
+                print(f"  Generated {file_path}")
+            else:
+                self.files_unchanged.append(file_path)
+                print(f"  Unchanged {file_path}")
             files_written.append(file_path)
-            print(f"  Generated {file_path}")
 
         return files_written
 
+    #: Optional report name → output file name, written by :meth:`write_report`.
+    EXTRA_OUTPUTS: dict[str, str] = {
+        "import_cost": IMPORT_COST_FILE_NAME,
+        "perf_findings": perflint.PERF_FINDINGS_FILE_NAME,
+        "async_blocking": asyncblock.ASYNC_BLOCKING_FILE_NAME,
+        "import_weight": sideeffects.IMPORT_WEIGHT_FILE_NAME,
+        "api_diff": gitrev.API_DIFF_FILE_NAME,
+    }
+
+    def write_report(self, output_dir: Path, name: str, **options: Any) -> Path:
+        """Write one optional report (see :attr:`EXTRA_OUTPUTS`) if its content changed.
+
+        *options* are passed to ``generate_<name>``, e.g.
+        ``write_report(out, "async_blocking", blocking_apis=[...])``.  The
+        report is fully built before the file is touched, so a failed
+        measurement (``import_cost`` raises :class:`RuntimeError`) leaves
+        any previous report in place.
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        file_path = output_dir / self.EXTRA_OUTPUTS[name]
+        with self._phase(f"render {file_path.name}"):
+            lines = list(getattr(self, f"_iter_{name}")(**options))
+        with self._phase("write files"):
+            written = write_if_changed(file_path, lines)
+        if written:
+            print(f"  Generated {file_path}")
+        else:
+            print(f"  Unchanged {file_path}")
+        return file_path
+
+    def write_shards(self, output_dir: Path) -> list[Path]:
+        """Write one document per (sub)package plus a top-level index.
+
+        Shards whose source fingerprint matches the previous run's manifest
+        are not re-rendered; the rest are rendered (across the worker pool
+        when ``workers`` allows) and written only if their content changed.
+        Shard documents for packages that no longer exist are removed.
+
+        See :mod:`dev_tools.codemap_generator.shards` for the layout.
+
+        Returns:
+            The index path followed by every shard path.
+        """
+        shard_dir = output_dir / SHARD_DIR_NAME
+        shard_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._phase("build shards"):
+            shards = build_shards(self)
+        previous = load_manifest(shard_dir)
+        stale = [
+            shard for shard in shards
+            if previous.get(shard.name) != shard.fingerprint
+            or not (shard_dir / shard.file_name).is_file()
+        ]
+        with self._phase("render shards"):
+            rendered = dict(
+                zip((shard.name for shard in stale), self._map(render_shard, stale))
+            )
+        self.shards_rendered = len(stale)
+        self.files_changed = []
+        self.files_unchanged = []
+
+        index_path = output_dir / INDEX_FILE_NAME
+        files_written = [index_path]
+        if write_if_changed(index_path, [render_index(self, shards)]):
+            self.files_changed.append(index_path)
+            print(f"  Generated {index_path}")
+        else:
+            self.files_unchanged.append(index_path)
 
-def main() -> None:
-    """Main entry point for the codemap generator CLI."""
-    parser = argparse.ArgumentParser(
-        description="Generate code map documentation for a Python package",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""\
-Examples:
-    codemap-generator --package my_package
-    codemap-generator --package my_package --output-dir docs/generated
-    python -m dev_tools.codemap_generator --package my_package
-
-Output files:
-    code-map.md         Combined overview
-    symbol-index.md     All classes and functions
-    dependency-graph.md Import relationships
-    entry-points.md     CLI scripts and main blocks
-    module-summaries.md Per-module descriptions
-    call-graph.md       Approximate call relationships
-""",
-    )
-    parser.add_argument(
-        "--output-dir",
-        type=Path,
-        default=Path("docs/ai-context/generated"),
-        help="Output directory for generated files (default: docs/ai-context/generated)",
-    )
-    parser.add_argument(
-        "--src-root",
-        type=Path,
-        default=Path("src"),
-        help="Source root directory (default: src)",
-    )
-    parser.add_argument(
-        "--package",
-        type=str,
-        required=True,
-        help="Package name to analyze (e.g. my_package)",
-    )
-
-    args = parser.parse_args()
-
-    print("Code Map Generator")
-    print(f"   Source: {args.src_root}/{args.package}")
-    print(f"   Output: {args.output_dir}")
-    print()
-
-    generator = CodeMapGenerator(args.src_root, args.package)
-
-    print("Analyzing codebase...")
-    generator.analyze()
-
-    print(f"   Found {len(generator.symbols)} symbols")
-    print(f"   Found {len(generator.imports)} imports")
-    print(f"   Found {len(generator.entry_points)} entry points")
-    print(f"   Found {len(generator.calls)} call relationships")
-    print()
-
-    print("Generating documentation...")
-    files = generator.write_outputs(args.output_dir)
-    print()
+        for shard in shards:
+            file_path = shard_dir / shard.file_name
+            files_written.append(file_path)
+            if shard.name in rendered and write_if_changed(file_path, [rendered[shard.name]]):
+                self.files_changed.append(file_path)
+                print(f"  Generated {file_path}")
+            else:
+                self.files_unchanged.append(file_path)
+
+        current = {shard.file_name for shard in shards}
+        for old in shard_dir.glob("*.md"):
+            if old.name not in current:
+                old.unlink()
+        save_manifest(shard_dir, {shard.name: shard.fingerprint for shard in shards})
+
+        if self.files_unchanged:
+            print(f"  {len(self.files_unchanged)} files unchanged")
+        return files_written
 
-    print(f"Done! Generated {len(files)} files in {args.output_dir}")
-    print()
-    print("Next steps:")
-    print("  1. Review generated files for accuracy")
-    print("  2. Add human context where marked with placeholders")
-    print("  3. Commit the generated documentation")
+    def write_database(self, db_path: Path) -> Path:
+        """Persist the analysis results into an indexed SQLite database.
+
+        See :class:`~dev_tools.codemap_generator.store.SymbolStore` for the
+        query API.
+        """
+        with self._phase("write database"), SymbolStore(db_path) as store:
+            store.write(self)
+        return db_path
+
+    def write_export(self, export_path: Path) -> Path:
+        """Write the analysis results as a compact, memory-mappable export.
+
+        See :mod:`~dev_tools.codemap_generator.export` for the format and
+        :class:`~dev_tools.codemap_generator.export.CodeMapExport` for the
+        lazy loader.
+        """
+        with self._phase("write export"):
+            return export.write_export(self, export_path)
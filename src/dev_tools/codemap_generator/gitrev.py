@@ -0,0 +1,295 @@
+"""
+Code map analysis of a git revision, and API diffs between revisions.
+
+:class:`RevisionSource` reads a package straight from the object database,
+without a checkout: ``git ls-tree`` lists the package's ``*.py`` blobs and
+a single ``git cat-file --batch`` process streams their contents, which go
+to :func:`~dev_tools.codemap_generator.extractor.extract_file` as bytes.
+Blob ids are content hashes, so extraction results can be reused by
+``(path, blob id)`` — across the two sides of a diff in memory, and across
+runs through the :class:`~dev_tools.codemap_generator.cache.ExtractionCache`
+— and only blobs that are new to the cache are read at all.
+
+:func:`api_diff` compares the public symbols of two analyses: symbols
+added, removed, or whose signature (kind, parameters of every kind and
+which of them have defaults, ``async``, ``property``/``staticmethod``/
+``classmethod``) changed.
+
+Usage::
+
+    gen = CodeMapGenerator(Path("src"), "my_package", revision="v2.0")
+    gen.analyze()
+    changes = gen.api_diff("v1.0")
+"""
+
+import subprocess
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Optional
+
+from dev_tools.codemap_generator.extractor import module_name_for
+from dev_tools.codemap_generator.index import CLASS_TYPES
+from dev_tools.codemap_generator.models import SymbolInfo
+
+#: Output file name of the API diff report.
+API_DIFF_FILE_NAME = "api-diff.md"
+
+#: Decorators that change how a function is called, shown in signatures.
+SIGNATURE_DECORATORS = ("property", "staticmethod", "classmethod")
+
+_SYMLINK_MODE = "120000"
+
+
+class GitError(RuntimeError):
+    """A git command failed (not a repository, unknown revision, ...)."""
+
+
+def run_git(repo: Path, *args: str) -> bytes:
+    """Run ``git -C <repo> <args>`` and return its stdout.
+
+    Raises:
+        GitError: If git is missing or exits with an error.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo), *args], capture_output=True, check=False
+        )
+    except OSError as exc:
+        raise GitError(f"cannot run git: {exc}") from exc
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise GitError(message[-1] if message else f"git {args[0]} failed")
+    return result.stdout
+
+
+def repo_root(path: Path) -> Path:
+    """Top-level directory of the repository containing *path* (which need not exist)."""
+    existing = path.resolve()
+    while not existing.is_dir() and existing != existing.parent:
+        existing = existing.parent
+    return Path(run_git(existing, "rev-parse", "--show-toplevel").decode().strip())
+
+
+class BlobReader:
+    """One ``git cat-file --batch`` process for reading many objects.
+
+    Use as a context manager.  Requests are written from a helper thread
+    while responses are read, so the pipes never fill up and deadlock.
+    """
+
+    def __init__(self, repo: Path) -> None:
+        self._process = subprocess.Popen(  # pylint: disable=consider-using-with
+            ["git", "-C", str(repo), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def __enter__(self) -> "BlobReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the git process."""
+        for stream in (self._process.stdin, self._process.stdout):
+            if stream is not None and not stream.closed:
+                stream.close()
+        self._process.wait()
+
+    def read_many(self, names: Iterable[str]) -> Iterator[Optional[bytes]]:
+        """Yield the content of each object (blob id or ``rev:path``), in order.
+
+        ``None`` is yielded for objects that do not exist.
+        """
+        names = list(names)
+        stdin, stdout = self._process.stdin, self._process.stdout
+        assert stdin is not None and stdout is not None
+        writer = threading.Thread(target=_write_requests, args=(stdin, names), daemon=True)
+        writer.start()
+        try:
+            for _ in names:
+                header = stdout.readline()
+                if not header:
+                    raise GitError("git cat-file exited early")
+                fields = header.split()
+                if len(fields) != 3 or fields[1] == b"missing":
+                    yield None
+                    continue
+                size = int(fields[2])
+                yield stdout.read(size)
+                stdout.read(1)  # the newline after the content
+        finally:
+            writer.join()
+
+
+def _write_requests(stdin: IO[bytes], names: list[str]) -> None:
+    for name in names:
+        stdin.write(f"{name}\n".encode("utf-8"))
+    stdin.flush()
+
+
+class RevisionSource:
+    """The Python files of one package at a git revision.
+
+    Args:
+        src_root: Source root directory, as for the working tree.
+        package_name: Package directory under *src_root*.
+        revision: Any revision git understands (tag, branch, sha, ``HEAD~3``).
+
+    Attributes:
+        commit: Full commit id the revision resolved to.
+        prefix: Repository path of the recorded paths' base (the parent of
+            *src_root*), ``""`` when that is the repository root.
+
+    Raises:
+        GitError: If *src_root* is not in a repository or the revision is unknown.
+    """
+
+    def __init__(self, src_root: Path, package_name: str, revision: str) -> None:
+        self.revision = revision
+        self.package_name = package_name
+        self.repo = repo_root(src_root.parent)
+        base = src_root.parent.resolve().relative_to(self.repo).as_posix()
+        self.prefix = "" if base == "." else base
+        self.src_dir = src_root.name
+        try:
+            self.commit = run_git(
+                self.repo, "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}"
+            ).decode().strip()
+        except GitError as exc:
+            raise GitError(f"Unknown revision: {revision}") from exc
+
+    def repo_path(self, recorded: str) -> str:
+        """Repository path of a recorded path (relative to the parent of the src root)."""
+        return f"{self.prefix}/{recorded}" if self.prefix else recorded
+
+    def blobs(self) -> list[tuple[str, str]]:
+        """``(recorded path, blob id)`` of every ``*.py`` file in the package, sorted."""
+        package_dir = self.repo_path(f"{self.src_dir}/{self.package_name}")
+        output = run_git(
+            self.repo, "ls-tree", "-r", "-z", "--full-tree", self.commit, "--", f"{package_dir}/"
+        )
+        strip = f"{self.prefix}/" if self.prefix else ""
+        found = []
+        for entry in output.split(b"\0"):
+            if not entry:
+                continue
+            meta, _, path = entry.decode("utf-8", "surrogateescape").partition("\t")
+            mode, kind, blob_id = meta.split()
+            if kind == "blob" and mode != _SYMLINK_MODE and path.endswith(".py"):
+                found.append((path.removeprefix(strip), blob_id))
+        return sorted(found)
+
+    def reader(self) -> BlobReader:
+        """A :class:`BlobReader` on this repository."""
+        return BlobReader(self.repo)
+
+    def file_name(self, recorded: str) -> str:
+        """``cat-file`` object name of a recorded path at this revision."""
+        return f"{self.commit}:{self.repo_path(recorded)}"
+
+
+@dataclass
+class ApiChange:
+    """One public symbol that differs between two analyses."""
+
+    kind: str  # 'added', 'removed' or 'changed'
+    name: str  # qualified name
+    symbol_type: str  # in the newer analysis ('removed': the older)
+    file_path: str
+    line_number: int
+    old_signature: Optional[str] = None
+    new_signature: Optional[str] = None
+
+
+def signature(sym: SymbolInfo) -> str:
+    """Comparable signature text: ``async def run(a, /, b=..., *, c)``, ``@property def size()``."""
+    if sym.symbol_type in CLASS_TYPES:
+        return f"class {sym.name}"
+    decorators = "".join(f"@{d} " for d in sym.decorators if d in SIGNATURE_DECORATORS)
+    prefix = "async def" if sym.symbol_type.startswith("async") else "def"
+    return f"{decorators}{prefix} {sym.name}({sym.signature})"
+
+
+def _is_private_module(module: str) -> bool:
+    return any(
+        part.startswith("_") and not part.endswith("__") for part in module.split(".")
+    )
+
+
+def public_api(symbols: Iterable[SymbolInfo], src_dir: str = "") -> dict[str, SymbolInfo]:
+    """Public symbols by qualified name (private modules and classes excluded)."""
+    api: dict[str, SymbolInfo] = {}
+    for sym in symbols:
+        module = module_name_for(sym.file_path, src_dir)
+        if not sym.is_public or _is_private_module(module):
+            continue
+        if sym.parent_class and sym.parent_class.startswith("_"):
+            continue
+        owner = f"{module}.{sym.parent_class}" if sym.parent_class else module
+        api.setdefault(f"{owner}.{sym.name}", sym)
+    return api
+
+
+def api_diff(
+    old: Iterable[SymbolInfo], new: Iterable[SymbolInfo], src_dir: str = ""
+) -> list[ApiChange]:
+    """Public symbols added, removed or changed from *old* to *new*, sorted by name."""
+    before = public_api(old, src_dir)
+    after = public_api(new, src_dir)
+    changes = []
+    for name in sorted(before.keys() | after.keys()):
+        was, now = before.get(name), after.get(name)
+        if now is None:
+            assert was is not None
+            changes.append(ApiChange(
+                "removed", name, was.symbol_type, was.file_path, was.line_number,
+                old_signature=signature(was),
+            ))
+        elif was is None:
+            changes.append(ApiChange(
+                "added", name, now.symbol_type, now.file_path, now.line_number,
+                new_signature=signature(now),
+            ))
+        elif signature(was) != signature(now):
+            changes.append(ApiChange(
+                "changed", name, now.symbol_type, now.file_path, now.line_number,
+                signature(was), signature(now),
+            ))
+    return changes
+
+
+def iter_report(changes: list[ApiChange], base: str, head: str) -> Iterator[str]:
+    """Yield the markdown body of the API diff report (without a header)."""
+    by_kind = {
+        kind: [c for c in changes if c.kind == kind] for kind in ("added", "removed", "changed")
+    }
+    yield (
+        f"Public API from `{base}` to `{head}`: {len(by_kind['added'])} added,"
+        f" {len(by_kind['removed'])} removed, {len(by_kind['changed'])} changed."
+    )
+    for kind, found in by_kind.items():
+        if not found:
+            continue
+        yield from ["", f"## {kind.title()}", ""]
+        if kind == "changed":
+            yield "| Symbol | Location | Before | After |"
+            yield "|--------|----------|--------|-------|"
+        else:
+            yield "| Symbol | Location | Signature |"
+            yield "|--------|----------|-----------|"
+        for change in found:
+            line = change.line_number
+            location = f"[{change.file_path}:{line}]({change.file_path}#L{line})"
+            if kind == "changed":
+                yield (
+                    f"| `{change.name}` | {location}"
+                    f" | `{change.old_signature}` | `{change.new_signature}` |"
+                )
+            else:
+                text = change.new_signature if kind == "added" else change.old_signature
+                yield f"| `{change.name}` | {location} | `{text}` |"
@@ -0,0 +1,101 @@
+"""
+Integer graph primitives shared by the call and dependency graphs.
+
+Graphs are stored as compressed sparse rows: ``offsets`` (length
+``node_count + 1``) and ``targets``, both ``array('I')``; the successors
+of node ``n`` are ``targets[offsets[n]:offsets[n + 1]]``.  Edges are
+passed around packed into single ints (``src << 32 | dst``), which keeps
+edge sets small and sorts fast.
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import accumulate
+
+_LOW = 0xFFFFFFFF
+
+
+def pack_edge(src: int, dst: int) -> int:
+    """Pack an edge into one int."""
+    return src << 32 | dst
+
+
+def pack_csr(
+    edges: Iterable[int], node_count: int, reverse: bool = False
+) -> tuple[array, array]:
+    """Build ``(offsets, targets)`` rows from packed *edges*.
+
+    Rows are sorted by target id.  With *reverse*, rows hold predecessors.
+    """
+    if reverse:
+        keys = sorted((edge & _LOW) << 32 | edge >> 32 for edge in edges)
+    else:
+        keys = sorted(edges)
+    counts = [0] * (node_count + 1)
+    for key in keys:
+        counts[(key >> 32) + 1] += 1
+    return array("I", accumulate(counts)), array("I", (key & _LOW for key in keys))
+
+
+def strongly_connected_components(  # pylint: disable=too-many-locals
+    offsets: array, targets: array
+) -> list[list[int]]:
+    """Tarjan's algorithm, iterative so deep graphs cannot overflow the stack.
+
+    Returns:
+        Components in reverse topological order of the condensation: every
+        component comes after all components reachable from it.
+    """
+    node_count = len(offsets) - 1
+    index = [-1] * node_count
+    low = [0] * node_count
+    on_stack = bytearray(node_count)
+    stack: list[int] = []
+    components: list[list[int]] = []
+    counter = 0
+
+    for root in range(node_count):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, offsets[root])]
+        while work:
+            node, pos = work[-1]
+            if pos < offsets[node + 1]:
+                work[-1] = (node, pos + 1)
+                succ = targets[pos]
+                if index[succ] == -1:
+                    index[succ] = low[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack[succ] = 1
+                    work.append((succ, offsets[succ]))
+                elif on_stack[succ] and index[succ] < low[node]:
+                    low[node] = index[succ]
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Yield the indexes of the set bits of *bits*, lowest first."""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
@@ -0,0 +1,125 @@
+"""
+Per-file resource guards for code map extraction.
+
+One pathological file — an 80 MB generated module, a giant data literal —
+can make ``ast.parse`` use gigabytes of memory and minutes of CPU, stalling
+the whole :meth:`~dev_tools.codemap_generator.generator.CodeMapGenerator.analyze`
+run.  :func:`extract_guarded` checks a file's size before parsing it:
+
+* files above :attr:`ResourceLimits.max_file_size` are not read at all;
+* files above :attr:`ResourceLimits.isolate_size` are parsed in a child
+  process that is killed once :attr:`ResourceLimits.time_budget` runs out
+  (a crash or out-of-memory kill only loses that file);
+* everything else is parsed in-process, as before.
+
+Files that are not parsed come back as a
+:class:`~dev_tools.codemap_generator.models.FileAnalysis` with ``skipped``
+set to the reason; the generator lists them instead of failing.
+"""
+
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Optional
+
+from dev_tools.codemap_generator.extractor import extract_file, path_to_module
+from dev_tools.codemap_generator.models import FileAnalysis
+
+#: Files larger than this (bytes) are skipped.
+DEFAULT_MAX_FILE_SIZE = 8 * 1024 * 1024
+
+#: Files larger than this (bytes) are parsed in a separate process.
+DEFAULT_ISOLATE_SIZE = 1024 * 1024
+
+#: Seconds an isolated parse may take before it is abandoned.
+DEFAULT_TIME_BUDGET = 60.0
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """Size and time limits applied to each file (``None`` disables a limit)."""
+
+    max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE
+    isolate_size: Optional[int] = DEFAULT_ISOLATE_SIZE
+    time_budget: Optional[float] = DEFAULT_TIME_BUDGET  # isolated parses only
+
+    def size_reason(self, size: int) -> Optional[str]:
+        """Why a file of *size* bytes is skipped, or ``None`` if it is not."""
+        if self.max_file_size is not None and size > self.max_file_size:
+            return f"file too large ({size:,} bytes, limit {self.max_file_size:,})"
+        return None
+
+    def isolates(self, size: int) -> bool:
+        """Whether a file of *size* bytes is parsed in a separate process."""
+        return self.isolate_size is not None and size > self.isolate_size
+
+
+#: No limits: every file is parsed in-process.
+UNLIMITED = ResourceLimits(None, None, None)
+
+
+def skipped_analysis(file_path: Path, base_dir: Path, reason: str) -> FileAnalysis:
+    """The result recorded for a file that was not parsed."""
+    return FileAnalysis(
+        file_path=str(file_path.relative_to(base_dir)).replace("\\", "/"),
+        module_name=path_to_module(file_path, base_dir),
+        skipped=reason,
+    )
+
+
+def extract_guarded(
+    file_path: Path,
+    base_dir: Path,
+    data: Optional[bytes] = None,
+    limits: ResourceLimits = ResourceLimits(),
+) -> FileAnalysis:
+    """:func:`~dev_tools.codemap_generator.extractor.extract_file` within *limits*.
+
+    Arguments are as for ``extract_file``; the size comes from *data* when
+    given, else from the file system, so a skipped file is never read.
+    """
+    try:
+        size = len(data) if data is not None else file_path.stat().st_size
+    except OSError:
+        return extract_file(file_path, base_dir, data)
+    reason = limits.size_reason(size)
+    if reason is not None:
+        return skipped_analysis(file_path, base_dir, reason)
+    # Daemonic processes (multiprocessing.Pool workers) cannot start children.
+    if not limits.isolates(size) or multiprocessing.current_process().daemon:
+        return extract_file(file_path, base_dir, data)
+    return _extract_isolated(file_path, base_dir, data, limits.time_budget)
+
+
+def _extract_isolated(
+    file_path: Path, base_dir: Path, data: Optional[bytes], time_budget: Optional[float]
+) -> FileAnalysis:
+    """Parse in a child process, giving up after *time_budget* seconds."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_isolated_worker, args=(sender, file_path, base_dir, data), daemon=True
+    )
+    process.start()
+    sender.close()
+    try:
+        if receiver.poll(time_budget):
+            return receiver.recv()
+        reason = f"parse exceeded the {time_budget:g}s time budget"
+    except EOFError:
+        process.join()
+        reason = f"parse worker exited with code {process.exitcode}"
+    finally:
+        receiver.close()
+        process.kill()  # a no-op once the child has exited
+        process.join()
+    return skipped_analysis(file_path, base_dir, reason)
+
+
+def _isolated_worker(
+    sender: Connection, file_path: Path, base_dir: Path, data: Optional[bytes]
+) -> None:
+    try:
+        sender.send(extract_file(file_path, base_dir, data))
+    finally:
+        sender.close()
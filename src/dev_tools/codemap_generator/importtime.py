@@ -0,0 +1,329 @@
+"""
+Import-time cost analysis for the code map generator.
+
+Runs ``python -X importtime -c "import <package>"`` in a subprocess,
+parses the per-module self/cumulative timings from its stderr and maps
+them onto the package's :class:`~dev_tools.codemap_generator.depgraph.DependencyGraph`
+and :class:`~dev_tools.codemap_generator.callgraph.CallGraph` to report:
+
+* the dominant import chain (the heaviest child at every level),
+* the cost of every internal module, with its import-time closure size,
+* the heaviest third-party/stdlib packages and who first imports them,
+* lazy-import candidates: expensive imports made by package modules,
+  flagged when nothing at module level of the importer calls into them.
+
+Usage::
+
+    gen = CodeMapGenerator(Path("src"), "my_package")
+    gen.analyze()
+    timings = measure_import_time("my_package", src_root=Path("src"))
+    print(gen.generate_import_cost(timings))
+"""
+
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from dev_tools.codemap_generator.callgraph import CallGraph
+from dev_tools.codemap_generator.depgraph import DependencyGraph
+from dev_tools.codemap_generator.extractor import MODULE_CALLER
+
+#: Output file name of the import-time cost report.
+IMPORT_COST_FILE_NAME = "import-cost.md"
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+@dataclass
+class ImportTiming:
+    """One line of ``-X importtime`` output (times in microseconds)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    parent: Optional[str] = None  # module whose import triggered this one
+    children: list[str] = field(default_factory=list)
+
+
+@dataclass
+class LazyImportCandidate:
+    """An expensive import that could be deferred into the functions using it."""
+
+    importer: str
+    module: str
+    cumulative_us: int
+    share: float  # of the total import time
+    used_at_import: bool  # the importer calls into it at module level
+
+
+def parse_importtime(text: str) -> list[ImportTiming]:
+    """Parse ``-X importtime`` stderr into timings, in output order.
+
+    The output is a post-order tree: children are printed (one indent level
+    deeper) before the module that imported them.  Lines that are not
+    timing lines are ignored.
+    """
+    timings: list[ImportTiming] = []
+    pending: dict[int, list[ImportTiming]] = defaultdict(list)
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        depth = (len(match.group(3)) - 1) // 2
+        timing = ImportTiming(
+            module=match.group(4),
+            self_us=int(match.group(1)),
+            cumulative_us=int(match.group(2)),
+            depth=depth,
+        )
+        for child in pending.pop(depth + 1, ()):
+            child.parent = timing.module
+            timing.children.append(child.module)
+        pending[depth].append(timing)
+        timings.append(timing)
+    return timings
+
+
+def measure_import_time(
+    module: str,
+    *,
+    src_root: Optional[Path] = None,
+    python: Optional[str] = None,
+    runs: int = 3,
+    timeout: float = 120.0,
+) -> list[ImportTiming]:
+    """Import *module* in fresh interpreters and return its import timings.
+
+    Each of *runs* subprocesses imports the module once; the fastest time
+    seen for every module is kept, which filters out cold-cache noise (the
+    first run also writes bytecode caches).
+
+    Args:
+        module: Module to import, e.g. ``"my_package"``.
+        src_root: Prepended to ``PYTHONPATH`` so the package is importable.
+        python: Interpreter to use (default: the current one).
+        runs: Number of measured imports.
+        timeout: Per-run timeout in seconds.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    env = dict(os.environ)
+    if src_root is not None:
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (str(src_root), env.get("PYTHONPATH", "")) if p
+        )
+    command = [python or sys.executable, "-X", "importtime", "-c", f"import {module}"]
+
+    best: Optional[list[ImportTiming]] = None
+    for _ in range(max(1, runs)):
+        result = subprocess.run(
+            command, capture_output=True, text=True, env=env, timeout=timeout, check=False
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            raise RuntimeError(f"import {module} failed: {error[0]}")
+        timings = parse_importtime(result.stderr)
+        if best is None:
+            best = timings
+            continue
+        fastest = {t.module: t for t in timings}
+        for timing in best:
+            other = fastest.get(timing.module)
+            if other is not None:
+                timing.self_us = min(timing.self_us, other.self_us)
+                timing.cumulative_us = min(timing.cumulative_us, other.cumulative_us)
+    return best or []
+
+
+class ImportCostAnalysis:
+    """Import timings of one package mapped onto its graphs.
+
+    Args:
+        timings: Parsed ``-X importtime`` output for ``import <package>``.
+        package_name: Top-level package; modules under it are *internal*.
+        dependency_graph: Supplies import-time closure sizes.
+        call_graph: Used to tell whether an importer uses a module at
+            import time (module-level calls into it).
+    """
+
+    def __init__(
+        self,
+        timings: list[ImportTiming],
+        package_name: str,
+        dependency_graph: Optional[DependencyGraph] = None,
+        call_graph: Optional[CallGraph] = None,
+    ) -> None:
+        self.package_name = package_name
+        self.dependency_graph = dependency_graph
+        self.call_graph = call_graph
+        self.by_module = {t.module: t for t in timings}
+        self.roots = [t for t in timings if t.depth == 0 and self.is_internal(t.module)]
+        self.total_us = sum(t.cumulative_us for t in self.roots)
+
+    def is_internal(self, module: str) -> bool:
+        """``True`` for the package itself and its submodules."""
+        return module == self.package_name or module.startswith(f"{self.package_name}.")
+
+    def share(self, microseconds: int) -> float:
+        """Fraction of the total import time."""
+        return microseconds / self.total_us if self.total_us else 0.0
+
+    def internal(self) -> list[ImportTiming]:
+        """Timings of every imported package module, most expensive first."""
+        found = [t for t in self.by_module.values() if self.is_internal(t.module)]
+        return sorted(found, key=lambda t: (-t.cumulative_us, t.module))
+
+    def not_imported(self) -> list[str]:
+        """Package modules in the dependency graph that ``import <package>`` never loads."""
+        if self.dependency_graph is None:
+            return []
+        return [m for m in self.dependency_graph.modules if m not in self.by_module]
+
+    def dominant_chain(self) -> list[ImportTiming]:
+        """Follow the most expensive child at every level, from the heaviest root."""
+        if not self.roots:
+            return []
+        node = max(self.roots, key=lambda t: t.cumulative_us)
+        chain = [node]
+        while node.children:
+            node = max(
+                (self.by_module[c] for c in node.children), key=lambda t: t.cumulative_us
+            )
+            chain.append(node)
+        return chain
+
+    def heaviest_external(self, top: int = 15) -> list[tuple[ImportTiming, str]]:
+        """Outermost non-package imports made on behalf of the package, with their importer.
+
+        Only the first module of each external subtree is listed (``numpy``,
+        not ``numpy.core``), attributed to the package module that imported it.
+        """
+        found = [
+            (t, t.parent)
+            for t in self.by_module.values()
+            if not self.is_internal(t.module) and t.parent and self.is_internal(t.parent)
+        ]
+        found.sort(key=lambda item: (-item[0].cumulative_us, item[0].module))
+        return found[:top]
+
+    def lazy_candidates(
+        self, min_share: float = 0.05, min_us: int = 5000
+    ) -> list[LazyImportCandidate]:
+        """Expensive imports made directly by package modules.
+
+        An import qualifies when it costs at least *min_us* and *min_share*
+        of the total.  ``used_at_import`` is ``True`` when the importer calls
+        into the module outside any function; those need restructuring
+        before the import can be deferred.
+        """
+        threshold = max(min_us, int(min_share * self.total_us))
+        candidates = []
+        for timing in self.by_module.values():
+            importer = timing.parent
+            if importer is None or not self.is_internal(importer):
+                continue
+            if timing.cumulative_us < threshold:
+                continue
+            if importer.startswith(f"{timing.module}."):
+                continue  # a package being imported for its submodule
+            candidates.append(
+                LazyImportCandidate(
+                    importer=importer,
+                    module=timing.module,
+                    cumulative_us=timing.cumulative_us,
+                    share=self.share(timing.cumulative_us),
+                    used_at_import=self._used_at_import(importer, timing.module),
+                )
+            )
+        candidates.sort(key=lambda c: (-c.cumulative_us, c.module))
+        return candidates
+
+    def _used_at_import(self, importer: str, module: str) -> bool:
+        if self.call_graph is None:
+            return False
+        caller = f"{importer}.{MODULE_CALLER}"
+        if caller not in self.call_graph:
+            return False
+        prefix = f"{module}."
+        return any(
+            callee == module or callee.startswith(prefix)
+            for callee in self.call_graph.callees(caller)
+        )
+
+    def iter_report(self) -> Iterator[str]:
+        """Yield the markdown sections (without a document header)."""
+        internal = self.internal()
+        yield (
+            f"`import {self.package_name}` takes **{self.total_us / 1000:.1f} ms**"
+            f" ({len(self.by_module)} modules loaded, {len(internal)} from the package)."
+        )
+
+        yield from ["", "## Dominant Import Chain", ""]
+        yield from _timing_table(self.dominant_chain(), self.share)
+
+        yield from ["", "## Package Modules", ""]
+        closure = self.dependency_graph.closure if self.dependency_graph else None
+        yield "| Module | Self (ms) | Cumulative (ms) | Share | Internal Imports (transitive) |"
+        yield "|--------|-----------|-----------------|-------|-------------------------------|"
+        for timing in internal:
+            pulled = "-"
+            if closure is not None and timing.module in self.dependency_graph:
+                pulled = str(len(closure(timing.module)))
+            yield (
+                f"| `{timing.module}` | {timing.self_us / 1000:.2f}"
+                f" | {timing.cumulative_us / 1000:.2f}"
+                f" | {self.share(timing.cumulative_us):.0%} | {pulled} |"
+            )
+        skipped = self.not_imported()
+        if skipped:
+            yield ""
+            yield f"Not loaded by `import {self.package_name}`: {len(skipped)} modules."
+
+        yield from [
+            "",
+            "## Heaviest External Imports",
+            "",
+            "| Module | Cumulative (ms) | Share | First Imported By |",
+            "|--------|-----------------|-------|-------------------|",
+        ]
+        for timing, importer in self.heaviest_external():
+            yield (
+                f"| `{timing.module}` | {timing.cumulative_us / 1000:.2f}"
+                f" | {self.share(timing.cumulative_us):.0%} | `{importer}` |"
+            )
+
+        yield from ["", "## Lazy-Import Candidates", ""]
+        candidates = self.lazy_candidates()
+        if not candidates:
+            yield "_No import costs more than 5% of the total._"
+            return
+        yield "| Import | In | Cumulative (ms) | Share | Used At Import Time |"
+        yield "|--------|----|-----------------|-------|---------------------|"
+        for cand in candidates:
+            yield (
+                f"| `{cand.module}` | `{cand.importer}` | {cand.cumulative_us / 1000:.2f}"
+                f" | {cand.share:.0%} | {'yes' if cand.used_at_import else 'no'} |"
+            )
+        yield ""
+        yield (
+            "Imports not used at import time can move into the functions that"
+            " need them (or behind a module `__getattr__`)."
+        )
+
+
+def _timing_table(timings: list[ImportTiming], share: Callable[[int], float]) -> Iterator[str]:
+    yield "| Module | Self (ms) | Cumulative (ms) | Share |"
+    yield "|--------|-----------|-----------------|-------|"
+    for timing in timings:
+        yield (
+            f"| `{timing.module}` | {timing.self_us / 1000:.2f}"
+            f" | {timing.cumulative_us / 1000:.2f} | {share(timing.cumulative_us):.0%} |"
+        )
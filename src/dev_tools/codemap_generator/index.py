@@ -0,0 +1,77 @@
+"""Secondary indexes over the records collected by the code map generator."""
+
+from collections import Counter, defaultdict
+
+from dev_tools.codemap_generator.models import CallInfo, SymbolInfo
+
+#: Symbol types grouped by the report category they belong to.
+CLASS_TYPES = ("class",)
+FUNCTION_TYPES = ("function", "async_function")
+METHOD_TYPES = ("method", "async_method")
+
+_CATEGORY_OF = {t: category for category in (CLASS_TYPES, FUNCTION_TYPES, METHOD_TYPES)
+                for t in category}
+
+
+class CodeIndex:  # pylint: disable=too-many-instance-attributes
+    """Lookup tables built once from the aggregate symbol and call lists.
+
+    Every ``generate_*`` report reads from these instead of re-scanning
+    ``symbols``/``calls``, so report generation is linear in the number of
+    records.
+
+    Attributes:
+        by_file: Symbols grouped by ``file_path`` (in collection order).
+        by_type: Symbols grouped by ``symbol_type`` (in collection order).
+        by_parent: Methods grouped by ``parent_class``.
+        by_category: Symbols grouped by :data:`CLASS_TYPES`,
+            :data:`FUNCTION_TYPES` or :data:`METHOD_TYPES`.
+        type_counts: Per-file ``Counter`` of symbol types.
+        callees: Caller name → set of callee names.
+        callers: Callee name → set of caller names.
+    """
+
+    def __init__(self, symbols: list[SymbolInfo], calls: list[CallInfo]) -> None:
+        self.by_file: dict[str, list[SymbolInfo]] = defaultdict(list)
+        self.by_type: dict[str, list[SymbolInfo]] = defaultdict(list)
+        self.by_parent: dict[str, list[SymbolInfo]] = defaultdict(list)
+        self.by_category: dict[tuple[str, ...], list[SymbolInfo]] = defaultdict(list)
+        self.type_counts: dict[str, Counter[str]] = defaultdict(Counter)
+        for sym in symbols:
+            self.by_file[sym.file_path].append(sym)
+            self.by_type[sym.symbol_type].append(sym)
+            self.type_counts[sym.file_path][sym.symbol_type] += 1
+            category = _CATEGORY_OF.get(sym.symbol_type)
+            if category is not None:
+                self.by_category[category].append(sym)
+            if sym.parent_class:
+                self.by_parent[sym.parent_class].append(sym)
+
+        self.callees: dict[str, set[str]] = defaultdict(set)
+        self.callers: dict[str, set[str]] = defaultdict(set)
+        for call in calls:
+            self.callees[call.caller].add(call.callee)
+            self.callers[call.callee].add(call.caller)
+
+        self._signature = (id(symbols), len(symbols), id(calls), len(calls))
+
+    def is_current(self, symbols: list[SymbolInfo], calls: list[CallInfo]) -> bool:
+        """Return ``True`` if the index was built from these (unchanged) lists."""
+        return self._signature == (id(symbols), len(symbols), id(calls), len(calls))
+
+    def of_types(self, types: tuple[str, ...]) -> list[SymbolInfo]:
+        """Return all symbols whose type is in *types*, in collection order."""
+        if types in self.by_category:
+            return list(self.by_category[types])
+        if len(types) == 1:
+            return list(self.by_type.get(types[0], ()))
+        return [sym for t in dict.fromkeys(types) for sym in self.by_type.get(t, ())]
+
+    def count(self, file_path: str, types: tuple[str, ...]) -> int:
+        """Return how many symbols of *types* are defined in *file_path*."""
+        counts = self.type_counts.get(file_path)
+        return sum(counts[t] for t in types) if counts else 0
+
+    def count_all(self, types: tuple[str, ...]) -> int:
+        """Return how many symbols of *types* exist in total."""
+        return sum(len(self.by_type.get(t, ())) for t in types)
@@ -0,0 +1,202 @@
+"""Record types produced by the code map extraction pass.
+
+A large monorepo yields millions of records, so they are slotted (no
+per-instance ``__dict__``), keep their sequences as tuples and, once
+merged, share one copy of each repeated string (see
+:meth:`FileAnalysis.intern_strings`).
+"""
+
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+
+@dataclass(slots=True)
+class SymbolInfo:  # pylint: disable=too-many-instance-attributes
+    """Information about a code symbol (class, function, method)."""
+
+    name: str
+    symbol_type: str  # 'class', 'function', 'method', 'async_function'
+    file_path: str
+    line_number: int
+    docstring: Optional[str] = None
+    parent_class: Optional[str] = None
+    is_public: bool = True
+    decorators: tuple[str, ...] = ()
+    parameters: tuple[str, ...] = ()  # names of the regular positional parameters
+    signature: str = ""  # every parameter kind, e.g. 'a, /, b=..., *args, c, **kw'
+
+
+@dataclass(slots=True)
+class ImportInfo:  # pylint: disable=too-many-instance-attributes
+    """Information about an import statement."""
+
+    module: str
+    names: tuple[str, ...]  # Specific names imported, or ('*',) for star import
+    is_from_import: bool
+    file_path: str
+    line_number: int
+    level: int = 0  # number of leading dots of a relative import
+    aliases: tuple[str, ...] = ()  # local names bound, parallel to names
+    deferred: bool = False  # inside a function or ``if TYPE_CHECKING:`` (not run at import)
+
+
+@dataclass(slots=True)
+class EntryPoint:
+    """Information about an entry point."""
+
+    file_path: str
+    entry_type: str  # 'main_block', 'cli_script', 'console_script'
+    description: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CallInfo:
+    """Information about a function/method call."""
+
+    caller: str  # function/method making the call
+    callee: str  # function/method being called
+    file_path: str
+    line_number: int
+    target: Optional[str] = None  # full dotted call expression, e.g. 'self.save', 'os.path.join'
+
+
+@dataclass(slots=True)
+class PerfFinding:
+    """A likely performance problem spotted during extraction."""
+
+    rule: str  # rule id, see :data:`~dev_tools.codemap_generator.perflint.RULES`
+    file_path: str
+    line_number: int
+    scope: str  # enclosing 'Class.method' / function, or '<module>'
+    message: str
+    loop_depth: int = 0  # number of enclosing loops/comprehensions in the scope
+
+
+@dataclass(slots=True)
+class SideEffect:
+    """A module-level statement that does work on import."""
+
+    kind: str  # 'io', 'loop', 'import', 'call' or 'literal'
+    file_path: str
+    line_number: int
+    scope: str  # enclosing class for class-body statements, else ''
+    detail: str
+    weight: int  # see :data:`~dev_tools.codemap_generator.sideeffects.WEIGHTS`
+    target: Optional[str] = None  # the imported module, for 'import'
+
+
+@dataclass(slots=True)
+class ParseTiming:
+    """Where the time went when one file was extracted (seconds)."""
+
+    size: int  # bytes of source
+    read: float
+    parse: float  # decoding, hashing and ``ast.parse``
+    extract: float  # walking the tree into records
+
+
+@dataclass(slots=True)
+class FileAnalysis:  # pylint: disable=too-many-instance-attributes
+    """Everything extracted from a single source file.
+
+    Plain, picklable data so it can cross process boundaries and be merged
+    by :class:`~dev_tools.codemap_generator.generator.CodeMapGenerator` in
+    a deterministic order.
+    """
+
+    file_path: str  # path relative to the src root's parent, '/'-separated
+    module_name: str
+    docstring: Optional[str] = None
+    symbols: list[SymbolInfo] = field(default_factory=list)
+    imports: list[ImportInfo] = field(default_factory=list)
+    calls: list[CallInfo] = field(default_factory=list)
+    entry_points: list[EntryPoint] = field(default_factory=list)
+    module_calls: list[CallInfo] = field(default_factory=list)  # calls outside any def
+    findings: list[PerfFinding] = field(default_factory=list)
+    side_effects: list[SideEffect] = field(default_factory=list)
+    error: Optional[str] = None  # set when the file could not be parsed
+    skipped: Optional[str] = None  # set when a resource limit kept it from being parsed
+    content_hash: Optional[str] = None  # sha256 of the raw source bytes
+    # set by a fresh extraction; describes that run, so never persisted
+    timing: Optional[ParseTiming] = field(default=None, compare=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable representation (without :attr:`timing`)."""
+        data = asdict(self)
+        del data["timing"]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FileAnalysis":
+        """Rebuild a :class:`FileAnalysis` from :meth:`to_dict` output."""
+        return cls(
+            file_path=data["file_path"],
+            module_name=data["module_name"],
+            docstring=data.get("docstring"),
+            symbols=[
+                SymbolInfo(**{
+                    **s, "decorators": tuple(s.get("decorators", ())),
+                    "parameters": tuple(s.get("parameters", ())),
+                })
+                for s in data.get("symbols", [])
+            ],
+            imports=[
+                ImportInfo(**{
+                    **i, "names": tuple(i["names"]), "aliases": tuple(i.get("aliases", ())),
+                })
+                for i in data.get("imports", [])
+            ],
+            calls=[CallInfo(**c) for c in data.get("calls", [])],
+            entry_points=[EntryPoint(**e) for e in data.get("entry_points", [])],
+            module_calls=[CallInfo(**c) for c in data.get("module_calls", [])],
+            findings=[PerfFinding(**f) for f in data.get("findings", [])],
+            side_effects=[SideEffect(**e) for e in data.get("side_effects", [])],
+            error=data.get("error"),
+            skipped=data.get("skipped"),
+            content_hash=data.get("content_hash"),
+        )
+
+    def intern_strings(self) -> None:
+        """Make all records share one copy of each path, name and keyword.
+
+        Records unpickled from a worker process or loaded from the cache
+        each carry their own copies of ``file_path``, caller and callee
+        names, parameter names and so on; after this every equal string is
+        a single :func:`sys.intern`-ed object.  Docstrings and messages are
+        left alone (they rarely repeat).
+        """
+        intern = sys.intern
+        path = self.file_path = intern(self.file_path)
+        self.module_name = intern(self.module_name)
+        for sym in self.symbols:
+            sym.file_path = path
+            sym.name = intern(sym.name)
+            sym.symbol_type = intern(sym.symbol_type)
+            if sym.parent_class is not None:
+                sym.parent_class = intern(sym.parent_class)
+            sym.decorators = tuple(map(intern, sym.decorators))
+            sym.parameters = tuple(map(intern, sym.parameters))
+            sym.signature = intern(sym.signature)
+        for imp in self.imports:
+            imp.file_path = path
+            imp.module = intern(imp.module)
+            imp.names = tuple(map(intern, imp.names))
+            imp.aliases = tuple(map(intern, imp.aliases))
+        for call in (*self.calls, *self.module_calls):
+            call.file_path = path
+            call.caller = intern(call.caller)
+            call.callee = intern(call.callee)
+            if call.target is not None:
+                call.target = intern(call.target)
+        for entry in self.entry_points:
+            entry.file_path = path
+            entry.entry_type = intern(entry.entry_type)
+        for finding in self.findings:
+            finding.file_path = path
+            finding.rule = intern(finding.rule)
+            finding.scope = intern(finding.scope)
+        for effect in self.side_effects:
+            effect.file_path = path
+            effect.kind = intern(effect.kind)
+            effect.scope = intern(effect.scope)
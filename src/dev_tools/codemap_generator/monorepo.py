@@ -0,0 +1,354 @@
+"""
+Multi-package (monorepo) mode for the code map generator.
+
+:class:`Monorepo` discovers every package under one or more source roots
+and analyzes them together:
+
+* one parallel extraction pass over the files of all packages (a single
+  process pool, sharing the per-file
+  :class:`~dev_tools.codemap_generator.cache.ExtractionCache` directory);
+* each ``pyproject.toml`` is read once, however many packages sit under
+  its source root;
+* every package gets its own :class:`CodeMapGenerator`, filled from the
+  shared pass, so per-package maps are exactly what a single-package run
+  would write;
+* one :class:`~dev_tools.codemap_generator.depgraph.DependencyGraph` over
+  all modules resolves imports between packages, from which the package
+  graph (edges weighted by module imports, package cycles) is derived.
+
+Layout::
+
+    <output_dir>/cross-package.md
+    <output_dir>/<package>/code-map.md, symbol-index.md, ...
+
+Usage::
+
+    repo = Monorepo([Path("libs/core/src"), Path("services/src")], workers=0)
+    repo.analyze()
+    repo.write_outputs(Path("docs/generated"))
+"""
+
+import hashlib
+import sys
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import repeat
+from pathlib import Path
+from typing import Optional
+
+from dev_tools.codemap_generator.cache import ExtractionCache, extract_file_cached
+from dev_tools.codemap_generator.condense import DEFAULT_NODE_BUDGET
+from dev_tools.codemap_generator.depgraph import DependencyGraph
+from dev_tools.codemap_generator.extractor import module_name_for
+from dev_tools.codemap_generator.generator import (
+    CodeMapGenerator,
+    discover_files,
+    parallel_map,
+    read_pyproject,
+    write_if_changed,
+)
+from dev_tools.codemap_generator.graph_utils import (
+    pack_csr,
+    pack_edge,
+    strongly_connected_components,
+)
+from dev_tools.codemap_generator.guards import ResourceLimits, extract_guarded
+from dev_tools.codemap_generator.models import FileAnalysis
+
+#: Output file name of the cross-package dependency report.
+CROSS_PACKAGE_FILE_NAME = "cross-package.md"
+
+
+@dataclass(frozen=True)
+class PackageRef:
+    """A top-level package found under a source root."""
+
+    name: str
+    src_root: Path
+
+
+@dataclass
+class PackageEdge:
+    """Import-time dependency of one package on another."""
+
+    importer: str
+    imported: str
+    imports: int  # module → module import edges behind it
+    example: tuple[str, str]  # one of them, ``(importer module, imported module)``
+
+
+def discover_packages(src_roots: Iterable[Path]) -> list[PackageRef]:
+    """Top-level packages (directories with an ``__init__.py``) under each root.
+
+    Packages are sorted by name.  When two roots contain a package of the
+    same name, the first root wins and a warning is printed.
+
+    Raises:
+        FileNotFoundError: If a source root does not exist.
+    """
+    found: dict[str, PackageRef] = {}
+    for src_root in src_roots:
+        if not src_root.is_dir():
+            raise FileNotFoundError(f"Source root not found: {src_root}")
+        for init in sorted(src_root.glob("*/__init__.py")):
+            name = init.parent.name
+            if name in found:
+                print(
+                    f"Warning: package {name} in {src_root} shadowed by"
+                    f" {found[name].src_root}",
+                    file=sys.stderr,
+                )
+                continue
+            found[name] = PackageRef(name, src_root)
+    return sorted(found.values(), key=lambda ref: ref.name)
+
+
+class Monorepo:  # pylint: disable=too-many-instance-attributes
+    """Every package under one or more source roots, analyzed in one pass.
+
+    Args:
+        src_roots: Source root directories to search for packages.
+        workers: Worker processes for the shared extraction pass (as for
+            :class:`CodeMapGenerator`).
+        cache_dir: Shared extraction cache directory (namespaced per package).
+        deterministic: Stamp reports with source digests instead of the time.
+        packages: Only analyze these package names (default: all discovered).
+        limits: Per-file resource limits (as for :class:`CodeMapGenerator`).
+        node_budget: Diagram node budget (as for :class:`CodeMapGenerator`).
+
+    Attributes:
+        packages: The packages analyzed, sorted by name.
+        generators: Package name → its analyzed :class:`CodeMapGenerator`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        src_roots: Iterable[Path],
+        workers: int | None = 1,
+        cache_dir: Optional[Path] = None,
+        deterministic: bool = False,
+        packages: Optional[Iterable[str]] = None,
+        *,
+        limits: Optional[ResourceLimits] = None,
+        node_budget: int | None = DEFAULT_NODE_BUDGET,
+    ) -> None:
+        self.src_roots = list(src_roots)
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.deterministic = deterministic
+        self.limits = limits if limits is not None else ResourceLimits()
+        self.node_budget = node_budget
+        self.packages = discover_packages(self.src_roots)
+        if packages is not None:
+            wanted = set(packages)
+            self.packages = [ref for ref in self.packages if ref.name in wanted]
+        self.generators: dict[str, CodeMapGenerator] = {}
+        self._dependency_graph: Optional[DependencyGraph] = None
+
+    def analyze(self) -> None:
+        """Extract all packages in one parallel pass and fill :attr:`generators`."""
+        files: list[Path] = []
+        owners: list[PackageRef] = []
+        for ref in self.packages:
+            package_files = discover_files(ref.src_root / ref.name)
+            files.extend(package_files)
+            owners.extend(repeat(ref, len(package_files)))
+        base_dirs = [ref.src_root.parent for ref in owners]
+
+        caches: dict[str, ExtractionCache] = {}
+        if self.cache_dir is None:
+            analyses = parallel_map(
+                self.workers, extract_guarded, files, base_dirs, repeat(None), repeat(self.limits)
+            )
+            results = [(analysis, "", False) for analysis in analyses]
+        else:
+            caches = {ref.name: ExtractionCache(self.cache_dir, ref.name) for ref in self.packages}
+            results = parallel_map(
+                self.workers,
+                extract_file_cached,
+                files,
+                base_dirs,
+                [caches[ref.name] for ref in owners],
+                repeat(self.limits),
+            )
+
+        by_package: dict[str, list[tuple[FileAnalysis, str, bool]]] = {
+            ref.name: [] for ref in self.packages
+        }
+        for ref, result in zip(owners, results):
+            by_package[ref.name].append(result)
+
+        pyprojects = {root: read_pyproject(root) for root in {r.src_root for r in self.packages}}
+        self.generators = {}
+        self._dependency_graph = None
+        for ref in self.packages:
+            package_results = by_package[ref.name]
+            gen = CodeMapGenerator(
+                ref.src_root, ref.name, self.workers, self.cache_dir, self.deterministic,
+                limits=self.limits, node_budget=self.node_budget,
+            )
+            gen.cache_hits = sum(1 for _, _, hit in package_results if hit)
+            gen.cache_misses = len(package_results) - gen.cache_hits if caches else 0
+            gen.load_analyses((a for a, _, _ in package_results), pyprojects[ref.src_root])
+            if caches:
+                caches[ref.name].prune({key for _, key, _ in package_results})
+            self.generators[ref.name] = gen
+
+    # -- cross-package graph -------------------------------------------------
+
+    @property
+    def dependency_graph(self) -> DependencyGraph:
+        """Module dependency graph across all packages (built on first access)."""
+        if self._dependency_graph is None:
+            module_names: dict[str, str] = {}
+            imports = []
+            for gen in self.generators.values():
+                src_dir = gen.src_root.name
+                for path in gen.source_hashes:
+                    if path.endswith(".py"):
+                        module_names[path] = module_name_for(path, src_dir)
+                imports.extend(gen.imports)
+            self._dependency_graph = DependencyGraph(
+                module_names, imports, module_names=module_names
+            )
+        return self._dependency_graph
+
+    def package_edges(self) -> list[PackageEdge]:
+        """Package → package dependencies, most module imports first."""
+        counts: Counter[tuple[str, str]] = Counter()
+        examples: dict[tuple[str, str], tuple[str, str]] = {}
+        for importer, imported in self.dependency_graph.edges():
+            key = (_package_of(importer), _package_of(imported))
+            if key[0] != key[1]:
+                counts[key] += 1
+                examples.setdefault(key, (importer, imported))
+        return sorted(
+            (PackageEdge(a, b, n, examples[(a, b)]) for (a, b), n in counts.items()),
+            key=lambda e: (-e.imports, e.importer, e.imported),
+        )
+
+    def package_cycles(self) -> list[list[str]]:
+        """Groups of packages that import each other (directly or transitively)."""
+        names = [ref.name for ref in self.packages]
+        ids = {name: i for i, name in enumerate(names)}
+        edges = {pack_edge(ids[e.importer], ids[e.imported]) for e in self.package_edges()}
+        offsets, targets = pack_csr(edges, len(names))
+        cycles = [
+            sorted(names[n] for n in members)
+            for members in strongly_connected_components(offsets, targets)
+            if len(members) > 1
+        ]
+        return sorted(cycles, key=lambda members: (-len(members), members))
+
+    # -- output --------------------------------------------------------------
+
+    def stamp(self) -> str:
+        """Provenance for the cross-package report (see :meth:`CodeMapGenerator.stamp`)."""
+        if self.deterministic:
+            digest = hashlib.sha256()
+            for name, gen in sorted(self.generators.items()):
+                digest.update(f"{name}\0{gen.source_digest()}\n".encode("utf-8"))
+            return f"from sources `{digest.hexdigest()[:12]}`"
+        return f"on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+    def generate_cross_package(self) -> str:
+        """Generate the cross-package dependency report."""
+        return "\n".join(self._iter_cross_package())
+
+    def _iter_cross_package(self) -> Iterator[str]:  # pylint: disable=too-many-locals
+        edges = self.package_edges()
+        yield from [
+            "# Cross-Package Dependencies",
+            "",
+            f"> Auto-generated by `codemap_generator` {self.stamp()}",
+            "> **Do not edit manually** — regenerate with `codemap-generator`",
+            "",
+            f"{len(self.packages)} packages under {len(self.src_roots)} source roots;"
+            f" {sum(e.imports for e in edges)} module imports cross package boundaries.",
+            "",
+            "## Packages",
+            "",
+            "| Package | Source Root | Modules | Symbols | Depends On | Used By |",
+            "|---------|-------------|---------|---------|------------|---------|",
+        ]
+        depends = Counter(e.importer for e in edges)
+        used = Counter(e.imported for e in edges)
+        for ref in self.packages:
+            gen = self.generators[ref.name]
+            modules = sum(1 for path in gen.source_hashes if path.endswith(".py"))
+            yield (
+                f"| [`{ref.name}`]({ref.name}/code-map.md) | `{ref.src_root}` | {modules}"
+                f" | {len(gen.symbols)} | {depends[ref.name]} | {used[ref.name]} |"
+            )
+
+        yield from ["", "## Package Graph", ""]
+        if edges:
+            node_ids = {ref.name: f"p{i}" for i, ref in enumerate(self.packages)}
+            yield "```mermaid"
+            yield "graph TD"
+            for ref in self.packages:
+                yield f'    {node_ids[ref.name]}["{ref.name}"]'
+            for edge in edges:
+                yield (
+                    f"    {node_ids[edge.importer]} -->|{edge.imports}|"
+                    f" {node_ids[edge.imported]}"
+                )
+            yield "```"
+        else:
+            yield "_No imports between packages._"
+
+        yield from ["", "## Package Cycles", ""]
+        cycles = self.package_cycles()
+        if cycles:
+            for members in cycles:
+                yield f"- {' ↔ '.join(f'`{m}`' for m in members)}"
+        else:
+            yield "_No package cycles detected._"
+
+        if edges:
+            yield from [
+                "",
+                "## Cross-Package Imports",
+                "",
+                "| Importer | Imported | Module Imports | Example |",
+                "|----------|----------|----------------|---------|",
+            ]
+            for edge in edges:
+                source, target = edge.example
+                yield (
+                    f"| `{edge.importer}` | `{edge.imported}` | {edge.imports}"
+                    f" | `{source}` → `{target}` |"
+                )
+        yield ""
+
+    def write_outputs(self, output_dir: Path, sharded: bool = False) -> list[Path]:
+        """Write each package's maps to ``<output_dir>/<package>/``, plus the cross-package report.
+
+        Args:
+            output_dir: Root output directory.
+            sharded: Write each package's maps with
+                :meth:`CodeMapGenerator.write_shards` instead of
+                :meth:`CodeMapGenerator.write_outputs`.
+
+        Returns:
+            The cross-package report path followed by every package's files.
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report = output_dir / CROSS_PACKAGE_FILE_NAME
+        if write_if_changed(report, self._iter_cross_package()):
+            print(f"  Generated {report}")
+        else:
+            print(f"  Unchanged {report}")
+        files = [report]
+        for name, gen in self.generators.items():
+            package_dir = output_dir / name
+            files.extend(
+                gen.write_shards(package_dir) if sharded else gen.write_outputs(package_dir)
+            )
+        return files
+
+
+def _package_of(module: str) -> str:
+    return module.partition(".")[0]
@@ -0,0 +1,188 @@
+"""
+Static performance anti-pattern rules for the code map generator.
+
+The checks run inside the extractor's single AST traversal (see
+:class:`~dev_tools.codemap_generator.extractor._FileExtractor`), so they
+add almost nothing to the cost of :meth:`CodeMapGenerator.analyze`.  This
+module holds the rule table, the expression predicates the extractor
+uses and the ranked report.
+
+Rules:
+
+``list-membership``
+    ``x in items`` inside a loop where ``items`` is a list (a list
+    literal, comprehension, ``list()``/``sorted()`` call or a local
+    name bound to one) — a linear scan per iteration.
+``regex-literal``
+    ``re.compile``/``re.sub``/... with a literal pattern inside a
+    function body; every call goes through ``re``'s cache lookup.
+``str-concat-loop``
+    ``s += ...`` string accumulation inside a loop (quadratic copying).
+``getenv-loop``
+    ``os.getenv``/``os.environ.get`` inside a loop.
+``len-of-list``
+    ``len(list(...))`` or ``len([...comprehension])`` materialising a
+    list only to count it.
+
+Findings are heuristics, not proofs: the extractor only knows what a name
+is bound to within the same scope.  They are ranked by rule weight times
+loop nesting.
+"""
+
+import ast
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from typing import Optional
+
+from dev_tools.codemap_generator.models import PerfFinding
+
+#: Output file name of the findings report.
+PERF_FINDINGS_FILE_NAME = "perf-findings.md"
+
+#: Rule id → (weight, title, suggested fix).
+RULES: dict[str, tuple[int, str, str]] = {
+    "list-membership": (3, "List membership in loop", "use a set or dict built once"),
+    "str-concat-loop": (2, "String += in loop", "collect parts in a list and ''.join() them"),
+    "getenv-loop": (2, "Environment lookup in loop", "read the variable once, before the loop"),
+    "regex-literal": (1, "Regex literal in function", "compile once at module level"),
+    "len-of-list": (1, "len() of a throwaway list", "use sum(1 for ...) or len() of the source"),
+}
+
+#: ``re`` functions whose first argument is the pattern.
+REGEX_FUNCTIONS = frozenset({
+    "compile", "match", "fullmatch", "search", "sub", "subn", "split", "findall", "finditer",
+})
+
+#: Dotted call targets that read the environment.
+GETENV_TARGETS = frozenset({"os.getenv", "os.environ.get"})
+
+#: Last names of the calls any rule looks at; the extractor skips the rest.
+CALL_NAMES = REGEX_FUNCTIONS | {"len", "getenv", "get"}
+
+#: Builtins that always return a new list.
+_LIST_BUILDERS = frozenset({"list", "sorted"})
+
+#: Nesting beyond this many loops does not raise severity further.
+_MAX_LOOP_WEIGHT = 3
+
+
+def severity(finding: PerfFinding) -> int:
+    """Rule weight scaled by loop nesting."""
+    weight = RULES[finding.rule][0]
+    return weight * (1 + min(finding.loop_depth, _MAX_LOOP_WEIGHT))
+
+
+def rank(findings: Iterable[PerfFinding]) -> list[PerfFinding]:
+    """Findings ordered most severe first, then by location."""
+    return sorted(findings, key=lambda f: (-severity(f), f.file_path, f.line_number, f.rule))
+
+
+def binding_kind(value: Optional[ast.expr]) -> Optional[str]:
+    """``"list"`` or ``"str"`` if *value* evidently builds one, else ``None``."""
+    if isinstance(value, ast.Call) and isinstance(value.func, ast.Name):
+        if value.func.id in _LIST_BUILDERS:
+            return "list"
+        return "str" if value.func.id == "str" else None
+    if isinstance(value, (ast.List, ast.ListComp)):
+        return "list"
+    if isinstance(value, ast.JoinedStr) or (
+        isinstance(value, ast.Constant) and isinstance(value.value, str)
+    ):
+        return "str"
+    return None
+
+
+def annotation_kind(annotation: Optional[ast.expr]) -> Optional[str]:
+    """``"list"`` or ``"str"`` for ``list``/``list[...]``/``List[...]``/``str`` annotations."""
+    if isinstance(annotation, ast.Subscript):
+        annotation = annotation.value
+    if isinstance(annotation, ast.Attribute):  # typing.List
+        name = annotation.attr
+    elif isinstance(annotation, ast.Name):
+        name = annotation.id
+    else:
+        return None
+    if name in ("list", "List"):
+        return "list"
+    return "str" if name == "str" else None
+
+
+def is_list_expr(node: ast.expr, kind_of: Callable[[str], Optional[str]]) -> bool:
+    """Whether *node* is (evidently) a list for a membership test.
+
+    Literal lists of constants are excluded: the compiler folds them into
+    tuple constants and they are usually short.
+    """
+    if isinstance(node, ast.Name):
+        return kind_of(node.id) == "list"
+    if isinstance(node, ast.List):
+        return not all(isinstance(elt, ast.Constant) for elt in node.elts)
+    return binding_kind(node) == "list"
+
+
+def is_len_of_list(node: ast.Call) -> bool:
+    """``len(list(...))``, ``len(sorted(...))`` or ``len([... for ...])``."""
+    if not (isinstance(node.func, ast.Name) and node.func.id == "len" and len(node.args) == 1):
+        return False
+    arg = node.args[0]
+    if isinstance(arg, ast.ListComp):
+        return True
+    return (
+        isinstance(arg, ast.Call)
+        and isinstance(arg.func, ast.Name)
+        and arg.func.id in _LIST_BUILDERS
+    )
+
+
+def has_literal_pattern(node: ast.Call) -> bool:
+    """Whether the call's first argument (or ``pattern=``) is a string/bytes literal."""
+    pattern: Optional[ast.expr] = node.args[0] if node.args else None
+    if pattern is None:
+        pattern = next((kw.value for kw in node.keywords if kw.arg == "pattern"), None)
+    return isinstance(pattern, ast.Constant) and isinstance(pattern.value, (str, bytes))
+
+
+def snippet(node: ast.AST, width: int = 40) -> str:
+    """Short, table-safe source text of *node*."""
+    text = ast.unparse(node).replace("|", "\\|").replace("\n", " ")
+    return text if len(text) <= width else f"{text[:width - 3]}..."
+
+
+def iter_report(findings: list[PerfFinding], top: Optional[int] = 100) -> Iterator[str]:
+    """Yield the markdown body of the findings report (without a header)."""
+    ranked = rank(findings)
+    if not ranked:
+        yield "_No performance anti-patterns found._"
+        return
+
+    counts = Counter(f.rule for f in ranked)
+    yield from [
+        "Heuristic findings from the AST pass, most severe first"
+        " (rule weight × loop nesting).",
+        "",
+        "## Summary",
+        "",
+        "| Rule | Findings | Fix |",
+        "|------|----------|-----|",
+    ]
+    for rule, (_weight, title, fix) in RULES.items():
+        if counts[rule]:
+            yield f"| `{rule}` — {title} | {counts[rule]} | {fix} |"
+
+    yield from [
+        "",
+        "## Findings",
+        "",
+        "| Severity | Location | Scope | Rule | Detail |",
+        "|----------|----------|-------|------|--------|",
+    ]
+    shown = ranked if top is None else ranked[:top]
+    for finding in shown:
+        location = f"{finding.file_path}:{finding.line_number}"
+        yield (
+            f"| {severity(finding)} | [{location}]({finding.file_path}#L{finding.line_number})"
+            f" | `{finding.scope}` | `{finding.rule}` | {finding.message} |"
+        )
+    if len(ranked) > len(shown):
+        yield ""
+        yield f"_{len(ranked) - len(shown)} lower-severity findings not shown._"
@@ -0,0 +1,328 @@
+"""
+Profile annotation for the code map generator.
+
+Loads one or more ``cProfile``/``pstats`` dumps and matches every profile
+entry to the :class:`SymbolInfo` it measured, so the code map can show
+which functions are hot:
+
+* Files are matched by path suffix — a profile recorded against
+  ``/home/ci/checkout/src/pkg/mod.py`` matches ``src/pkg/mod.py`` — so
+  profiles taken on another machine or checkout still apply.
+* Within a file, entries are matched by function name and line.  pstats
+  records the first line of the code object, which for decorated
+  functions is the first decorator, so the nearest definition at or below
+  that line wins.
+* Module bodies (``<module>``) map to the ``pkg.mod.<module>`` node of
+  the :class:`~dev_tools.codemap_generator.callgraph.CallGraph`.
+
+Matched entries use the call graph's qualified names, and profiled
+caller → callee pairs become weighted edges that can be compared against
+the static graph (edges the static analysis missed are dynamic calls).
+
+Usage::
+
+    python -m cProfile -o run.pstats -m my_package.cli ...
+
+    gen = CodeMapGenerator(Path("src"), "my_package")
+    gen.analyze()
+    gen.load_profiles([Path("run.pstats")])
+    gen.profile.hot_paths()
+"""
+
+import pstats
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path, PurePath
+from typing import Optional
+
+from dev_tools.codemap_generator.callgraph import CallGraph
+from dev_tools.codemap_generator.extractor import MODULE_CALLER, module_name_for
+from dev_tools.codemap_generator.index import CLASS_TYPES
+from dev_tools.codemap_generator.models import SymbolInfo
+
+#: pstats key: ``(file name, first line, function name)``.
+_FuncKey = tuple[str, int, str]
+
+
+@dataclass
+class ProfileEntry:
+    """Profile totals of one symbol (times in seconds)."""
+
+    name: str  # qualified name, as in the call graph
+    file_path: str
+    line_number: int
+    primitive_calls: int  # calls that were not recursive
+    calls: int
+    total_time: float  # in the function itself
+    cumulative_time: float  # including callees
+
+    @property
+    def per_call(self) -> float:
+        """Cumulative time per call."""
+        return self.cumulative_time / self.calls if self.calls else 0.0
+
+
+@dataclass
+class ProfileEdge:
+    """A measured caller → callee pair."""
+
+    caller: str
+    callee: str
+    calls: int
+    cumulative_time: float  # time in *callee* on behalf of *caller*
+
+
+def load_stats(paths: Iterable[Path]) -> pstats.Stats:
+    """Load and merge ``.pstats`` files.
+
+    Raises:
+        ValueError: If no paths are given.
+        OSError, TypeError: If a file is missing or not a pstats dump.
+    """
+    paths = [str(p) for p in paths]
+    if not paths:
+        raise ValueError("No profile files given")
+    return pstats.Stats(*paths)
+
+
+class ProfileData:  # pylint: disable=too-many-instance-attributes
+    """pstats entries matched to the analyzed symbols.
+
+    Args:
+        stats: Loaded profile (see :func:`load_stats`).
+        symbols: All collected symbols.
+        src_dir: Name of the src directory that prefixes recorded paths.
+        file_paths: Recorded paths of every analyzed module, so module
+            bodies of files without functions are matched too.
+
+    Attributes:
+        entries: Qualified name → merged :class:`ProfileEntry`.
+        edges: Measured edges between matched entries, heaviest first.
+        total_time: Total profiled time of the whole run.
+        matched_time: Own time of all matched entries.
+        unmatched_entries: Entries in analyzed files with no matching symbol.
+    """
+
+    def __init__(
+        self,
+        stats: pstats.Stats,
+        symbols: list[SymbolInfo],
+        src_dir: str = "",
+        file_paths: Iterable[str] = (),
+    ) -> None:
+        self._src_dir = src_dir
+        prefix = f"{src_dir}/" if src_dir else ""
+        self._by_suffix: dict[str, str] = {
+            path.removeprefix(prefix): path
+            for path in [*file_paths, *(sym.file_path for sym in symbols)]
+        }
+        self._by_name: dict[tuple[str, str], list[SymbolInfo]] = defaultdict(list)
+        for sym in symbols:
+            if sym.symbol_type not in CLASS_TYPES:
+                self._by_name[(sym.file_path, sym.name)].append(sym)
+        for candidates in self._by_name.values():
+            candidates.sort(key=lambda s: s.line_number)
+
+        raw: dict[_FuncKey, tuple] = stats.stats  # type: ignore[attr-defined]
+        self.total_time: float = stats.total_tt  # type: ignore[attr-defined]
+        self.entries: dict[str, ProfileEntry] = {}
+        self.unmatched_entries = 0
+        names = self._collect_entries(raw)
+        self.matched_time = sum(e.total_time for e in self.entries.values())
+
+        self.edges = self._collect_edges(raw, names)
+        self._out: dict[str, list[ProfileEdge]] = defaultdict(list)
+        self._callers: dict[str, int] = defaultdict(int)
+        for edge in self.edges:
+            self._out[edge.caller].append(edge)
+            self._callers[edge.callee] += 1
+
+    def _collect_entries(self, raw: dict[_FuncKey, tuple]) -> dict[_FuncKey, str]:
+        """Fill :attr:`entries`; return the qualified name of every matched key."""
+        names: dict[_FuncKey, str] = {}
+        for key, (cc, nc, tt, ct, _callers) in raw.items():
+            match = self._match(key)
+            if match is None:
+                continue
+            name, file_path, line = match
+            if not name:
+                self.unmatched_entries += 1
+                continue
+            names[key] = name
+            entry = self.entries.get(name)
+            if entry is None:
+                self.entries[name] = ProfileEntry(name, file_path, line, cc, nc, tt, ct)
+            else:  # e.g. the same function recorded under two checkouts
+                entry.primitive_calls += cc
+                entry.calls += nc
+                entry.total_time += tt
+                entry.cumulative_time += ct
+        return names
+
+    @staticmethod
+    def _collect_edges(
+        raw: dict[_FuncKey, tuple], names: dict[_FuncKey, str]
+    ) -> list[ProfileEdge]:
+        """Merge the per-callee caller tables into edges, heaviest first."""
+        weights: dict[tuple[str, str], list] = {}
+        for key, callee in names.items():
+            for caller_key, value in raw[key][4].items():
+                caller = names.get(caller_key)
+                if caller is None or caller == callee:
+                    continue
+                # cProfile stores (cc, nc, tt, ct) per caller; the profile module a count
+                if isinstance(value, tuple):
+                    calls, cumulative = value[1], value[3]
+                else:
+                    calls, cumulative = value, 0.0
+                weight = weights.setdefault((caller, callee), [0, 0.0])
+                weight[0] += calls
+                weight[1] += cumulative
+        return sorted(
+            (ProfileEdge(a, b, calls, ct) for (a, b), (calls, ct) in weights.items()),
+            key=lambda e: (-e.cumulative_time, e.caller, e.callee),
+        )
+
+    def _file_for(self, filename: str) -> Optional[str]:
+        """Recorded path of the analyzed file a profiled *filename* refers to."""
+        parts = PurePath(filename).as_posix().split("/")
+        for i in range(len(parts)):
+            found = self._by_suffix.get("/".join(parts[i:]))
+            if found is not None:
+                return found
+        return None
+
+    def _match(self, key: _FuncKey) -> Optional[tuple[str, str, int]]:
+        """``(qualified name, file, line)`` for a pstats key.
+
+        Returns ``None`` for entries outside the analyzed package and an
+        empty name for entries in analyzed files that match no symbol
+        (lambdas, comprehensions, nested functions).
+        """
+        filename, line, func = key
+        file_path = self._file_for(filename)
+        if file_path is None:
+            return None
+        module = module_name_for(file_path, self._src_dir)
+        if func == MODULE_CALLER:
+            return f"{module}.{MODULE_CALLER}", file_path, 1
+        candidates = self._by_name.get((file_path, func))
+        if not candidates:
+            return "", file_path, line
+        # The recorded line is the first decorator; the def is at or below it.
+        sym = next((s for s in candidates if s.line_number >= line), candidates[-1])
+        owner = f"{module}.{sym.parent_class}" if sym.parent_class else module
+        return f"{owner}.{sym.name}", file_path, sym.line_number
+
+    # -- queries -------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, name: str) -> Optional[ProfileEntry]:
+        """The profile entry of a qualified name, if it was profiled."""
+        return self.entries.get(name)
+
+    def hottest(self, top: Optional[int] = 20, by: str = "cumulative_time") -> list[ProfileEntry]:
+        """Profiled symbols ordered by *by* (an attribute of :class:`ProfileEntry`)."""
+        ranked = sorted(self.entries.values(), key=lambda e: (-getattr(e, by), e.name))
+        return ranked if top is None else ranked[:top]
+
+    def callees(self, name: str) -> list[ProfileEdge]:
+        """Measured calls made by *name*, heaviest first."""
+        return list(self._out.get(name, ()))
+
+    def hot_paths(self, top: int = 5, max_depth: int = 12) -> list[list[ProfileEntry]]:
+        """The heaviest call chains through the package.
+
+        Each path starts at a profiled symbol with no profiled package
+        caller (an entry point of the run, heaviest first) and repeatedly
+        follows the callee that received the most cumulative time.
+        """
+        heads = [e for e in self.hottest(top=None) if not self._callers.get(e.name)]
+        paths: list[list[ProfileEntry]] = []
+        for head in heads[:top]:
+            path = [head]
+            seen = {head.name}
+            while len(path) < max_depth:
+                edges = self._out.get(path[-1].name, ())
+                step = next((e for e in edges if e.callee not in seen), None)
+                if step is None:
+                    break
+                seen.add(step.callee)
+                path.append(self.entries[step.callee])
+            paths.append(path)
+        return paths
+
+    def dynamic_edges(self, call_graph: CallGraph) -> list[ProfileEdge]:
+        """Measured edges the static call graph does not contain."""
+        missing = []
+        for edge in self.edges:
+            if edge.caller not in call_graph or edge.callee not in call_graph.callees(edge.caller):
+                missing.append(edge)
+        return missing
+
+    # -- report sections -----------------------------------------------------
+
+    def iter_symbol_section(self, top: int = 50) -> Iterator[str]:
+        """Yield the "Profiled Symbols" section of the symbol index."""
+        yield from [
+            "",
+            "## Profiled Symbols",
+            "",
+            f"{len(self.entries)} symbols matched ({_share(self.matched_time, self.total_time)}"
+            f" of {self.total_time * 1000:.1f} ms own time).",
+            "",
+            "| Symbol | File | Calls | Total (ms) | Cumulative (ms) | Per Call (ms) |",
+            "|--------|------|-------|------------|-----------------|---------------|",
+        ]
+        for entry in self.hottest(top):
+            calls = (
+                str(entry.calls) if entry.calls == entry.primitive_calls
+                else f"{entry.calls}/{entry.primitive_calls}"
+            )
+            yield (
+                f"| `{entry.name}` | [{entry.file_path}]({entry.file_path}#L{entry.line_number})"
+                f" | {calls} | {entry.total_time * 1000:.2f}"
+                f" | {entry.cumulative_time * 1000:.2f} | {entry.per_call * 1000:.3f} |"
+            )
+
+    def iter_call_graph_section(self, call_graph: CallGraph, top: int = 20) -> Iterator[str]:
+        """Yield the "Hot Paths" and "Hottest Calls" sections of the call graph."""
+        yield from ["", "## Hot Paths", ""]
+        paths = self.hot_paths()
+        if not paths:
+            yield "_No profiled package functions._"
+        for i, path in enumerate(paths, 1):
+            chain = " → ".join(
+                f"`{e.name}` ({e.cumulative_time * 1000:.1f} ms)" for e in path
+            )
+            yield f"{i}. {chain}"
+
+        if not self.edges:
+            return
+        dynamic = {(e.caller, e.callee) for e in self.dynamic_edges(call_graph)}
+        yield from [
+            "",
+            "## Hottest Calls",
+            "",
+            "| Caller | Callee | Calls | Cumulative (ms) | Static |",
+            "|--------|--------|-------|-----------------|--------|",
+        ]
+        for edge in self.edges[:top]:
+            static = "no" if (edge.caller, edge.callee) in dynamic else "yes"
+            yield (
+                f"| `{edge.caller}` | `{edge.callee}` | {edge.calls}"
+                f" | {edge.cumulative_time * 1000:.2f} | {static} |"
+            )
+        if dynamic:
+            yield ""
+            yield (
+                f"{len(dynamic)} measured calls are missing from the static graph"
+                " (dynamic dispatch, callbacks or unresolved names)."
+            )
+
+
+def _share(part: float, whole: float) -> str:
+    return f"{part / whole:.0%}" if whole else "0%"
@@ -0,0 +1,267 @@
+"""
+Sharded output for the code map generator.
+
+Instead of one combined document, :meth:`CodeMapGenerator.write_shards`
+writes one markdown document per (sub)package plus a small top-level
+index.  Every shard is stamped with a fingerprint of the source files it
+covers; a manifest of those fingerprints lets later runs skip shards
+whose sources did not change, so regeneration cost scales with the size
+of the change rather than the size of the package.
+
+Layout::
+
+    <output_dir>/index.md
+    <output_dir>/shards/<package.dotted.name>.md
+    <output_dir>/shards/.manifest.json
+"""
+
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from dev_tools.codemap_generator.extractor import EXTRACTOR_VERSION, module_name_for
+from dev_tools.codemap_generator.index import CLASS_TYPES, FUNCTION_TYPES, METHOD_TYPES
+from dev_tools.codemap_generator.models import CallInfo, EntryPoint, ImportInfo, SymbolInfo
+
+if TYPE_CHECKING:
+    from dev_tools.codemap_generator.generator import CodeMapGenerator
+
+#: Bump when the rendered shard layout changes, so every shard is rebuilt.
+SHARD_FORMAT_VERSION = 1
+
+#: Subdirectory of the output directory that holds the shard documents.
+SHARD_DIR_NAME = "shards"
+
+#: Top-level index document written next to the shard directory.
+INDEX_FILE_NAME = "index.md"
+
+MANIFEST_FILE_NAME = ".manifest.json"
+
+
+@dataclass
+class Shard:  # pylint: disable=too-many-instance-attributes
+    """The records of one (sub)package, ready to render.
+
+    Plain, picklable data so shards can be rendered in worker processes.
+    """
+
+    name: str  # dotted package name, e.g. ``pkg.sub``
+    file_paths: list[str] = field(default_factory=list)
+    content_hashes: dict[str, str] = field(default_factory=dict)
+    docstrings: dict[str, str] = field(default_factory=dict)
+    symbols: list[SymbolInfo] = field(default_factory=list)
+    imports: list[ImportInfo] = field(default_factory=list)
+    calls: list[CallInfo] = field(default_factory=list)
+    entry_points: list[EntryPoint] = field(default_factory=list)
+
+    @property
+    def file_name(self) -> str:
+        """The shard's document name inside :data:`SHARD_DIR_NAME`."""
+        return f"{self.name}.md"
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the shard's sources and the renderer/extractor versions."""
+        digest = hashlib.sha256(
+            f"shard:{SHARD_FORMAT_VERSION}:{EXTRACTOR_VERSION}:{self.name}\n".encode()
+        )
+        for file_path in self.file_paths:
+            digest.update(f"{file_path}\0{self.content_hashes.get(file_path, '')}\n".encode())
+        return digest.hexdigest()
+
+
+def shard_name_for(file_path: str, src_dir: str = "") -> str:
+    """Return the dotted name of the package that contains *file_path*."""
+    directory = file_path.rpartition("/")[0]
+    return module_name_for(f"{directory}/__init__.py", src_dir)
+
+
+def build_shards(generator: "CodeMapGenerator") -> list[Shard]:
+    """Group *generator*'s analysis results into per-package shards.
+
+    Every analyzed ``.py`` file belongs to the shard of its directory;
+    shards are returned sorted by name.
+    """
+    src_dir = generator.src_root.name
+    shards: dict[str, Shard] = {}
+    shard_of: dict[str, Shard] = {}
+
+    for file_path in sorted(generator.source_hashes):
+        if not file_path.endswith(".py"):
+            continue
+        name = shard_name_for(file_path, src_dir)
+        shard = shards.get(name)
+        if shard is None:
+            shard = shards[name] = Shard(name)
+        shard.file_paths.append(file_path)
+        shard.content_hashes[file_path] = generator.source_hashes[file_path]
+        docstring = generator.module_docstrings.get(
+            file_path.removesuffix(".py").replace("/", ".")
+        )
+        if docstring:
+            shard.docstrings[file_path] = docstring
+        shard_of[file_path] = shard
+
+    for sym in generator.symbols:
+        if sym.file_path in shard_of:
+            shard_of[sym.file_path].symbols.append(sym)
+    for imp in generator.imports:
+        if imp.file_path in shard_of:
+            shard_of[imp.file_path].imports.append(imp)
+    for call in generator.calls:
+        if call.file_path in shard_of:
+            shard_of[call.file_path].calls.append(call)
+    for ep in generator.entry_points:
+        if ep.file_path in shard_of:
+            shard_of[ep.file_path].entry_points.append(ep)
+
+    return [shards[name] for name in sorted(shards)]
+
+
+def _summary(docstring: Optional[str], width: int) -> str:
+    return docstring.split("\n")[0][:width] if docstring else "-"
+
+
+def _reference_lines(shard: Shard) -> list[str]:
+    """Return the imports, calls and entry point sections of a shard."""
+    lines: list[str] = []
+    if shard.imports:
+        imported: dict[str, set[str]] = defaultdict(set)
+        for imp in shard.imports:
+            imported[imp.module].add(imp.file_path.rpartition("/")[2])
+        lines.extend(["", "## Imports", "", "| Module | Imported In |", "|---|---|"])
+        for module, files in sorted(imported.items()):
+            lines.append(f"| `{module or '.'}` | {', '.join(sorted(files))} |")
+
+    if shard.calls:
+        callees: dict[str, set[str]] = defaultdict(set)
+        for call in shard.calls:
+            callees[call.caller].add(call.callee)
+        lines.extend(["", "## Calls", ""])
+        for caller, names in sorted(callees.items()):
+            lines.append(f"- `{caller}` → {', '.join(f'`{n}`' for n in sorted(names))}")
+
+    if shard.entry_points:
+        lines.extend(["", "## Entry Points", ""])
+        for ep in shard.entry_points:
+            lines.append(f"- [{ep.file_path}]({ep.file_path}) — {ep.entry_type}")
+
+    return lines
+
+
+def render_shard(shard: Shard) -> str:  # pylint: disable=too-many-locals
+    """Render one shard as a standalone markdown document.
+
+    Unlike the combined reports, shard tables are never truncated.
+    """
+    lines = [
+        f"# `{shard.name}`",
+        "",
+        f"> Auto-generated by `codemap_generator` from sources `{shard.fingerprint[:12]}`",
+        "> **Do not edit manually** — regenerate with `codemap-generator`",
+        "",
+        f"[Index](../{INDEX_FILE_NAME})",
+        "",
+        "## Modules",
+        "",
+    ]
+
+    counts: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for sym in shard.symbols:
+        counts[sym.file_path][sym.symbol_type] += 1
+    for file_path in shard.file_paths:
+        file_counts = counts[file_path]
+        class_count = sum(file_counts[t] for t in CLASS_TYPES)
+        func_count = sum(file_counts[t] for t in FUNCTION_TYPES)
+        symbol_info = []
+        if class_count:
+            symbol_info.append(f"{class_count} class{'es' if class_count > 1 else ''}")
+        if func_count:
+            symbol_info.append(f"{func_count} func{'s' if func_count > 1 else ''}")
+        symbol_str = f" ({', '.join(symbol_info)})" if symbol_info else ""
+        file_name = file_path.rpartition("/")[2]
+        lines.append(f"- **[{file_name}]({file_path})**{symbol_str}")
+        if file_path in shard.docstrings:
+            lines.append(f"  - {_summary(shard.docstrings[file_path], 80)}")
+
+    sections = (
+        ("Classes", "Class", CLASS_TYPES),
+        ("Functions", "Function", FUNCTION_TYPES),
+        ("Methods", "Class.Method", METHOD_TYPES),
+    )
+    for heading, column, types in sections:
+        members = [s for s in shard.symbols if s.symbol_type in types and s.is_public]
+        if not members:
+            continue
+        members.sort(key=lambda s: (s.file_path, s.parent_class or "", s.name))
+        lines.extend([
+            "",
+            f"## {heading}",
+            "",
+            f"| {column} | File | Line | Description |",
+            "|---|---|---|---|",
+        ])
+        for sym in members:
+            name = f"{sym.parent_class}.{sym.name}" if sym.parent_class else sym.name
+            prefix = "async " if "async" in sym.symbol_type else ""
+            lines.append(
+                f"| `{prefix}{name}` | [{sym.file_path}]({sym.file_path}#L{sym.line_number})"
+                f" | {sym.line_number} | {_summary(sym.docstring, 60)} |"
+            )
+
+    lines.extend(_reference_lines(shard))
+    lines.append("")
+    return "\n".join(lines)
+
+
+def render_index(generator: "CodeMapGenerator", shards: list[Shard]) -> str:
+    """Render the top-level index that links every shard."""
+    lines = [
+        f"# Code Map Index — {generator.package_name}",
+        "",
+        f"> Auto-generated by `codemap_generator` {generator.stamp()}",
+        "> **Do not edit manually** — regenerate with `codemap-generator`",
+        "",
+        "| Package | Modules | Classes | Functions | Methods |",
+        "|---------|---------|---------|-----------|---------|",
+    ]
+    for shard in shards:
+        type_counts: dict[str, int] = defaultdict(int)
+        for sym in shard.symbols:
+            type_counts[sym.symbol_type] += 1
+        lines.append(
+            f"| [`{shard.name}`]({SHARD_DIR_NAME}/{shard.file_name})"
+            f" | {len(shard.file_paths)}"
+            f" | {sum(type_counts[t] for t in CLASS_TYPES)}"
+            f" | {sum(type_counts[t] for t in FUNCTION_TYPES)}"
+            f" | {sum(type_counts[t] for t in METHOD_TYPES)} |"
+        )
+
+    console_scripts = [ep for ep in generator.entry_points if ep.entry_type == "console_script"]
+    if console_scripts:
+        lines.extend(["", "## Console Scripts", ""])
+        lines.extend(f"- {ep.description}" for ep in console_scripts)
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+def load_manifest(shard_dir: Path) -> dict[str, str]:
+    """Return the shard name → fingerprint map from the last run (or ``{}``)."""
+    try:
+        data = json.loads((shard_dir / MANIFEST_FILE_NAME).read_text(encoding="utf-8"))
+        shards = data["shards"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+    return shards if isinstance(shards, dict) else {}
+
+
+def save_manifest(shard_dir: Path, fingerprints: dict[str, str]) -> None:
+    """Persist the shard name → fingerprint map for the next run."""
+    (shard_dir / MANIFEST_FILE_NAME).write_text(
+        json.dumps({"shards": fingerprints}, indent=1, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
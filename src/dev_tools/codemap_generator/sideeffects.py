@@ -0,0 +1,318 @@
+"""
+Module-level side effects and static import-time weight.
+
+Everything at module level runs on first import, in every process that
+imports the module.  :func:`classify_module` looks only at that code — the
+module body, class bodies and the branches of module-level ``if``/``try``/
+``with`` blocks, never function bodies — and records each statement that
+does real work as a :class:`~dev_tools.codemap_generator.models.SideEffect`:
+
+========== ====== ==========================================================
+Kind       Weight Statement
+========== ====== ==========================================================
+``io``     5      file, network, subprocess or environment-file I/O
+``loop``   3      a ``for``/``while`` loop
+``import`` 3 / 1  an eager third-party import / a known-heavy stdlib import
+``call``   2      any other call (cheap factories such as ``TypeVar``,
+                  ``getLogger`` or ``re.compile`` are ignored)
+``literal`` 1+    a literal table, one point per 200 elements
+========== ====== ==========================================================
+
+Imports of the package itself, ``if TYPE_CHECKING:`` blocks and the
+``__main__`` block are not counted.  A module's *import-time weight* is
+the sum of its statements' weights; :func:`module_weights` also adds the
+weights of every package module it pulls in (from the
+:class:`~dev_tools.codemap_generator.depgraph.DependencyGraph`), which is
+what importing it actually costs.  Scores are static estimates for
+ranking lazy-loading work, not timings — see
+:mod:`~dev_tools.codemap_generator.importtime` for measurements.
+"""
+
+import ast
+import fnmatch
+import re
+import sys
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from dev_tools.codemap_generator.models import SideEffect
+from dev_tools.codemap_generator.perflint import snippet
+
+if TYPE_CHECKING:
+    from dev_tools.codemap_generator.depgraph import DependencyGraph
+
+#: Output file name of the import-time weight report.
+IMPORT_WEIGHT_FILE_NAME = "import-weight.md"
+
+#: Weight of each side-effect kind (``literal`` is per 200 elements).
+WEIGHTS: dict[str, int] = {"io": 5, "loop": 3, "import": 3, "call": 2, "literal": 1}
+
+#: Call targets (source text, ``fnmatch`` patterns) that do I/O.
+IO_CALLS: tuple[str, ...] = (
+    "open", "*.open", "io.open",
+    "*.read_text", "*.read_bytes", "*.write_text", "*.write_bytes",
+    "json.load", "pickle.load", "tomllib.load", "toml.load", "yaml.*load*",
+    "os.listdir", "os.scandir", "os.walk", "os.makedirs", "os.mkdir", "*.mkdir",
+    "glob.glob", "glob.iglob", "*.glob", "*.rglob", "*.iterdir",
+    "subprocess.*", "os.system", "os.popen",
+    "requests.*", "urllib.request.*", "socket.*", "sqlite3.connect",
+    "load_dotenv", "dotenv.load_dotenv", "logging.basicConfig", "*.fileConfig",
+)
+
+#: Calls that are cheap enough to ignore at module level.
+CHEAP_CALLS: tuple[str, ...] = (
+    "TypeVar", "typing.TypeVar", "ParamSpec", "NewType", "typing.NewType", "cast",
+    "namedtuple", "collections.namedtuple", "NamedTuple", "TypedDict",
+    "logging.getLogger", "getLogger", "re.compile", "object",
+    "frozenset", "set", "dict", "tuple", "list", "str", "int", "float", "bool",
+    "field", "dataclasses.field", "dataclass", "dataclasses.dataclass",
+    "property", "staticmethod", "classmethod", "Path", "pathlib.Path",
+    "*.__file__", "ContextVar", "contextvars.ContextVar", "Enum", "IntEnum",
+    "*.setdefault", "*.append", "*.extend", "*.update", "__all__.*",
+)
+
+#: Standard-library modules (and their submodules) that are noticeably slow to import.
+HEAVY_STDLIB = frozenset({
+    "asyncio", "concurrent.futures", "ctypes", "decimal", "doctest", "email",
+    "http.client", "http.server", "multiprocessing", "pydoc", "sqlite3", "ssl",
+    "tarfile", "tkinter", "unittest", "urllib.request", "xml.dom", "xml.etree",
+    "xmlrpc", "zipfile",
+})
+
+#: Elements of a literal table per weight point.
+LITERAL_ELEMENTS_PER_POINT = 200
+
+_IO = re.compile("|".join(fnmatch.translate(p) for p in IO_CALLS))
+_CHEAP = re.compile("|".join(fnmatch.translate(p) for p in CHEAP_CALLS))
+_LITERALS = (ast.List, ast.Tuple, ast.Set, ast.Dict)
+
+
+def _is_heavy_stdlib(module: str) -> bool:
+    parts = module.split(".")
+    return any(".".join(parts[:i]) in HEAVY_STDLIB for i in range(1, len(parts) + 1))
+
+
+class _Classifier:
+    """Collects the side effects of one module's import-time code."""
+
+    def __init__(self, file_path: str, skip: Callable[[ast.expr], bool]) -> None:
+        self.file_path = file_path
+        self.skip = skip
+        self.effects: list[SideEffect] = []
+
+    def add(  # pylint: disable=too-many-arguments
+        self,
+        kind: str,
+        node: ast.AST,
+        scope: str,
+        detail: str,
+        *,
+        weight: int = 0,
+        target: Optional[str] = None,
+    ) -> None:
+        """Record one side effect."""
+        self.effects.append(
+            SideEffect(
+                kind=kind,
+                file_path=self.file_path,
+                line_number=getattr(node, "lineno", 0),
+                scope=scope,
+                detail=detail,
+                weight=weight or WEIGHTS[kind],
+                target=target,
+            )
+        )
+
+    def body(self, statements: Iterable[ast.stmt], scope: str) -> None:
+        """Classify a block of statements that runs at import time."""
+        for stmt in statements:
+            self.statement(stmt, scope)
+
+    def statement(self, stmt: ast.stmt, scope: str) -> None:  # pylint: disable=too-many-branches
+        """Classify one statement (recursing into blocks that run at import)."""
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return
+        if isinstance(stmt, ast.ClassDef):
+            self.body(stmt.body, f"{scope}.{stmt.name}" if scope else stmt.name)
+        elif isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            self.imports(stmt, scope)
+        elif isinstance(stmt, ast.If):
+            if self.skip(stmt.test):
+                self.body(stmt.orelse, scope)
+                return
+            self.calls(stmt.test, stmt, scope)
+            self.body(stmt.body, scope)
+            self.body(stmt.orelse, scope)
+        elif isinstance(stmt, ast.Try):
+            self.body(stmt.body, scope)
+            for handler in stmt.handlers:
+                self.body(handler.body, scope)
+            self.body(stmt.orelse, scope)
+            self.body(stmt.finalbody, scope)
+        elif isinstance(stmt, ast.With):
+            for item in stmt.items:
+                self.calls(item.context_expr, stmt, scope)
+            self.body(stmt.body, scope)
+        elif isinstance(stmt, (ast.For, ast.While, ast.AsyncFor)):
+            header = (
+                f"while {snippet(stmt.test)}" if isinstance(stmt, ast.While)
+                else f"for {snippet(stmt.target, 20)} in {snippet(stmt.iter)}"
+            )
+            self.add("loop", stmt, scope, f"`{header}`")
+        elif isinstance(stmt, (ast.Expr, ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+                return  # docstring
+            if stmt.value is not None:
+                self.literal(stmt.value, stmt, scope)
+                self.calls(stmt.value, stmt, scope)
+
+    def imports(self, stmt: ast.Import | ast.ImportFrom, scope: str) -> None:
+        """Flag eager imports of third-party and heavy stdlib modules.
+
+        Imports of the analyzed packages look third-party here; they are
+        dropped by :func:`module_weights`, which knows the package names.
+        """
+        if isinstance(stmt, ast.ImportFrom):
+            if stmt.level:
+                return
+            modules = [stmt.module or ""]
+        else:
+            modules = [alias.name for alias in stmt.names]
+        for module in modules:
+            top = module.partition(".")[0]
+            if not top or top == "__future__":
+                continue
+            if top not in sys.stdlib_module_names:
+                self.add("import", stmt, scope, f"`{module}`", target=module)
+            elif _is_heavy_stdlib(module):
+                self.add("import", stmt, scope, f"stdlib `{module}`", weight=1, target=module)
+
+    def calls(self, expr: ast.expr, stmt: ast.stmt, scope: str) -> None:
+        """Record the most expensive call in *expr* (one entry per statement)."""
+        kind: Optional[str] = None
+        for node in ast.walk(expr):
+            if not isinstance(node, ast.Call):
+                continue
+            name = ast.unparse(node.func)
+            if _IO.fullmatch(name):
+                kind = "io"
+                break
+            if not _CHEAP.fullmatch(name):
+                kind = "call"
+        if kind is not None:
+            self.add(kind, stmt, scope, f"`{snippet(stmt)}`")
+
+    def literal(self, expr: ast.expr, stmt: ast.stmt, scope: str) -> None:
+        """Record literal tables of at least :data:`LITERAL_ELEMENTS_PER_POINT` elements."""
+        if not isinstance(expr, _LITERALS):
+            return
+        elements = sum(1 for node in ast.walk(expr) if isinstance(node, ast.Constant))
+        points = elements // LITERAL_ELEMENTS_PER_POINT
+        if points:
+            target = snippet(stmt.targets[0] if isinstance(stmt, ast.Assign) else stmt, 30)
+            self.add("literal", stmt, scope, f"`{target}` ({elements} elements)", weight=points)
+
+
+def classify_module(
+    tree: ast.Module, file_path: str, skip: Callable[[ast.expr], bool]
+) -> list[SideEffect]:
+    """Return the side effects of importing the module parsed as *tree*.
+
+    Args:
+        tree: The parsed module.
+        file_path: Recorded path (``src/<package>/...``).
+        skip: Whether an ``if`` test guards code that does not run on
+            import (``TYPE_CHECKING``, the ``__main__`` check); only its
+            ``else`` branch is classified.
+    """
+    classifier = _Classifier(file_path, skip)
+    classifier.body(tree.body, "")
+    return classifier.effects
+
+
+@dataclass
+class ModuleWeight:
+    """Static import-time weight of one module."""
+
+    module: str
+    file_path: str
+    own: int  # sum of the module's own side-effect weights
+    cumulative: int = 0  # own plus every package module it imports, transitively
+    effects: list[SideEffect] = field(default_factory=list)
+
+    @property
+    def counts(self) -> Counter[str]:
+        """Side effects per kind."""
+        return Counter(effect.kind for effect in self.effects)
+
+
+def module_weights(
+    effects: Iterable[SideEffect],
+    modules: dict[str, str],
+    graph: Optional["DependencyGraph"] = None,
+) -> list[ModuleWeight]:
+    """Aggregate side effects per module, heaviest (cumulative) first.
+
+    Args:
+        effects: All recorded side effects.
+        modules: Recorded file path → dotted module name, for every module.
+        graph: Adds the weight of each module's import-time closure.
+    """
+    weights = {
+        module: ModuleWeight(module, file_path, 0) for file_path, module in modules.items()
+    }
+    local = {module.partition(".")[0] for module in weights}
+    for effect in effects:
+        entry = weights.get(modules.get(effect.file_path, ""))
+        if effect.target is not None and effect.target.partition(".")[0] in local:
+            continue
+        if entry is not None:
+            entry.effects.append(effect)
+            entry.own += effect.weight
+    for entry in weights.values():
+        pulled = graph.closure(entry.module) if graph is not None and entry.module in graph else ()
+        entry.cumulative = entry.own + sum(weights[m].own for m in pulled if m in weights)
+    return sorted(
+        (w for w in weights.values() if w.cumulative),
+        key=lambda w: (-w.cumulative, -w.own, w.module),
+    )
+
+
+def iter_report(weights: list[ModuleWeight], top: int = 15) -> Iterator[str]:
+    """Yield the markdown body of the import-time weight report (without a header)."""
+    if not weights:
+        yield "_No module-level side effects found._"
+        return
+    kinds = list(WEIGHTS)
+    yield from [
+        "Static estimate of the work each module does when first imported"
+        f" (weights: {', '.join(f'{k} {w}' for k, w in WEIGHTS.items())}"
+        f" per {LITERAL_ELEMENTS_PER_POINT} elements).",
+        "",
+        "## Modules",
+        "",
+        f"| Module | Own | With Imports | {' | '.join(k.title() for k in kinds)} |",
+        f"|--------|-----|--------------|{'|'.join('-' * (len(k) + 2) for k in kinds)}|",
+    ]
+    for weight in weights:
+        counts = weight.counts
+        yield (
+            f"| `{weight.module}` | {weight.own} | {weight.cumulative}"
+            f" | {' | '.join(str(counts[k] or '-') for k in kinds)} |"
+        )
+
+    yield from ["", "## Offending Statements", ""]
+    offenders = sorted((w for w in weights if w.effects), key=lambda w: (-w.own, w.module))
+    for weight in offenders[:top]:
+        yield f"### `{weight.module}` ({weight.own})"
+        yield ""
+        for effect in sorted(weight.effects, key=lambda e: (-e.weight, e.line_number)):
+            location = f"{effect.file_path}:{effect.line_number}"
+            scope = f" in `{effect.scope}`" if effect.scope else ""
+            yield (
+                f"- [{location}]({effect.file_path}#L{effect.line_number})"
+                f" — {effect.kind} ({effect.weight}){scope}: {effect.detail}"
+            )
+        yield ""
@@ -0,0 +1,280 @@
+"""
+SQLite-backed symbol store for the code map generator.
+
+Persists symbols, imports, calls and entry points into an indexed SQLite
+database so that lookups ("who calls X", "where is X defined", "what does
+module Y import") answer in milliseconds without re-parsing and without the
+truncation of the markdown reports.
+
+Usage::
+
+    gen = CodeMapGenerator(Path("src"), "my_package")
+    gen.analyze()
+    gen.write_database(Path("codemap.sqlite"))
+
+    with SymbolStore(Path("codemap.sqlite")) as store:
+        for row in store.callers_of("process"):
+            print(row["file_path"], row["line_number"], row["caller"])
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Optional
+
+from dev_tools.codemap_generator.extractor import (
+    EXTRACTOR_VERSION,
+    absolute_import,
+    module_name_for,
+)
+
+if TYPE_CHECKING:
+    from dev_tools.codemap_generator.generator import CodeMapGenerator
+
+#: Bump when the table layout changes.
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE modules (
+    module TEXT PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    docstring TEXT
+);
+CREATE TABLE symbols (
+    name TEXT NOT NULL,
+    qualified_name TEXT NOT NULL,
+    symbol_type TEXT NOT NULL,
+    module TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    line_number INTEGER NOT NULL,
+    parent_class TEXT,
+    is_public INTEGER NOT NULL,
+    docstring TEXT,
+    decorators TEXT NOT NULL,
+    parameters TEXT NOT NULL
+);
+CREATE TABLE imports (
+    module TEXT NOT NULL,
+    names TEXT NOT NULL,
+    is_from_import INTEGER NOT NULL,
+    source_module TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    line_number INTEGER NOT NULL
+);
+CREATE TABLE calls (
+    caller TEXT NOT NULL,
+    caller_name TEXT NOT NULL,
+    callee TEXT NOT NULL,
+    module TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    line_number INTEGER NOT NULL
+);
+CREATE TABLE entry_points (
+    file_path TEXT NOT NULL,
+    entry_type TEXT NOT NULL,
+    description TEXT
+);
+CREATE INDEX idx_symbols_name ON symbols (name);
+CREATE INDEX idx_symbols_qualified ON symbols (qualified_name);
+CREATE INDEX idx_symbols_module ON symbols (module);
+CREATE INDEX idx_imports_source ON imports (source_module);
+CREATE INDEX idx_imports_module ON imports (module);
+CREATE INDEX idx_calls_callee ON calls (callee);
+CREATE INDEX idx_calls_caller ON calls (caller);
+CREATE INDEX idx_calls_caller_name ON calls (caller_name);
+"""
+
+
+class SymbolStore:
+    """Read/write access to a code map SQLite database.
+
+    Query methods return lists of :class:`sqlite3.Row` (mapping-style access
+    by column name), ordered by file and line.
+
+    Args:
+        path: Database file.  Created on :meth:`write` if missing.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # -- connection management ---------------------------------------------
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The open connection (opened lazily)."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+    def close(self) -> None:
+        """Close the connection if open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "SymbolStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    # -- writing -------------------------------------------------------------
+
+    def write(self, generator: "CodeMapGenerator") -> None:
+        """Replace the database contents with *generator*'s analysis results."""
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+
+        src_dir = generator.src_root.name
+        modules: dict[str, str] = {}
+
+        def module_of(file_path: str) -> str:
+            module = modules.get(file_path)
+            if module is None:
+                module = modules[file_path] = module_name_for(file_path, src_dir)
+            return module
+
+        conn = self.conn
+        with conn:
+            conn.executescript(_SCHEMA)
+            conn.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [
+                    ("schema_version", str(SCHEMA_VERSION)),
+                    ("extractor_version", str(EXTRACTOR_VERSION)),
+                    ("package", generator.package_name),
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        s.name,
+                        f"{s.parent_class}.{s.name}" if s.parent_class else s.name,
+                        s.symbol_type,
+                        module_of(s.file_path),
+                        s.file_path,
+                        s.line_number,
+                        s.parent_class,
+                        int(s.is_public),
+                        s.docstring,
+                        json.dumps(list(s.decorators)),
+                        json.dumps(list(s.parameters)),
+                    )
+                    for s in generator.symbols
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO imports VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        # resolved, so relative imports are found by importers_of
+                        absolute_import(
+                            module_of(i.file_path),
+                            i.file_path.rpartition("/")[2] == "__init__.py",
+                            i.module,
+                            i.level,
+                        ),
+                        json.dumps(list(i.names)),
+                        int(i.is_from_import),
+                        module_of(i.file_path),
+                        i.file_path,
+                        i.line_number,
+                    )
+                    for i in generator.imports
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO calls VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        c.caller,
+                        c.caller.rpartition(".")[2],
+                        c.callee,
+                        module_of(c.file_path),
+                        c.file_path,
+                        c.line_number,
+                    )
+                    for c in generator.calls
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO entry_points VALUES (?, ?, ?)",
+                ((e.file_path, e.entry_type, e.description) for e in generator.entry_points),
+            )
+            for dotted in generator.module_docstrings:
+                module_of(dotted.replace(".", "/") + ".py")
+            file_docstrings = {
+                path: generator.module_docstrings.get(
+                    path.removesuffix(".py").replace("/", ".")
+                )
+                for path in modules
+            }
+            conn.executemany(
+                "INSERT OR IGNORE INTO modules VALUES (?, ?, ?)",
+                ((module, path, file_docstrings[path]) for path, module in modules.items()),
+            )
+
+    # -- queries -------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        return self.conn.execute(sql, params).fetchall()
+
+    def meta(self) -> dict[str, str]:
+        """Return the metadata table as a dict."""
+        return {row["key"]: row["value"] for row in self._query("SELECT key, value FROM meta")}
+
+    def definitions(self, name: str) -> list[sqlite3.Row]:
+        """Where is *name* defined?  Accepts ``name`` or ``Class.method``."""
+        return self._query(
+            "SELECT * FROM symbols WHERE name = ? OR qualified_name = ?"
+            " ORDER BY file_path, line_number",
+            (name, name),
+        )
+
+    def callers_of(self, name: str) -> list[sqlite3.Row]:
+        """Who calls *name* (bare callee name)?"""
+        return self._query(
+            "SELECT * FROM calls WHERE callee = ? ORDER BY file_path, line_number",
+            (name.rpartition(".")[2],),
+        )
+
+    def callees_of(self, name: str) -> list[sqlite3.Row]:
+        """What does *name* call?  Accepts ``func``, ``Class.method`` or ``method``."""
+        column = "caller" if "." in name else "caller_name"
+        return self._query(
+            f"SELECT * FROM calls WHERE {column} = ? ORDER BY file_path, line_number",
+            (name,),
+        )
+
+    def imports_of(self, module: str) -> list[sqlite3.Row]:
+        """What does *module* (dotted name, e.g. ``pkg.sub.mod``) import?"""
+        return self._query(
+            "SELECT * FROM imports WHERE source_module = ? ORDER BY line_number",
+            (module,),
+        )
+
+    def importers_of(self, module: str) -> list[sqlite3.Row]:
+        """Which modules import *module* (or a submodule of it)?"""
+        # ``'.' < '/'``, so the range covers exactly the ``module.*`` names
+        # while still using the index.
+        return self._query(
+            "SELECT * FROM imports WHERE module = ? OR (module > ? AND module < ?)"
+            " ORDER BY file_path, line_number",
+            (module, module + ".", module + "/"),
+        )
+
+    def entry_points(self) -> list[sqlite3.Row]:
+        """All detected entry points."""
+        return self._query("SELECT * FROM entry_points ORDER BY file_path, entry_type")
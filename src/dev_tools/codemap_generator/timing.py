@@ -0,0 +1,175 @@
+"""
+Per-phase timing and memory instrumentation for a code map run.
+
+Pass a :class:`PhaseTimer` to
+:class:`~dev_tools.codemap_generator.generator.CodeMapGenerator`
+(``timer=``), or run ``codemap-generator --profile``, to see where a run
+spends its time:
+
+* wall time of each phase — file discovery, extraction, merging, building
+  the call and dependency graphs, rendering each report, writing files;
+* read, ``ast.parse`` and record-extraction time of every freshly parsed
+  file (summed over files, so with several workers the sum exceeds the
+  extraction wall time), and the slowest files;
+* throughput of the extraction phase and the peak resident set size of
+  the process and of its worker processes.
+
+Files loaded from the extraction cache were not parsed in this run and
+have no per-file timing.
+
+Usage::
+
+    timer = PhaseTimer()
+    gen = CodeMapGenerator(Path("src"), "my_package", timer=timer)
+    gen.analyze()
+    gen.write_outputs(out)
+    print("\\n".join(timer.iter_report()))
+    timer.write_json(out / PROFILE_FILE_NAME)
+"""
+
+import json
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional
+
+from dev_tools.codemap_generator.models import FileAnalysis, ParseTiming
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+#: Default file name of the JSON sidecar.
+PROFILE_FILE_NAME = "codemap-profile.json"
+
+#: Default number of slowest files reported.
+DEFAULT_TOP_FILES = 10
+
+#: Phase whose wall time the throughput is computed over.
+EXTRACT_PHASE = "extract files"
+
+
+def peak_rss(children: bool = False) -> Optional[int]:
+    """Peak resident set size in bytes, where the platform reports it.
+
+    With *children*, of the largest finished child process (pool workers).
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # kB elsewhere
+
+
+class PhaseTimer:
+    """Collects phase wall times and per-file parse times of one run.
+
+    Attributes:
+        phases: Phase name → accumulated wall seconds, in first-run order.
+        files: Recorded path and timing of every freshly parsed file.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.files: list[tuple[str, ParseTiming]] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the ``with`` block to phase *name*."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record(self, analyses: Iterable[FileAnalysis]) -> None:
+        """Keep the parse timing of each analysis that has one."""
+        self.files.extend(
+            (analysis.file_path, analysis.timing)
+            for analysis in analyses if analysis.timing is not None
+        )
+
+    def slowest(self, top: int = DEFAULT_TOP_FILES) -> list[tuple[str, ParseTiming]]:
+        """The *top* files with the longest read + parse + extract time."""
+        return sorted(
+            self.files, key=lambda item: (-_total(item[1]), item[0])
+        )[:top]
+
+    def file_totals(self) -> dict[str, float]:
+        """Read, parse and extract seconds summed over all parsed files."""
+        return {
+            step: sum(getattr(timing, step) for _, timing in self.files)
+            for step in ("read", "parse", "extract")
+        }
+
+    def throughput(self) -> Optional[tuple[float, float]]:
+        """Files and bytes per second of the extraction phase, once it ran."""
+        seconds = self.phases.get(EXTRACT_PHASE)
+        if not seconds:
+            return None
+        size = sum(timing.size for _, timing in self.files)
+        return len(self.files) / seconds, size / seconds
+
+    def to_dict(self, top: int = DEFAULT_TOP_FILES) -> dict[str, Any]:
+        """JSON-serialisable summary (seconds and bytes)."""
+        throughput = self.throughput()
+        return {
+            "wall_time": time.perf_counter() - self._started,
+            "phases": dict(self.phases),
+            "files_parsed": len(self.files),
+            "file_totals": self.file_totals(),
+            "slowest_files": [
+                {"file_path": path, **asdict(timing)} for path, timing in self.slowest(top)
+            ],
+            "throughput": None if throughput is None else {
+                "files_per_second": throughput[0], "bytes_per_second": throughput[1]
+            },
+            "peak_rss": peak_rss(),
+            "peak_rss_workers": peak_rss(children=True) or None,
+        }
+
+    def write_json(self, path: Path, top: int = DEFAULT_TOP_FILES) -> Path:
+        """Write :meth:`to_dict` to *path*."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(top), indent=2) + "\n", encoding="utf-8")
+        return path
+
+    def iter_report(self, top: int = DEFAULT_TOP_FILES) -> Iterator[str]:
+        """Yield a plain-text report for the terminal."""
+        data = self.to_dict(top)
+        yield f"Profile ({data['wall_time']:.3f}s wall):"
+        for name, seconds in data["phases"].items():
+            yield f"   {name:<40} {seconds * 1000:10.1f} ms"
+        if self.files:
+            totals = data["file_totals"]
+            yield (
+                f"   Per file, summed over {len(self.files)} parsed files:"
+                f" read {totals['read'] * 1000:.1f} ms, parse {totals['parse'] * 1000:.1f} ms,"
+                f" extract {totals['extract'] * 1000:.1f} ms"
+            )
+            yield f"   Slowest {len(data['slowest_files'])} files:"
+            for path, timing in self.slowest(top):
+                yield (
+                    f"     {_total(timing) * 1000:8.1f} ms  {path}"
+                    f" ({timing.size:,} bytes; parse {timing.parse * 1000:.1f} ms)"
+                )
+        if data["throughput"] is not None:
+            yield (
+                f"   Throughput: {data['throughput']['files_per_second']:.0f} files/s,"
+                f" {data['throughput']['bytes_per_second'] / 2**20:.2f} MiB/s"
+            )
+        if data["peak_rss"] is not None:
+            workers = data["peak_rss_workers"]
+            yield (
+                f"   Peak RSS: {data['peak_rss'] / 2**20:.1f} MiB"
+                + (f" (largest worker: {workers / 2**20:.1f} MiB)" if workers else "")
+            )
+
+
+def _total(timing: ParseTiming) -> float:
+    return timing.read + timing.parse + timing.extract
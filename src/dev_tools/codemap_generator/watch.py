@@ -0,0 +1,247 @@
+"""
+Watch mode: keep a package's code map current while it is being edited.
+
+:class:`CodeMapWatcher` keeps every file's
+:class:`~dev_tools.codemap_generator.models.FileAnalysis` in memory and
+polls the package with ``stat`` snapshots (modification time and size of
+each ``.py`` file, no reads).  When a snapshot differs from the previous
+one:
+
+* only added and modified files are parsed again;
+* the generator's record lists are rebuilt from the kept results, which
+  is a merge, not a parse;
+* the kinds of results that actually changed (the :data:`FACETS`) decide
+  which reports are affected, so editing a docstring leaves the call graph
+  and dependency graph alone, and saving a file unchanged affects nothing.
+
+Usage::
+
+    gen = CodeMapGenerator(Path("src"), "my_package")
+    watcher = CodeMapWatcher(gen)
+    watcher.load()
+    gen.write_outputs(out)
+    for update in watcher.updates():
+        gen.write_outputs(out, only=update.outputs)
+"""
+
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from itertools import repeat
+from pathlib import Path
+from typing import Optional
+
+from dev_tools.codemap_generator.generator import (
+    CodeMapGenerator,
+    parallel_map,
+    read_pyproject,
+)
+from dev_tools.codemap_generator.guards import extract_guarded
+from dev_tools.codemap_generator.models import FileAnalysis
+
+#: Default seconds between two snapshots.
+DEFAULT_POLL_INTERVAL = 0.25
+
+#: Fewer changed files than this are re-parsed in-process; starting a
+#: process pool costs more than parsing them.
+_SERIAL_LIMIT = 32
+
+#: Record facet → how to read it from a merged file result.
+_RECORDS: dict[str, Callable[[FileAnalysis], object]] = {
+    "symbols": lambda analysis: analysis.symbols,
+    "imports": lambda analysis: analysis.imports,
+    "calls": lambda analysis: (analysis.calls, analysis.module_calls),
+    "entry_points": lambda analysis: analysis.entry_points,
+    "docstring": lambda analysis: analysis.docstring,
+    "findings": lambda analysis: analysis.findings,
+    "side_effects": lambda analysis: analysis.side_effects,
+}
+
+#: Every facet: the record facets above, ``files`` (a file appeared,
+#: disappeared or was skipped) and ``sources`` (its bytes changed at all).
+FACETS = frozenset({*_RECORDS, "files", "sources"})
+
+#: What an unparsed (skipped, failed or deleted) file contributes.
+_NOTHING = FileAnalysis("", "")
+
+#: Python file → ``(st_mtime_ns, st_size)``.
+Snapshot = dict[Path, tuple[int, int]]
+
+
+def take_snapshot(package_root: Path) -> Snapshot:
+    """Stat every Python file under *package_root* (skipping ``__pycache__``)."""
+    found: Snapshot = {}
+    for dir_path, dir_names, file_names in os.walk(package_root):
+        dir_names[:] = [name for name in dir_names if name != "__pycache__"]
+        for name in file_names:
+            if name.endswith(".py"):
+                path = Path(dir_path, name)
+                try:
+                    stat = path.stat()
+                except OSError:  # deleted since the directory was listed
+                    continue
+                found[path] = (stat.st_mtime_ns, stat.st_size)
+    return found
+
+
+def _stat(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def changed_facets(old: Optional[FileAnalysis], new: Optional[FileAnalysis]) -> set[str]:
+    """The facets in which two results for one file differ (``None``: no file)."""
+    facets: set[str] = set()
+    if (old is None, old and old.skipped) != (new is None, new and new.skipped):
+        facets.add("files")
+    if (old and old.content_hash) != (new and new.content_hash):
+        facets.add("sources")
+    before, after = _merged(old), _merged(new)
+    facets.update(name for name, part in _RECORDS.items() if part(before) != part(after))
+    return facets
+
+
+def _merged(analysis: Optional[FileAnalysis]) -> FileAnalysis:
+    """What :meth:`CodeMapGenerator.load_analyses` takes from *analysis*."""
+    if analysis is None or analysis.skipped is not None or analysis.error is not None:
+        return _NOTHING
+    return analysis
+
+
+@dataclass
+class WatchUpdate:
+    """What one poll found.
+
+    Attributes:
+        changed: Files added or modified since the previous poll (re-parsed).
+        removed: Files deleted since the previous poll.
+        facets: Kinds of results that changed (see :data:`FACETS`); empty
+            when files were only touched.
+        outputs: Names of the reports the change affects, in
+            :attr:`CodeMapGenerator.OUTPUTS` order.
+        seconds: Time spent re-parsing and reloading.
+    """
+
+    changed: list[Path]
+    removed: list[Path]
+    facets: set[str]
+    outputs: list[str]
+    seconds: float
+
+
+class CodeMapWatcher:
+    """Keeps a generator's analysis in step with its package on disk.
+
+    Args:
+        generator: Generator to keep current.  Its workers, cache and
+            resource limits are used for :meth:`load`; later re-parses
+            bypass the cache.
+
+    Raises:
+        ValueError: If *generator* analyzes a git revision.
+    """
+
+    def __init__(self, generator: CodeMapGenerator) -> None:
+        if generator.revision is not None:
+            raise ValueError("A git revision cannot be watched")
+        self.generator = generator
+        self.package_root = generator.src_root / generator.package_name
+        self._pyproject_path = generator.src_root.parent / "pyproject.toml"
+        self._snapshot: Snapshot = {}
+        self._pyproject_stat: Optional[tuple[int, int]] = None
+        self._pyproject: Optional[str] = None
+        self._analyses: dict[Path, FileAnalysis] = {}
+
+    def load(self) -> None:
+        """Analyze the whole package, as :meth:`CodeMapGenerator.analyze` does.
+
+        Raises:
+            FileNotFoundError: If the package does not exist.
+        """
+        if not self.package_root.exists():
+            raise FileNotFoundError(f"Package not found: {self.package_root}")
+        self._snapshot = take_snapshot(self.package_root)
+        self._pyproject_stat = _stat(self._pyproject_path)
+        self._pyproject = read_pyproject(self.generator.src_root)
+        files = sorted(self._snapshot)
+        self._analyses = dict(zip(files, self.generator.extract_files(files)))
+        self._reload()
+
+    def poll(self) -> Optional[WatchUpdate]:
+        """Re-analyze whatever changed since the last poll; ``None`` if nothing did."""
+        snapshot = take_snapshot(self.package_root)
+        pyproject_stat = _stat(self._pyproject_path)
+        if snapshot == self._snapshot and pyproject_stat == self._pyproject_stat:
+            return None
+        started = time.perf_counter()
+        changed = sorted(
+            path for path, stat in snapshot.items() if self._snapshot.get(path) != stat
+        )
+        removed = sorted(path for path in self._snapshot if path not in snapshot)
+        added = any(path not in self._snapshot for path in changed)
+        self._snapshot = snapshot
+
+        facets: set[str] = set()
+        for path, analysis in zip(changed, self._extract(changed)):
+            facets |= changed_facets(self._analyses.get(path), analysis)
+            self._analyses[path] = analysis
+        for path in removed:
+            facets |= changed_facets(self._analyses.pop(path), None)
+        if added:
+            self._analyses = dict(sorted(self._analyses.items()))
+
+        if pyproject_stat != self._pyproject_stat:
+            self._pyproject_stat = pyproject_stat
+            pyproject = read_pyproject(self.generator.src_root)
+            if pyproject != self._pyproject:
+                self._pyproject = pyproject
+                facets |= {"entry_points", "sources"}
+
+        if facets:
+            self._reload()
+        return WatchUpdate(
+            changed, removed, facets, self.affected_outputs(facets),
+            time.perf_counter() - started,
+        )
+
+    def updates(self, interval: float = DEFAULT_POLL_INTERVAL) -> Iterator[WatchUpdate]:
+        """Poll every *interval* seconds and yield each update, forever."""
+        while True:
+            time.sleep(interval)
+            update = self.poll()
+            if update is not None:
+                yield update
+
+    def affected_outputs(self, facets: Iterable[str]) -> list[str]:
+        """Names of the reports to re-render after *facets* changed.
+
+        In deterministic mode every report header carries a digest of all
+        sources, so any source change affects every report.
+        """
+        facets = set(facets)
+        if self.generator.deterministic and "sources" in facets:
+            return [name for _, name in self.generator.OUTPUTS]
+        return [
+            name for _, name in self.generator.OUTPUTS
+            if facets & self.generator.OUTPUT_SOURCES[name]
+        ]
+
+    def _extract(self, files: list[Path]) -> list[FileAnalysis]:
+        gen = self.generator
+        return parallel_map(
+            gen.workers if len(files) >= _SERIAL_LIMIT else 1,
+            extract_guarded,
+            files,
+            repeat(gen.src_root.parent),
+            repeat(None),
+            repeat(gen.limits),
+        )
+
+    def _reload(self) -> None:
+        """Rebuild the generator's results from the kept per-file results."""
+        self.generator.reset()
+        self.generator.load_analyses(self._analyses.values(), self._pyproject)
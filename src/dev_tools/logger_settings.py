@@ -9,7 +9,9 @@ import atexit
 from datetime import datetime
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 import sys
 from pathlib import Path
 from types import TracebackType
@@ -22,6 +24,14 @@ from .debug_tools import is_debug_on
 # record a non-zero status that ``log_exit_code`` reads at interpreter shutdown.
 _exit_state: dict[str, int] = {"status": 0}
 
+#: Default capacity of the async logging queue (records).
+DEFAULT_QUEUE_SIZE = 10_000
+
+#: What a log call does when the async logging queue is full: ``drop`` the
+#: record (counted, and reported when the queue is drained) or ``block``
+#: until the listener has made room.
+QUEUE_OVERFLOW_POLICIES = ("drop", "block")
+
 
 def is_same_day_append_enabled(override: bool | None = None) -> bool:
     """Check if logs should append to a stable file within the active folder.
@@ -70,6 +80,126 @@ def is_script_folders_enabled(override: bool | None = None) -> bool:
     return os.getenv("LOGGER_SCRIPT_FOLDERS", "False").lower() in ["true", "1", "t", "yes"]
 
 
+def is_async_logging_enabled(override: bool | None = None) -> bool:
+    """Check if log records should be handed to a background thread.
+
+    Args:
+        override: Explicit value. When not ``None`` it takes precedence over the
+            ``LOGGER_ASYNC`` environment variable.
+    """
+    if override is not None:
+        return override
+    return os.getenv("LOGGER_ASYNC", "False").lower() in ["true", "1", "t", "yes"]
+
+
+def _get_queue_size(override: int | None = None) -> int:
+    """Return the async logging queue capacity.
+
+    Args:
+        override: Explicit value. When not ``None`` it takes precedence over the
+            ``LOGGER_QUEUE_SIZE`` environment variable.
+
+    Raises:
+        ValueError: If the size is not a positive integer.
+    """
+    size = override if override is not None else os.getenv("LOGGER_QUEUE_SIZE")
+    if size is None:
+        return DEFAULT_QUEUE_SIZE
+    try:
+        value = int(size)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise ValueError(f"Log queue size must be a positive integer, got {size!r}")
+    return value
+
+
+def _get_queue_overflow(override: str | None = None) -> str:
+    """Return the async logging queue overflow policy.
+
+    Args:
+        override: Explicit value. When not ``None`` it takes precedence over the
+            ``LOGGER_QUEUE_OVERFLOW`` environment variable (default ``drop``).
+
+    Raises:
+        ValueError: If the policy is not one of :data:`QUEUE_OVERFLOW_POLICIES`.
+    """
+    policy = (override or os.getenv("LOGGER_QUEUE_OVERFLOW") or "drop").lower()
+    if policy not in QUEUE_OVERFLOW_POLICIES:
+        raise ValueError(
+            f"Unknown log queue overflow policy {policy!r};"
+            f" expected one of {', '.join(QUEUE_OVERFLOW_POLICIES)}"
+        )
+    return policy
+
+
+class _BoundedQueueHandler(logging.handlers.QueueHandler):
+    """A ``QueueHandler`` for a bounded queue that applies an overflow policy."""
+
+    def __init__(self, log_queue: queue.Queue, overflow: str) -> None:
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put *record* on the queue, waiting or dropping it when full."""
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _DrainingQueueListener(logging.handlers.QueueListener):
+    """A ``QueueListener`` whose stop waits for room instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+# The running listener and the handler feeding it, while async logging is on.
+_async_state: dict[str, tuple[_DrainingQueueListener, _BoundedQueueHandler]] = {}
+
+
+def _start_async_logging(queue_size: int, overflow: str) -> None:
+    """Move the root logger's handlers behind a queue and a listener thread."""
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    handler = _BoundedQueueHandler(log_queue, overflow)
+    listener = _DrainingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    for target in handlers:
+        root.removeHandler(target)
+    root.addHandler(handler)
+    _async_state["running"] = (listener, handler)
+    listener.start()
+
+
+def stop_async_logging() -> None:
+    """Drain the async logging queue and return its handlers to the root logger.
+
+    Blocks until every queued record has been handled. Logging stays
+    synchronous afterwards; records dropped on overflow are reported in a
+    final warning. Does nothing when async logging is not running, so it is
+    safe to call more than once. :func:`log_exit_code` calls it at exit.
+    """
+    running = _async_state.pop("running", None)
+    if running is None:
+        return
+    listener, handler = running
+    root = logging.getLogger()
+    root.removeHandler(handler)
+    listener.stop()
+    for target in listener.handlers:
+        root.addHandler(target)
+    if handler.dropped:
+        logging.getLogger(__name__).warning(
+            "Dropped %s log records: the async logging queue was full", handler.dropped
+        )
+
+
 def _log_uncaught_exception(
     exc_type: type[BaseException],
     exc_value: BaseException,
@@ -108,9 +238,13 @@ def log_exit_code() -> None:
     *uncaught-exception* status only: explicit ``sys.exit(N)`` / ``SystemExit``
     codes are not captured here, because :data:`sys.excepthook` is not invoked
     for ``SystemExit``.
+
+    With async logging, the queue is drained afterwards (see
+    :func:`stop_async_logging`), so no record is lost at shutdown.
     """
     logger = logging.getLogger(__name__)
     logger.info("Exit code: %s", _exit_state["status"])
+    stop_async_logging()
 
 
 def _get_logger_folder(
@@ -184,13 +318,16 @@ def _get_log_basename(
     return f"{safe_script_name}.log"
 
 
-def logger_setup(
+def logger_setup(  # pylint: disable=too-many-arguments,too-many-locals
     script_name: str | None = None,
     *,
     logger_path: str | None = None,
     script_folders: bool | None = None,
     day_specific: bool | None = None,
     append_same_day: bool | None = None,
+    async_logging: bool | None = None,
+    queue_size: int | None = None,
+    queue_overflow: str | None = None,
 ) -> None:
     """Set up logging configuration based on arguments, env vars, and debug mode.
 
@@ -219,6 +356,17 @@ def logger_setup(
         append_same_day: Reuse one stable log file per folder (named after the
             script) instead of creating a new timestamped file each run.
             Env var: ``LOGGER_APPEND_SAME_DAY`` (default ``False``).
+        async_logging: Hand records to a background thread instead of writing
+            them on the calling thread. The root logger's configured handlers
+            are moved behind a ``QueueListener``; loggers call a
+            ``QueueHandler`` that only enqueues. Env var: ``LOGGER_ASYNC``
+            (default ``False``).
+        queue_size: Capacity of the async logging queue, in records.
+            Env var: ``LOGGER_QUEUE_SIZE`` (default ``10000``).
+        queue_overflow: What a log call does when the queue is full: ``drop``
+            the record (counted and reported when the queue is drained) or
+            ``block`` until there is room.
+            Env var: ``LOGGER_QUEUE_OVERFLOW`` (default ``drop``).
 
     Additional environment variables (no argument equivalent):
         ``LOGGER_CONF_PATH`` (default ``logging.conf``) and
@@ -240,6 +388,10 @@ def logger_setup(
         ``logs/2026/03/my_etl.log``; with the built-in
         ``TimedRotatingFileHandler`` (or the bundled ``logging.conf``) that file
         rotates at midnight, yielding one file per day.
+
+    Raises:
+        ValueError: If async logging is enabled with an invalid queue size or
+            overflow policy.
     """
     # Install the exit handlers once. The excepthook records unhandled
     # exceptions so the exit code logged at shutdown reflects real failures.
@@ -251,6 +403,13 @@ def logger_setup(
     load_dotenv()
 
     effective_script = script_name or os.getenv("SCRIPT_NAME")
+    async_settings = (
+        (_get_queue_size(queue_size), _get_queue_overflow(queue_overflow))
+        if is_async_logging_enabled(async_logging) else None
+    )
+    # A previous async setup's listener still owns the old handlers; drain it
+    # before they are replaced.
+    stop_async_logging()
 
     debug = is_debug_on()
     logger_conf_path = Path(os.getenv("LOGGER_CONF_PATH", "logging.conf"))
@@ -295,6 +454,9 @@ def logger_setup(
     else:
         logging.config.dictConfig(_default_logging_config(logger_file_path))
 
+    if async_settings is not None:
+        _start_async_logging(*async_settings)
+
     logger = logging.getLogger(__name__)
     logger.info("Setting up logger for %s", effective_script or Path.cwd().name)
 
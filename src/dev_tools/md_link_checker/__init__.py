@@ -19,7 +19,9 @@ markdown files and reporting broken internal links.
 
 Modules:
     scanner — Data classes, enums, and all scanning/resolution logic.
+    rules   — Compiled exclusion and root-relative glob matching.
     cli     — Argument parsing, coloured output, and JSON reporting.
+    benchmark — Timing of the rule matchers with growing rule lists.
 """
 
 # Public API — import the things a library consumer would need.
@@ -28,7 +30,10 @@ from .scanner import (
     LinkCheckError,
     LinkResult,
     LinkStatus,
+    ScanLimits,
     ScanResult,
+    ScanTimeoutError,
+    SkippedFile,
     check_link,
     extract_anchors,
     find_markdown_files,
@@ -38,13 +43,22 @@ from .scanner import (
     scan_files,
     slugify_heading,
 )
+from .rules import IGNORE_FILE_NAME, GlobMatcher, PathRule, PathRules, RuleSet
 
 __all__ = [
     "DEFAULT_SKIP_DIRS",
+    "IGNORE_FILE_NAME",
+    "GlobMatcher",
     "LinkCheckError",
     "LinkResult",
     "LinkStatus",
+    "PathRule",
+    "PathRules",
+    "RuleSet",
+    "ScanLimits",
     "ScanResult",
+    "ScanTimeoutError",
+    "SkippedFile",
     "check_link",
     "extract_anchors",
     "find_markdown_files",
@@ -0,0 +1,138 @@
+"""
+Benchmark for the path-rule matchers with growing numbers of rules.
+
+Times :meth:`RuleSet.match <dev_tools.md_link_checker.rules.RuleSet.match>`
+and :meth:`GlobMatcher.matches
+<dev_tools.md_link_checker.rules.GlobMatcher.matches>` over a fixed set of
+paths against synthetic rule lists of increasing size, next to a single
+regex with every rule as one alternative (the layout before bucketing).
+
+The synthetic rules are what large ignore lists tend to hold: mostly
+literal directory and file names, some anchored paths and one wildcard
+rule in ten.  Bucketed matching stays flat as literal rules are added and
+grows only with the wildcard rules; the single regex grows with all of them.
+
+Usage:
+    python -m dev_tools.md_link_checker.benchmark [--rules 10 100 1000] [--repeat 5]
+"""
+
+import argparse
+import fnmatch
+import re
+import sys
+import time
+from collections.abc import Callable, Sequence
+
+from .rules import GlobMatcher, PathRule, RuleSet, _compile_rules
+
+#: Rule list sizes timed by default.
+DEFAULT_RULE_COUNTS = (10, 100, 300, 1000)
+
+#: Paths matched per timing run.
+DEFAULT_PATHS = 2000
+
+
+def synthetic_rules(count: int) -> list[PathRule]:
+    """*count* exclusion rules; every tenth one has a wildcard last component."""
+    rules = []
+    for i in range(count):
+        if i % 10 == 9:
+            rules.append(PathRule(f"*.tmp{i}"))
+        elif i % 3 == 0:
+            rules.append(PathRule(f"gen_{i}", dir_only=True))
+        elif i % 3 == 1:
+            rules.append(PathRule(f"docs/area_{i}/out"))
+        else:
+            rules.append(PathRule(f"notes_{i}.md", negated=True))
+    return rules
+
+
+def synthetic_globs(count: int) -> list[str]:
+    """*count* root-relative globs; every tenth one has no literal extension."""
+    return [
+        f"site/{i}/**" if i % 10 == 9 else f"docs/*/page_{i}.{('md', 'html', 'txt')[i % 3]}"
+        for i in range(count)
+    ]
+
+
+def synthetic_paths(count: int = DEFAULT_PATHS) -> list[str]:
+    """*count* root-relative paths, a few of which match the synthetic rules."""
+    return [
+        f"docs/area_{i % 50}/{('out', 'page.md', 'notes_2.md', 'x.tmp9')[i % 4]}"
+        for i in range(count)
+    ]
+
+
+def _time_per_call(match: Callable[[str], object], paths: Sequence[str], repeat: int) -> float:
+    """Best time over *repeat* runs of *match* on every path, in µs per path."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            match(path)
+        best = min(best, time.perf_counter() - start)
+    return best / len(paths) * 1e6
+
+
+def run_benchmark(
+    rule_counts: Sequence[int] = DEFAULT_RULE_COUNTS,
+    paths: int = DEFAULT_PATHS,
+    repeat: int = 5,
+) -> list[dict[str, float]]:
+    """Time single-regex and bucketed matching for each rule count.
+
+    Returns:
+        One row per rule count with µs-per-path timings: ``rules``,
+        ``ruleset_single``, ``ruleset_bucketed``, ``globs_single`` and
+        ``globs_bucketed``.
+    """
+    sample = synthetic_paths(paths)
+    rows = []
+    for count in rule_counts:
+        rules = synthetic_rules(count)
+        single = _compile_rules(list(enumerate(rules)))
+        bucketed = RuleSet(rules)
+        globs = synthetic_globs(count)
+        single_globs = re.compile("|".join(map(fnmatch.translate, globs)))
+        bucketed_globs = GlobMatcher(globs)
+        rows.append({
+            "rules": count,
+            "ruleset_single": _time_per_call(single.fullmatch, sample, repeat),
+            "ruleset_bucketed": _time_per_call(bucketed.match, sample, repeat),
+            "globs_single": _time_per_call(single_globs.match, sample, repeat),
+            "globs_bucketed": _time_per_call(bucketed_globs.matches, sample, repeat),
+        })
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and print a table of µs per matched path."""
+    parser = argparse.ArgumentParser(
+        description="Time RuleSet and GlobMatcher matching with growing rule lists.",
+    )
+    parser.add_argument(
+        "--rules", type=int, nargs="+", default=list(DEFAULT_RULE_COUNTS), metavar="N",
+        help=f"Rule list sizes to time (default: {' '.join(map(str, DEFAULT_RULE_COUNTS))})",
+    )
+    parser.add_argument(
+        "--paths", type=int, default=DEFAULT_PATHS, metavar="N",
+        help=f"Paths matched per run (default: {DEFAULT_PATHS})",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, metavar="N",
+        help="Runs per measurement; the best is reported (default: 5)",
+    )
+    args = parser.parse_args(argv)
+
+    print("µs per path     RuleSet             GlobMatcher")
+    print(f"{'rules':>7}  {'single':>9} {'bucketed':>9}  {'single':>9} {'bucketed':>9}")
+    for row in run_benchmark(args.rules, args.paths, args.repeat):
+        print(
+            f"{row['rules']:>7}  {row['ruleset_single']:>9.2f} {row['ruleset_bucketed']:>9.2f}"
+            f"  {row['globs_single']:>9.2f} {row['globs_bucketed']:>9.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
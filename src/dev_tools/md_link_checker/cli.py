@@ -11,7 +11,16 @@ import sys
 from pathlib import Path
 from typing import TextIO
 
-from .scanner import LinkResult, LinkStatus, ScanResult, scan_all
+from .scanner import (
+    DEFAULT_ISOLATE_SIZE,
+    DEFAULT_MAX_FILE_SIZE,
+    DEFAULT_TIME_BUDGET,
+    LinkResult,
+    LinkStatus,
+    ScanLimits,
+    ScanResult,
+    scan_all,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -83,6 +92,13 @@ def print_results(
         elif r.status == LinkStatus.SKIPPED and verbose:
             print(f"{loc}: {_yellow('SKIPPED', color=use_color)} {r.target}", file=out)
 
+    for skipped in scan_result.skipped_files:
+        print(
+            f"{skipped.source_file}: {_yellow('NOT SCANNED', color=use_color)}"
+            f" -- {skipped.reason}",
+            file=out,
+        )
+
     # Short summary (only when there are failures)
     if broken:
         print(file=out)
@@ -103,6 +119,8 @@ def print_results(
         parts.append(_yellow(f"{scan_result.links_skipped} skipped", color=use_color))
 
     totals = ", ".join(parts) + f" in {scan_result.files_scanned} files"
+    if scan_result.skipped_files:
+        totals += f" ({len(scan_result.skipped_files)} not scanned)"
     print(_separator(totals), file=out)
 
 
@@ -131,6 +149,9 @@ def print_json(scan_result: ScanResult, file: TextIO | None = None) -> None:
             for r in scan_result.results
             if r.status == LinkStatus.BROKEN
         ],
+        "files_skipped": [
+            {"source": f.source_file, "reason": f.reason} for f in scan_result.skipped_files
+        ],
     }
     print(json.dumps(output, indent=2, ensure_ascii=False), file=out)
 
@@ -175,8 +196,13 @@ def build_parser() -> argparse.ArgumentParser:
         "--exclude",
         action="append",
         default=[],
-        metavar="DIR",
-        help="Additional directory names to skip (repeatable, e.g., --exclude out --exclude _site)",
+        metavar="PATTERN",
+        help=(
+            "Additional paths to skip (repeatable). Bare names match any path "
+            "component, patterns with '/' are root-anchored, '**' spans directories "
+            "and a leading '!' re-includes a path "
+            "(e.g., --exclude out --exclude 'docs/**/draft-*.md' --exclude '!docs/keep.md')"
+        ),
     )
     parser.add_argument(
         "--root-relative",
@@ -189,6 +215,36 @@ def build_parser() -> argparse.ArgumentParser:
             "(e.g., --root-relative 'docs/generated/**')"
         ),
     )
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=DEFAULT_MAX_FILE_SIZE,
+        metavar="BYTES",
+        help=(
+            "Report files larger than BYTES as not scanned instead of reading them"
+            f" (0 = no limit; default: {DEFAULT_MAX_FILE_SIZE})"
+        ),
+    )
+    parser.add_argument(
+        "--isolate-size",
+        type=int,
+        default=DEFAULT_ISOLATE_SIZE,
+        metavar="BYTES",
+        help=(
+            "Scan files larger than BYTES in a separate process"
+            f" (0 = never; default: {DEFAULT_ISOLATE_SIZE})"
+        ),
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=DEFAULT_TIME_BUDGET,
+        metavar="SECONDS",
+        help=(
+            "Give up on a file after SECONDS and report it as not scanned"
+            f" (0 = no limit; default: {DEFAULT_TIME_BUDGET:g})"
+        ),
+    )
     return parser
 
 
@@ -213,7 +269,12 @@ def main(argv: list[str] | None = None) -> int:
         root,
         skip_anchors=args.no_anchors,
         root_relative_globs=args.root_relative or None,
-        extra_skip_dirs=set(args.exclude) if args.exclude else None,
+        exclude_patterns=args.exclude or None,
+        limits=ScanLimits(
+            max_file_size=args.max_file_size or None,
+            isolate_size=args.isolate_size or None,
+            time_budget=args.time_budget or None,
+        ),
     )
 
     if args.output_json:
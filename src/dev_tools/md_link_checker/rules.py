@@ -0,0 +1,318 @@
+"""Compiled path-rule engine for exclusions and root-relative globs.
+
+Rules are bucketed before they are compiled: a rule whose last component
+is a literal name (``node_modules``, ``docs/generated``, ``build/``) can
+only match paths with that basename, so each basename gets its own
+precompiled regular expression, and the remaining wildcard rules share one
+more.  Matching a path runs at most two ``re`` calls, whose cost grows
+with the rules in the path's bucket plus the wildcard rules — not with the
+total.  Root-relative globs are bucketed the same way by the extension of
+their literal tail (``*.gen.md`` → ``md``).
+
+Exclusion rules follow a small, ``.gitignore``-like syntax:
+
+* ``name`` — a pattern without ``/`` matches any path component
+  (``node_modules`` skips every ``node_modules`` directory).
+* ``docs/generated`` — a pattern containing ``/`` is anchored to the
+  directory that declares it (the scan root for CLI/API rules).
+* ``build/`` — a trailing ``/`` restricts the rule to directories.
+* ``*``, ``?``, ``[...]`` match within one path component; ``**`` matches
+  across components.
+* ``!pattern`` — negates an earlier rule; the last matching rule wins.
+
+Directories may contain an :data:`IGNORE_FILE_NAME` file with one rule per
+line (``#`` starts a comment).  Its rules apply to that directory and
+everything below it, and are compiled once per directory.
+"""
+
+import fnmatch
+import functools
+import logging
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_WILDCARDS = frozenset("*?[")
+
+#: Name of the per-directory rule file picked up while walking the tree.
+IGNORE_FILE_NAME = ".mdlinkignore"
+
+
+# ---------------------------------------------------------------------------
+# Rule parsing
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class PathRule:
+    """A single parsed exclusion rule.
+
+    Attributes:
+        pattern: The glob, without the ``!`` prefix or trailing ``/``.
+        negated: ``True`` for ``!pattern`` rules (re-include a path).
+        dir_only: ``True`` when the rule only matches directories.
+        base: Root-relative POSIX directory the rule is anchored to
+            (``""`` for the scan root).
+    """
+
+    pattern: str
+    negated: bool = False
+    dir_only: bool = False
+    base: str = ""
+
+    @classmethod
+    def parse(cls, line: str, base: str = "") -> "PathRule | None":
+        """Parse one rule line; return ``None`` for blanks and comments."""
+        text = line.strip()
+        if not text or text.startswith("#"):
+            return None
+        negated = text.startswith("!")
+        if negated:
+            text = text[1:]
+        dir_only = text.endswith("/")
+        text = text.strip("/") if dir_only else text.lstrip("/")
+        if not text:
+            return None
+        return cls(text, negated=negated, dir_only=dir_only, base=base)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a path glob to a regex fragment (``/``-aware)."""
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1:i + 2] in ("!", "]") else i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+def _literal_name(rule: PathRule) -> str | None:
+    """The basename every path matched by *rule* has, or ``None`` for a wildcard."""
+    name = rule.pattern.rpartition("/")[2]
+    return None if _WILDCARDS.intersection(name) else name
+
+
+def _extension(text: str) -> str | None:
+    """The text after the last ``.`` in *text*, or ``None`` without one."""
+    _, dot, extension = text.rpartition(".")
+    return extension if dot else None
+
+
+def _literal_extension(glob: str) -> str | None:
+    """The extension every path matched by the ``fnmatch`` *glob* has, if known.
+
+    Only the literal tail after the last wildcard or bracket is looked at.
+    """
+    return _extension(glob[max(map(glob.rfind, "*?[]")) + 1:])
+
+
+def _rule_to_regex(rule: PathRule) -> str:
+    """Build the full-path regex for *rule* (directories carry a trailing ``/``)."""
+    prefix = re.escape(rule.base + "/") if rule.base else ""
+    if "/" not in rule.pattern:
+        prefix += "(?:.*/)?"
+    suffix = "/" if rule.dir_only else "/?"
+    return f"{prefix}{_glob_to_regex(rule.pattern)}{suffix}"
+
+
+# ---------------------------------------------------------------------------
+# Compiled matchers
+# ---------------------------------------------------------------------------
+
+def _compile_rules(indexed: list[tuple[int, PathRule]]) -> re.Pattern[str]:
+    """Compile rules into one regex whose group ``r<index>`` names the match.
+
+    Alternatives are emitted in reverse order, so the regex engine reports
+    the *last* matching rule first — giving ``.gitignore`` precedence with a
+    single ``fullmatch`` call.
+    """
+    return re.compile(
+        "|".join(f"(?P<r{index}>{_rule_to_regex(rule)})" for index, rule in reversed(indexed)),
+        re.DOTALL,
+    )
+
+
+class RuleSet:
+    """An ordered list of :class:`PathRule` compiled into bucketed regexes.
+
+    Rules with a literal last component are compiled per basename, the
+    wildcard rules into one further regex; a path is matched against its
+    basename's regex and the wildcard one, and the later rule of the two
+    matches wins.
+    """
+
+    def __init__(self, rules: Iterable[PathRule] = ()) -> None:
+        self.rules: tuple[PathRule, ...] = tuple(rules)
+        by_name: dict[str, list[tuple[int, PathRule]]] = {}
+        wildcards: list[tuple[int, PathRule]] = []
+        for index, rule in enumerate(self.rules):
+            name = _literal_name(rule)
+            (wildcards if name is None else by_name.setdefault(name, [])).append((index, rule))
+        self._by_name = {name: _compile_rules(group) for name, group in by_name.items()}
+        self._wildcards = _compile_rules(wildcards) if wildcards else None
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def extend(self, rules: Iterable[PathRule]) -> "RuleSet":
+        """Return a new rule set with *rules* appended (higher precedence)."""
+        extra = tuple(rules)
+        return RuleSet(self.rules + extra) if extra else self
+
+    def match(self, rel_path: str, is_dir: bool = False) -> PathRule | None:
+        """Return the rule deciding *rel_path*, or ``None`` if none matches.
+
+        Args:
+            rel_path: Root-relative POSIX path.
+            is_dir: Whether *rel_path* is a directory.
+        """
+        target = rel_path + "/" if is_dir else rel_path
+        best = -1
+        for regex in (self._by_name.get(rel_path.rpartition("/")[2]), self._wildcards):
+            found = regex.fullmatch(target) if regex is not None else None
+            if found is not None and found.lastgroup is not None:
+                best = max(best, int(found.lastgroup[1:]))
+        return self.rules[best] if best >= 0 else None
+
+    def is_excluded(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Return ``True`` if the deciding rule for *rel_path* excludes it."""
+        rule = self.match(rel_path, is_dir)
+        return rule is not None and not rule.negated
+
+
+class GlobMatcher:
+    """Any-of matcher for ``fnmatch``-style globs, compiled into bucketed regexes.
+
+    Matches exactly like ``any(fnmatch.fnmatch(path, g) for g in globs)``.
+    Globs whose literal tail has an extension are compiled per extension,
+    the rest into one further regex; a path is tried against its
+    extension's regex and that one.
+    """
+
+    def __init__(self, globs: Iterable[str] = ()) -> None:
+        self.globs: tuple[str, ...] = tuple(globs)
+        by_extension: dict[str | None, list[str]] = {}
+        for glob in self.globs:
+            by_extension.setdefault(_literal_extension(glob), []).append(glob)
+        self._by_extension = {
+            extension: re.compile("|".join(map(fnmatch.translate, group)))
+            for extension, group in by_extension.items()
+        }
+        self._other = self._by_extension.pop(None, None)
+
+    def __bool__(self) -> bool:
+        return bool(self.globs)
+
+    def matches(self, path: str) -> bool:
+        """Return ``True`` if *path* matches any of the globs."""
+        extension = _extension(path)
+        regex = self._by_extension.get(extension) if extension is not None else None
+        return (
+            regex is not None and regex.match(path) is not None
+            or self._other is not None and self._other.match(path) is not None
+        )
+
+
+@functools.lru_cache(maxsize=64)
+def compile_globs(globs: tuple[str, ...]) -> GlobMatcher:
+    """Return a cached :class:`GlobMatcher` for *globs*."""
+    return GlobMatcher(globs)
+
+
+# ---------------------------------------------------------------------------
+# Directory-aware rule resolution
+# ---------------------------------------------------------------------------
+
+class PathRules:
+    """Exclusion rules for a directory tree, including per-directory files.
+
+    The rule set for a directory is its parent's rule set extended with the
+    rules from the directory's own :data:`IGNORE_FILE_NAME` file.  Results
+    are cached per directory, so each ignore file is read and compiled once;
+    directories without one share their parent's compiled matcher.
+
+    Args:
+        root: Scan root; all paths are matched relative to it.
+        skip_dirs: Bare directory names to skip anywhere in the tree.
+        patterns: Additional root-level rules (``!`` negation supported).
+        ignore_file: Per-directory rule file name, or ``None`` to disable.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        skip_dirs: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        ignore_file: str | None = IGNORE_FILE_NAME,
+    ) -> None:
+        self.root = root
+        self.ignore_file = ignore_file
+        base_rules = [PathRule(name, dir_only=True) for name in sorted(skip_dirs)]
+        base_rules.extend(
+            rule for rule in (PathRule.parse(p) for p in patterns) if rule is not None
+        )
+        self._base = RuleSet(base_rules)
+        self._cache: dict[Path, RuleSet] = {}
+
+    def _rel(self, path: Path) -> str:
+        rel = path.relative_to(self.root).as_posix()
+        return "" if rel == "." else rel
+
+    def _load_ignore_file(self, directory: Path) -> list[PathRule]:
+        if self.ignore_file is None:
+            return []
+        try:
+            text = (directory / self.ignore_file).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return []
+        except OSError:
+            logger.warning("Could not read %s", directory / self.ignore_file, exc_info=True)
+            return []
+        base = self._rel(directory)
+        return [
+            rule for rule in (PathRule.parse(line, base) for line in text.splitlines())
+            if rule is not None
+        ]
+
+    def rules_for(self, directory: Path) -> RuleSet:
+        """Return the compiled rule set that applies inside *directory*."""
+        cached = self._cache.get(directory)
+        if cached is not None:
+            return cached
+        if directory == self.root:
+            parent_rules = self._base
+        else:
+            parent_rules = self.rules_for(directory.parent)
+        rules = parent_rules.extend(self._load_ignore_file(directory))
+        self._cache[directory] = rules
+        return rules
+
+    def is_excluded(self, path: Path, is_dir: bool = False) -> bool:
+        """Return ``True`` if *path* (under :attr:`root`) is excluded."""
+        return self.rules_for(path.parent).is_excluded(self._rel(path), is_dir)
@@ -5,14 +5,19 @@ Extracts links from markdown files, resolves them, and reports their status.
 """
 
 import enum
-import fnmatch
 import logging
+import multiprocessing
+import os
 import re
+import time
 from collections.abc import Iterator
 from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
 from pathlib import Path
 from urllib.parse import unquote
 
+from .rules import GlobMatcher, PathRules, compile_globs
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -24,6 +29,15 @@ DEFAULT_SKIP_DIRS: frozenset[str] = frozenset(
     {"venv", "node_modules", ".git", "__pycache__", ".tox", "htmlcov", "dist", "build"},
 )
 
+#: Markdown files larger than this (bytes) are skipped.
+DEFAULT_MAX_FILE_SIZE = 10 * 1024 * 1024
+
+#: Markdown files larger than this (bytes) are scanned in a separate process.
+DEFAULT_ISOLATE_SIZE = 1024 * 1024
+
+#: Seconds a single file's scan may take before it is abandoned.
+DEFAULT_TIME_BUDGET = 30.0
+
 # ---------------------------------------------------------------------------
 # Compiled regex patterns
 # ---------------------------------------------------------------------------
@@ -64,6 +78,20 @@ class LinkCheckError(Exception):
         self.__cause__ = cause
 
 
+class ScanTimeoutError(Exception):
+    """Raised when scanning a file exceeds its time budget.
+
+    Attributes:
+        path: The file being scanned.
+        budget: The budget, in seconds.
+    """
+
+    def __init__(self, path: Path, budget: float) -> None:
+        self.path = path
+        self.budget = budget
+        super().__init__(f"Scanning {path} exceeded the {budget:g}s time budget")
+
+
 # ---------------------------------------------------------------------------
 # Enums
 # ---------------------------------------------------------------------------
@@ -97,6 +125,28 @@ class LinkResult:
     reason: str | None = None
 
 
+@dataclass
+class SkippedFile:
+    """A markdown file left unscanned because it exceeded a resource limit."""
+
+    source_file: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class ScanLimits:
+    """Per-file resource limits for scanning (``None`` disables a limit).
+
+    Files over *max_file_size* are not read.  Files over *isolate_size*
+    are scanned in a child process, which is killed if it outlives
+    *time_budget*; smaller files check the budget between lines.
+    """
+
+    max_file_size: int | None = DEFAULT_MAX_FILE_SIZE
+    isolate_size: int | None = DEFAULT_ISOLATE_SIZE
+    time_budget: float | None = DEFAULT_TIME_BUDGET
+
+
 @dataclass
 class ScanResult:
     """Aggregate result of scanning one or more files.
@@ -107,6 +157,7 @@ class ScanResult:
 
     files_scanned: int = 0
     results: list[LinkResult] = field(default_factory=list)
+    skipped_files: list[SkippedFile] = field(default_factory=list)
 
     @property
     def links_checked(self) -> int:
@@ -190,6 +241,24 @@ def _iter_non_fenced_lines(content: str) -> Iterator[tuple[int, str]]:
             yield line_num, line
 
 
+def _within_budget(
+    lines: list[tuple[int, str]], path: Path, time_budget: float | None, started: float
+) -> Iterator[tuple[int, str]]:
+    """Yield *lines* until *time_budget* seconds after *started* (``time.monotonic()``).
+
+    Raises:
+        ScanTimeoutError: Once the budget has run out.
+    """
+    if time_budget is None:
+        yield from lines
+        return
+    deadline = started + time_budget
+    for item in lines:
+        if time.monotonic() > deadline:
+            raise ScanTimeoutError(path, time_budget)
+        yield item
+
+
 def _is_template_placeholder(target: str) -> bool:
     """Check if a link target contains template placeholders like {NN}."""
     return "{" in target and "}" in target
@@ -241,20 +310,34 @@ def extract_anchors(file_path: Path) -> set[str]:
 # File discovery
 # ---------------------------------------------------------------------------
 
-def _should_skip_dir(path: Path, skip_dirs: frozenset[str]) -> bool:
-    """Check if any path component is in the skip list."""
-    return any(part in skip_dirs for part in path.parts)
-
-
 def find_markdown_files(
     root: Path,
     skip_dirs: frozenset[str] = DEFAULT_SKIP_DIRS,
+    rules: PathRules | None = None,
 ) -> list[Path]:
-    """Find all markdown files under *root*, excluding ignored directories."""
-    return sorted(
-        f for f in root.rglob("*.md")
-        if not _should_skip_dir(f.relative_to(root), skip_dirs)
-    )
+    """Find all markdown files under *root*, excluding ignored paths.
+
+    Excluded directories are pruned during the walk, so their contents are
+    never listed.
+
+    Args:
+        root: Directory to search.
+        skip_dirs: Bare directory names to skip (ignored when *rules* is given).
+        rules: Pre-built exclusion rules; see :class:`~.rules.PathRules`.
+    """
+    if rules is None:
+        rules = PathRules(root, skip_dirs)
+    found: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        directory = Path(dirpath)
+        dirnames[:] = [
+            d for d in dirnames if not rules.is_excluded(directory / d, is_dir=True)
+        ]
+        found.extend(
+            directory / name for name in filenames
+            if name.endswith(".md") and not rules.is_excluded(directory / name)
+        )
+    return sorted(found)
 
 
 # ---------------------------------------------------------------------------
@@ -314,8 +397,13 @@ def check_link(  # pylint: disable=too-many-arguments,too-many-positional-argume
     anchor_cache: dict[Path, set[str]],
     *,
     skip_anchors: bool = False,
+    max_file_size: int | None = None,
 ) -> LinkResult:
-    """Check a single markdown link and return its status."""
+    """Check a single markdown link and return its status.
+
+    Anchors into a markdown file larger than *max_file_size* bytes are not
+    checked; the link is reported as skipped.
+    """
     rel_source = str(source_file.relative_to(root)).replace("\\", "/")
 
     # Skip external links
@@ -342,6 +430,15 @@ def check_link(  # pylint: disable=too-many-arguments,too-many-positional-argume
 
     # Check anchor if specified (unless skip_anchors)
     if anchor and not skip_anchors and resolved_path.suffix.lower() == ".md":
+        if (
+            resolved_path not in anchor_cache
+            and max_file_size is not None
+            and resolved_path.stat().st_size > max_file_size
+        ):
+            return LinkResult(
+                rel_source, line_number, link_text, target,
+                LinkStatus.SKIPPED, "anchor not checked: target file too large",
+            )
         if resolved_path not in anchor_cache:
             anchor_cache[resolved_path] = extract_anchors(resolved_path)
         if anchor not in anchor_cache[resolved_path]:
@@ -357,25 +454,35 @@ def check_link(  # pylint: disable=too-many-arguments,too-many-positional-argume
 # File scanning
 # ---------------------------------------------------------------------------
 
-def scan_file(  # pylint: disable=too-many-locals
+def scan_file(  # pylint: disable=too-many-locals,too-many-arguments
     md_file: Path,
     root: Path,
     anchor_cache: dict[Path, set[str]],
     skip_anchors: bool = False,
-    root_relative_globs: list[str] | None = None,
+    root_relative_globs: list[str] | GlobMatcher | None = None,
+    *,
+    time_budget: float | None = None,
+    max_file_size: int | None = None,
 ) -> list[LinkResult]:
     """Scan a single markdown file for links and check them.
 
     Handles both inline links ``[text](target)`` and reference-style links
     ``[text][ref]`` / ``[text][]`` where a matching ``[ref]: target``
     definition exists in the same file.
+
+    *root_relative_globs* may be a list of globs or a precompiled
+    :class:`~.rules.GlobMatcher`; lists are compiled once and cached.
+
+    Raises:
+        LinkCheckError: If the file cannot be read.
+        ScanTimeoutError: If scanning takes longer than *time_budget* seconds
+            (checked between lines).
     """
     results: list[LinkResult] = []
     rel_path = str(md_file.relative_to(root)).replace("\\", "/")
-    is_root_relative = any(
-        fnmatch.fnmatch(rel_path, glob)
-        for glob in (root_relative_globs or [])
-    )
+    if not isinstance(root_relative_globs, GlobMatcher):
+        root_relative_globs = compile_globs(tuple(root_relative_globs or ()))
+    is_root_relative = root_relative_globs.matches(rel_path)
 
     try:
         content = md_file.read_text(encoding="utf-8", errors="replace")
@@ -384,7 +491,9 @@ def scan_file(  # pylint: disable=too-many-locals
 
     # Pass 1: collect reference definitions [label]: target
     ref_defs: dict[str, str] = {}
-    for _line_num, line in _iter_non_fenced_lines(content):
+    started = time.monotonic()
+    lines = list(_iter_non_fenced_lines(content))
+    for _line_num, line in _within_budget(lines, md_file, time_budget, started):
         def_match = REF_DEF_PATTERN.match(line.strip())
         if def_match:
             label = def_match.group(1).strip().lower()
@@ -392,7 +501,7 @@ def scan_file(  # pylint: disable=too-many-locals
             ref_defs[label] = target
 
     # Pass 2: find and check all links
-    for line_num, line in _iter_non_fenced_lines(content):
+    for line_num, line in _within_budget(lines, md_file, time_budget, started):
         # Strip inline code spans to avoid matching example links
         line_without_code = re.sub(r"`[^`]+`", "", line)
 
@@ -402,7 +511,7 @@ def scan_file(  # pylint: disable=too-many-locals
             target = match.group(2).strip()
             results.append(check_link(
                 md_file, line_num, link_text, target, root, is_root_relative, anchor_cache,
-                skip_anchors=skip_anchors,
+                skip_anchors=skip_anchors, max_file_size=max_file_size,
             ))
 
         # Reference-style links: [text][label] or collapsed [text][]
@@ -417,7 +526,7 @@ def scan_file(  # pylint: disable=too-many-locals
                     continue
                 results.append(check_link(
                     md_file, line_num, link_text, target, root, is_root_relative, anchor_cache,
-                    skip_anchors=skip_anchors,
+                    skip_anchors=skip_anchors, max_file_size=max_file_size,
                 ))
 
     return results
@@ -427,11 +536,114 @@ def scan_file(  # pylint: disable=too-many-locals
 # Multi-file scanning
 # ---------------------------------------------------------------------------
 
+class _FileTooLarge(Exception):
+    """Internal: a file is over the size limit (the message is the reason)."""
+
+
+def _scan_isolated(
+    md_file: Path,
+    root: Path,
+    skip_anchors: bool,
+    root_relative: GlobMatcher,
+    limits: ScanLimits,
+) -> list[LinkResult]:
+    """Run :func:`scan_file` in a child process, killed if it outlives the budget.
+
+    Raises:
+        LinkCheckError: If the file cannot be read.
+        ScanTimeoutError: If the child does not finish within the time budget.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_isolated_worker,
+        args=(sender, md_file, root, skip_anchors, root_relative, limits),
+        daemon=True,
+    )
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(limits.time_budget):
+            assert limits.time_budget is not None
+            raise ScanTimeoutError(md_file, limits.time_budget)
+        status, payload = receiver.recv()
+    except EOFError:
+        process.join()
+        status, payload = "unreadable", f"scan worker exited with code {process.exitcode}"
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+    if status == "timeout":
+        raise ScanTimeoutError(md_file, payload)
+    if status == "unreadable":
+        raise LinkCheckError(md_file, OSError(payload))
+    return payload
+
+
+def _isolated_worker(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    sender: Connection,
+    md_file: Path,
+    root: Path,
+    skip_anchors: bool,
+    root_relative: GlobMatcher,
+    limits: ScanLimits,
+) -> None:
+    # Exceptions with custom constructors do not pickle; send a status instead.
+    try:
+        sender.send(("ok", scan_file(
+            md_file, root, {}, skip_anchors, root_relative,
+            time_budget=limits.time_budget, max_file_size=limits.max_file_size,
+        )))
+    except LinkCheckError as exc:
+        sender.send(("unreadable", str(exc.__cause__)))
+    except ScanTimeoutError as exc:
+        sender.send(("timeout", exc.budget))
+    finally:
+        sender.close()
+
+
+def _scan_guarded(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    md_file: Path,
+    root: Path,
+    anchor_cache: dict[Path, set[str]],
+    skip_anchors: bool,
+    root_relative: GlobMatcher,
+    limits: ScanLimits,
+) -> list[LinkResult]:
+    """:func:`scan_file` within *limits*.
+
+    Raises:
+        LinkCheckError: If the file cannot be read.
+        ScanTimeoutError: If scanning exceeds the time budget.
+        _FileTooLarge: If the file is over the size limit.
+    """
+    try:
+        size = md_file.stat().st_size
+    except OSError as exc:
+        raise LinkCheckError(md_file, exc) from exc
+    if limits.max_file_size is not None and size > limits.max_file_size:
+        raise _FileTooLarge(f"file too large ({size:,} bytes, limit {limits.max_file_size:,})")
+    # Daemonic processes (multiprocessing.Pool workers) cannot start children.
+    if (
+        limits.isolate_size is not None
+        and size > limits.isolate_size
+        and not multiprocessing.current_process().daemon
+    ):
+        return _scan_isolated(md_file, root, skip_anchors, root_relative, limits)
+    return scan_file(
+        md_file, root, anchor_cache, skip_anchors, root_relative,
+        time_budget=limits.time_budget, max_file_size=limits.max_file_size,
+    )
+
+
 def scan_files(
     files: list[Path],
     root: Path,
     skip_anchors: bool = False,
     root_relative_globs: list[str] | None = None,
+    *,
+    limits: ScanLimits | None = None,
 ) -> ScanResult:
     """Scan a pre-built list of markdown files for broken internal links.
 
@@ -443,28 +655,43 @@ def scan_files(
         root: Project root directory (used to resolve relative paths).
         skip_anchors: If ``True``, only check file existence (skip anchor validation).
         root_relative_globs: Globs for files that resolve ``src/`` paths from root.
+        limits: Per-file size and time limits (default: :class:`ScanLimits`).
+            Files over them are listed in :attr:`ScanResult.skipped_files`.
     """
+    limits = limits if limits is not None else ScanLimits()
     anchor_cache: dict[Path, set[str]] = {}
     result = ScanResult()
+    root_relative = compile_globs(tuple(root_relative_globs or ()))
 
     for md_file in files:
         logger.debug("Scanning %s", md_file)
         result.files_scanned += 1
         try:
             result.results.extend(
-                scan_file(md_file, root, anchor_cache, skip_anchors, root_relative_globs),
+                _scan_guarded(md_file, root, anchor_cache, skip_anchors, root_relative, limits),
             )
         except LinkCheckError:
             logger.warning("Could not read %s — skipping", md_file, exc_info=True)
+        except (ScanTimeoutError, _FileTooLarge) as exc:
+            reason = (
+                f"scan exceeded the {exc.budget:g}s time budget"
+                if isinstance(exc, ScanTimeoutError) else str(exc)
+            )
+            rel_path = str(md_file.relative_to(root)).replace("\\", "/")
+            logger.warning("Skipping %s: %s", rel_path, reason)
+            result.skipped_files.append(SkippedFile(rel_path, reason))
 
     return result
 
 
-def scan_all(
+def scan_all(  # pylint: disable=too-many-arguments
     root: Path,
     skip_anchors: bool = False,
     root_relative_globs: list[str] | None = None,
     extra_skip_dirs: set[str] | None = None,
+    exclude_patterns: list[str] | None = None,
+    *,
+    limits: ScanLimits | None = None,
 ) -> ScanResult:
     """Scan all markdown files under *root* for broken internal links.
 
@@ -476,7 +703,12 @@ def scan_all(
         skip_anchors: If ``True``, only check file existence (skip anchor validation).
         root_relative_globs: Globs for files that resolve ``src/`` paths from root.
         extra_skip_dirs: Additional directory names to skip beyond the defaults.
+        exclude_patterns: Exclusion rules (globs, ``!`` negation); see
+            :mod:`~dev_tools.md_link_checker.rules`.  Per-directory
+            ``.mdlinkignore`` files are honoured as well.
+        limits: Per-file size and time limits; see :func:`scan_files`.
     """
     skip_dirs = DEFAULT_SKIP_DIRS | frozenset(extra_skip_dirs or ())
-    md_files = find_markdown_files(root, skip_dirs)
-    return scan_files(md_files, root, skip_anchors, root_relative_globs)
+    rules = PathRules(root, skip_dirs, exclude_patterns or ())
+    md_files = find_markdown_files(root, skip_dirs, rules)
+    return scan_files(md_files, root, skip_anchors, root_relative_globs, limits=limits)
@@ -1,8 +1,11 @@
 """Tests for the dev_tools.codemap_generator sub-package."""
 
+import multiprocessing
+import os
 import subprocess
 import sys
 import textwrap
+import time
 from pathlib import Path
 from typing import Generator
 
@@ -10,12 +13,31 @@ import pytest
 
 from dev_tools.codemap_generator import (
     CallInfo,
+    CodeMapExport,
     CodeMapGenerator,
+    CodeMapWatcher,
     EntryPoint,
+    ExtractionCache,
+    FileAnalysis,
+    GitError,
     ImportInfo,
+    Monorepo,
+    ResourceLimits,
+    RevisionSource,
     SymbolInfo,
+    SymbolStore,
+    extract_file,
     main,
 )
+from dev_tools.codemap_generator import gitrev, guards, watch
+from dev_tools.codemap_generator.generator import write_if_changed
+from dev_tools.codemap_generator.condense import condense, iter_mermaid
+from dev_tools.codemap_generator.timing import PhaseTimer
+from dev_tools.codemap_generator.importtime import (
+    ImportCostAnalysis,
+    measure_import_time,
+    parse_importtime,
+)
 
 
 # ===================================================================
@@ -101,6 +123,14 @@ def analyzed_generator(fixture_pkg: Path) -> CodeMapGenerator:
     return gen
 
 
+@pytest.fixture()
+def umask_022() -> Generator[None, None, None]:
+    """Run the test under umask ``022`` (new files ``0644``)."""
+    previous = os.umask(0o022)
+    yield
+    os.umask(previous)
+
+
 # ===================================================================
 # TestSymbolInfo
 # ===================================================================
@@ -131,8 +161,8 @@ class TestSymbolInfo:
         assert si.docstring is None
         assert si.parent_class is None
         assert si.is_public is True
-        assert si.decorators == []
-        assert si.parameters == []
+        assert si.decorators == ()
+        assert si.parameters == ()
 
     def test_optional_fields(self) -> None:
         si = SymbolInfo(
@@ -143,14 +173,20 @@ class TestSymbolInfo:
             docstring="A method.",
             parent_class="MyClass",
             is_public=False,
-            decorators=["staticmethod"],
-            parameters=["x", "y"],
+            decorators=("staticmethod",),
+            parameters=("x", "y"),
         )
         assert si.docstring == "A method."
         assert si.parent_class == "MyClass"
         assert si.is_public is False
-        assert si.decorators == ["staticmethod"]
-        assert si.parameters == ["x", "y"]
+        assert si.decorators == ("staticmethod",)
+        assert si.parameters == ("x", "y")
+
+    def test_records_are_slotted(self) -> None:
+        si = SymbolInfo(name="bar", symbol_type="class", file_path="a.py", line_number=1)
+        assert not hasattr(si, "__dict__")
+        with pytest.raises(AttributeError):
+            si.extra = 1  # type: ignore[attr-defined]
 
 
 # ===================================================================
@@ -164,13 +200,13 @@ class TestImportInfo:
     def test_required_fields(self) -> None:
         ii = ImportInfo(
             module="os.path",
-            names=["join"],
+            names=("join",),
             is_from_import=True,
             file_path="a.py",
             line_number=1,
         )
         assert ii.module == "os.path"
-        assert ii.names == ["join"]
+        assert ii.names == ("join",)
         assert ii.is_from_import is True
         assert ii.file_path == "a.py"
         assert ii.line_number == 1
@@ -178,7 +214,7 @@ class TestImportInfo:
     def test_plain_import(self) -> None:
         ii = ImportInfo(
             module="sys",
-            names=["sys"],
+            names=("sys",),
             is_from_import=False,
             file_path="a.py",
             line_number=2,
@@ -293,6 +329,193 @@ class TestCodeMapGeneratorAnalyze:
         assert any("Utilities module" in ds for ds in docstrings.values())
 
 
+# ===================================================================
+# TestParallelAnalyze
+# ===================================================================
+
+
+def _strip_timestamps(text: str) -> str:
+    """Drop the ``Auto-generated ... on <date>`` lines from generated markdown."""
+    return "\n".join(
+        line for line in text.splitlines() if not line.startswith("> Auto-generated")
+    )
+
+
+class TestParallelAnalyze:
+    """Tests for process-pool analysis (``workers=``)."""
+
+    def test_extract_file_returns_picklable_result(self, fixture_pkg: Path) -> None:
+        import pickle
+
+        result = extract_file(fixture_pkg / "my_test_pkg" / "models.py", fixture_pkg.parent)
+        assert isinstance(result, FileAnalysis)
+        assert result.file_path == "src/my_test_pkg/models.py"
+        assert result.module_name == "src.my_test_pkg.models"
+        assert result.docstring == "Models module."
+        assert pickle.loads(pickle.dumps(result)) == result
+
+    def test_extract_file_reports_syntax_error(self, fixture_pkg: Path) -> None:
+        bad = fixture_pkg / "my_test_pkg" / "bad.py"
+        bad.write_text("def broken(\n", encoding="utf-8")
+        result = extract_file(bad, fixture_pkg.parent)
+        assert result.error is not None
+        assert result.symbols == []
+
+    def test_parallel_matches_serial(self, fixture_pkg: Path) -> None:
+        sub = fixture_pkg / "my_test_pkg" / "sub"
+        sub.mkdir()
+        for i in range(6):
+            (sub / f"mod_{i}.py").write_text(
+                f"class C{i}:\n    def m(self):\n        self.n()\n",
+                encoding="utf-8",
+            )
+        serial = CodeMapGenerator(fixture_pkg, "my_test_pkg")
+        serial.analyze()
+        parallel = CodeMapGenerator(fixture_pkg, "my_test_pkg", workers=3)
+        parallel.analyze()
+
+        assert parallel.symbols == serial.symbols
+        assert parallel.imports == serial.imports
+        assert parallel.calls == serial.calls
+        assert parallel.entry_points == serial.entry_points
+        assert parallel.module_docstrings == serial.module_docstrings
+        assert _strip_timestamps(parallel.generate_combined_code_map()) == _strip_timestamps(
+            serial.generate_combined_code_map()
+        )
+
+    def test_merged_records_share_strings(self, fixture_pkg: Path) -> None:
+        import pickle
+
+        pkg = fixture_pkg / "my_test_pkg"
+        for name in ("one", "two"):
+            (pkg / f"{name}.py").write_text("def run(value):\n    helper(value)\n", encoding="utf-8")
+        # Unpickled, as from a worker: nothing is shared across files.
+        analyses = [
+            pickle.loads(pickle.dumps(extract_file(pkg / f"{name}.py", fixture_pkg.parent)))
+            for name in ("one", "two")
+        ]
+        first, second = analyses[0].calls[0], analyses[1].calls[0]
+        assert first.callee is not second.callee
+        CodeMapGenerator(fixture_pkg, "my_test_pkg").load_analyses(analyses)
+
+        assert first.callee is second.callee
+        assert first.caller is second.caller
+        assert analyses[0].symbols[0].parameters[0] is analyses[1].symbols[0].parameters[0]
+        assert first.file_path is analyses[0].symbols[0].file_path is analyses[0].file_path
+
+    def test_from_dict_restores_tuples(self, fixture_pkg: Path) -> None:
+        import json
+
+        analysis = extract_file(fixture_pkg / "my_test_pkg" / "utils.py", fixture_pkg.parent)
+        loaded = FileAnalysis.from_dict(json.loads(json.dumps(analysis.to_dict())))
+        assert loaded == analysis
+        assert all(isinstance(sym.parameters, tuple) for sym in loaded.symbols)
+        assert all(isinstance(imp.names, tuple) for imp in loaded.imports)
+
+    def test_cli_jobs_flag(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        out_dir = tmp_path / "jobs_output"
+        sys.argv = [
+            "codemap-generator",
+            "--package", "my_test_pkg",
+            "--src-root", str(fixture_pkg),
+            "--output-dir", str(out_dir),
+            "--jobs", "2",
+        ]
+        main()
+        assert len(list(out_dir.glob("*.md"))) == 6
+
+
+# ===================================================================
+# TestExtractionCache
+# ===================================================================
+
+
+class TestExtractionCache:
+    """Tests for the persistent per-file extraction cache (``cache_dir=``)."""
+
+    def test_second_run_reuses_every_file(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        first = CodeMapGenerator(fixture_pkg, "my_test_pkg", cache_dir=cache_dir)
+        first.analyze()
+        assert first.cache_hits == 0
+        assert first.cache_misses == 3
+
+        second = CodeMapGenerator(fixture_pkg, "my_test_pkg", cache_dir=cache_dir)
+        second.analyze()
+        assert second.cache_hits == 3
+        assert second.cache_misses == 0
+        assert second.symbols == first.symbols
+        assert second.imports == first.imports
+        assert second.calls == first.calls
+        assert second.entry_points == first.entry_points
+        assert second.module_docstrings == first.module_docstrings
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+    @pytest.mark.usefixtures("umask_022")
+    def test_entries_are_shareable(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        CodeMapGenerator(fixture_pkg, "my_test_pkg", cache_dir=cache_dir).analyze()
+        entries = list(cache_dir.rglob("*.json"))
+        assert len(entries) == 3
+        assert {entry.stat().st_mode & 0o777 for entry in entries} == {0o644}
+
+    def test_changed_file_is_reparsed(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        CodeMapGenerator(fixture_pkg, "my_test_pkg", cache_dir=cache_dir).analyze()
+        (fixture_pkg / "my_test_pkg" / "models.py").write_text(
+            "def fresh():\n    pass\n", encoding="utf-8"
+        )
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg", cache_dir=cache_dir)
+        gen.analyze()
+        assert gen.cache_misses == 1
+        assert gen.cache_hits == 2
+        names = {s.name for s in gen.symbols}
+        assert "fresh" in names
+        assert "MyModel" not in names
+
+    def test_stale_entries_pruned(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        CodeMapGenerator(fixture_pkg, "my_test_pkg", cache_dir=cache_dir).analyze()
+        (fixture_pkg / "my_test_pkg" / "utils.py").unlink()
+        CodeMapGenerator(fixture_pkg, "my_test_pkg", cache_dir=cache_dir).analyze()
+        assert len(list((cache_dir / "my_test_pkg").glob("*/*.json"))) == 2
+
+    def test_key_depends_on_path_and_content(self, tmp_path: Path) -> None:
+        cache = ExtractionCache(tmp_path, "pkg")
+        key = cache.key_for("src/pkg/a.py", b"x = 1\n")
+        assert key == cache.key_for("src/pkg/a.py", b"x = 1\n")
+        assert key != cache.key_for("src/pkg/b.py", b"x = 1\n")
+        assert key != cache.key_for("src/pkg/a.py", b"x = 2\n")
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path) -> None:
+        cache = ExtractionCache(tmp_path, "pkg")
+        cache.put("ab" * 32, FileAnalysis(file_path="a.py", module_name="a"))
+        assert cache.get("ab" * 32) == FileAnalysis(file_path="a.py", module_name="a")
+        (tmp_path / "pkg" / "ab" / f"{'ab' * 32}.json").write_text("{", encoding="utf-8")
+        assert cache.get("ab" * 32) is None
+
+    def test_cache_with_workers(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        CodeMapGenerator(fixture_pkg, "my_test_pkg", workers=2, cache_dir=cache_dir).analyze()
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg", workers=2, cache_dir=cache_dir)
+        gen.analyze()
+        assert gen.cache_hits == 3
+
+    def test_cli_cache_dir_flag(
+        self, fixture_pkg: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        sys.argv = [
+            "codemap-generator",
+            "--package", "my_test_pkg",
+            "--src-root", str(fixture_pkg),
+            "--output-dir", str(tmp_path / "out"),
+            "--cache-dir", str(tmp_path / "cache"),
+        ]
+        main()
+        main()
+        assert "Cache: 3 reused, 0 re-parsed" in capsys.readouterr().out
+
+
 # ===================================================================
 # TestSymbolExtraction
 # ===================================================================
@@ -363,7 +586,7 @@ class TestSymbolExtraction:
         helper = next(
             s for s in analyzed_generator.symbols if s.name == "helper_function"
         )
-        assert helper.parameters == ["x", "y"]
+        assert helper.parameters == ("x", "y")
 
     def test_function_docstring(self, analyzed_generator: CodeMapGenerator) -> None:
         helper = next(
@@ -426,6 +649,84 @@ class TestSymbolExtraction:
         assert init.is_public is True
 
 
+# ===================================================================
+# TestSinglePassExtraction
+# ===================================================================
+
+
+class TestSinglePassExtraction:
+    """Tests for the unified single-traversal extractor."""
+
+    def _extract(self, tmp_path: Path, source: str) -> FileAnalysis:
+        path = tmp_path / "mod.py"
+        path.write_text(textwrap.dedent(source), encoding="utf-8")
+        return extract_file(path, tmp_path)
+
+    def test_nested_class_and_scoped_calls(self, tmp_path: Path) -> None:
+        result = self._extract(tmp_path, '''\
+            class Outer:
+                class Inner:
+                    def go(self):
+                        helper()
+
+            def factory():
+                class Local:
+                    pass
+                return build()
+        ''')
+        classes = {s.name for s in result.symbols if s.symbol_type == "class"}
+        assert classes == {"Outer", "Inner", "Local"}
+        callers = {(c.caller, c.callee) for c in result.calls}
+        assert ("Outer.Inner.go", "helper") in callers
+        assert ("factory", "build") in callers
+
+    def test_only_module_body_functions_are_top_level(self, tmp_path: Path) -> None:
+        result = self._extract(tmp_path, '''\
+            def top():
+                def inner():
+                    pass
+
+            if True:
+                def guarded():
+                    pass
+        ''')
+        functions = {s.name for s in result.symbols if s.symbol_type == "function"}
+        assert functions == {"top"}
+
+    def test_module_level_calls_not_recorded(self, tmp_path: Path) -> None:
+        result = self._extract(tmp_path, "setup()\n")
+        assert result.calls == []
+
+    def test_cli_detection_ignores_strings(self, tmp_path: Path) -> None:
+        result = self._extract(tmp_path, '''\
+            """Mentions argparse and typer in prose only."""
+            INDICATORS = ["argparse", "click.command"]
+        ''')
+        assert result.entry_points == []
+
+    def test_cli_detection_click_decorator(self, tmp_path: Path) -> None:
+        result = self._extract(tmp_path, '''\
+            import click
+
+            @click.command()
+            def cli():
+                pass
+        ''')
+        assert [ep.description for ep in result.entry_points] == [
+            "CLI script (detected: click.command)"
+        ]
+
+    def test_main_block_listed_before_cli_script(self, tmp_path: Path) -> None:
+        result = self._extract(tmp_path, '''\
+            from argparse import ArgumentParser
+
+            if __name__ == "__main__":
+                ArgumentParser()
+        ''')
+        assert [ep.entry_type for ep in result.entry_points] == ["main_block", "cli_script"]
+        assert result.entry_points[1].description == "CLI script (detected: argparse)"
+
+
 # ===================================================================
 # TestImportExtraction
 # ===================================================================
@@ -623,6 +924,49 @@ class TestOutputGeneration:
         assert "_private_helper" not in functions_section
 
 
+# ===================================================================
+# TestCodeIndex
+# ===================================================================
+
+
+class TestCodeIndex:
+    """Tests for the secondary indexes used by the report builders."""
+
+    def test_index_groups(self, analyzed_generator: CodeMapGenerator) -> None:
+        index = analyzed_generator.index
+        models = index.by_file["src/my_test_pkg/models.py"]
+        assert {s.name for s in models} == {
+            "MyModel", "__init__", "process", "helper_function", "_private_helper",
+        }
+        assert {s.name for s in index.by_parent["MyModel"]} == {"__init__", "process"}
+        assert [s.name for s in index.by_type["class"]] == ["MyModel"]
+        assert index.count("src/my_test_pkg/models.py", ("function", "async_function")) == 2
+        assert index.count("missing.py", ("class",)) == 0
+
+    def test_call_adjacency(self, analyzed_generator: CodeMapGenerator) -> None:
+        index = analyzed_generator.index
+        assert {"MyModel", "process"} <= index.callees["run"]
+        assert "run" in index.callers["process"]
+
+    def test_index_rebuilt_when_records_change(
+        self, analyzed_generator: CodeMapGenerator
+    ) -> None:
+        first = analyzed_generator.index
+        assert analyzed_generator.index is first
+        analyzed_generator.symbols.append(
+            SymbolInfo(name="Extra", symbol_type="class", file_path="x.py", line_number=1)
+        )
+        assert analyzed_generator.index is not first
+        assert "`Extra`" in analyzed_generator.generate_symbol_index()
+
+    def test_index_available_without_analyze(self) -> None:
+        gen = CodeMapGenerator(Path("src"), "pkg")
+        gen.symbols = [
+            SymbolInfo(name="A", symbol_type="class", file_path="pkg/a.py", line_number=1),
+        ]
+        assert "**Classes**: 1" in gen.generate_combined_code_map()
+
+
 # ===================================================================
 # TestWriteOutputs
 # ===================================================================
@@ -680,6 +1024,175 @@ class TestWriteOutputs:
             assert f.exists()
 
 
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+    @pytest.mark.usefixtures("umask_022")
+    def test_replaced_files_keep_readable_mode(
+        self, analyzed_generator: CodeMapGenerator, tmp_path: Path
+    ) -> None:
+        out = tmp_path / "output"
+        for path in analyzed_generator.write_outputs(out):
+            assert path.stat().st_mode & 0o777 == 0o644
+        report = out / "code-map.md"
+        report.chmod(0o640)
+        assert write_if_changed(report, ["changed"])
+        assert report.stat().st_mode & 0o777 == 0o640
+
+
+class TestDeterministicOutput:
+    """Tests for ``deterministic=`` and skipping unchanged outputs."""
+
+    def _generator(self, fixture_pkg: Path) -> CodeMapGenerator:
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg", deterministic=True)
+        gen.analyze()
+        return gen
+
+    def test_stamp_is_source_digest(self, fixture_pkg: Path) -> None:
+        gen = self._generator(fixture_pkg)
+        header = gen.generate_symbol_index().splitlines()[2]
+        assert header == (
+            f"> Auto-generated by `codemap_generator` from sources"
+            f" `{gen.source_digest()[:12]}`"
+        )
+
+    def test_identical_sources_identical_output(self, fixture_pkg: Path) -> None:
+        first = self._generator(fixture_pkg).generate_combined_code_map()
+        second = self._generator(fixture_pkg).generate_combined_code_map()
+        assert first == second
+
+    def test_digest_tracks_source_changes(self, fixture_pkg: Path) -> None:
+        before = self._generator(fixture_pkg).source_digest()
+        models = fixture_pkg / "my_test_pkg" / "models.py"
+        models.write_text(models.read_text(encoding="utf-8") + "\n# edit\n", encoding="utf-8")
+        assert self._generator(fixture_pkg).source_digest() != before
+
+    def test_streamed_output_matches_generate(
+        self, analyzed_generator: CodeMapGenerator, tmp_path: Path
+    ) -> None:
+        analyzed_generator.deterministic = True
+        analyzed_generator.write_outputs(tmp_path)
+        written = (tmp_path / "code-map.md").read_text(encoding="utf-8")
+        assert written == analyzed_generator.generate_combined_code_map()
+
+    def test_unchanged_outputs_not_rewritten(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        gen = self._generator(fixture_pkg)
+        files = gen.write_outputs(tmp_path)
+        assert gen.files_changed == files
+        mtimes = {f: f.stat().st_mtime_ns for f in files}
+
+        again = self._generator(fixture_pkg)
+        assert again.write_outputs(tmp_path) == files
+        assert again.files_changed == []
+        assert again.files_unchanged == files
+        assert {f: f.stat().st_mtime_ns for f in files} == mtimes
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    def test_changed_sources_rewrite_outputs(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        self._generator(fixture_pkg).write_outputs(tmp_path)
+        (fixture_pkg / "my_test_pkg" / "extra.py").write_text(
+            "class Extra:\n    pass\n", encoding="utf-8"
+        )
+        gen = self._generator(fixture_pkg)
+        gen.write_outputs(tmp_path)
+        assert tmp_path / "symbol-index.md" in gen.files_changed
+        assert "`Extra`" in (tmp_path / "symbol-index.md").read_text(encoding="utf-8")
+
+
+class TestShardedOutput:
+    """Tests for write_shards()."""
+
+    def _generator(self, fixture_pkg: Path) -> CodeMapGenerator:
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg")
+        gen.analyze()
+        return gen
+
+    def test_writes_index_and_one_shard_per_package(
+        self, fixture_pkg: Path, tmp_path: Path
+    ) -> None:
+        sub = fixture_pkg / "my_test_pkg" / "sub"
+        sub.mkdir()
+        (sub / "__init__.py").write_text("", encoding="utf-8")
+        (sub / "deep.py").write_text("class Deep:\n    pass\n", encoding="utf-8")
+
+        files = self._generator(fixture_pkg).write_shards(tmp_path)
+        assert [f.relative_to(tmp_path).as_posix() for f in files] == [
+            "index.md",
+            "shards/my_test_pkg.md",
+            "shards/my_test_pkg.sub.md",
+        ]
+        index = (tmp_path / "index.md").read_text(encoding="utf-8")
+        assert "(shards/my_test_pkg.sub.md)" in index
+        deep = (tmp_path / "shards" / "my_test_pkg.sub.md").read_text(encoding="utf-8")
+        assert "`Deep`" in deep
+        assert "MyModel" not in deep
+
+    def test_shard_contents(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        self._generator(fixture_pkg).write_shards(tmp_path)
+        text = (tmp_path / "shards" / "my_test_pkg.md").read_text(encoding="utf-8")
+        assert "`MyModel`" in text
+        assert "`MyModel.process`" in text
+        assert "`_private_helper`" not in text
+        assert "## Imports" in text
+        assert "## Entry Points" in text
+
+    def test_unchanged_shards_not_rerendered(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        first = self._generator(fixture_pkg)
+        first.write_shards(tmp_path)
+        assert first.shards_rendered == 1
+
+        second = self._generator(fixture_pkg)
+        files = second.write_shards(tmp_path)
+        assert second.shards_rendered == 0
+        assert second.files_unchanged == files
+
+    def test_only_changed_shard_rerendered(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        sub = fixture_pkg / "my_test_pkg" / "sub"
+        sub.mkdir()
+        (sub / "__init__.py").write_text("", encoding="utf-8")
+        self._generator(fixture_pkg).write_shards(tmp_path)
+
+        (sub / "new.py").write_text("def added():\n    pass\n", encoding="utf-8")
+        gen = self._generator(fixture_pkg)
+        gen.write_shards(tmp_path)
+        assert gen.shards_rendered == 1
+        assert tmp_path / "shards" / "my_test_pkg.sub.md" in gen.files_changed
+        assert tmp_path / "shards" / "my_test_pkg.md" in gen.files_unchanged
+
+    def test_removed_package_shard_deleted(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        sub = fixture_pkg / "my_test_pkg" / "sub"
+        sub.mkdir()
+        (sub / "__init__.py").write_text("", encoding="utf-8")
+        self._generator(fixture_pkg).write_shards(tmp_path)
+        (sub / "__init__.py").unlink()
+        sub.rmdir()
+
+        self._generator(fixture_pkg).write_shards(tmp_path)
+        assert not (tmp_path / "shards" / "my_test_pkg.sub.md").exists()
+
+    def test_parallel_matches_serial(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        self._generator(fixture_pkg).write_shards(tmp_path / "serial")
+        parallel = CodeMapGenerator(fixture_pkg, "my_test_pkg", workers=2)
+        parallel.analyze()
+        parallel.write_shards(tmp_path / "parallel")
+        for name in ("index.md", "shards/my_test_pkg.md"):
+            assert _strip_timestamps(
+                (tmp_path / "serial" / name).read_text(encoding="utf-8")
+            ) == _strip_timestamps((tmp_path / "parallel" / name).read_text(encoding="utf-8"))
+
+    def test_cli_sharded_flag(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        out_dir = tmp_path / "sharded_output"
+        sys.argv = [
+            "codemap-generator",
+            "--package", "my_test_pkg",
+            "--src-root", str(fixture_pkg),
+            "--output-dir", str(out_dir),
+            "--sharded",
+        ]
+        main()
+        assert (out_dir / "index.md").is_file()
+        assert (out_dir / "shards" / "my_test_pkg.md").is_file()
+        assert not (out_dir / "code-map.md").exists()
+
+
 # ===================================================================
 # TestCLI
 # ===================================================================
@@ -734,6 +1247,286 @@ class TestCLI:
             os.chdir(original_dir)
 
 
+# ===================================================================
+# TestSymbolStore
+# ===================================================================
+
+
+@pytest.fixture()
+def symbol_db(analyzed_generator: CodeMapGenerator, tmp_path: Path) -> Path:
+    """Write the analyzed fixture package to a SQLite database."""
+    return analyzed_generator.write_database(tmp_path / "db" / "codemap.sqlite")
+
+
+class TestSymbolStore:
+    """Tests for the SQLite symbol store and the ``query`` subcommand."""
+
+    def test_definitions(self, symbol_db: Path) -> None:
+        with SymbolStore(symbol_db) as store:
+            rows = store.definitions("process")
+            assert [(r["qualified_name"], r["module"]) for r in rows] == [
+                ("MyModel.process", "my_test_pkg.models")
+            ]
+            assert store.definitions("MyModel.process")[0]["line_number"] == rows[0]["line_number"]
+            assert store.definitions("missing") == []
+
+    def test_callers_and_callees(self, symbol_db: Path) -> None:
+        with SymbolStore(symbol_db) as store:
+            assert {r["caller"] for r in store.callers_of("process")} == {"run"}
+            assert {r["callee"] for r in store.callees_of("run")} >= {"MyModel", "process"}
+
+    def test_imports_and_importers(self, symbol_db: Path) -> None:
+        with SymbolStore(symbol_db) as store:
+            assert {r["module"] for r in store.imports_of("my_test_pkg.utils")} == {
+                "os", "my_test_pkg.models",
+            }
+            assert {r["source_module"] for r in store.importers_of("my_test_pkg")} == {
+                "my_test_pkg.utils"
+            }
+            assert store.importers_of("my_test") == []
+
+    def test_relative_imports_are_resolved(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        pkg = fixture_pkg / "my_test_pkg"
+        (pkg / "rel.py").write_text("from .models import MyModel\n", encoding="utf-8")
+        (pkg / "sub").mkdir()
+        (pkg / "sub" / "__init__.py").write_text("from .. import utils\n", encoding="utf-8")
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg")
+        gen.analyze()
+        gen.write_database(tmp_path / "rel.sqlite")
+        with SymbolStore(tmp_path / "rel.sqlite") as store:
+            assert {r["source_module"] for r in store.importers_of("my_test_pkg.models")} == {
+                "my_test_pkg.rel", "my_test_pkg.utils",
+            }
+            assert [r["module"] for r in store.imports_of("my_test_pkg.sub")] == ["my_test_pkg"]
+
+    def test_meta_and_entry_points(self, symbol_db: Path) -> None:
+        with SymbolStore(symbol_db) as store:
+            assert store.meta()["package"] == "my_test_pkg"
+            assert any(r["entry_type"] == "main_block" for r in store.entry_points())
+            docstring = store.conn.execute(
+                "SELECT docstring FROM modules WHERE module = ?", ("my_test_pkg",)
+            ).fetchone()[0]
+            assert docstring.startswith("my_test_pkg")
+
+    def test_rewrite_replaces_contents(
+        self, analyzed_generator: CodeMapGenerator, symbol_db: Path
+    ) -> None:
+        analyzed_generator.write_database(symbol_db)
+        with SymbolStore(symbol_db) as store:
+            assert len(store.definitions("MyModel")) == 1
+
+    def test_cli_db_flag(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        out_dir = tmp_path / "out"
+        assert main([
+            "--package", "my_test_pkg",
+            "--src-root", str(fixture_pkg),
+            "--output-dir", str(out_dir),
+            "--db",
+        ]) == 0
+        assert (out_dir / "codemap.sqlite").is_file()
+
+    def test_cli_query(self, symbol_db: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        assert main(["query", "callers", "process", "--db", str(symbol_db)]) == 0
+        out = capsys.readouterr().out
+        assert "src/my_test_pkg/utils.py:" in out
+        assert "run -> process" in out
+
+    def test_cli_query_json_and_no_results(
+        self, symbol_db: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        import json
+
+        assert main(["query", "where", "MyModel", "--db", str(symbol_db), "--json"]) == 0
+        rows = json.loads(capsys.readouterr().out)
+        assert rows[0]["symbol_type"] == "class"
+        assert main(["query", "where", "Nope", "--db", str(symbol_db)]) == 1
+
+    def test_cli_query_missing_db(self, tmp_path: Path) -> None:
+        assert main(["query", "entry-points", "--db", str(tmp_path / "none.sqlite")]) == 2
+
+    def test_cli_query_requires_name(self, symbol_db: Path) -> None:
+        with pytest.raises(SystemExit) as exc_info:
+            main(["query", "callers", "--db", str(symbol_db)])
+        assert exc_info.value.code == 2
+
+
+# ===================================================================
+# TestExport
+# ===================================================================
+
+
+@pytest.fixture()
+def export_file(analyzed_generator: CodeMapGenerator, tmp_path: Path) -> Path:
+    """Write the analyzed fixture package to a binary export."""
+    return analyzed_generator.write_export(tmp_path / "export" / "codemap.cmx")
+
+
+class TestExport:
+    """Tests for the compact export and its memory-mapped loader."""
+
+    def test_round_trips_every_record(
+        self, analyzed_generator: CodeMapGenerator, export_file: Path
+    ) -> None:
+        with CodeMapExport(export_file) as export:
+            loaded = list(export)
+            assert export.package == "my_test_pkg"
+            assert len(export) == len(loaded)
+            assert [a.file_path for a in loaded] == sorted(analyzed_generator.source_hashes)
+        for attr in ("symbols", "imports", "calls", "entry_points"):
+            exported = [r for a in loaded for r in getattr(a, attr)]
+            assert sorted(exported, key=repr) == sorted(getattr(analyzed_generator, attr), key=repr)
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+    @pytest.mark.usefixtures("umask_022")
+    def test_export_is_readable(
+        self, analyzed_generator: CodeMapGenerator, tmp_path: Path
+    ) -> None:
+        path = analyzed_generator.write_export(tmp_path / "codemap.cmx")
+        assert path.stat().st_mode & 0o777 == 0o644
+
+    def test_load_one_module(self, export_file: Path) -> None:
+        with CodeMapExport(export_file) as export:
+            models = export.load("my_test_pkg.models")
+            assert models.file_path == "src/my_test_pkg/models.py"
+            assert models.module_name == "my_test_pkg.models"
+            assert {s.name for s in models.symbols} >= {"MyModel", "process"}
+            assert export.load("src/my_test_pkg/models.py") == models
+            assert export.load("my_test_pkg").docstring.startswith("my_test_pkg")
+            assert "my_test_pkg.utils" in export.modules()
+            assert "my_test_pkg.nope" not in export
+            with pytest.raises(KeyError):
+                export.load("my_test_pkg.nope")
+
+    def test_strings_are_interned(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        (fixture_pkg / "my_test_pkg" / "repeat.py").write_text(
+            "".join(f"def handler_{i}(request, context):\n    pass\n" for i in range(50))
+        )
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg")
+        gen.analyze()
+        path = gen.write_export(tmp_path / "codemap.cmx")
+        # once as a parameter name, once inside the rendered signature
+        assert path.read_bytes().count(b"context") == 2
+
+    def test_rejects_other_files(self, tmp_path: Path) -> None:
+        bogus = tmp_path / "bogus.cmx"
+        bogus.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError, match="Not a code map export"):
+            CodeMapExport(bogus)
+        bogus.write_bytes(b"")
+        with pytest.raises(ValueError, match="Not a code map export"):
+            CodeMapExport(bogus)
+
+    def test_cli_export_flag(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        out_dir = tmp_path / "out"
+        assert main([
+            "--package", "my_test_pkg",
+            "--src-root", str(fixture_pkg),
+            "--output-dir", str(out_dir),
+            "--export",
+        ]) == 0
+        with CodeMapExport(out_dir / "codemap.cmx") as export:
+            assert "my_test_pkg.utils" in export
+
+
+# ===================================================================
+# TestResourceLimits
+# ===================================================================
+
+
+class TestResourceLimits:
+    """Tests for per-file size limits, time budgets and isolated parsing."""
+
+    @pytest.fixture()
+    def big_module(self, fixture_pkg: Path) -> Path:
+        path = fixture_pkg / "my_test_pkg" / "generated.py"
+        path.write_text("".join(f"def gen_{i}():\n    return {i}\n" for i in range(200)))
+        return path
+
+    def test_oversized_file_is_skipped(
+        self, fixture_pkg: Path, big_module: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        size = big_module.stat().st_size
+        gen = CodeMapGenerator(
+            fixture_pkg, "my_test_pkg", limits=ResourceLimits(max_file_size=size - 1)
+        )
+        gen.analyze()
+        assert gen.skipped_files == {
+            "src/my_test_pkg/generated.py": f"file too large ({size:,} bytes, limit {size - 1:,})"
+        }
+        assert "Skipped src/my_test_pkg/generated.py" in capsys.readouterr().err
+        assert not any(s.name.startswith("gen_") for s in gen.symbols)
+        assert any(s.name == "MyModel" for s in gen.symbols)
+        code_map = gen.generate_combined_code_map()
+        assert "- **Files skipped**: 1 (resource limits)" in code_map
+        assert "| `src/my_test_pkg/generated.py` | file too large" in code_map
+
+    def test_isolated_parse_matches_in_process(
+        self, fixture_pkg: Path, big_module: Path
+    ) -> None:
+        in_process = CodeMapGenerator(
+            fixture_pkg, "my_test_pkg", limits=ResourceLimits(isolate_size=None)
+        )
+        in_process.analyze()
+        isolated = CodeMapGenerator(
+            fixture_pkg, "my_test_pkg", limits=ResourceLimits(isolate_size=0)
+        )
+        isolated.analyze()
+        assert isolated.symbols == in_process.symbols
+        assert isolated.calls == in_process.calls
+        assert isolated.skipped_files == {}
+
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork",
+        reason="the patched worker only reaches forked children",
+    )
+    def test_isolated_parse_is_killed_after_budget(
+        self, fixture_pkg: Path, big_module: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(guards, "_isolated_worker", lambda *args: time.sleep(30))
+        size = big_module.stat().st_size
+        gen = CodeMapGenerator(
+            fixture_pkg, "my_test_pkg",
+            limits=ResourceLimits(isolate_size=size - 1, time_budget=0.5),
+        )
+        started = time.monotonic()
+        gen.analyze()
+        assert time.monotonic() - started < 10
+        assert gen.skipped_files == {
+            "src/my_test_pkg/generated.py": "parse exceeded the 0.5s time budget"
+        }
+
+    def test_skipped_files_are_not_cached(
+        self, fixture_pkg: Path, big_module: Path, tmp_path: Path
+    ) -> None:
+        cache_dir = tmp_path / "cache"
+        limited = ResourceLimits(max_file_size=big_module.stat().st_size - 1)
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg", cache_dir=cache_dir, limits=limited)
+        gen.analyze()
+        assert "src/my_test_pkg/generated.py" in gen.skipped_files
+
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg", cache_dir=cache_dir)
+        gen.analyze()
+        assert gen.skipped_files == {}
+        assert any(s.name == "gen_0" for s in gen.symbols)
+
+    def test_cli_limit_flags(
+        self,
+        fixture_pkg: Path,
+        big_module: Path,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        assert main([
+            "--package", "my_test_pkg",
+            "--src-root", str(fixture_pkg),
+            "--output-dir", str(tmp_path / "out"),
+            "--max-file-size", str(big_module.stat().st_size - 1),
+            "--isolate-size", "0",
+            "--time-budget", "0",
+        ]) == 0
+        assert "Skipped 1 files over resource limits" in capsys.readouterr().out
+
+
 # ===================================================================
 # TestCallGraph
 # ===================================================================
@@ -785,6 +1578,1427 @@ class TestCallGraph:
         assert "```mermaid" in output
 
 
+@pytest.fixture()
+def graph_generator(fixture_pkg: Path) -> CodeMapGenerator:
+    """Fixture package extended with relative imports, re-exports and aliases."""
+    pkg = fixture_pkg / "my_test_pkg"
+    (pkg / "__init__.py").write_text(
+        '"""Package."""\nfrom .models import MyModel\n', encoding="utf-8"
+    )
+    sub = pkg / "service"
+    sub.mkdir()
+    (sub / "__init__.py").write_text("", encoding="utf-8")
+    (sub / "api.py").write_text(
+        textwrap.dedent('''\
+            import os.path
+            import json as js
+            from my_test_pkg import MyModel
+            from ..models import helper_function as add
+            from . import store
+
+
+            class Service:
+                def handle(self):
+                    self.validate()
+                    store.save(add(1, 2))
+                    return MyModel("x")
+
+                def validate(self):
+                    return js.dumps(os.path.join("a", "b"))
+
+
+            def main():
+                Service().handle()
+        '''),
+        encoding="utf-8",
+    )
+    (sub / "store.py").write_text(
+        "def save(value):\n    return _write(value)\n\n\ndef _write(value):\n    return value\n",
+        encoding="utf-8",
+    )
+    (fixture_pkg.parent / "pyproject.toml").write_text(
+        '[project.scripts]\nsvc = "my_test_pkg.service.api:main"\n', encoding="utf-8"
+    )
+    gen = CodeMapGenerator(fixture_pkg, "my_test_pkg")
+    gen.analyze()
+    return gen
+
+
+class TestResolvedCallGraph:
+    """Tests for the qualified-name CallGraph engine."""
+
+    API = "my_test_pkg.service.api"
+
+    def test_self_call_resolves_to_method(self, graph_generator: CodeMapGenerator) -> None:
+        graph = graph_generator.call_graph
+        assert f"{self.API}.Service.validate" in graph.callees(f"{self.API}.Service.handle")
+
+    def test_relative_and_aliased_imports(self, graph_generator: CodeMapGenerator) -> None:
+        callees = graph_generator.call_graph.callees(f"{self.API}.Service.handle")
+        assert "my_test_pkg.service.store.save" in callees
+        assert "my_test_pkg.models.helper_function" in callees
+
+    def test_reexport_followed_to_definition(self, graph_generator: CodeMapGenerator) -> None:
+        callees = graph_generator.call_graph.callees(f"{self.API}.Service.handle")
+        assert "my_test_pkg.models.MyModel.__init__" in callees
+
+    def test_external_calls_resolved_through_imports(
+        self, graph_generator: CodeMapGenerator
+    ) -> None:
+        graph = graph_generator.call_graph
+        assert graph.callees(f"{self.API}.Service.validate") == ["json.dumps", "os.path.join"]
+        assert not graph.is_internal("os.path.join")
+
+    def test_callers(self, graph_generator: CodeMapGenerator) -> None:
+        graph = graph_generator.call_graph
+        assert graph.callers("my_test_pkg.models.MyModel.__init__") == [
+            f"{self.API}.Service.handle",
+            "my_test_pkg.utils.run",
+        ]
+
+    def test_roots_from_main_blocks_and_console_scripts(
+        self, graph_generator: CodeMapGenerator
+    ) -> None:
+        roots = graph_generator.call_graph.roots
+        assert "my_test_pkg.utils.__main__" in roots
+        assert f"{self.API}.main" in roots
+
+    def test_reachable_from_entry_points(self, graph_generator: CodeMapGenerator) -> None:
+        reached = graph_generator.call_graph.reachable()
+        assert "my_test_pkg.service.store._write" in reached
+        assert "my_test_pkg.models.MyModel.process" not in reached  # via a local variable
+
+    def test_unreachable(self, graph_generator: CodeMapGenerator) -> None:
+        dead = graph_generator.call_graph.unreachable()
+        assert "my_test_pkg.models._private_helper" in dead
+        assert "my_test_pkg.service.store.save" not in dead
+
+    def test_shortest_path(self, graph_generator: CodeMapGenerator) -> None:
+        graph = graph_generator.call_graph
+        assert graph.shortest_path(f"{self.API}.main", "my_test_pkg.service.store._write") == [
+            f"{self.API}.main",
+            f"{self.API}.Service.handle",
+            "my_test_pkg.service.store.save",
+            "my_test_pkg.service.store._write",
+        ]
+        assert graph.shortest_path("my_test_pkg.service.store._write", f"{self.API}.main") is None
+
+    def test_fan_in_and_fan_out(self, graph_generator: CodeMapGenerator) -> None:
+        graph = graph_generator.call_graph
+        assert graph.fan_out(top=1) == [(f"{self.API}.Service.handle", 4)]
+        assert ("my_test_pkg.models.MyModel.__init__", 2) in graph.fan_in()
+        assert all(graph.is_internal(name) for name, _ in graph.fan_in())
+
+    def test_find_and_unknown_names(self, graph_generator: CodeMapGenerator) -> None:
+        graph = graph_generator.call_graph
+        assert graph.find("Service.handle") == [f"{self.API}.Service.handle"]
+        with pytest.raises(KeyError):
+            graph.callees("no.such.function")
+
+    def test_unresolved_counted(self, graph_generator: CodeMapGenerator) -> None:
+        # model.process() goes through a local variable
+        assert graph_generator.call_graph.unresolved >= 1
+
+    def test_rebuilt_when_records_change(self, graph_generator: CodeMapGenerator) -> None:
+        first = graph_generator.call_graph
+        assert graph_generator.call_graph is first
+        graph_generator.calls.append(
+            CallInfo("run", "helper_function", "src/my_test_pkg/utils.py", 1, "helper_function")
+        )
+        assert graph_generator.call_graph is not first
+
+
+@pytest.fixture()
+def dep_generator(fixture_pkg: Path) -> CodeMapGenerator:
+    """Fixture package with a cycle, same-named modules and deferred imports."""
+    pkg = fixture_pkg / "my_test_pkg"
+    for sub in ("alpha", "beta"):
+        (pkg / sub).mkdir()
+        (pkg / sub / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "alpha" / "models.py").write_text(
+        "from .helpers import VALUE\nfrom my_test_pkg.beta.models import Beta\n", encoding="utf-8"
+    )
+    (pkg / "alpha" / "helpers.py").write_text(
+        "from my_test_pkg.alpha import models\n", encoding="utf-8"
+    )
+    (pkg / "beta" / "models.py").write_text(
+        textwrap.dedent('''\
+            from typing import TYPE_CHECKING
+
+            if TYPE_CHECKING:
+                from my_test_pkg.alpha.models import Alpha
+
+
+            class Beta:
+                def load(self):
+                    from my_test_pkg import utils
+                    return utils
+        '''),
+        encoding="utf-8",
+    )
+    gen = CodeMapGenerator(fixture_pkg, "my_test_pkg")
+    gen.analyze()
+    return gen
+
+
+class TestDependencyGraph:
+    """Tests for the module DependencyGraph and its report sections."""
+
+    def test_full_module_names(self, dep_generator: CodeMapGenerator) -> None:
+        graph = dep_generator.dependency_graph
+        assert graph.imports_of("my_test_pkg.alpha.models") == [
+            "my_test_pkg.alpha.helpers",
+            "my_test_pkg.beta.models",
+        ]
+        assert graph.importers_of("my_test_pkg.models") == ["my_test_pkg.utils"]
+
+    def test_deferred_imports_excluded(self, dep_generator: CodeMapGenerator) -> None:
+        graph = dep_generator.dependency_graph
+        assert graph.imports_of("my_test_pkg.beta.models") == []
+        assert graph.deferred_edges == [
+            ("my_test_pkg.beta.models", "my_test_pkg.alpha.models"),
+            ("my_test_pkg.beta.models", "my_test_pkg.utils"),
+        ]
+
+    def test_deferred_flag_extracted(self, dep_generator: CodeMapGenerator) -> None:
+        deferred = {
+            imp.module for imp in dep_generator.imports
+            if imp.file_path.endswith("beta/models.py") and imp.deferred
+        }
+        assert deferred == {"my_test_pkg.alpha.models", "my_test_pkg"}
+
+    def test_cycles(self, dep_generator: CodeMapGenerator) -> None:
+        graph = dep_generator.dependency_graph
+        assert graph.cycles() == [["my_test_pkg.alpha.helpers", "my_test_pkg.alpha.models"]]
+        assert graph.cycle_path("my_test_pkg.alpha.models") == [
+            "my_test_pkg.alpha.models",
+            "my_test_pkg.alpha.helpers",
+            "my_test_pkg.alpha.models",
+        ]
+        assert graph.cycle_path("my_test_pkg.utils") is None
+
+    def test_closure_and_dependents(self, dep_generator: CodeMapGenerator) -> None:
+        graph = dep_generator.dependency_graph
+        assert graph.closure("my_test_pkg.alpha.helpers") == {
+            "my_test_pkg.alpha.models",
+            "my_test_pkg.beta.models",
+        }
+        assert graph.closure("my_test_pkg.beta.models") == set()
+        assert graph.dependents("my_test_pkg.beta.models") == {
+            "my_test_pkg.alpha.models",
+            "my_test_pkg.alpha.helpers",
+        }
+
+    def test_heaviest_and_chains(self, dep_generator: CodeMapGenerator) -> None:
+        graph = dep_generator.dependency_graph
+        assert graph.heaviest(top=2) == [
+            ("my_test_pkg.alpha.helpers", 2),
+            ("my_test_pkg.alpha.models", 2),
+        ]
+        assert graph.longest_chains(top=1) == [
+            ["my_test_pkg.alpha.helpers", "my_test_pkg.beta.models"]
+        ]
+
+    def test_unknown_module(self, dep_generator: CodeMapGenerator) -> None:
+        with pytest.raises(KeyError):
+            dep_generator.dependency_graph.closure("not.a.module")
+
+    def test_report_sections(self, dep_generator: CodeMapGenerator) -> None:
+        output = dep_generator.generate_dependency_graph()
+        assert '["my_test_pkg.alpha.models"]' in output
+        assert '["my_test_pkg.beta.models"]' in output
+        assert "-.->" in output
+        assert "## Import Cycles" in output
+        assert "`my_test_pkg.alpha.models` → `my_test_pkg.alpha.helpers`" in output
+        assert "## Heaviest Imports" in output
+        assert "## Longest Import Chains" in output
+
+    def test_relative_imports_not_external(self, dep_generator: CodeMapGenerator) -> None:
+        external = dep_generator.generate_dependency_graph().split("## External Dependencies")[1]
+        assert "`helpers`" not in external
+
+
+class TestCondense:
+    """Tests for diagram condensation to a node budget."""
+
+    _NODES = ["pkg.a.x", "pkg.a.y", "pkg.b.x", "pkg.b.y", "pkg.c"]
+    _EDGES = [
+        ("pkg.a.x", "pkg.b.x"),
+        ("pkg.a.y", "pkg.b.y"),
+        ("pkg.b.x", "pkg.c"),
+        ("pkg.a.x", "pkg.a.y"),
+    ]
+
+    def test_within_budget_unchanged(self) -> None:
+        graph = condense(self._NODES, self._EDGES, node_budget=10)
+        assert graph.steps == []
+        assert list(graph.nodes) == sorted(self._NODES)
+        assert all(nodes == [label] for label, nodes in graph.nodes.items())
+        assert [(e.source, e.target, e.weight) for e in graph.edges] == [
+            (src, dst, 1) for src, dst in sorted(self._EDGES)
+        ]
+
+    def test_package_collapse_sums_weights(self) -> None:
+        graph = condense(self._NODES, self._EDGES, node_budget=3)
+        assert graph.nodes == {
+            "pkg.a": ["pkg.a.x", "pkg.a.y"],
+            "pkg.b": ["pkg.b.x", "pkg.b.y"],
+            "pkg.c": ["pkg.c"],
+        }
+        assert [(e.source, e.target, e.weight) for e in graph.edges] == [
+            ("pkg.a", "pkg.b", 2),
+            ("pkg.b", "pkg.c", 1),
+        ]
+        assert graph.steps == ["names collapsed to their first 2 dotted parts"]
+
+    def test_cycles_merged(self) -> None:
+        edges = [("a", "b"), ("b", "a"), ("b", "c"), ("c", "d")]
+        graph = condense(["a", "b", "c", "d"], edges, [("d", "c")], node_budget=3)
+        assert graph.nodes["cycle: a +1"] == ["a", "b"]
+        assert [(e.source, e.target) for e in graph.edges] == [
+            ("c", "d"),
+            ("cycle: a +1", "c"),
+            ("d", "c"),
+        ]
+        assert "1 cycles merged" in graph.steps
+
+    def test_least_connected_omitted(self) -> None:
+        edges = [("hub", "a"), ("hub", "b"), ("hub", "c"), ("a", "b")]
+        graph = condense(["hub", "a", "b", "c", "lonely"], edges, node_budget=3)
+        assert list(graph.nodes) == ["a", "b", "hub"]
+        assert graph.omitted == 2
+        assert all({e.source, e.target} <= {"a", "b", "hub"} for e in graph.edges)
+
+    def test_edge_budget_keeps_heaviest(self) -> None:
+        edges = [("p.a", "q.a"), ("p.b", "q.b"), ("p.a", "r"), ("q.a", "r")]
+        graph = condense(["p.a", "p.b", "q.a", "q.b", "r"], edges, node_budget=3, edge_budget=1)
+        assert [(e.source, e.target, e.weight) for e in graph.edges] == [("p", "q", 2)]
+        assert graph.truncated
+        assert graph.edge_total == 3
+
+    def test_soft_only_if_all_merged_edges_soft(self) -> None:
+        graph = condense(
+            self._NODES, [("pkg.a.x", "pkg.b.x")], [("pkg.a.y", "pkg.b.y"), ("pkg.b.x", "pkg.c")],
+            node_budget=3,
+        )
+        assert {(e.source, e.target): e.soft for e in graph.edges} == {
+            ("pkg.a", "pkg.b"): False,
+            ("pkg.b", "pkg.c"): True,
+        }
+
+    def test_no_budget(self) -> None:
+        graph = condense(self._NODES, self._EDGES, node_budget=None)
+        assert len(graph.nodes) == len(self._NODES)
+
+    def test_mermaid(self) -> None:
+        graph = condense(self._NODES, self._EDGES, [("pkg.c", "pkg.a.x")], node_budget=3)
+        lines = list(iter_mermaid(graph, id_prefix="m"))
+        assert lines[:2] == ["```mermaid", "graph TD"]
+        assert '    m0["pkg.a (2)"]' in lines
+        assert '    m2["pkg.c"]' in lines
+        assert "    m0 -->|2| m1" in lines
+        assert "    m2 -.-> m0" in lines
+        assert lines[-1] == "```"
+
+    def test_generator_notes_condensation(self, dep_generator: CodeMapGenerator) -> None:
+        dep_generator.node_budget = 5
+        output = dep_generator.generate_dependency_graph()
+        assert '["my_test_pkg.alpha (3)"]' in output
+        assert "_Condensed from 8 modules to 5 nodes" in output
+        assert "names collapsed to their first 2 dotted parts" in output
+
+    def test_cli_flag(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        out = tmp_path / "out"
+        rc = main([
+            "--src-root", str(fixture_pkg),
+            "--package", "my_test_pkg",
+            "--output-dir", str(out),
+            "--graph-nodes", "1",
+        ])
+        assert rc == 0
+        assert "_Condensed from" in (out / "dependency-graph.md").read_text(encoding="utf-8")
+
+
+_IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:        50 |         50 |   _io
+import time:       100 |        150 | site
+import time:      6000 |       6000 |       json.decoder
+import time:      2000 |       8000 |     json
+import time:       500 |        500 |     my_test_pkg.models
+import time:       300 |       8800 |   my_test_pkg.utils
+import time:       200 |       9000 | my_test_pkg
+"""
+
+
+class TestImportCost:
+    """Tests for the -X importtime parser and the import-cost report."""
+
+    def test_parse_tree(self) -> None:
+        timings = {t.module: t for t in parse_importtime(_IMPORTTIME_OUTPUT)}
+        assert len(timings) == 7
+        assert timings["json.decoder"].parent == "json"
+        assert timings["json"].parent == "my_test_pkg.utils"
+        assert timings["my_test_pkg.utils"].children == ["json", "my_test_pkg.models"]
+        assert timings["my_test_pkg"].parent is None
+        assert timings["my_test_pkg"].depth == 0
+        assert timings["json"].self_us == 2000
+        assert timings["json"].cumulative_us == 8000
+
+    def test_dominant_chain_and_external(self) -> None:
+        analysis = ImportCostAnalysis(parse_importtime(_IMPORTTIME_OUTPUT), "my_test_pkg")
+        assert analysis.total_us == 9000
+        assert [t.module for t in analysis.dominant_chain()] == [
+            "my_test_pkg", "my_test_pkg.utils", "json", "json.decoder",
+        ]
+        assert [(t.module, importer) for t, importer in analysis.heaviest_external()] == [
+            ("json", "my_test_pkg.utils"),
+        ]
+
+    def test_lazy_candidates(self) -> None:
+        analysis = ImportCostAnalysis(parse_importtime(_IMPORTTIME_OUTPUT), "my_test_pkg")
+        candidates = {c.module: c for c in analysis.lazy_candidates(min_us=1000)}
+        assert set(candidates) == {"json", "my_test_pkg.utils"}
+        assert candidates["json"].importer == "my_test_pkg.utils"
+        assert candidates["json"].share == pytest.approx(8000 / 9000)
+        assert not candidates["json"].used_at_import
+
+    def test_used_at_import_from_call_graph(self, fixture_pkg: Path) -> None:
+        (fixture_pkg / "my_test_pkg" / "utils.py").write_text(
+            'import json\nCONFIG = json.loads("{}")\n', encoding="utf-8"
+        )
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg")
+        gen.analyze()
+        analysis = ImportCostAnalysis(
+            parse_importtime(_IMPORTTIME_OUTPUT), "my_test_pkg", call_graph=gen.call_graph
+        )
+        candidates = {c.module: c for c in analysis.lazy_candidates(min_us=1000)}
+        assert candidates["json"].used_at_import
+
+    def test_report(self, analyzed_generator: CodeMapGenerator) -> None:
+        output = analyzed_generator.generate_import_cost(parse_importtime(_IMPORTTIME_OUTPUT))
+        assert output.startswith("# Import Cost — my_test_pkg")
+        assert "takes **9.0 ms**" in output
+        assert "## Dominant Import Chain" in output
+        assert "| `my_test_pkg.utils` | 0.30 | 8.80 | 98% | 1 |" in output
+        assert "| `json` | `my_test_pkg.utils` | 8.00 | 89% | no |" in output
+
+    def test_measure_fixture_package(self, fixture_pkg: Path) -> None:
+        timings = measure_import_time("my_test_pkg.utils", src_root=fixture_pkg, runs=1)
+        modules = {t.module for t in timings}
+        assert {"my_test_pkg", "my_test_pkg.models", "my_test_pkg.utils"} <= modules
+
+    def test_measure_failure(self, fixture_pkg: Path) -> None:
+        with pytest.raises(RuntimeError, match="ModuleNotFoundError"):
+            measure_import_time("my_test_pkg.missing", src_root=fixture_pkg, runs=1)
+
+    def test_cli_writes_report(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        out_dir = tmp_path / "cli_output"
+        sys.argv = [
+            "codemap-generator",
+            "--package", "my_test_pkg",
+            "--src-root", str(fixture_pkg),
+            "--output-dir", str(out_dir),
+            "--import-time",
+        ]
+        main()
+        report = (out_dir / "import-cost.md").read_text(encoding="utf-8")
+        assert "| `my_test_pkg` |" in report
+        assert "Not loaded by `import my_test_pkg`: 2 modules." in report
+
+
+@pytest.fixture()
+def profile_path(fixture_pkg: Path, tmp_path: Path) -> Path:
+    """Add a module with a dynamic dispatch to the fixture and profile it."""
+    (fixture_pkg / "my_test_pkg" / "hot.py").write_text(
+        textwrap.dedent('''\
+            from my_test_pkg.models import MyModel
+
+            REGISTRY = {}
+
+
+            def register(func):
+                REGISTRY[func.__name__] = func
+                return func
+
+
+            @register
+            def compute(n):
+                return sum(range(n))
+
+
+            def dispatch(name, n):
+                return REGISTRY[name](n)
+
+
+            def main():
+                for _ in range(3):
+                    dispatch("compute", 1000)
+                MyModel("x").process()
+        '''),
+        encoding="utf-8",
+    )
+    driver = tmp_path / "driver.py"
+    driver.write_text("from my_test_pkg.hot import main\nmain()\n", encoding="utf-8")
+    output = tmp_path / "run.pstats"
+    subprocess.run(
+        [sys.executable, "-m", "cProfile", "-o", str(output), str(driver)],
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(fixture_pkg)},
+    )
+    return output
+
+
+class TestProfileAnnotation:
+    """Tests for matching pstats data to symbols."""
+
+    @pytest.fixture()
+    def profiled(self, fixture_pkg: Path, profile_path: Path) -> CodeMapGenerator:
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg")
+        gen.analyze()
+        gen.load_profiles([profile_path])
+        return gen
+
+    def test_entries_matched(self, profiled: CodeMapGenerator) -> None:
+        profile = profiled.profile
+        assert profile is not None
+        assert profile.get("my_test_pkg.hot.dispatch").calls == 3
+        assert profile.get("my_test_pkg.models.MyModel.process").calls == 1
+        assert profile.get("my_test_pkg.hot.<module>") is not None
+
+    def test_decorated_function_matched_to_def_line(self, profiled: CodeMapGenerator) -> None:
+        entry = profiled.profile.get("my_test_pkg.hot.compute")
+        assert entry is not None
+        assert entry.calls == 3
+        assert entry.line_number == 12
+
+    def test_edges_and_dynamic_calls(self, profiled: CodeMapGenerator) -> None:
+        profile = profiled.profile
+        callees = [e.callee for e in profile.callees("my_test_pkg.hot.dispatch")]
+        assert callees == ["my_test_pkg.hot.compute"]
+        dynamic = {(e.caller, e.callee) for e in profile.dynamic_edges(profiled.call_graph)}
+        assert ("my_test_pkg.hot.dispatch", "my_test_pkg.hot.compute") in dynamic
+        assert ("my_test_pkg.hot.main", "my_test_pkg.hot.dispatch") not in dynamic
+
+    def test_hot_paths(self, profiled: CodeMapGenerator) -> None:
+        paths = [[e.name for e in path] for path in profiled.profile.hot_paths()]
+        assert [
+            "my_test_pkg.hot.main", "my_test_pkg.hot.dispatch", "my_test_pkg.hot.compute",
+        ] in [path[-3:] for path in paths]
+
+    def test_report_sections(self, profiled: CodeMapGenerator) -> None:
+        index = profiled.generate_symbol_index()
+        assert "## Profiled Symbols" in index
+        assert "| `my_test_pkg.hot.dispatch` | [src/my_test_pkg/hot.py]" in index
+        graph = profiled.generate_call_graph()
+        assert "## Hot Paths" in graph
+        assert "| `my_test_pkg.hot.dispatch` | `my_test_pkg.hot.compute` | 3 |" in graph
+        assert "missing from the static graph" in graph
+
+    def test_no_profile_no_sections(self, analyzed_generator: CodeMapGenerator) -> None:
+        assert "## Profiled Symbols" not in analyzed_generator.generate_symbol_index()
+        assert "## Hot Paths" not in analyzed_generator.generate_call_graph()
+
+    def test_cli(self, fixture_pkg: Path, profile_path: Path, tmp_path: Path) -> None:
+        out_dir = tmp_path / "cli_output"
+        code = main([
+            "--package", "my_test_pkg",
+            "--src-root", str(fixture_pkg),
+            "--output-dir", str(out_dir),
+            "--pstats", str(profile_path),
+        ])
+        assert code == 0
+        assert "## Hot Paths" in (out_dir / "call-graph.md").read_text(encoding="utf-8")
+
+    def test_cli_bad_profile(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        code = main([
+            "--package", "my_test_pkg",
+            "--src-root", str(fixture_pkg),
+            "--output-dir", str(tmp_path / "out"),
+            "--pstats", str(tmp_path / "missing.pstats"),
+        ])
+        assert code == 2
+
+
+_PERF_SOURCE = textwrap.dedent('''\
+    import os
+    import re
+    from os import environ
+
+    PATTERN = re.compile(r"\\d+")
+    ALLOWED = ["a", "b"]
+
+
+    def scan(rows, names: list[str]):
+        seen = []
+        out = ""
+        for row in rows:
+            if row in seen:
+                continue
+            if row in names:
+                out += row
+            if row in ("x", "y") or row in ["x", "y"]:
+                out = out + row
+            level = os.getenv("LEVEL")
+            debug = environ.get("DEBUG")
+            seen.append(row)
+        if out in seen:
+            pass
+        return re.sub(r"\\s+", " ", out), len(list(rows)), level, debug
+
+
+    def nested(groups):
+        return [g for g in groups if g in ALLOWED] + [
+            x for x in list(groups) if len([y for y in x]) > 1
+        ]
+
+
+    def once():
+        for item in sorted(os.listdir(".")):
+            yield PATTERN.match(item)
+''')
+
+
+class TestPerfLint:
+    """Tests for the performance anti-pattern lint in the extraction pass."""
+
+    @pytest.fixture()
+    def findings(self, tmp_path: Path) -> list[tuple[str, int]]:
+        src = tmp_path / "src"
+        src.mkdir()
+        module = src / "perf.py"
+        module.write_text(_PERF_SOURCE, encoding="utf-8")
+        analysis = extract_file(module, tmp_path)
+        assert FileAnalysis.from_dict(analysis.to_dict()).findings == analysis.findings
+        return [(f.rule, f.line_number) for f in analysis.findings]
+
+    def test_list_membership(self, findings: list[tuple[str, int]]) -> None:
+        lines = sorted(line for rule, line in findings if rule == "list-membership")
+        # seen (local list), names (annotated list), ALLOWED (module list);
+        # not the tuple/constant list, and not the test after the loop
+        assert lines == [13, 15, 28]
+
+    def test_string_concat(self, findings: list[tuple[str, int]]) -> None:
+        assert ("str-concat-loop", 16) in findings
+        assert [rule for rule, line in findings if line == 18] == []  # `out = out + row`
+
+    def test_getenv_in_loop(self, findings: list[tuple[str, int]]) -> None:
+        assert ("getenv-loop", 19) in findings
+        assert ("getenv-loop", 20) in findings
+
+    def test_regex_literal(self, findings: list[tuple[str, int]]) -> None:
+        assert [line for rule, line in findings if rule == "regex-literal"] == [24]
+
+    def test_len_of_list(self, findings: list[tuple[str, int]]) -> None:
+        assert sorted(line for rule, line in findings if rule == "len-of-list") == [24, 29]
+
+    def test_loop_iterable_not_in_loop(self, findings: list[tuple[str, int]]) -> None:
+        assert all(line < 33 for _rule, line in findings)
+
+    def test_report_ranked(self, tmp_path: Path) -> None:
+        pkg = tmp_path / "src" / "perfpkg"
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text("", encoding="utf-8")
+        (pkg / "perf.py").write_text(_PERF_SOURCE, encoding="utf-8")
+        gen = CodeMapGenerator(tmp_path / "src", "perfpkg")
+        gen.analyze()
+        assert len(gen.perf_findings) == 9
+        output = gen.generate_perf_findings()
+        assert output.startswith("# Performance Findings — perfpkg")
+        rows = [line for line in output.splitlines() if line.startswith("| 6 |")]
+        assert rows[0].startswith("| 6 | [src/perfpkg/perf.py:13](src/perfpkg/perf.py#L13) | `scan`")
+        assert "| `list-membership` — List membership in loop | 3 |" in output
+
+    def test_cli_writes_report(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        out_dir = tmp_path / "out"
+        code = main([
+            "--package", "my_test_pkg",
+            "--src-root", str(fixture_pkg),
+            "--output-dir", str(out_dir),
+            "--perf-lint",
+        ])
+        assert code == 0
+        report = (out_dir / "perf-findings.md").read_text(encoding="utf-8")
+        assert "_No performance anti-patterns found._" in report
+
+
+@pytest.fixture()
+def async_generator(tmp_path: Path) -> CodeMapGenerator:
+    """A package whose coroutines block directly and through sync helpers."""
+    pkg = tmp_path / "src" / "svc"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "io.py").write_text(
+        textwrap.dedent('''\
+            import time
+
+            import requests
+
+
+            def fetch(url):
+                return requests.get(url)
+
+
+            def wait():
+                time.sleep(1)
+
+
+            def helper():
+                return wait()
+
+
+            def pure():
+                return 1
+        '''),
+        encoding="utf-8",
+    )
+    (pkg / "handlers.py").write_text(
+        textwrap.dedent('''\
+            import asyncio
+
+            from svc.io import fetch, helper, pure
+
+
+            class Handler:
+                async def handle(self):
+                    data = open("x").read()
+                    return fetch(data)
+
+                async def safe(self):
+                    await asyncio.to_thread(helper)
+                    return pure()
+
+
+            async def run():
+                shell()
+                helper()
+                await Handler().handle()
+
+
+            def shell():
+                import subprocess
+                subprocess.run(["ls"])
+        '''),
+        encoding="utf-8",
+    )
+    gen = CodeMapGenerator(tmp_path / "src", "svc")
+    gen.analyze()
+    return gen
+
+
+class TestAsyncBlocking:
+    """Tests for blocking calls reachable from coroutines."""
+
+    def test_findings(self, async_generator: CodeMapGenerator) -> None:
+        found = {
+            (f.coroutine, f.api, f.line_number, tuple(f.path[1:-1]))
+            for f in async_generator.find_blocking_calls()
+        }
+        assert found == {
+            ("svc.handlers.Handler.handle", "open", 8, ()),
+            ("svc.handlers.Handler.handle", "requests.get", 9, ("svc.io.fetch",)),
+            ("svc.handlers.run", "subprocess.run", 17, ("svc.handlers.shell",)),
+            ("svc.handlers.run", "time.sleep", 18, ("svc.io.helper", "svc.io.wait")),
+        }
+
+    def test_direct_flag(self, async_generator: CodeMapGenerator) -> None:
+        direct = [f.api for f in async_generator.find_blocking_calls() if f.direct]
+        assert direct == ["open"]
+
+    def test_configurable_apis(self, async_generator: CodeMapGenerator) -> None:
+        found = async_generator.find_blocking_calls(["svc.io.pure"])
+        assert [(f.coroutine, f.api) for f in found] == [
+            ("svc.handlers.Handler.safe", "svc.io.pure")
+        ]
+        assert async_generator.find_blocking_calls([]) == []
+
+    def test_mutually_recursive_matched_functions(self, tmp_path: Path) -> None:
+        pkg = tmp_path / "src" / "pk"
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text("", encoding="utf-8")
+        (pkg / "m.py").write_text(
+            textwrap.dedent('''\
+                def sync_a(n):
+                    return sync_b(n - 1) if n else 0
+
+
+                def sync_b(n):
+                    return sync_a(n - 1) if n else 0
+
+
+                def helper():
+                    return sync_a(3)
+
+
+                async def co():
+                    return sync_a(3)
+
+
+                async def via_helper():
+                    return helper()
+            '''),
+            encoding="utf-8",
+        )
+        gen = CodeMapGenerator(tmp_path / "src", "pk")
+        gen.analyze()
+        found = gen.find_blocking_calls(["pk.m.sync_*"])
+        assert [(f.coroutine, f.path[1:]) for f in found] == [
+            ("pk.m.co", ["pk.m.sync_a"]),
+            ("pk.m.via_helper", ["pk.m.helper", "pk.m.sync_a"]),
+        ]
+
+    def test_report(self, async_generator: CodeMapGenerator) -> None:
+        output = async_generator.generate_async_blocking()
+        assert output.startswith("# Blocking Calls in Coroutines — svc")
+        assert "4 blocking calls in 2 coroutines (1 direct, 3 through sync helpers)." in output
+        assert (
+            "| `svc.handlers.run` | [src/svc/handlers.py:18](src/svc/handlers.py#L18)"
+            " | `time.sleep` | `svc.io.helper` → `svc.io.wait` |"
+        ) in output
+
+    def test_cli(self, async_generator: CodeMapGenerator, tmp_path: Path) -> None:
+        out_dir = tmp_path / "out"
+        code = main([
+            "--package", "svc",
+            "--src-root", str(async_generator.src_root),
+            "--output-dir", str(out_dir),
+            "--async-lint",
+            "--blocking-api", "svc.io.pure",
+        ])
+        assert code == 0
+        report = (out_dir / "async-blocking.md").read_text(encoding="utf-8")
+        assert "`svc.io.pure`" in report
+        assert "`time.sleep`" in report
+
+
+_SIDE_EFFECT_SOURCE = textwrap.dedent('''\
+    """Module with import-time work."""
+    import json
+    import logging
+    from typing import TYPE_CHECKING, TypeVar
+
+    import numpy as np
+    from weight import helpers
+
+    if TYPE_CHECKING:
+        import pandas
+
+    logger = logging.getLogger(__name__)
+    T = TypeVar("T")
+    CONFIG = json.load(open("config.json"))
+    TABLE = {WORDS}
+    REGISTRY = helpers.build()
+    for name in ("a", "b"):
+        REGISTRY.add(name)
+
+
+    class Settings:
+        values = helpers.load_defaults()
+
+        def method(self):
+            return open("x").read()
+
+
+    def lazy():
+        import pandas
+        return pandas.read_csv("x")
+
+
+    if __name__ == "__main__":
+        helpers.build()
+''').replace("{WORDS}", repr(list(range(450))))
+
+
+@pytest.fixture()
+def weight_generator(tmp_path: Path) -> CodeMapGenerator:
+    """A package with module-level side effects in ``heavy`` imported by ``api``."""
+    pkg = tmp_path / "src" / "weight"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "helpers.py").write_text("def build():\n    return set()\n", encoding="utf-8")
+    (pkg / "heavy.py").write_text(_SIDE_EFFECT_SOURCE, encoding="utf-8")
+    (pkg / "api.py").write_text("from weight import heavy\n", encoding="utf-8")
+    gen = CodeMapGenerator(tmp_path / "src", "weight")
+    gen.analyze()
+    return gen
+
+
+class TestImportWeight:
+    """Tests for module-level side effects and import-time weight."""
+
+    def test_classification(self, weight_generator: CodeMapGenerator) -> None:
+        found = [
+            (e.kind, e.line_number, e.weight, e.scope)
+            for e in weight_generator.side_effects
+        ]
+        assert found == [
+            ("import", 1, 3, ""),  # api: `weight`, dropped when scoring
+            ("import", 6, 3, ""),  # numpy
+            ("import", 7, 3, ""),  # `weight`, dropped when scoring
+            ("io", 14, 5, ""),
+            ("literal", 15, 2, ""),
+            ("call", 16, 2, ""),
+            ("loop", 17, 3, ""),
+            ("call", 22, 2, "Settings"),
+        ]
+
+    def test_round_trip(self, weight_generator: CodeMapGenerator) -> None:
+        heavy = weight_generator.src_root / "weight" / "heavy.py"
+        analysis = extract_file(heavy, weight_generator.src_root.parent)
+        assert FileAnalysis.from_dict(analysis.to_dict()).side_effects == analysis.side_effects
+
+    def test_weights(self, weight_generator: CodeMapGenerator) -> None:
+        weights = {w.module: w for w in weight_generator.import_weights()}
+        assert set(weights) == {"weight.heavy", "weight.api"}
+        heavy = weights["weight.heavy"]
+        assert (heavy.own, heavy.cumulative) == (17, 17)
+        assert all(e.target != "weight" for e in heavy.effects)
+        assert (weights["weight.api"].own, weights["weight.api"].cumulative) == (0, 17)
+        assert heavy.counts["io"] == 1
+
+    def test_report(self, weight_generator: CodeMapGenerator) -> None:
+        output = weight_generator.generate_import_weight()
+        assert output.startswith("# Import-Time Weight — weight")
+        assert "| `weight.heavy` | 17 | 17 | 1 | 1 | 1 | 2 | 1 |" in output
+        assert (
+            "- [src/weight/heavy.py:14](src/weight/heavy.py#L14) — io (5):"
+            " `CONFIG = json.load(open('config.json'))`"
+        ) in output
+        assert "in `Settings`" in output
+        assert "loop (3): `for name in ('a', 'b')`" in output
+
+    def test_cli(self, weight_generator: CodeMapGenerator, tmp_path: Path) -> None:
+        out_dir = tmp_path / "out"
+        code = main([
+            "--package", "weight",
+            "--src-root", str(weight_generator.src_root),
+            "--output-dir", str(out_dir),
+            "--import-weight",
+        ])
+        assert code == 0
+        report = (out_dir / "import-weight.md").read_text(encoding="utf-8")
+        assert "### `weight.heavy` (17)" in report
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        capture_output=True, text=True, check=True,
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture()
+def git_repo(tmp_path: Path) -> Path:
+    """A repository with two commits (``v1``, ``v2``) of ``src/lib``, plus local edits."""
+    repo = tmp_path / "repo"
+    pkg = repo / "src" / "lib"
+    pkg.mkdir(parents=True)
+    _git(repo, "init", "-q")
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "core.py").write_text(textwrap.dedent('''\
+        def load(path):
+            return path
+
+
+        def save(path, data):
+            return data
+
+
+        class Store:
+            def get(self, key):
+                return key
+    '''), encoding="utf-8")
+    (pkg / "util.py").write_text("def helper():\n    return 1\n", encoding="utf-8")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-qm", "v1")
+    _git(repo, "tag", "v1")
+
+    (pkg / "core.py").write_text(textwrap.dedent('''\
+        def load(path, encoding):
+            return path
+
+
+        class Store:
+            def get(self, key):
+                return key
+
+            async def fetch(self, key):
+                return key
+    '''), encoding="utf-8")
+    _git(repo, "commit", "-qam", "v2")
+    _git(repo, "tag", "v2")
+
+    (pkg / "core.py").write_text("def uncommitted():\n    pass\n", encoding="utf-8")
+    return repo
+
+
+class TestGitRevision:
+    """Tests for analyzing git revisions and diffing their APIs."""
+
+    def test_analyze_revision_ignores_working_tree(self, git_repo: Path) -> None:
+        gen = CodeMapGenerator(git_repo / "src", "lib", revision="v1")
+        gen.analyze()
+        names = sorted(s.name for s in gen.symbols)
+        assert names == ["Store", "get", "helper", "load", "save"]
+        assert {s.file_path for s in gen.symbols} == {"src/lib/core.py", "src/lib/util.py"}
+        assert "at revision `v1`" in gen.generate_symbol_index()
+
+    def test_matches_checkout(self, git_repo: Path) -> None:
+        _git(git_repo, "checkout", "-q", "v2", "--", "src")
+        tree = CodeMapGenerator(git_repo / "src", "lib", deterministic=True)
+        tree.analyze()
+        rev = CodeMapGenerator(git_repo / "src", "lib", deterministic=True, revision="v2")
+        rev.analyze()
+        assert rev.symbols == tree.symbols
+        assert rev.source_hashes == tree.source_hashes
+
+    def test_blobs_and_reader(self, git_repo: Path) -> None:
+        source = RevisionSource(git_repo / "src", "lib", "v1")
+        blobs = source.blobs()
+        assert [path for path, _ in blobs] == [
+            "src/lib/__init__.py", "src/lib/core.py", "src/lib/util.py"
+        ]
+        with source.reader() as reader:
+            contents = list(reader.read_many([blobs[2][1], source.file_name("missing.py")]))
+        assert contents == [b"def helper():\n    return 1\n", None]
+
+    def test_unknown_revision(self, git_repo: Path) -> None:
+        gen = CodeMapGenerator(git_repo / "src", "lib", revision="nope")
+        with pytest.raises(GitError, match="Unknown revision: nope"):
+            gen.analyze()
+
+    def test_api_diff(self, git_repo: Path) -> None:
+        gen = CodeMapGenerator(git_repo / "src", "lib", revision="v2")
+        gen.analyze()
+        changes = {(c.kind, c.name): c for c in gen.api_diff("v1")}
+        assert set(changes) == {
+            ("added", "lib.core.Store.fetch"),
+            ("removed", "lib.core.save"),
+            ("changed", "lib.core.load"),
+        }
+        changed = changes[("changed", "lib.core.load")]
+        assert (changed.old_signature, changed.new_signature) == (
+            "def load(path)", "def load(path, encoding)"
+        )
+        assert changes[("added", "lib.core.Store.fetch")].new_signature == (
+            "async def fetch(key)"
+        )
+
+    @staticmethod
+    def _signatures(source: str, tmp_path: Path) -> dict[str, str]:
+        path = tmp_path / "mod.py"
+        analysis = extract_file(path, tmp_path, textwrap.dedent(source).encode())
+        return {sym.name: gitrev.signature(sym) for sym in analysis.symbols}
+
+    @pytest.mark.parametrize(("source", "expected"), [
+        ("def f(a, *, b): pass", "def f(a, *, b)"),
+        ("def f(a, *, c=1): pass", "def f(a, *, c=...)"),
+        ("def f(a, /, b): pass", "def f(a, /, b)"),
+        ("def f(*args, **kwargs): pass", "def f(*args, **kwargs)"),
+        ("def f(a, b=2, *rest, c, d=4, **kw): pass", "def f(a, b=..., *rest, c, d=..., **kw)"),
+        ("class C:\n    def m(self, /, x, *, y): pass", "def m(x, *, y)"),
+        ("class C:\n    @classmethod\n    def m(cls, x=1): pass", "@classmethod def m(x=...)"),
+    ])
+    def test_signature_covers_every_parameter_kind(
+        self, source: str, expected: str, tmp_path: Path
+    ) -> None:
+        name = expected.split("(")[0].rsplit(" ", 1)[-1]
+        assert self._signatures(source, tmp_path)[name] == expected
+
+    @pytest.mark.parametrize(("before", "after"), [
+        ("def f(a, *, b): pass", "def f(a, *, c=1): pass"),
+        ("def f(a, b): pass", "def f(a, /, b): pass"),
+        ("def f(a): pass", "def f(a, *args): pass"),
+        ("def f(a): pass", "def f(a, **kwargs): pass"),
+        ("def f(a, b): pass", "def f(a, b=None): pass"),
+    ])
+    def test_api_diff_reports_any_parameter_change(
+        self, before: str, after: str, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "mod.py"
+        old = extract_file(path, tmp_path, before.encode()).symbols
+        new = extract_file(path, tmp_path, after.encode()).symbols
+        assert [(c.kind, c.name) for c in gitrev.api_diff(old, new)] == [("changed", "mod.f")]
+
+    def test_api_diff_reuses_unchanged_blobs(self, git_repo: Path, tmp_path: Path) -> None:
+        gen = CodeMapGenerator(git_repo / "src", "lib", revision="v2")
+        gen.analyze()
+        base = gen._at_revision("v1")  # pylint: disable=protected-access
+        assert (base.cache_hits, base.cache_misses) == (2, 1)  # only core.py changed
+
+        cache_dir = tmp_path / "cache"
+        first = CodeMapGenerator(git_repo / "src", "lib", cache_dir=cache_dir, revision="v1")
+        first.analyze()
+        again = CodeMapGenerator(git_repo / "src", "lib", cache_dir=cache_dir, revision="v1")
+        again.analyze()
+        assert (again.cache_hits, again.cache_misses) == (3, 0)
+        assert again.symbols == first.symbols
+
+    def test_revision_runs_keep_other_cache_entries(
+        self, git_repo: Path, tmp_path: Path
+    ) -> None:
+        cache_dir = tmp_path / "cache"
+
+        def run(revision: str | None = None) -> CodeMapGenerator:
+            gen = CodeMapGenerator(git_repo / "src", "lib", cache_dir=cache_dir, revision=revision)
+            gen.analyze()
+            return gen
+
+        run()
+        run(revision="v2").api_diff("v1")
+        again = run()
+        assert (again.cache_hits, again.cache_misses) == (3, 0)
+        for revision in ("v1", "v2"):
+            assert run(revision=revision).cache_misses == 0
+
+        stale = cache_dir / "lib" / "blobs" / "v0-py0.0"
+        stale.mkdir()
+        run(revision="v1")
+        assert not stale.exists()
+
+    def test_cli(self, git_repo: Path, tmp_path: Path) -> None:
+        out_dir = tmp_path / "out"
+        code = main([
+            "--package", "lib",
+            "--src-root", str(git_repo / "src"),
+            "--output-dir", str(out_dir),
+            "--revision", "v2",
+            "--api-diff", "v1",
+        ])
+        assert code == 0
+        report = (out_dir / "api-diff.md").read_text(encoding="utf-8")
+        assert "Public API from `v1` to `v2`: 1 added, 1 removed, 1 changed." in report
+        assert "| `def load(path)` | `def load(path, encoding)` |" in report
+
+    def test_cli_unknown_revision(self, git_repo: Path, tmp_path: Path) -> None:
+        code = main([
+            "--package", "lib",
+            "--src-root", str(git_repo / "src"),
+            "--output-dir", str(tmp_path / "out"),
+            "--revision", "nope",
+        ])
+        assert code == 2
+
+
+@pytest.fixture()
+def monorepo_roots(tmp_path: Path) -> list[Path]:
+    """Two source roots: ``core``/``api`` under ``libs/src``, ``app`` under ``apps/lib``."""
+    files = {
+        "libs/src/core/__init__.py": "",
+        "libs/src/core/models.py": "class Model:\n    pass\n",
+        "libs/src/core/util.py": "from api.client import Client\n",
+        "libs/src/api/__init__.py": "",
+        "libs/src/api/client.py": (
+            "from core.models import Model\n\n\nclass Client:\n    def get(self):\n"
+            "        return Model()\n"
+        ),
+        "libs/src/notapkg/readme.py": "x = 1\n",
+        "libs/pyproject.toml": '[project.scripts]\ncore-cli = "core.util:main"\n',
+        "apps/lib/app/__init__.py": "from api import client\nfrom core import models\n",
+        "apps/lib/app/main.py": (
+            "from api.client import Client\n\n\nif __name__ == '__main__':\n"
+            "    Client().get()\n"
+        ),
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return [tmp_path / "libs" / "src", tmp_path / "apps" / "lib"]
+
+
+class TestMonorepo:
+    """Tests for analyzing every package under several source roots."""
+
+    def test_discovers_packages(self, monorepo_roots: list[Path]) -> None:
+        repo = Monorepo(monorepo_roots)
+        assert [(ref.name, ref.src_root) for ref in repo.packages] == [
+            ("api", monorepo_roots[0]), ("app", monorepo_roots[1]), ("core", monorepo_roots[0])
+        ]
+        assert [ref.name for ref in Monorepo(monorepo_roots, packages=["core"]).packages] == [
+            "core"
+        ]
+
+    def test_per_package_maps_match_single_runs(self, monorepo_roots: list[Path]) -> None:
+        repo = Monorepo(monorepo_roots, deterministic=True)
+        repo.analyze()
+        for ref in repo.packages:
+            single = CodeMapGenerator(ref.src_root, ref.name, deterministic=True)
+            single.analyze()
+            combined = repo.generators[ref.name]
+            assert combined.symbols == single.symbols
+            assert combined.entry_points == single.entry_points
+            assert combined.generate_combined_code_map() == single.generate_combined_code_map()
+
+    def test_cross_package_graph(self, monorepo_roots: list[Path]) -> None:
+        repo = Monorepo(monorepo_roots, workers=2)
+        repo.analyze()
+        edges = {(e.importer, e.imported): e.imports for e in repo.package_edges()}
+        assert edges == {("app", "api"): 2, ("app", "core"): 1, ("api", "core"): 1,
+                         ("core", "api"): 1}
+        assert repo.package_cycles() == [["api", "core"]]
+        assert "api.client" in repo.dependency_graph.closure("app.main")
+
+    def test_shared_cache(self, monorepo_roots: list[Path], tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        Monorepo(monorepo_roots, cache_dir=cache_dir).analyze()
+        again = Monorepo(monorepo_roots, cache_dir=cache_dir)
+        again.analyze()
+        assert {name: g.cache_hits for name, g in again.generators.items()} == {
+            "api": 2, "app": 2, "core": 3
+        }
+        assert sum(g.cache_misses for g in again.generators.values()) == 0
+
+    def test_write_outputs(self, monorepo_roots: list[Path], tmp_path: Path) -> None:
+        repo = Monorepo(monorepo_roots)
+        repo.analyze()
+        out_dir = tmp_path / "out"
+        files = repo.write_outputs(out_dir)
+        assert files[0] == out_dir / "cross-package.md"
+        assert (out_dir / "api" / "code-map.md").is_file()
+        assert (out_dir / "app" / "symbol-index.md").is_file()
+        report = files[0].read_text(encoding="utf-8")
+        assert "3 packages under 2 source roots; 5 module imports cross package boundaries." in (
+            report
+        )
+        assert "| `app` | `api` | 2 | `app` → `api.client` |" in report
+        assert "- `api` ↔ `core`" in report
+
+    def test_cli(self, monorepo_roots: list[Path], tmp_path: Path) -> None:
+        out_dir = tmp_path / "out"
+        code = main([
+            "--monorepo", *map(str, monorepo_roots),
+            "--output-dir", str(out_dir),
+            "--jobs", "2",
+        ])
+        assert code == 0
+        assert (out_dir / "cross-package.md").is_file()
+        assert (out_dir / "core" / "entry-points.md").is_file()
+        assert main(["--monorepo", str(tmp_path / "missing")]) == 2
+
+    def test_cli_per_package_options(self, monorepo_roots: list[Path], tmp_path: Path) -> None:
+        out_dir = tmp_path / "out"
+        code = main([
+            "--monorepo", *map(str, monorepo_roots),
+            "--output-dir", str(out_dir),
+            "--perf-lint", "--async-lint", "--import-weight", "--db", "--export",
+        ])
+        assert code == 0
+        for package in ("api", "app", "core"):
+            for name in ("perf-findings.md", "async-blocking.md", "import-weight.md",
+                         "codemap.sqlite", "codemap.cmx"):
+                assert (out_dir / package / name).is_file(), (package, name)
+        assert not (out_dir / "codemap.sqlite").exists()
+
+    @pytest.mark.parametrize("option", [
+        ["--revision", "HEAD"], ["--profile"], ["--db", "x.db"], ["--export", "x.cmx"],
+    ])
+    def test_cli_rejects_single_package_options(
+        self, monorepo_roots: list[Path], tmp_path: Path, option: list[str]
+    ) -> None:
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--monorepo", *map(str, monorepo_roots),
+                  "--output-dir", str(tmp_path / "out"), *option])
+        assert exc_info.value.code == 2
+        assert not (tmp_path / "out").exists()
+
+
+# ===================================================================
+# TestPhaseTimer
+# ===================================================================
+
+
+class TestPhaseTimer:
+    """Tests for per-phase timing instrumentation (``--profile``)."""
+
+    def test_extract_file_timing(self, fixture_pkg: Path) -> None:
+        analysis = extract_file(fixture_pkg / "my_test_pkg" / "models.py", fixture_pkg.parent)
+        assert analysis.timing is not None
+        size = (fixture_pkg / "my_test_pkg" / "models.py").stat().st_size
+        assert analysis.timing.size == size
+        assert min(analysis.timing.read, analysis.timing.parse, analysis.timing.extract) >= 0
+        assert "timing" not in analysis.to_dict()
+        assert FileAnalysis.from_dict(analysis.to_dict()) == analysis
+
+    def test_generator_phases(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        timer = PhaseTimer()
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg", timer=timer)
+        gen.analyze()
+        gen.write_outputs(tmp_path / "out")
+        assert list(timer.phases)[:5] == [
+            "discover files", "extract files", "merge results",
+            "build call graph", "build dependency graph",
+        ]
+        assert {f"render {name}" for name, _ in CodeMapGenerator.OUTPUTS} <= set(timer.phases)
+        assert "write files" in timer.phases
+        assert sorted(path for path, _ in timer.files) == sorted(
+            path for path in gen.source_hashes if path.endswith(".py")
+        )
+        slowest = timer.slowest(2)
+        assert len(slowest) == 2
+        first, second = (timing.read + timing.parse + timing.extract for _, timing in slowest)
+        assert first >= second
+
+        data = timer.to_dict(top=1)
+        assert data["files_parsed"] == len(timer.files)
+        assert len(data["slowest_files"]) == 1
+        assert data["throughput"]["files_per_second"] > 0
+        assert "Throughput:" in "\n".join(timer.iter_report())
+
+    def test_cached_files_not_timed(self, fixture_pkg: Path, tmp_path: Path) -> None:
+        CodeMapGenerator(fixture_pkg, "my_test_pkg", cache_dir=tmp_path / "cache").analyze()
+        timer = PhaseTimer()
+        CodeMapGenerator(
+            fixture_pkg, "my_test_pkg", cache_dir=tmp_path / "cache", timer=timer
+        ).analyze()
+        assert timer.files == []
+        assert "extract files" in timer.phases
+
+    def test_cli(
+        self, fixture_pkg: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        import json
+
+        out = tmp_path / "out"
+        code = main([
+            "--src-root", str(fixture_pkg),
+            "--package", "my_test_pkg",
+            "--output-dir", str(out),
+            "--profile",
+            "--profile-top", "2",
+        ])
+        assert code == 0
+        assert "Slowest 2 files:" in capsys.readouterr().out
+        data = json.loads((out / "codemap-profile.json").read_text(encoding="utf-8"))
+        assert len(data["slowest_files"]) == 2
+        assert "render call-graph.md" in data["phases"]
+
+
+# ===================================================================
+# TestWatch
+# ===================================================================
+
+
+class TestWatch:
+    """Tests for watch mode: incremental re-analysis of changed files."""
+
+    @pytest.fixture()
+    def watcher(self, fixture_pkg: Path) -> CodeMapWatcher:
+        watcher = CodeMapWatcher(CodeMapGenerator(fixture_pkg, "my_test_pkg", deterministic=True))
+        watcher.load()
+        return watcher
+
+    @staticmethod
+    def _edit(path: Path, content: str) -> None:
+        mtime = path.stat().st_mtime_ns
+        path.write_text(content, encoding="utf-8")
+        os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+    @staticmethod
+    def _fresh(fixture_pkg: Path) -> CodeMapGenerator:
+        gen = CodeMapGenerator(fixture_pkg, "my_test_pkg", deterministic=True)
+        gen.analyze()
+        return gen
+
+    def test_load_matches_analyze(self, watcher: CodeMapWatcher, fixture_pkg: Path) -> None:
+        fresh = self._fresh(fixture_pkg)
+        assert watcher.generator.symbols == fresh.symbols
+        assert watcher.generator.entry_points == fresh.entry_points
+        assert watcher.poll() is None
+
+    def test_docstring_edit(self, watcher: CodeMapWatcher, fixture_pkg: Path) -> None:
+        models = fixture_pkg / "my_test_pkg" / "models.py"
+        self._edit(models, models.read_text(encoding="utf-8").replace(
+            '"""Models module."""', '"""Domain models."""'
+        ))
+        update = watcher.poll()
+        assert update is not None
+        assert update.changed == [models]
+        assert update.facets == {"docstring", "sources"}
+        assert "Domain models." in watcher.generator.module_docstrings.values()
+        watcher.generator.deterministic = False
+        assert watcher.affected_outputs(update.facets) == ["combined_code_map", "module_summaries"]
+
+    def test_add_and_remove(self, watcher: CodeMapWatcher, fixture_pkg: Path) -> None:
+        pkg = fixture_pkg / "my_test_pkg"
+        (pkg / "extra.py").write_text("def extra():\n    pass\n", encoding="utf-8")
+        update = watcher.poll()
+        assert update is not None and update.changed == [pkg / "extra.py"]
+        assert {"files", "symbols"} <= update.facets
+        assert update.outputs == [name for _, name in CodeMapGenerator.OUTPUTS]
+        fresh = self._fresh(fixture_pkg)
+        assert watcher.generator.generate_combined_code_map() == fresh.generate_combined_code_map()
+        assert watcher.generator.generate_call_graph() == fresh.generate_call_graph()
+
+        (pkg / "extra.py").unlink()
+        update = watcher.poll()
+        assert update is not None and update.removed == [pkg / "extra.py"]
+        assert "extra" not in {sym.name for sym in watcher.generator.symbols}
+
+    def test_touch_affects_nothing(self, watcher: CodeMapWatcher, fixture_pkg: Path) -> None:
+        models = fixture_pkg / "my_test_pkg" / "models.py"
+        self._edit(models, models.read_text(encoding="utf-8"))
+        update = watcher.poll()
+        assert update is not None
+        assert update.facets == set()
+        assert update.outputs == []
+
+    def test_changed_facets(self) -> None:
+        old = FileAnalysis("pkg/a.py", "pkg.a", content_hash="1")
+        new = FileAnalysis("pkg/a.py", "pkg.a", content_hash="2", error="bad syntax")
+        new.symbols.append(SymbolInfo("f", "function", "pkg/a.py", 1))
+        assert watch.changed_facets(old, new) == {"sources"}
+        assert watch.changed_facets(None, old) == {"files", "sources"}
+        assert watch.changed_facets(old, FileAnalysis("pkg/a.py", "pkg.a", skipped="too big")) == {
+            "files", "sources"
+        }
+
+    def test_write_outputs_only(self, watcher: CodeMapWatcher, tmp_path: Path) -> None:
+        gen = watcher.generator
+        out = tmp_path / "out"
+        gen.write_outputs(out)
+        (out / "call-graph.md").write_text("stale", encoding="utf-8")
+        (out / "symbol-index.md").write_text("stale", encoding="utf-8")
+        gen.write_outputs(out, only=["symbol_index"])
+        assert gen.files_changed == [out / "symbol-index.md"]
+        assert (out / "call-graph.md").read_text(encoding="utf-8") == "stale"
+
+    def test_revision_rejected(self, fixture_pkg: Path) -> None:
+        with pytest.raises(ValueError):
+            CodeMapWatcher(CodeMapGenerator(fixture_pkg, "my_test_pkg", revision="HEAD"))
+
+    def test_cli(
+        self, fixture_pkg: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calls = []
+
+        def fake_sleep(seconds: float) -> None:
+            calls.append(seconds)
+            if len(calls) == 1:
+                self._edit(fixture_pkg / "my_test_pkg" / "extra.py", "def extra():\n    pass\n")
+            else:
+                raise KeyboardInterrupt
+
+        (fixture_pkg / "my_test_pkg" / "extra.py").write_text("", encoding="utf-8")
+        monkeypatch.setattr(watch.time, "sleep", fake_sleep)
+        out = tmp_path / "out"
+        code = main([
+            "--src-root", str(fixture_pkg),
+            "--package", "my_test_pkg",
+            "--output-dir", str(out),
+            "--watch", "0.5",
+        ])
+        assert code == 0
+        assert calls == [0.5, 0.5]
+        assert "`extra`" in (out / "symbol-index.md").read_text(encoding="utf-8")
+
+    def test_cli_rejects_revision(self, fixture_pkg: Path) -> None:
+        with pytest.raises(SystemExit):
+            main(["--src-root", str(fixture_pkg), "--package", "my_test_pkg",
+                  "--revision", "HEAD", "--watch"])
+
+
 # ===================================================================
 # TestEdgeCases
 # ===================================================================
@@ -944,3 +3158,105 @@ class TestMainModule:
         assert result.returncode == 0
         assert output_dir.exists()
         assert (output_dir / "code-map.md").exists()
+
+
+# ===================================================================
+# TestBenchmark
+# ===================================================================
+
+
+class TestBenchmark:
+    """Tests for the synthetic-package benchmark helpers."""
+
+    def test_synthetic_package_counts(self, tmp_path: Path) -> None:
+        from dev_tools.codemap_generator.benchmark import generate_synthetic_package
+
+        src = tmp_path / "src"
+        generate_synthetic_package(src, modules=12, classes=2, methods=3, functions=4, calls=2)
+        gen = CodeMapGenerator(src, "synthetic_pkg")
+        gen.analyze()
+
+        by_type: dict[str, int] = {}
+        for sym in gen.symbols:
+            by_type[sym.symbol_type] = by_type.get(sym.symbol_type, 0) + 1
+        assert by_type == {"class": 24, "method": 72, "function": 12 * (4 + 2)}
+        assert len([ep for ep in gen.entry_points if ep.entry_type == "main_block"]) == 12
+
+    def test_main_reports_timing(self, capsys: pytest.CaptureFixture[str]) -> None:
+        from dev_tools.codemap_generator.benchmark import main as bench_main
+
+        assert bench_main(["--modules", "5", "--repeat", "1"]) == 0
+        assert "analyze(): 5 modules" in capsys.readouterr().out
+
+    def test_synthetic_imports(self, tmp_path: Path) -> None:
+        from dev_tools.codemap_generator.benchmark import generate_synthetic_package
+
+        src = tmp_path / "src"
+        generate_synthetic_package(src, modules=6, imports=3)
+        gen = CodeMapGenerator(src, "synthetic_pkg")
+        gen.analyze()
+        graph = gen.dependency_graph
+        assert graph.imports_of("synthetic_pkg.sub_5.mod_5") == [
+            "synthetic_pkg.sub_2.mod_2",
+            "synthetic_pkg.sub_3.mod_3",
+            "synthetic_pkg.sub_4.mod_4",
+        ]
+        assert "synthetic_pkg.sub_4.mod_4.func_0" in gen.call_graph.callees(
+            "synthetic_pkg.sub_5.mod_5.func_0"
+        )
+
+    def test_run_benchmark_phases(self, tmp_path: Path) -> None:
+        from dev_tools.codemap_generator.benchmark import (
+            generate_synthetic_package,
+            run_benchmark,
+        )
+
+        generate_synthetic_package(tmp_path / "src", modules=3)
+        result = run_benchmark(tmp_path / "src", "synthetic_pkg", repeat=1)
+        phases = ["analyze", *(f"generate_{name}" for _, name in CodeMapGenerator.OUTPUTS),
+                  "write_outputs"]
+        assert list(result["timings"]) == phases
+        assert list(result["peak_memory"]) == phases
+        assert all(peak > 0 for peak in result["peak_memory"].values())
+        assert result["files"] == 7  # 3 modules, 3 subpackage and 1 package __init__
+
+    def test_record_memory(self, tmp_path: Path) -> None:
+        from dev_tools.codemap_generator.benchmark import (
+            RECORD_LAYOUTS,
+            generate_synthetic_package,
+            measure_record_memory,
+        )
+
+        generate_synthetic_package(tmp_path / "src", modules=40)
+        result = measure_record_memory(tmp_path / "src", "synthetic_pkg")
+        assert result["records"] > 4000
+        for layout in RECORD_LAYOUTS:
+            assert result[layout] is None or result[layout] >= 0
+        if sys.platform == "linux":
+            assert result["slotted"] < result["dataclass"]
+
+    def test_json_and_baseline(self, tmp_path: Path) -> None:
+        import json
+
+        from dev_tools.codemap_generator.benchmark import compare
+        from dev_tools.codemap_generator.benchmark import main as bench_main
+
+        args = ["--modules", "3", "--repeat", "1", "--no-memory"]
+        assert bench_main([*args, "--json", str(tmp_path / "base.json")]) == 0
+        baseline = json.loads((tmp_path / "base.json").read_text(encoding="utf-8"))
+        assert baseline["parameters"]["modules"] == 3
+        assert baseline["peak_memory"] == {}
+
+        slower = {**baseline, "timings": {k: v * 2 + 1 for k, v in baseline["timings"].items()}}
+        assert compare(slower, baseline) == [
+            phase for phase, seconds in baseline["timings"].items() if seconds >= 0.005
+        ]
+        assert compare(baseline, baseline) == []
+        with pytest.raises(ValueError):
+            compare({**baseline, "parameters": {"modules": 4}}, baseline)
+
+        (tmp_path / "fast.json").write_text(json.dumps(
+            {**baseline, "timings": {k: 0.005 for k in baseline["timings"]}}
+        ), encoding="utf-8")
+        assert bench_main([*args, "--baseline", str(tmp_path / "fast.json"),
+                           "--tolerance", "1000"]) == 0
@@ -1,6 +1,9 @@
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
 import pytest
 from unittest.mock import patch
@@ -15,6 +18,12 @@ from dev_tools.logger_settings import (
     _get_logger_folder,
     _get_log_basename,
     _default_logging_config,
+    _BoundedQueueHandler,
+    _async_state,
+    _get_queue_overflow,
+    _get_queue_size,
+    is_async_logging_enabled,
+    stop_async_logging,
 )
 
 
@@ -620,3 +629,118 @@ class TestDefaultLoggingConfig:
         assert config["handlers"]["screen"]["level"] == "WARNING"
         assert config["handlers"]["file"]["level"] == "INFO"
         assert config["root"]["level"] == "INFO"
+
+
+# ===================================================================
+# TestAsyncLogging
+# ===================================================================
+
+
+class TestAsyncLogging:
+    """Tests for the queue-based async logging mode."""
+
+    @pytest.fixture(autouse=True)
+    def _restore_root_logger(self, monkeypatch, tmp_path):
+        """Use the built-in config and put the root logger back afterwards."""
+        monkeypatch.setenv("LOGGER_CONF_PATH", str(tmp_path / "missing.conf"))
+        for name in ("LOGGER_ASYNC", "LOGGER_QUEUE_SIZE", "LOGGER_QUEUE_OVERFLOW"):
+            monkeypatch.delenv(name, raising=False)
+        root = logging.getLogger()
+        saved = root.handlers[:], root.level
+        yield
+        stop_async_logging()
+        for handler in root.handlers:
+            if handler not in saved[0]:
+                handler.close()
+        root.handlers[:] = saved[0]
+        root.setLevel(saved[1])
+
+    def test_env_var_enables(self, monkeypatch):
+        """LOGGER_ASYNC should enable async logging; the argument wins."""
+        assert is_async_logging_enabled() is False
+        monkeypatch.setenv("LOGGER_ASYNC", "true")
+        assert is_async_logging_enabled() is True
+        assert is_async_logging_enabled(False) is False
+
+    def test_queue_settings_validation(self, monkeypatch):
+        """Queue size and overflow policy come from arguments or env vars."""
+        assert _get_queue_size() == 10_000
+        monkeypatch.setenv("LOGGER_QUEUE_SIZE", "50")
+        assert _get_queue_size() == 50
+        assert _get_queue_size(5) == 5
+        monkeypatch.setenv("LOGGER_QUEUE_OVERFLOW", "BLOCK")
+        assert _get_queue_overflow() == "block"
+        with pytest.raises(ValueError, match="positive"):
+            _get_queue_size(0)
+        monkeypatch.setenv("LOGGER_QUEUE_SIZE", "many")
+        with pytest.raises(ValueError, match="positive"):
+            _get_queue_size()
+        with pytest.raises(ValueError, match="overflow policy"):
+            _get_queue_overflow("spill")
+
+    def test_records_are_written_by_the_listener(self, tmp_path):
+        """Handlers move behind a listener thread; draining writes every record."""
+        logger_setup(logger_path=str(tmp_path), async_logging=True)
+        root = logging.getLogger()
+        assert [type(h) for h in root.handlers] == [_BoundedQueueHandler]
+
+        for i in range(100):
+            logging.getLogger("async.test").info("record %s", i)
+        stop_async_logging()
+
+        assert not any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers)
+        text = "".join(p.read_text(encoding="utf-8") for p in tmp_path.rglob("*.log"))
+        assert "record 0" in text and "record 99" in text
+        assert text.index("record 0") < text.index("record 99")
+
+    def test_log_calls_do_not_run_handlers_on_the_caller(self, tmp_path):
+        """The configured handlers run on the listener thread only."""
+        logger_setup(logger_path=str(tmp_path), async_logging=True)
+        threads: set[str] = set()
+
+        class Recorder(logging.Handler):
+            def emit(self, record):
+                threads.add(threading.current_thread().name)
+
+        listener, _ = _async_state["running"]
+        listener.handlers = (*listener.handlers, Recorder())
+        logging.getLogger("async.test").warning("from the caller")
+        stop_async_logging()
+        assert threads and threading.current_thread().name not in threads
+
+    def test_drop_policy_counts_dropped_records(self):
+        """A full queue drops new records under "drop" and counts them."""
+        handler = _BoundedQueueHandler(queue.Queue(maxsize=2), "drop")
+        for i in range(5):
+            handler.emit(logging.makeLogRecord({"msg": f"m{i}"}))
+        assert handler.dropped == 3
+        assert [handler.queue.get_nowait().msg for _ in range(2)] == ["m0", "m1"]
+
+    def test_dropped_records_are_reported_on_drain(self, tmp_path):
+        """Draining logs a warning with the number of dropped records."""
+        logger_setup(logger_path=str(tmp_path), async_logging=True)
+        _async_state["running"][1].dropped = 7
+        stop_async_logging()
+        text = "".join(p.read_text(encoding="utf-8") for p in tmp_path.rglob("*.log"))
+        assert "Dropped 7 log records" in text
+
+    def test_exit_drains_queue(self, tmp_path):
+        """log_exit_code() should write the exit line and drain the queue."""
+        logger_setup(logger_path=str(tmp_path), async_logging=True, queue_overflow="block")
+        log_exit_code()
+        root = logging.getLogger()
+        assert not any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers)
+        text = "".join(p.read_text(encoding="utf-8") for p in tmp_path.rglob("*.log"))
+        assert "Exit code: 0" in text
+
+    def test_repeated_setup_replaces_listener(self, tmp_path):
+        """A second logger_setup() drains the first listener before reconfiguring."""
+        logger_setup(logger_path=str(tmp_path), async_logging=True)
+        logging.getLogger("async.test").info("first setup")
+        logger_setup(logger_path=str(tmp_path), async_logging=True)
+        root = logging.getLogger()
+        assert [type(h) for h in root.handlers] == [_BoundedQueueHandler]
+        stop_async_logging()
+        text = "".join(p.read_text(encoding="utf-8") for p in tmp_path.rglob("*.log"))
+        assert "first setup" in text
+
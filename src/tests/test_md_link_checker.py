@@ -1,17 +1,25 @@
 """Tests for the dev_tools.md_link_checker sub-package."""
 
+import fnmatch
+import itertools
+import multiprocessing
 import subprocess
 import sys
+import time
 from pathlib import Path
 
 import pytest
 
+from dev_tools.md_link_checker import scanner
 from dev_tools.md_link_checker.scanner import (
     DEFAULT_SKIP_DIRS,
     LinkCheckError,
     LinkResult,
     LinkStatus,
+    ScanLimits,
     ScanResult,
+    ScanTimeoutError,
+    SkippedFile,
     check_link,
     extract_anchors,
     find_markdown_files,
@@ -22,6 +30,7 @@ from dev_tools.md_link_checker.scanner import (
     slugify_heading,
 )
 from dev_tools.md_link_checker.cli import build_parser, main
+from dev_tools.md_link_checker.rules import GlobMatcher, PathRule, PathRules, RuleSet
 
 
 # ===================================================================
@@ -170,6 +179,145 @@ class TestFindMarkdownFiles:
         assert files == sorted(files)
 
 
+# ===================================================================
+# TestPathRules
+# ===================================================================
+
+class TestPathRules:
+    """Tests for the compiled rule engine in md_link_checker.rules."""
+
+    def test_parse_skips_blank_and_comment(self) -> None:
+        assert PathRule.parse("") is None
+        assert PathRule.parse("   # comment") is None
+
+    def test_parse_negated_dir_only(self) -> None:
+        rule = PathRule.parse("!build/", base="docs")
+        assert rule == PathRule("build", negated=True, dir_only=True, base="docs")
+
+    def test_bare_name_matches_any_component(self) -> None:
+        rules = RuleSet([PathRule("out")])
+        assert rules.is_excluded("out", is_dir=True)
+        assert rules.is_excluded("a/b/out", is_dir=True)
+        assert not rules.is_excluded("a/outer", is_dir=True)
+
+    def test_slash_pattern_is_anchored(self) -> None:
+        rules = RuleSet([PathRule("docs/*.md")])
+        assert rules.is_excluded("docs/a.md")
+        assert not rules.is_excluded("x/docs/a.md")
+        assert not rules.is_excluded("docs/sub/a.md")
+
+    def test_double_star_spans_directories(self) -> None:
+        rules = RuleSet([PathRule("docs/**/draft-*.md")])
+        assert rules.is_excluded("docs/draft-1.md")
+        assert rules.is_excluded("docs/a/b/draft-2.md")
+        assert not rules.is_excluded("docs/a/final.md")
+
+    def test_dir_only_rule_ignores_files(self) -> None:
+        rules = RuleSet([PathRule("build", dir_only=True)])
+        assert rules.is_excluded("build", is_dir=True)
+        assert not rules.is_excluded("build")
+
+    def test_last_matching_rule_wins(self) -> None:
+        rules = RuleSet([
+            PathRule("*.md"),
+            PathRule("keep.md", negated=True),
+        ])
+        assert rules.is_excluded("drop.md")
+        assert not rules.is_excluded("keep.md")
+        assert rules.extend([PathRule("keep.md")]).is_excluded("keep.md")
+
+    def test_many_rules_single_matcher(self) -> None:
+        rules = RuleSet(PathRule(f"gen_{i}") for i in range(500))
+        assert len(rules) == 500
+        assert rules.match("a/gen_499", is_dir=True) == PathRule("gen_499")
+        assert rules.match("a/gen_500", is_dir=True) is None
+
+    def test_precedence_across_buckets(self) -> None:
+        rules = RuleSet([
+            PathRule("keep.md"),
+            PathRule("*.md", negated=True),
+            PathRule("docs/keep.md"),
+        ])
+        assert rules.match("docs/keep.md") == PathRule("docs/keep.md")
+        assert rules.match("x/keep.md") == PathRule("*.md", negated=True)
+        assert rules.match("x/other.md") == PathRule("*.md", negated=True)
+        assert rules.match("x/keep.txt") is None
+
+    def test_bucketed_match_equals_rule_by_rule(self) -> None:
+        patterns = [
+            "out", "build/", "!docs/out", "docs/*.md", "**/draft", "a?c", "[ab]*/x",
+            "docs/**", "!docs/keep.md", "keep.md", "x/**/out/",
+        ]
+        rules = [PathRule.parse(p) for p in patterns]
+        rule_set = RuleSet(r for r in rules if r is not None)
+        paths = [
+            "out", "a/out", "docs/out", "build", "docs/a.md", "docs/keep.md", "keep.md",
+            "y/draft", "abc", "b1/x", "x/y/out", "docs/sub/z.txt",
+        ]
+        for path, is_dir in itertools.product(paths, (False, True)):
+            expected = None
+            for rule in rule_set.rules:
+                if RuleSet([rule]).match(path, is_dir) is not None:
+                    expected = rule
+            assert rule_set.match(path, is_dir) == expected, (path, is_dir)
+
+    def test_glob_matcher_buckets_match_fnmatch(self) -> None:
+        globs = ["*.md", "docs/*.gen.md", "*/README", "a[.]txt", "*.tar.*", "lib/**", "x?.py"]
+        paths = ["a.md", "docs/b.gen.md", "x/README", "a.txt", "b.tar.gz", "lib/a", "xy.py",
+                 "README", "a.rst", "md", "docs/c.gen.txt"]
+        for path in paths:
+            expected = any(fnmatch.fnmatch(path, glob) for glob in globs)
+            assert GlobMatcher(globs).matches(path) == expected, path
+
+    def test_glob_matcher_matches_fnmatch(self) -> None:
+        matcher = GlobMatcher(["docs/generated/**", "*.gen.md"])
+        assert matcher.matches("docs/generated/a/b.md")
+        assert matcher.matches("x/y.gen.md")
+        assert not matcher.matches("docs/other.md")
+        assert not GlobMatcher()
+        assert not GlobMatcher().matches("a.md")
+
+    def test_benchmark_rows(self, capsys: pytest.CaptureFixture[str]) -> None:
+        from dev_tools.md_link_checker.benchmark import main as bench_main, run_benchmark
+
+        rows = run_benchmark([10, 300], paths=50, repeat=1)
+        assert [row["rules"] for row in rows] == [10, 300]
+        assert all(value > 0 for row in rows for value in row.values())
+        assert bench_main(["--rules", "20", "--paths", "10", "--repeat", "1"]) == 0
+        assert "bucketed" in capsys.readouterr().out
+
+    def test_ignore_file_applies_to_subtree(self, tmp_path: Path) -> None:
+        docs = tmp_path / "docs"
+        (docs / "drafts").mkdir(parents=True)
+        (docs / ".mdlinkignore").write_text("drafts/\n*.tmp.md\n", encoding="utf-8")
+        (docs / "a.md").write_text("# A\n")
+        (docs / "b.tmp.md").write_text("# B\n")
+        (docs / "drafts" / "c.md").write_text("# C\n")
+        (tmp_path / "top.tmp.md").write_text("# Top\n")
+
+        files = find_markdown_files(tmp_path)
+        names = {f.relative_to(tmp_path).as_posix() for f in files}
+        assert names == {"docs/a.md", "top.tmp.md"}
+
+    def test_rules_cached_per_directory(self, tmp_path: Path) -> None:
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        rules = PathRules(tmp_path, {"venv"})
+        leaf = rules.rules_for(tmp_path / "a" / "b")
+        assert rules.rules_for(tmp_path / "a" / "b") is leaf
+        # Directories without an ignore file share the parent's matcher.
+        assert rules.rules_for(tmp_path / "a") is leaf
+
+    def test_scan_all_exclude_patterns_with_negation(self, tmp_path: Path) -> None:
+        d = tmp_path / "gen"
+        d.mkdir()
+        (d / "bad.md").write_text("[broken](nope.md)\n", encoding="utf-8")
+        (d / "keep.md").write_text("# Keep\n", encoding="utf-8")
+
+        result = scan_all(tmp_path, exclude_patterns=["gen/*.md", "!gen/keep.md"])
+        assert result.files_scanned == 1
+        assert result.links_broken == 0
+
+
 # ===================================================================
 # TestResolveLinkTarget
 # ===================================================================
@@ -449,6 +597,93 @@ class TestScanAll:
         assert result.files_scanned == 2
 
 
+# ===================================================================
+# TestResourceLimits
+# ===================================================================
+
+class TestResourceLimits:
+    """Tests for per-file size limits, time budgets and isolated scans."""
+
+    def test_oversized_file_is_skipped(self, tmp_path: Path) -> None:
+        (tmp_path / "small.md").write_text("[broken](nope.md)\n", encoding="utf-8")
+        (tmp_path / "dump.md").write_text("[broken](nope.md)\n" * 100, encoding="utf-8")
+
+        result = scan_all(tmp_path, limits=ScanLimits(max_file_size=500))
+        assert result.links_broken == 1
+        assert result.skipped_files == [
+            SkippedFile("dump.md", "file too large (1,800 bytes, limit 500)")
+        ]
+
+    def test_isolated_scan_matches_in_process(self, tmp_path: Path) -> None:
+        (tmp_path / "target.md").write_text("# Target\n", encoding="utf-8")
+        (tmp_path / "source.md").write_text(
+            "[ok](target.md#target)\n[bad](target.md#nope)\n[ext](https://x.org)\n",
+            encoding="utf-8",
+        )
+        in_process = scan_all(tmp_path, limits=ScanLimits(isolate_size=None))
+        isolated = scan_all(tmp_path, limits=ScanLimits(isolate_size=0))
+        assert isolated.results == in_process.results
+        assert isolated.skipped_files == []
+
+    def test_time_budget_checked_between_lines(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        md = tmp_path / "slow.md"
+        md.write_text("line\n" * 10, encoding="utf-8")
+        clock = itertools.count(step=1.0)
+        monkeypatch.setattr(scanner.time, "monotonic", lambda: next(clock))
+
+        with pytest.raises(ScanTimeoutError):
+            scan_file(md, tmp_path, {}, time_budget=5)
+        result = scan_files([md], tmp_path, limits=ScanLimits(isolate_size=None, time_budget=5))
+        assert result.skipped_files == [
+            SkippedFile("slow.md", "scan exceeded the 5s time budget")
+        ]
+
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork",
+        reason="the patched worker only reaches forked children",
+    )
+    def test_isolated_scan_is_killed_after_budget(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        md = tmp_path / "hang.md"
+        md.write_text("# Hang\n", encoding="utf-8")
+        monkeypatch.setattr(scanner, "_isolated_worker", lambda *args: time.sleep(30))
+
+        started = time.monotonic()
+        result = scan_files([md], tmp_path, limits=ScanLimits(isolate_size=0, time_budget=0.5))
+        assert time.monotonic() - started < 10
+        assert result.skipped_files == [
+            SkippedFile("hang.md", "scan exceeded the 0.5s time budget")
+        ]
+
+    def test_anchor_into_oversized_target_not_checked(self, tmp_path: Path) -> None:
+        target = tmp_path / "big.md"
+        target.write_text("# Big\n" + "x" * 1000, encoding="utf-8")
+        result = check_link(
+            tmp_path / "a.md", 1, "t", "big.md#big", tmp_path, False, {}, max_file_size=100
+        )
+        assert result.status == LinkStatus.SKIPPED
+        assert result.reason == "anchor not checked: target file too large"
+
+    def test_cli_reports_skipped_files(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        (tmp_path / "dump.md").write_text("[broken](nope.md)\n" * 100, encoding="utf-8")
+        assert main(["--root", str(tmp_path), "--no-color", "--max-file-size", "100"]) == 0
+        out = capsys.readouterr().out
+        assert "dump.md: NOT SCANNED -- file too large" in out
+        assert "(1 not scanned)" in out
+
+        assert main(["--root", str(tmp_path), "--json", "--max-file-size", "100"]) == 0
+        import json
+        data = json.loads(capsys.readouterr().out)
+        assert data["files_skipped"][0]["source"] == "dump.md"
+
+        assert main(["--root", str(tmp_path), "--no-color", "--max-file-size", "0"]) == 1
+
+
 # ===================================================================
 # TestCLI
 # ===================================================================